@@ -1,13 +1,26 @@
-from fastapi import APIRouter
+from typing import Annotated
+
+from fastapi import APIRouter, Query
 
 from app.database import DbSession
-from app.schemas.system_info import SystemInfoResponse
+from app.integrations.celery.metrics import get_queue_metrics
+from app.schemas.system_info import QueueMetrics, SystemInfoResponse
 from app.services import DeveloperDep, system_info_service
 
 router = APIRouter()
 
 
 @router.get("/stats", response_model=SystemInfoResponse, tags=["dashboard"])
-async def get_stats(db: DbSession, _developer: DeveloperDep):
+async def get_stats(
+    db: DbSession,
+    _developer: DeveloperDep,
+    exact: Annotated[bool, Query(description="Compute exact counts from the database instead of counters")] = False,
+):
     """Get system dashboard statistics."""
-    return system_info_service.get_system_info(db)
+    return system_info_service.get_system_info(db, exact=exact)
+
+
+@router.get("/queues", response_model=list[QueueMetrics], tags=["dashboard"])
+async def get_queues(_developer: DeveloperDep):
+    """Get the depth and recent task wait times of the background task queues."""
+    return get_queue_metrics()
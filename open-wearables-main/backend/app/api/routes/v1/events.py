@@ -9,6 +9,7 @@ from app.schemas.event_record import EventRecordQueryParams
 from app.schemas.events import (
     SleepSession,
     Workout,
+    WorkoutDetailed,
 )
 from app.services import ApiKeyDep
 from app.services.event_record_service import event_record_service
@@ -24,7 +25,10 @@ async def list_workouts(
     end_date: str,
     db: DbSession,
     _api_key: ApiKeyDep,
-    record_type: str | None = None,
+    record_type: Annotated[
+        str | None,
+        Query(description="Unified workout type (exact match), or any other text for a substring match"),
+    ] = None,
     cursor: str | None = None,
     limit: Annotated[int, Query(ge=1, le=100)] = 50,
 ) -> PaginatedResponse[Workout]:
@@ -39,6 +43,21 @@ async def list_workouts(
     return await event_record_service.get_workouts(db, user_id, params)
 
 
+@router.get("/users/{user_id}/events/workouts/{workout_id}")
+async def get_workout(
+    user_id: UUID,
+    workout_id: UUID,
+    db: DbSession,
+    _api_key: ApiKeyDep,
+    max_heart_rate_points: Annotated[
+        int,
+        Query(ge=0, le=10000, description="Downsample the heart rate stream to this many points (0 = all samples)"),
+    ] = 500,
+) -> WorkoutDetailed:
+    """Returns a workout with its heart rate stream."""
+    return await event_record_service.get_workout_detailed(db, user_id, workout_id, max_heart_rate_points)
+
+
 @router.get("/users/{user_id}/events/sleep")
 async def list_sleep_sessions(
     user_id: UUID,
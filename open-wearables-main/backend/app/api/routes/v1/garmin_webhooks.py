@@ -2,14 +2,13 @@
 
 from logging import getLogger
 from typing import Annotated
-from urllib.parse import parse_qs, urlparse
 
-import httpx
 from fastapi import APIRouter, Header, HTTPException, Request
 
 from app.database import DbSession
-from app.integrations.redis_client import get_redis_client
-from app.repositories import UserConnectionRepository
+from app.integrations.celery.tasks import process_garmin_pings, process_garmin_push
+from app.services.providers.garmin.pings import plan_pings
+from app.services.providers.garmin.summaries import WELLNESS_SAVERS
 
 router = APIRouter()
 logger = getLogger(__name__)
@@ -28,6 +27,10 @@ async def garmin_ping_notification(
     The notification contains a callbackURL with a temporary pull token
     that can be used to fetch the actual data.
 
+    Pings are acknowledged right away and pulled by a Celery task, so large bursts
+    never keep Garmin waiting into a timeout (and its retries). Users are resolved in
+    one query and repeated pings for the same user and upload window are coalesced.
+
     Expected format:
     {
         "activities": [{
@@ -51,112 +54,18 @@ async def garmin_ping_notification(
 
     try:
         payload = await request.json()
-        logger.info(f"Received Garmin ping notification: {payload}")
-
-        # Process different summary types
-        processed_count = 0
-        errors: list[str] = []
-        processed_activities: list[dict] = []
-
-        # Process activities
-        if "activities" in payload:
-            for activity in payload["activities"]:
-                try:
-                    garmin_user_id = activity.get("userId")
-                    callback_url = activity.get("callbackURL")
-
-                    if not callback_url:
-                        logger.warning(f"No callback URL in activity notification for user {garmin_user_id}")
-                        continue
-
-                    logger.info(f"Activity callback URL for user {garmin_user_id}: {callback_url}")
-
-                    # Find internal user_id based on garmin_user_id
-                    repo = UserConnectionRepository()
-                    connection = repo.get_by_provider_user_id(db, "garmin", garmin_user_id)
-
-                    if not connection:
-                        logger.warning(f"No connection found for Garmin user {garmin_user_id}")
-                        errors.append(f"User {garmin_user_id} not connected")
-                        continue
-
-                    internal_user_id = connection.user_id
-                    logger.info(f"Mapped Garmin user {garmin_user_id} to internal user {internal_user_id}")
-
-                    # Extract parameters from callback URL (including pull token)
-                    parsed_url = urlparse(callback_url)
-                    query_params = parse_qs(parsed_url.query)
-                    pull_token = query_params.get("token", [None])[0]
-                    upload_start = query_params.get("uploadStartTimeInSeconds", [None])[0]
-                    upload_end = query_params.get("uploadEndTimeInSeconds", [None])[0]
-
-                    if pull_token:
-                        # Save pull token to Redis for later use
-                        # Token is associated with user and time range
-                        redis_client = get_redis_client()
-
-                        # Create key: garmin_token:{user_id}:{timestamp_range}
-                        token_key = f"garmin_pull_token:{internal_user_id}:{upload_start}_{upload_end}"
-                        redis_client.setex(
-                            token_key,
-                            3600,  # Token valid for 1 hour (adjust based on Garmin's actual expiry)
-                            pull_token,
-                        )
-
-                        logger.info(
-                            f"Saved pull token for user {internal_user_id} (time range: {upload_start}-{upload_end})",
-                        )
-
-                        # Also save the full callback URL for convenience
-                        url_key = f"garmin_callback_url:{internal_user_id}:latest"
-                        redis_client.setex(url_key, 3600, callback_url)
-
-                    # Optionally: Fetch and cache activity data immediately
-                    # This is recommended so data is available even if token expires
-                    try:
-                        async with httpx.AsyncClient() as client:
-                            response = await client.get(callback_url, timeout=30.0)
-                            response.raise_for_status()
-                            activities_data = response.json()
-
-                        logger.info(
-                            f"Fetched {len(activities_data) if isinstance(activities_data, list) else 1} "
-                            f"activities for user {internal_user_id}",
-                        )
-
-                        # TODO: Parse and save to database
-                        # For now, just log the data structure
-                        logger.debug(f"Activity data: {activities_data}")
-
-                        processed_count += 1
-                        processed_activities.append(
-                            {
-                                "garmin_user_id": garmin_user_id,
-                                "internal_user_id": str(internal_user_id),
-                                "activities_count": len(activities_data) if isinstance(activities_data, list) else 1,
-                                "status": "fetched",
-                                "pull_token_saved": True,
-                            },
-                        )
-
-                    except httpx.HTTPError as e:
-                        logger.error(f"Failed to fetch activity data from callback URL: {str(e)}")
-                        errors.append(f"HTTP error: {str(e)}")
+        planned = plan_pings(db, payload)
 
-                except Exception as e:
-                    logger.error(f"Error processing activity notification: {str(e)}")
-                    errors.append(str(e))
-
-        # Process other summary types (activityDetails, dailies, etc.)
-        for summary_type in ["activityDetails", "dailies", "epochs", "sleeps"]:
-            if summary_type in payload:
-                logger.info(f"Received {len(payload[summary_type])} {summary_type} notifications")
-                # TODO: Process other summary types similarly
+        if planned.pings:
+            process_garmin_pings.delay([ping.model_dump(mode="json") for ping in planned.pings])
 
+        logger.info(
+            f"Queued {len(planned.pings)} Garmin pings ({planned.coalesced} coalesced, {len(planned.errors)} errors)",
+        )
         return {
-            "processed": processed_count,
-            "errors": errors,
-            "activities": processed_activities,
+            "queued": len(planned.pings),
+            "coalesced": planned.coalesced,
+            "errors": planned.errors,
         }
 
     except Exception as e:
@@ -176,6 +85,9 @@ async def garmin_push_notification(
     Push notifications contain basic activity metadata.
     Use the activityId to fetch full activity details from Garmin API.
 
+    Wellness summaries (dailies, epochs, sleeps, stressDetails) carry their data and
+    are handed to a Celery task as a whole, which saves them in bulk.
+
     Expected format:
     {
         "activities": [{
@@ -189,7 +101,16 @@ async def garmin_push_notification(
             "deviceName": "Forerunner 965",
             "manual": false,
             "isWebUpload": false
-        }]
+        }],
+        "epochs": [{
+            "userId": "garmin_user_id",
+            "summaryId": "x153a9f3-691e7a00-6",
+            "startTimeInSeconds": 1763596800,
+            "durationInSeconds": 900,
+            "steps": 412,
+            ...
+        }],
+        ...
     }
     """
     # Verify request is from Garmin
@@ -199,7 +120,16 @@ async def garmin_push_notification(
 
     try:
         payload = await request.json()
-        logger.info(f"Received Garmin push notification: {payload}")
+        logger.info(f"Received Garmin push notification: {list(payload)}")
+
+        # Wellness summaries are saved in bulk by a Celery task, so large payloads are acknowledged right away
+        summaries = {
+            summary_type: items
+            for summary_type in WELLNESS_SAVERS
+            if isinstance(items := payload.get(summary_type), list) and items
+        }
+        if summaries:
+            process_garmin_push.delay(summaries)
 
         processed_count = 0
         errors: list[str] = []
@@ -258,6 +188,7 @@ async def garmin_push_notification(
             "processed": processed_count,
             "errors": errors,
             "activities": processed_activities,
+            "queued": {summary_type: len(items) for summary_type, items in summaries.items()},
         }
 
     except Exception as e:
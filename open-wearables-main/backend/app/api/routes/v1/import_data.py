@@ -1,16 +1,20 @@
-from typing import Annotated
+from collections.abc import AsyncIterator
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import Annotated, BinaryIO
 
 from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, status
 
+from app.config import settings
 from app.database import DbSession
-from app.integrations.celery.tasks.poll_sqs_task import poll_sqs_task
 from app.schemas import PresignedURLRequest, PresignedURLResponse, UploadDataResponse
 from app.services import ApiKeyDep, ae_import_service, hk_import_service, pre_url_service
 
 router = APIRouter()
 
 
-async def get_content_type(request: Request) -> tuple[str, str]:
+async def get_content_type(request: Request) -> AsyncIterator[tuple[BinaryIO, str]]:
+    """Spool the uploaded document (over ``sdk_upload_spool_bytes`` to disk) instead of holding it in memory."""
     content_type = request.headers.get("content-type", "")
     if "multipart/form-data" in content_type:
         form = await request.form()
@@ -19,15 +23,19 @@ async def get_content_type(request: Request) -> tuple[str, str]:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No file found")
 
         if isinstance(file, UploadFile):
-            content_bytes = await file.read()
-            content_str = content_bytes.decode("utf-8")
-        else:
-            content_str = str(file)
-    else:
-        body = await request.body()
-        content_str = body.decode("utf-8")
+            # Already spooled by the form parser, and closed with the request
+            await file.seek(0)
+            yield file.file, content_type
+            return
+        with BytesIO(str(file).encode("utf-8")) as content:
+            yield content, content_type
+        return
 
-    return content_str, content_type
+    with SpooledTemporaryFile(max_size=settings.sdk_upload_spool_bytes) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        yield spool, content_type
 
 
 @router.post("/users/{user_id}/import/apple/auto-health-export")
@@ -36,11 +44,11 @@ async def import_data_auto_health_export(
     request: Request,
     db: DbSession,
     _api_key: ApiKeyDep,
-    content: Annotated[tuple[str, str], Depends(get_content_type)],
+    content: Annotated[tuple[BinaryIO, str], Depends(get_content_type)],
 ) -> UploadDataResponse:
     """Import health data from file upload or JSON."""
-    content_str, content_type = content[0], content[1]
-    return await ae_import_service.import_data_from_request(db, content_str, content_type, user_id)
+    body, content_type = content[0], content[1]
+    return await ae_import_service.import_data_from_request(db, body, content_type, user_id)
 
 
 @router.post("/users/{user_id}/import/apple/healthion")
@@ -49,11 +57,11 @@ async def import_data_healthion(
     request: Request,
     db: DbSession,
     _api_key: ApiKeyDep,
-    content: Annotated[tuple[str, str], Depends(get_content_type)],
+    content: Annotated[tuple[BinaryIO, str], Depends(get_content_type)],
 ) -> UploadDataResponse:
     """Import health data from file upload or JSON."""
-    content_str, content_type = content[0], content[1]
-    return await hk_import_service.import_data_from_request(db, content_str, content_type, user_id)
+    body, content_type = content[0], content[1]
+    return await hk_import_service.import_data_from_request(db, body, content_type, user_id)
 
 
 @router.post("/users/{user_id}/import/apple/xml")
@@ -62,9 +70,5 @@ async def import_xml(
     request: PresignedURLRequest,
     _api_key: ApiKeyDep,
 ) -> PresignedURLResponse:
-    """Generate presigned URL for XML file upload and trigger processing task."""
-    presigned_response = pre_url_service.create_presigned_url(user_id, request)
-
-    poll_sqs_task.delay(presigned_response.expires_in)
-
-    return presigned_response
+    """Generate presigned URL for XML file upload, imported by the upload queue consumer once uploaded."""
+    return pre_url_service.create_presigned_url(user_id, request)
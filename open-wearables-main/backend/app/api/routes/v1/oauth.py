@@ -4,8 +4,10 @@ from uuid import UUID
 from fastapi import APIRouter, HTTPException, Query, status
 from fastapi.responses import RedirectResponse
 
+from app.config import settings
 from app.database import DbSession
-from app.integrations.celery.tasks import sync_vendor_data
+from app.integrations.celery.queues import INTERACTIVE, PRIORITY_HIGH
+from app.integrations.celery.tasks import backfill_connection, sync_vendor_data
 from app.schemas import (
     AuthorizationURLResponse,
     BulkProviderSettingsUpdate,
@@ -85,12 +87,15 @@ async def oauth_callback(
     oauth_state = strategy.oauth.handle_callback(db, code, state)
 
     # schedule sync task
-    sync_vendor_data.delay(
-        str(oauth_state.user_id),
-        start_date=None,
-        end_date=None,
-        providers=[provider.value],
+    sync_vendor_data.apply_async(
+        args=(str(oauth_state.user_id),),
+        kwargs={"start_date": None, "end_date": None, "providers": [provider.value]},
+        queue=INTERACTIVE,
+        priority=PRIORITY_HIGH,
     )
+    # and the backfill of the connection's history, window by window
+    if provider.value in settings.backfill_window_days:
+        backfill_connection.delay(str(oauth_state.user_id), provider.value)
 
     # If a specific redirect_uri was requested (e.g. by frontend), redirect there
     if oauth_state.redirect_uri:
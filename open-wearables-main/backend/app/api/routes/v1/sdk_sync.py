@@ -1,16 +1,24 @@
-from typing import Annotated
+from collections.abc import AsyncIterator, Awaitable, Callable
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import Annotated, BinaryIO
 
-from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, UploadFile, status
 
+from app.config import settings
 from app.database import DbSession
 from app.schemas import UploadDataResponse
 from app.services import ae_import_service, hk_import_service
 from app.utils.auth import SDKAuthDep
+from app.utils.idempotency import IdempotentUpload
 
 router = APIRouter()
 
+IdempotencyKey = Annotated[str | None, Header(alias="Idempotency-Key", max_length=255)]
 
-async def get_content_type(request: Request) -> tuple[str, str]:
+
+async def get_content_type(request: Request) -> AsyncIterator[tuple[BinaryIO, str]]:
+    """Spool the uploaded document (over ``sdk_upload_spool_bytes`` to disk) instead of holding it in memory."""
     content_type = request.headers.get("content-type", "")
     if "multipart/form-data" in content_type:
         form = await request.form()
@@ -19,15 +27,37 @@ async def get_content_type(request: Request) -> tuple[str, str]:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No file found")
 
         if isinstance(file, UploadFile):
-            content_bytes = await file.read()
-            content_str = content_bytes.decode("utf-8")
-        else:
-            content_str = str(file)
-    else:
-        body = await request.body()
-        content_str = body.decode("utf-8")
+            # Already spooled by the form parser, and closed with the request
+            await file.seek(0)
+            yield file.file, content_type
+            return
+        with BytesIO(str(file).encode("utf-8")) as content:
+            yield content, content_type
+        return
+
+    with SpooledTemporaryFile(max_size=settings.sdk_upload_spool_bytes) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        yield spool, content_type
 
-    return content_str, content_type
+
+async def _import_once(
+    upload: IdempotentUpload,
+    response: Response,
+    run_import: Callable[[], Awaitable[UploadDataResponse]],
+) -> UploadDataResponse:
+    """Import an upload unless the same upload was imported before, whose outcome is replayed."""
+    if (outcome := upload.begin()) is not None:
+        response.headers["Idempotent-Replayed"] = "true"
+        return outcome
+    try:
+        outcome = await run_import()
+    except Exception:
+        upload.release()
+        raise
+    upload.finish(outcome)
+    return outcome
 
 
 @router.post("/sdk/users/{user_id}/sync/apple/auto-health-export")
@@ -36,11 +66,14 @@ async def sync_data_auto_health_export(
     request: Request,
     db: DbSession,
     auth: SDKAuthDep,
-    content: Annotated[tuple[str, str], Depends(get_content_type)],
+    content: Annotated[tuple[BinaryIO, str], Depends(get_content_type)],
+    response: Response,
+    idempotency_key: IdempotencyKey = None,
 ) -> UploadDataResponse:
     """Import health data from file upload or JSON.
 
     Accepts either SDK user token (Bearer) or API key (X-Open-Wearables-API-Key header).
+    Retries of an imported upload (same Idempotency-Key or body) are answered without importing again.
     """
     if auth.auth_type == "sdk_token" and (not auth.user_id or str(auth.user_id) != user_id):
         raise HTTPException(
@@ -48,8 +81,13 @@ async def sync_data_auto_health_export(
             detail="Token does not match user_id",
         )
 
-    content_str, content_type = content[0], content[1]
-    return await ae_import_service.import_data_from_request(db, content_str, content_type, user_id)
+    body, content_type = content[0], content[1]
+    upload = IdempotentUpload("auto-health-export", user_id, body, idempotency_key)
+    return await _import_once(
+        upload,
+        response,
+        lambda: ae_import_service.import_data_from_request(db, body, content_type, user_id),
+    )
 
 
 @router.post("/sdk/users/{user_id}/sync/apple/healthion")
@@ -58,11 +96,14 @@ async def sync_data_healthion(
     request: Request,
     db: DbSession,
     auth: SDKAuthDep,
-    content: Annotated[tuple[str, str], Depends(get_content_type)],
+    content: Annotated[tuple[BinaryIO, str], Depends(get_content_type)],
+    response: Response,
+    idempotency_key: IdempotencyKey = None,
 ) -> UploadDataResponse:
     """Import health data from file upload or JSON.
 
     Accepts either SDK user token (Bearer) or API key (X-Open-Wearables-API-Key header).
+    Retries of an imported upload (same Idempotency-Key or body) are answered without importing again.
     """
     if auth.auth_type == "sdk_token" and (not auth.user_id or str(auth.user_id) != user_id):
         raise HTTPException(
@@ -70,5 +111,10 @@ async def sync_data_healthion(
             detail="Token does not match user_id",
         )
 
-    content_str, content_type = content[0], content[1]
-    return await hk_import_service.import_data_from_request(db, content_str, content_type, user_id)
+    body, content_type = content[0], content[1]
+    upload = IdempotentUpload("healthion", user_id, body, idempotency_key)
+    return await _import_once(
+        upload,
+        response,
+        lambda: hk_import_service.import_data_from_request(db, body, content_type, user_id),
+    )
@@ -1,13 +1,17 @@
 from datetime import datetime, timedelta
 from enum import Enum
+from math import ceil
 from typing import Annotated, Any, cast
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Path, Query, status
 
 from app.database import DbSession
+from app.integrations.celery.tasks import sync_vendor_data
+from app.integrations.sync_lock import SyncLeases
 from app.schemas.oauth import ProviderName
 from app.services import ApiKeyDep
+from app.services.providers.base_strategy import BaseProviderStrategy
 from app.services.providers.factory import ProviderFactory
 from app.services.providers.templates.base_247_data import Base247DataTemplate
 
@@ -23,6 +27,16 @@ class SyncDataType(str, Enum):
     ALL = "all"
 
 
+def _families(strategy: BaseProviderStrategy, data_type: SyncDataType) -> list[str]:
+    """Data families a manual sync of the given type covers, as leased by sync_vendor_data."""
+    families: list[str] = []
+    if strategy.workouts and data_type in (SyncDataType.WORKOUTS, SyncDataType.ALL):
+        families.append("workouts")
+    if strategy.data_247 and data_type in (SyncDataType.DATA_247, SyncDataType.ALL):
+        families.extend(strategy.data_247.get_sync_families() or ["data_247"])
+    return families
+
+
 @router.post("/{provider}/users/{user_id}/sync")
 async def sync_user_data(
     provider: Annotated[ProviderName, Path(description="Data provider")],
@@ -94,47 +108,61 @@ async def sync_user_data(
         "summary_end_time": summary_end_time,
     }
 
-    # Sync workouts if requested
-    if data_type in (SyncDataType.WORKOUTS, SyncDataType.ALL):
-        if strategy.workouts:
-            results["workouts"] = strategy.workouts.load_data(db, user_id, **params)
-        elif data_type == SyncDataType.WORKOUTS:
-            raise HTTPException(
-                status_code=status.HTTP_501_NOT_IMPLEMENTED,
-                detail=f"Provider '{provider.value}' does not support workouts",
-            )
-
-    # Sync 247 data if requested (Suunto-specific)
-    if data_type in (SyncDataType.DATA_247, SyncDataType.ALL):
-        if strategy.data_247:
-            data_provider = cast(Base247DataTemplate, strategy.data_247)
-            start_dt = datetime.now() - timedelta(days=30)
-            end_dt = datetime.now()
-
-            if since:
-                start_dt = datetime.fromtimestamp(since)
-
-            # Use load_and_save_all if available (Suunto), otherwise fallback to load_all_247_data
-            provider_any = cast(Any, data_provider)
-            if hasattr(provider_any, "load_and_save_all"):
-                results["data_247"] = provider_any.load_and_save_all(
-                    db,
-                    user_id,
-                    start_time=start_dt,
-                    end_time=end_dt,
+    # One sync per data family at a time, clients retry once the running one is likely done
+    leases = SyncLeases(user_id, provider.value, _families(strategy, data_type))
+    if busy := leases.acquire(coalesce=False):
+        leases.release()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Already syncing {', '.join(sorted(busy))} for this user",
+            headers={"Retry-After": str(ceil(max(busy.values())))},
+        )
+
+    try:
+        # Sync workouts if requested
+        if data_type in (SyncDataType.WORKOUTS, SyncDataType.ALL):
+            if strategy.workouts:
+                results["workouts"] = strategy.workouts.load_data(db, user_id, **params)
+            elif data_type == SyncDataType.WORKOUTS:
+                raise HTTPException(
+                    status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                    detail=f"Provider '{provider.value}' does not support workouts",
                 )
-            else:
-                results["data_247"] = provider_any.load_all_247_data(
-                    db,
-                    user_id,
-                    start_time=start_dt,
-                    end_time=end_dt,
+
+        # Sync 247 data if requested (Suunto-specific)
+        if data_type in (SyncDataType.DATA_247, SyncDataType.ALL):
+            if strategy.data_247:
+                data_provider = cast(Base247DataTemplate, strategy.data_247)
+                start_dt = datetime.now() - timedelta(days=30)
+                end_dt = datetime.now()
+
+                if since:
+                    start_dt = datetime.fromtimestamp(since)
+
+                # Use load_and_save_all if available (Suunto), otherwise fallback to load_all_247_data
+                provider_any = cast(Any, data_provider)
+                if hasattr(provider_any, "load_and_save_all"):
+                    results["data_247"] = provider_any.load_and_save_all(
+                        db,
+                        user_id,
+                        start_time=start_dt,
+                        end_time=end_dt,
+                    )
+                else:
+                    results["data_247"] = provider_any.load_all_247_data(
+                        db,
+                        user_id,
+                        start_time=start_dt,
+                        end_time=end_dt,
+                    )
+            elif data_type == SyncDataType.DATA_247:
+                raise HTTPException(
+                    status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                    detail=f"Provider '{provider.value}' does not support 247 data (sleep/recovery/activity)",
                 )
-        elif data_type == SyncDataType.DATA_247:
-            raise HTTPException(
-                status_code=status.HTTP_501_NOT_IMPLEMENTED,
-                detail=f"Provider '{provider.value}' does not support 247 data (sleep/recovery/activity)",
-            )
+    finally:
+        if leases.release():
+            sync_vendor_data.delay(str(user_id), providers=[provider.value])
 
     if not results:
         raise HTTPException(
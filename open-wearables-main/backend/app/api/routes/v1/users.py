@@ -2,6 +2,7 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.database import DbSession
 from app.schemas.common import PaginatedResponse
@@ -18,7 +19,7 @@ async def list_users(
     query_params: Annotated[UserQueryParams, Depends()],
 ):
     """List users with pagination, sorting, and search."""
-    return user_service.get_users_paginated(db, query_params)
+    return await run_in_threadpool(user_service.get_users_paginated, db, query_params)
 
 
 @router.get(
@@ -46,7 +47,7 @@ async def list_users(
     },
 )
 async def get_user(user_id: UUID, db: DbSession, _api_key: ApiKeyDep):
-    return user_service.get(db, user_id, raise_404=True)
+    return await run_in_threadpool(user_service.get, db, user_id, raise_404=True)
 
 
 @router.post("/users", status_code=status.HTTP_201_CREATED, response_model=UserRead)
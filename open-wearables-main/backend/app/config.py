@@ -50,6 +50,9 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    auth_cache_ttl_seconds: int = 60  # Cache of validated API keys and developers (0 disables)
+    auth_cache_max_entries: int = 1024
+    auth_cache_redis_ttl_seconds: int = 0  # Shared Redis tier for the auth cache (0 disables)
     token_lifetime: int = 3600
 
     # REDIS SETTINGS
@@ -62,6 +65,63 @@ class Settings(BaseSettings):
 
     # SYNC SETTINGS
     sync_interval_seconds: int = 3600  # Default: 1 hour (3600 seconds)
+    sync_max_concurrency: int = 8  # Provider API fetches running in parallel within one user sync
+    sync_detail_fetch_concurrency: int = 4  # Detail requests or time chunks fetched in parallel within one data family
+    sync_247_window_days: int = 7  # 247 data is fetched and saved one window at a time (bounds memory)
+    sync_overlap_minutes: int = 60  # Incremental syncs re-fetch this much before the last sync (late uploads)
+    sync_fanout_jitter_seconds: float = 30.0  # Random delay added to each user sync queued by sync_all_users
+    sync_lease_seconds: int = 1800  # Lease of a family by one sync, extended while it runs, expires if the worker dies
+    sync_lease_retry_seconds: float = 60.0  # Longest wait before retrying a range sync of a family leased by another
+
+    # CELERY SETTINGS
+    celery_worker_prefetch_multiplier: int = 1  # Tasks reserved per worker process, 1 reserves only the running one
+    celery_visibility_timeout_seconds: int = 6 * 3600  # Longer than the longest task, which is redelivered after it
+    celery_latency_samples: int = 1000  # Recent queue wait times kept per queue for the metrics
+
+    # PROVIDER HTTP SETTINGS
+    provider_http_timeout_seconds: float = 30.0
+    provider_http_connect_timeout_seconds: float = 10.0
+    provider_http_max_connections: int = 20  # Per provider
+    provider_http_max_keepalive_connections: int = 10
+    provider_http_keepalive_expiry_seconds: float = 60.0
+    provider_http2: bool = True  # Negotiated with ALPN, servers without HTTP/2 get HTTP/1.1
+    provider_http_max_retries: int = 3  # Retries on 429/5xx and transport errors
+    provider_http_backoff_seconds: float = 0.5  # Base of the jittered exponential backoff
+    provider_http_backoff_max_seconds: float = 30.0
+
+    # PROVIDER TOKEN SETTINGS
+    provider_token_cache_ttl_seconds: int = 300  # Cache of valid provider access tokens (0 disables)
+    provider_token_refresh_lock_seconds: int = 30  # Single-flight refresh lock timeout per (user, provider)
+
+    # PROVIDER RATE LIMIT SETTINGS
+    # Requests per minute per provider app key, shared by all workers (vendors' documented base quotas)
+    provider_rate_limits: dict[str, float] = {"garmin": 100, "polar": 33, "suunto": 300, "whoop": 100}
+    provider_rate_limit_burst: int = 10
+    provider_rate_limit_max_wait_seconds: float = 30.0  # Longer waits defer the sync instead of blocking
+    # Estimated API calls per user sync, used to pace the fan-out of sync_all_users
+    provider_sync_requests_per_user: dict[str, int] = {"garmin": 4, "polar": 3, "suunto": 6, "whoop": 4}
+
+    # RECORD MERGE SETTINGS
+    # Workouts and sleeps recorded by several sources are merged: the record of the first source
+    # listed is canonical and the others are flagged as its duplicates (unlisted sources come last)
+    record_source_priority: list[str] = ["garmin", "polar", "suunto", "whoop", "apple"]
+    record_merge_min_overlap: float = 0.5  # Share of the shorter record two records overlap to be duplicates
+
+    # BACKFILL SETTINGS
+    backfill_history_days: int = 365  # History synced for a new connection, window by window
+    # Length of one backfill window per provider, the longest range its API serves per request
+    # (unlisted providers, e.g. Polar which only serves data uploaded after connecting, are not backfilled)
+    backfill_window_days: dict[str, float] = {"garmin": 1, "suunto": 28, "whoop": 30}
+    backfill_max_attempts: int = 3  # Attempts of a failing window before it is left failed
+    backfill_retry_seconds: float = 300.0  # Base of the exponential backoff between attempts of a window
+
+    # SDK UPLOAD SETTINGS
+    sdk_upload_dedup_ttl_seconds: int = 7 * 24 * 3600  # Retries of a successful SDK upload are answered from Redis
+    sdk_upload_pending_seconds: int = 900  # Retries while the same upload is being imported get 409 for at most this
+    sdk_upload_spool_bytes: int = 1024 * 1024  # Larger upload bodies are spooled to disk while imported
+
+    # DASHBOARD SETTINGS
+    system_stats_reconcile_interval_seconds: int = 3600  # Exact recount of the maintained dashboard counters
 
     # SUUNTO OAUTH SETTINGS
     suunto_client_id: str | None = None
@@ -76,6 +136,12 @@ class Settings(BaseSettings):
     garmin_redirect_uri: str = "http://localhost:8000/api/v1/oauth/garmin/callback"
     garmin_default_scope: str = ""  # Scope is managed at app creation in Garmin Developer Portal
 
+    # GARMIN WEBHOOK SETTINGS
+    garmin_ping_fetch_concurrency: int = 4  # Callback URLs pulled in parallel by one ping task
+    garmin_ping_coalesce_seconds: int = 3600  # Repeated pings for the same user and upload window are dropped
+    garmin_ping_max_attempts: int = 4  # Pulls of a ping before it is given up
+    garmin_ping_retry_seconds: int = 60  # First retry delay of a failed ping, doubled on each retry
+
     # POLAR OAUTH SETTINGS
     polar_client_id: str | None = None
     polar_client_secret: SecretStr | None = None
@@ -102,6 +168,16 @@ class Settings(BaseSettings):
     aws_secret_access_key: str | None = None
     aws_region: str = "eu-north-1"
     sqs_queue_url: str | None = None
+    sqs_wait_seconds: int = 20
+    sqs_visibility_timeout: int = 300
+    sqs_consumer_concurrency: int = 2
+
+    # RAW ARCHIVE SETTINGS
+    raw_archive_backend: str | None = None  # "local" or "s3"; unset disables archiving of raw provider payloads
+    raw_archive_path: Path = Path("/var/lib/open-wearables/raw-archive")  # Root of the local backend
+    raw_archive_bucket: str | None = None  # S3 backend bucket, defaults to aws_bucket_name
+    raw_archive_prefix: str = "raw-archive"  # S3 backend key prefix
+    raw_archive_zstd_level: int = 3  # zstd compression level of archived payloads
 
     xml_chunk_size: int = 50_000
 
@@ -1,4 +1,8 @@
+from kombu import Queue
+
 from app.config import settings
+from app.integrations.celery.metrics import connect_metrics
+from app.integrations.celery.queues import DEFAULT, PRIORITY_NORMAL, QUEUES, TASK_ROUTES
 from celery import Celery
 from celery import current_app as current_celery_app
 
@@ -13,10 +17,25 @@ def create_celery() -> Celery:
         result_serializer="json",
         timezone="Europe/Warsaw",
         enable_utc=True,
-        task_default_queue="default",
-        task_default_exchange="default",
+        task_default_queue=DEFAULT,
+        task_default_exchange=DEFAULT,
+        task_default_priority=PRIORITY_NORMAL,
+        task_queues=[Queue(name) for name in QUEUES],
+        task_routes=TASK_ROUTES,
+        # Tasks are acknowledged once done, so a worker dying mid-task hands it to another
+        # one (all tasks are idempotent). Each process reserves only the task it runs,
+        # so a long import doesn't hold back tasks prefetched behind it.
+        task_acks_late=True,
+        task_reject_on_worker_lost=True,
+        worker_prefetch_multiplier=settings.celery_worker_prefetch_multiplier,
+        broker_transport_options={
+            # Unacknowledged tasks (and countdowns) are redelivered after this, so it must exceed the longest task
+            "visibility_timeout": settings.celery_visibility_timeout_seconds,
+            "queue_order_strategy": "priority",
+        },
         result_expires=3 * 24 * 3600,
     )
+    connect_metrics()
 
     celery_app.autodiscover_tasks(["app.integrations.celery.tasks"])
 
@@ -26,6 +45,11 @@ def create_celery() -> Celery:
             "schedule": float(settings.sync_interval_seconds),
             "args": (),  # No args - task calculates date range dynamically
         },
+        "reconcile-system-stats-periodic": {
+            "task": "app.integrations.celery.tasks.reconcile_system_stats_task.reconcile_system_stats",
+            "schedule": float(settings.system_stats_reconcile_interval_seconds),
+            "args": (),
+        },
     }
 
     return celery_app
@@ -0,0 +1,102 @@
+"""Depth and wait latency of the Celery queues.
+
+Every published task is stamped with the time it was queued. When a worker starts it,
+the time it waited (from its countdown, if any) is kept in a capped Redis list per queue,
+from which percentiles of recent waits are computed next to the queue depth.
+"""
+
+import time
+from datetime import datetime
+from logging import getLogger
+from typing import Any
+
+from kombu.exceptions import ChannelError
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.integrations.celery.queues import QUEUES
+from app.integrations.redis_client import get_redis_client
+from app.schemas import QueueMetrics
+from celery import Task, current_app
+from celery.signals import before_task_publish, task_prerun
+
+ENQUEUED_AT = "enqueued_at"  # Message header, seconds since the epoch
+
+logger = getLogger(__name__)
+
+
+def _latency_key(queue: str) -> str:
+    return f"celery_latency:{queue}"
+
+
+def _stamp_enqueued_at(headers: dict[str, Any] | None = None, **kwargs: Any) -> None:
+    if headers is not None:
+        headers.setdefault(ENQUEUED_AT, time.time())
+
+
+def _record_wait(task: Task | None = None, **kwargs: Any) -> None:
+    if task is None:
+        return
+    request = task.request
+    enqueued_at = getattr(request, ENQUEUED_AT, None)
+    queue = (request.delivery_info or {}).get("routing_key")
+    if enqueued_at is None or not queue:
+        return
+    ready_at = float(enqueued_at)
+    if eta := request.eta:
+        # Tasks with a countdown only wait from when they are due
+        due = datetime.fromisoformat(eta) if isinstance(eta, str) else eta
+        ready_at = max(ready_at, due.timestamp())
+    record_latency(queue, time.time() - ready_at)
+
+
+def connect_metrics() -> None:
+    """Stamp published tasks and record their wait when started (in API and worker processes)."""
+    before_task_publish.connect(_stamp_enqueued_at, weak=False, dispatch_uid="celery_metrics_publish")
+    task_prerun.connect(_record_wait, weak=False, dispatch_uid="celery_metrics_prerun")
+
+
+def record_latency(queue: str, seconds: float) -> None:
+    """Keep the wait of a started task among the recent waits of its queue."""
+    key = _latency_key(queue)
+    try:
+        pipeline = get_redis_client().pipeline(transaction=False)
+        pipeline.lpush(key, round(max(seconds, 0.0), 3))
+        pipeline.ltrim(key, 0, settings.celery_latency_samples - 1)
+        pipeline.execute()
+    except RedisError as e:
+        logger.debug(f"[celery_metrics] Failed to record wait of {queue}: {e}")
+
+
+def _percentile(ordered: list[float], share: float) -> float | None:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def _depth(channel: Any, queue: str) -> int:
+    try:
+        return channel.queue_declare(queue=queue, passive=True).message_count
+    except ChannelError:
+        return 0  # Never used yet
+
+
+def get_queue_metrics() -> list[QueueMetrics]:
+    """Depth and recent wait percentiles of each queue."""
+    redis = get_redis_client()
+    with current_app.connection_for_read() as connection:
+        channel = connection.default_channel
+        metrics = []
+        for queue in QUEUES:
+            waits = sorted(float(wait) for wait in redis.lrange(_latency_key(queue), 0, -1))
+            metrics.append(
+                QueueMetrics(
+                    queue=queue,
+                    depth=_depth(channel, queue),
+                    latency_samples=len(waits),
+                    latency_p50_seconds=_percentile(waits, 0.5),
+                    latency_p95_seconds=_percentile(waits, 0.95),
+                    latency_max_seconds=waits[-1] if waits else None,
+                ),
+            )
+    return metrics
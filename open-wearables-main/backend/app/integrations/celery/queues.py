@@ -0,0 +1,26 @@
+"""Celery queues and priorities, so bulk work never delays what a user is waiting for.
+
+Workers consume all queues unless started with ``CELERY_QUEUES``; a dedicated worker for
+``bulk`` keeps imports and backfills from occupying every worker process. Within a worker,
+messages are taken by priority first. The Redis broker takes lower numbers first.
+"""
+
+INTERACTIVE = "interactive"  # A user is waiting: invitation emails, the first sync of a new connection
+DEFAULT = "default"  # Webhook data and housekeeping
+SYNC = "sync"  # Periodic, rerun and deferred provider syncs
+BULK = "bulk"  # File imports and history backfills
+
+QUEUES = [INTERACTIVE, DEFAULT, SYNC, BULK]
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 3
+PRIORITY_LOW = 6  # Fan-outs of many tasks, so single requests queued meanwhile go first
+
+TASK_ROUTES = {
+    "app.integrations.celery.tasks.send_email_task.send_invitation_email_task": {"queue": INTERACTIVE},
+    "app.integrations.celery.tasks.sync_vendor_data_task.sync_vendor_data": {"queue": SYNC},
+    "app.integrations.celery.tasks.periodic_sync_task.sync_all_users": {"queue": SYNC},
+    "app.integrations.celery.tasks.process_upload_task.process_uploaded_file": {"queue": BULK},
+    "app.integrations.celery.tasks.backfill_task.backfill_connection": {"queue": BULK},
+    "app.integrations.celery.tasks.backfill_task.backfill_window": {"queue": BULK},
+}
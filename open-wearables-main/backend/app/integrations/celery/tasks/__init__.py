@@ -1,13 +1,20 @@
+from .backfill_task import backfill_connection, backfill_window
+from .garmin_ping_task import process_garmin_pings
+from .garmin_push_task import process_garmin_push
 from .periodic_sync_task import sync_all_users
-from .poll_sqs_task import poll_sqs_task
 from .process_upload_task import process_uploaded_file
+from .reconcile_system_stats_task import reconcile_system_stats
 from .send_email_task import send_invitation_email_task
 from .sync_vendor_data_task import sync_vendor_data
 
 __all__ = [
-    "poll_sqs_task",
+    "backfill_connection",
+    "backfill_window",
+    "process_garmin_pings",
+    "process_garmin_push",
     "process_uploaded_file",
     "sync_vendor_data",
     "sync_all_users",
     "send_invitation_email_task",
+    "reconcile_system_stats",
 ]
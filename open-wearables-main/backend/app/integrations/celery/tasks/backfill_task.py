@@ -0,0 +1,185 @@
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from typing import Any
+from uuid import UUID
+
+from app.config import settings
+from app.database import DbSession, SessionLocal
+from app.integrations.celery.queues import PRIORITY_LOW
+from app.integrations.celery.tasks.sync_vendor_data_task import sync_vendor_data
+from app.integrations.rate_limiter import sync_spacing_seconds
+from app.models import UserConnection
+from app.repositories import BackfillWindowRepository
+from app.repositories.user_connection_repository import UserConnectionRepository
+from app.schemas import ConnectionStatus
+from celery import shared_task
+
+logger = getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@shared_task
+def backfill_connection(user_id: str, provider: str, history_days: int | None = None) -> dict[str, Any]:
+    """
+    Backfill the history of a new provider connection, one window at a time.
+
+    The history is split into windows of ``backfill_window_days`` (the longest range the
+    provider serves per request), each synced by its own ``backfill_window`` subtask.
+    Subtasks are spaced by the provider's per-user share of its rate limit, most recent
+    window first. Progress is stored per window, so running this again only re-queues the
+    windows that are not done yet.
+
+    Args:
+        user_id: UUID of the connected user
+        provider: Provider name
+        history_days: Days of history to backfill (None = ``backfill_history_days``)
+
+    Returns:
+        dict with counts of planned and queued windows
+    """
+    result = {"planned": 0, "queued": 0}
+    window_days = settings.backfill_window_days.get(provider)
+    if not window_days:
+        logger.info(f"[backfill_connection] {provider} history is not backfilled")
+        return result
+
+    with SessionLocal() as db:
+        connection = UserConnectionRepository().get_active_connection(db, UUID(user_id), provider)
+        if connection is None:
+            logger.info(f"[backfill_connection] No active {provider} connection for user {user_id}")
+            return result
+
+        end = datetime.now(timezone.utc)
+        start = end - timedelta(days=history_days or settings.backfill_history_days)
+        windows = _windows(start, end, timedelta(days=window_days))
+        window_repo = BackfillWindowRepository()
+        window_repo.plan(db, connection.id, windows)
+        result["planned"] = len(windows)
+
+        unfinished = window_repo.get_unfinished(db, connection.id)
+        if not unfinished:
+            _complete(db, connection)
+            return result
+
+        spacing = sync_spacing_seconds(provider)
+        for i, window in enumerate(unfinished):
+            backfill_window.apply_async(
+                args=(str(connection.id), window.window_start.isoformat()),
+                countdown=i * spacing,
+                priority=PRIORITY_LOW,
+            )
+        result["queued"] = len(unfinished)
+
+    logger.info(f"[backfill_connection] Queued {result['queued']} {provider} windows for user {user_id}")
+    return result
+
+
+@shared_task
+def backfill_window(user_connection_id: str, window_start: str) -> dict[str, Any]:
+    """
+    Sync one window of a connection's history backfill.
+
+    Rate limited windows are re-queued for when the quota allows; failing windows are
+    retried with exponential backoff up to ``backfill_max_attempts`` times, both at low
+    priority. The connection is marked as backfilled once its last window is done. A window
+    synced again, or overlapping incremental syncs, stores nothing twice: savers replace
+    samples by series and instant and keep event records unique by device and time span.
+
+    Args:
+        user_connection_id: UUID of the connection being backfilled
+        window_start: ISO 8601 start of the window
+
+    Returns:
+        dict with the window's status
+    """
+    window_repo = BackfillWindowRepository()
+
+    with SessionLocal() as db:
+        connection = UserConnectionRepository().get(db, UUID(user_connection_id))
+        window = window_repo.get(db, UUID(user_connection_id), datetime.fromisoformat(window_start))
+        if connection is None or window is None or connection.status != ConnectionStatus.ACTIVE:
+            return {"status": "skipped"}
+        if window.status == "done":
+            return {"status": "done"}
+
+        sync = sync_vendor_data(
+            str(connection.user_id),
+            window.window_start.isoformat(),
+            window.window_end.isoformat(),
+            providers=[connection.provider],
+            defer=False,
+        )
+
+        retry_after = sync["deferred"].get(connection.provider)
+        if retry_after is not None:
+            backfill_window.apply_async(
+                args=(user_connection_id, window_start),
+                countdown=retry_after,
+                priority=PRIORITY_LOW,
+            )
+            return {"status": "deferred", "retry_after": retry_after}
+
+        error = _sync_error(sync, connection.provider)
+        attempts = window.attempts + 1
+        window_repo.finish(db, window, error)
+        if error is None:
+            _complete(db, connection)
+            return {"status": "done"}
+
+        if attempts < settings.backfill_max_attempts:
+            countdown = settings.backfill_retry_seconds * 2 ** (attempts - 1)
+            backfill_window.apply_async(
+                args=(user_connection_id, window_start),
+                countdown=countdown,
+                priority=PRIORITY_LOW,
+            )
+            logger.warning(
+                f"[backfill_window] {connection.provider} window {window_start} of connection "
+                f"{user_connection_id} failed, retrying in {countdown:.0f}s: {error}",
+            )
+        else:
+            logger.error(
+                f"[backfill_window] {connection.provider} window {window_start} of connection "
+                f"{user_connection_id} failed {attempts} times: {error}",
+            )
+        return {"status": "failed", "error": error}
+
+
+def _windows(start: datetime, end: datetime, size: timedelta) -> list[tuple[datetime, datetime]]:
+    """Split [start, end) into windows aligned to multiples of ``size`` since the epoch.
+
+    Aligned windows keep their start when the backfill is planned again later, so the
+    windows already done are recognized and not synced twice.
+    """
+    current = EPOCH + (start - EPOCH) // size * size
+    windows = []
+    while current < end:
+        windows.append((current, min(current + size, end)))
+        current += size
+    return windows
+
+
+def _sync_error(sync: dict[str, Any], provider: str) -> str | None:
+    """Error of a window's sync, or None if every data family of the provider synced."""
+    if error := sync["errors"].get(provider) or sync["errors"].get("general"):
+        return error
+    provider_result = sync["providers_synced"].get(provider)
+    if provider_result is None:
+        return sync.get("message") or "Provider was not synced"
+    failed = [
+        f"{family}: {params.get('error') or params.get('errors') or 'failed'}"
+        for family, params in provider_result["params"].items()
+        if isinstance(params, dict) and params.get("success") is False
+    ]
+    return "; ".join(failed) or None
+
+
+def _complete(db: DbSession, connection: UserConnection) -> None:
+    """Mark the connection as backfilled once all of its windows are done."""
+    if connection.backfill_completed_at is not None:
+        return
+    counts = BackfillWindowRepository().count_by_status(db, connection.id)
+    if counts and counts.keys() == {"done"}:
+        UserConnectionRepository().mark_backfilled(db, connection)
+        logger.info(f"[backfill] {connection.provider} history of user {connection.user_id} is fully backfilled")
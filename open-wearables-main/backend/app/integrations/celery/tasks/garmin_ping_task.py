@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from logging import getLogger
+from typing import Any
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.providers.api_client import ProviderRateLimitedError
+from app.services.providers.garmin.pings import GarminPing, fetch_callback, release, save_summaries
+from celery import shared_task
+
+logger = getLogger(__name__)
+
+
+@shared_task
+def process_garmin_pings(pings: list[dict[str, Any]]) -> dict[str, int]:
+    """
+    Pull and save the data behind Garmin ping notifications.
+
+    Callback URLs are pulled concurrently (at most ``garmin_ping_fetch_concurrency`` at
+    once) while the pulled summaries are parsed and saved on the task thread, through a
+    single session. Garmin has already been answered, so it never redelivers a ping:
+    pings that fail are queued again with an exponential backoff (or after Garmin's
+    Retry-After), and only released once ``garmin_ping_max_attempts`` pulls have failed.
+
+    Args:
+        pings: GarminPing dicts queued by the ping webhook or by a previous run
+
+    Returns:
+        dict with counts of pulled, saved, retried and failed pings
+    """
+    queued = [GarminPing.model_validate(ping) for ping in pings]
+    result = {"pulled": 0, "saved": 0, "retried": 0, "failed": 0}
+    retries: list[GarminPing] = []
+    countdown = 0.0
+    if not queued:
+        return result
+
+    with (
+        SessionLocal() as db,
+        ThreadPoolExecutor(
+            max_workers=max(1, min(settings.garmin_ping_fetch_concurrency, len(queued))),
+            thread_name_prefix="garmin-ping",
+        ) as executor,
+    ):
+        futures = {executor.submit(fetch_callback, ping): ping for ping in queued}
+        for future in as_completed(futures):
+            ping = futures[future]
+            try:
+                summaries = future.result()
+                result["pulled"] += 1
+                result["saved"] += save_summaries(db, ping, summaries)
+            except Exception as e:
+                logger.warning(
+                    f"[process_garmin_pings] Failed to process {ping.summary_type} of Garmin user "
+                    f"{ping.garmin_user_id} (attempt {ping.attempt + 1}): {e}",
+                )
+                db.rollback()
+                if ping.attempt + 1 < settings.garmin_ping_max_attempts:
+                    retries.append(ping.model_copy(update={"attempt": ping.attempt + 1}))
+                    delay = settings.garmin_ping_retry_seconds * 2**ping.attempt
+                    if isinstance(e, ProviderRateLimitedError):
+                        delay = max(delay, e.retry_after)
+                    countdown = max(countdown, delay)
+                    result["retried"] += 1
+                else:
+                    release(ping)
+                    result["failed"] += 1
+
+    if retries:
+        process_garmin_pings.apply_async(
+            args=([ping.model_dump(mode="json") for ping in retries],),
+            countdown=countdown,
+        )
+
+    logger.info(
+        f"[process_garmin_pings] Pulled {result['pulled']} of {len(queued)} pings, saved {result['saved']} summaries",
+    )
+    return result
@@ -0,0 +1,26 @@
+from logging import getLogger
+from typing import Any
+
+from app.database import SessionLocal
+from app.services.providers.garmin.summaries import save_pushed_summaries
+from celery import shared_task
+
+logger = getLogger(__name__)
+
+
+@shared_task
+def process_garmin_push(summaries: dict[str, list[dict[str, Any]]]) -> dict[str, int]:
+    """
+    Save the wellness summaries of a Garmin push notification.
+
+    Args:
+        summaries: summary type -> summaries, as pushed by Garmin
+
+    Returns:
+        dict with counts of saved summaries per type, skipped and failed summaries
+    """
+    with SessionLocal() as db:
+        result = save_pushed_summaries(db, summaries)
+
+    logger.info(f"[process_garmin_push] Saved Garmin summaries: {result}")
+    return result
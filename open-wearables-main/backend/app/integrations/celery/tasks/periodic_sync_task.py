@@ -1,13 +1,25 @@
+import json
+import math
+import random
 from logging import getLogger
+from uuid import UUID
 
+from redis.exceptions import RedisError
+
+from app.config import settings
 from app.database import SessionLocal
+from app.integrations.celery.queues import PRIORITY_LOW
 from app.integrations.celery.tasks.sync_vendor_data_task import sync_vendor_data
+from app.integrations.rate_limiter import sync_spacing_seconds
+from app.integrations.redis_client import get_redis_client
 from app.repositories.user_connection_repository import UserConnectionRepository
 from app.schemas import SyncAllUsersResult
 from celery import shared_task
 
 logger = getLogger(__name__)
 
+DEFERRED_SYNCS_KEY = "sync_all_users:deferred"
+
 
 @shared_task
 def sync_all_users(start_date: str | None = None, end_date: str | None = None) -> dict:
@@ -15,6 +27,11 @@ def sync_all_users(start_date: str | None = None, end_date: str | None = None) -
     Sync all users with active connections.
     Calls sync_vendor_data for each user with the same parameters.
 
+    User syncs are spread out over time so that each provider receives requests at
+    the pace its quota allows, instead of every worker calling it at once. The spread
+    never exceeds the sync interval, so runs do not pile up: users that do not fit are
+    deferred to the next run, which syncs them first.
+
     Args:
         start_date: ISO 8601 date string for start of sync period
         end_date: ISO 8601 date string for end of sync period
@@ -24,11 +41,84 @@ def sync_all_users(start_date: str | None = None, end_date: str | None = None) -
     user_connection_repo = UserConnectionRepository()
 
     with SessionLocal() as db:
-        user_ids = user_connection_repo.get_all_active_users(db)
+        user_providers = user_connection_repo.get_active_providers_by_user(db)
+
+        logger.info(f"[sync_all_users] Found {len(user_providers)} users with active connections")
+
+        user_providers = _deferred_first(user_providers)
+        countdowns = _schedule_user_syncs(user_providers, horizon=settings.sync_interval_seconds)
+        for user_id, countdown in countdowns.items():
+            sync_vendor_data.apply_async(
+                args=(str(user_id), start_date, end_date),
+                countdown=countdown,
+                priority=PRIORITY_LOW,
+            )
+
+        deferred = [user_id for user_id in user_providers if user_id not in countdowns]
+        _store_deferred(deferred)
+        if deferred:
+            logger.warning(
+                f"[sync_all_users] {len(deferred)} users do not fit in the sync interval of "
+                f"{settings.sync_interval_seconds}s at the providers' rate limits, deferred to the next run",
+            )
+
+        return SyncAllUsersResult(
+            users_for_sync=len(user_providers),
+            deferred=len(deferred),
+            spread_seconds=max(countdowns.values(), default=0.0),
+        ).model_dump()
+
 
-        logger.info(f"[sync_all_users] Found {len(user_ids)} users with active connections")
+def _deferred_first(user_providers: dict[UUID, list[str]]) -> dict[UUID, list[str]]:
+    """Order users so that those deferred by the previous run are scheduled first."""
+    try:
+        raw = get_redis_client().get(DEFERRED_SYNCS_KEY)
+    except RedisError as e:
+        # Without the carry-over a random order still reaches every user over a few runs
+        logger.warning(f"[sync_all_users] Failed to read deferred syncs: {e}")
+        users = list(user_providers)
+        random.shuffle(users)
+        return {user_id: user_providers[user_id] for user_id in users}
+    deferred = set(json.loads(raw)) if raw else set()
+    return dict(sorted(user_providers.items(), key=lambda item: str(item[0]) not in deferred))
+
+
+def _store_deferred(deferred: list[UUID]) -> None:
+    """Remember the users left out of this run for the next one."""
+    try:
+        if deferred:
+            get_redis_client().set(
+                DEFERRED_SYNCS_KEY,
+                json.dumps([str(user_id) for user_id in deferred]),
+                ex=2 * settings.sync_interval_seconds,
+            )
+        else:
+            get_redis_client().delete(DEFERRED_SYNCS_KEY)
+    except RedisError as e:
+        logger.warning(f"[sync_all_users] Failed to store deferred syncs: {e}")
+
+
+def _schedule_user_syncs(
+    user_providers: dict[UUID, list[str]],
+    horizon: float = math.inf,
+) -> dict[UUID, float]:
+    """
+    Delay (in seconds) of each user's sync, pacing requests to each provider.
+
+    Every provider has a timeline of reserved slots sized by the share of its quota one
+    user sync uses. A user starts at the first time all of their providers are free;
+    users that cannot start before ``horizon`` are left out, without reserving slots.
+    Jitter keeps workers from waking up in lockstep.
+    """
+    next_free: dict[str, float] = {}
+    countdowns: dict[UUID, float] = {}
 
-        for user_id in user_ids:
-            sync_vendor_data.delay(str(user_id), start_date, end_date)
+    for user_id, providers in user_providers.items():
+        start = max((next_free.get(provider, 0.0) for provider in providers), default=0.0)
+        if countdowns and start >= horizon:
+            continue
+        for provider in providers:
+            next_free[provider] = start + sync_spacing_seconds(provider)
+        countdowns[user_id] = min(start + random.uniform(0, settings.sync_fanout_jitter_seconds), horizon)
 
-        return SyncAllUsersResult(users_for_sync=len(user_ids)).model_dump()
+    return countdowns
@@ -0,0 +1,24 @@
+from logging import getLogger
+
+from app.database import SessionLocal
+from app.services.system_info_service import system_info_service
+from celery import shared_task
+
+logger = getLogger(__name__)
+
+
+@shared_task
+def reconcile_system_stats() -> dict:
+    """
+    Recompute the maintained dashboard counters with exact database counts.
+
+    Corrects any drift of the incrementally updated counters (deleted rows,
+    increments lost while Redis was unavailable) and prunes stale daily buckets.
+    """
+    logger.info("[reconcile_system_stats] Recomputing dashboard counters")
+
+    with SessionLocal() as db:
+        counters = system_info_service.reconcile_counters(db)
+
+    logger.info(f"[reconcile_system_stats] Stored {len(counters)} counters")
+    return {"counters": len(counters)}
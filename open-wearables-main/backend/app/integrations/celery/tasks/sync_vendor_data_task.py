@@ -1,13 +1,28 @@
-from contextlib import suppress
-from datetime import datetime, timedelta
+import random
+import time
+from collections.abc import Iterator, Sized
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import zip_longest
 from logging import getLogger
-from typing import Any, cast
+from typing import Any, Callable, cast
 from uuid import UUID
 
-from app.database import SessionLocal
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import DbSession, SessionLocal
+from app.integrations.raw_archive import archive_payload
+from app.integrations.sync_lock import SyncLeases
+from app.models import DataPointSeries, EventRecord, UserConnection
+from app.repositories.sync_watermark_repository import SyncWatermarkRepository
 from app.repositories.user_connection_repository import UserConnectionRepository
-from app.schemas import ProviderSyncResult, SyncVendorDataResult
+from app.schemas import ProviderSyncResult, SyncRecordCounts, SyncVendorDataResult
+from app.services.providers.api_client import ProviderRateLimitedError, get_valid_token
+from app.services.providers.base_strategy import BaseProviderStrategy
 from app.services.providers.factory import ProviderFactory
+from app.services.providers.templates.base_247_data import ChunkedFetchResult, SyncSaver, split_time_range
 from celery import shared_task
 
 logger = getLogger(__name__)
@@ -19,21 +34,35 @@ def sync_vendor_data(
     start_date: str | None = None,
     end_date: str | None = None,
     providers: list[str] | None = None,
+    defer: bool = True,
 ) -> dict[str, Any]:
     """
     Synchronize workout/exercise/activity data from all providers the user is connected to.
 
+    Providers and their data families (workouts, sleep, activity samples, ...) are fetched
+    concurrently, while everything is written through this task's single database session.
+    Providers whose rate limit is exhausted are re-queued to sync again once it allows.
+
+    Each data family is leased by one sync of a connection at a time. An incremental sync
+    skips the families another sync is running and has that sync run once more when done;
+    a sync of an explicit range is deferred until the running one is likely done.
+
+    Without a start date, every data family only fetches what is new since its last
+    successful sync (its watermark), with a small overlap for data arriving late.
+
     Args:
         user_id: UUID of the user to sync data for
-        start_date: ISO 8601 date string for start of sync period (None = full history)
+        start_date: ISO 8601 date string for start of sync period (None = since the last sync)
         end_date: ISO 8601 date string for end of sync period (None = current time)
         providers: Optional list of provider names to sync (None = all active providers)
+        defer: Re-queue rate limited providers (False = only report them in ``deferred``)
 
     Returns:
         dict with sync results per provider
     """
     factory = ProviderFactory()
     user_connection_repo = UserConnectionRepository()
+    watermark_repo = SyncWatermarkRepository()
 
     try:
         user_uuid = UUID(user_id)
@@ -52,6 +81,7 @@ def sync_vendor_data(
         end_date=end_date,
     )
 
+    leases: list[SyncLeases] = []
     with SessionLocal() as db:
         try:
             connections = user_connection_repo.get_all_active_by_user(db, user_uuid)
@@ -68,6 +98,12 @@ def sync_vendor_data(
                 f"[sync_vendor_data] Found {len(connections)} active connections for user {user_id}",
             )
 
+            now = datetime.now(timezone.utc)
+            coalesce = start_date is None and end_date is None
+            jobs: list[_SyncJob] = []
+            leased_elsewhere: dict[str, float] = {}
+            synced: list[tuple[UserConnection, ProviderSyncResult, _SyncWindow]] = []
+
             for connection in connections:
                 provider_name = connection.provider
                 logger.info(f"[sync_vendor_data] Syncing data from {provider_name} for user {user_id}")
@@ -75,69 +111,61 @@ def sync_vendor_data(
                 try:
                     strategy = factory.get_provider(provider_name)
                     provider_result = ProviderSyncResult(success=True, params={})
-
-                    # Sync workouts
+                    watermarks = watermark_repo.get_for_connection(db, connection.id)
+                    window = _SyncWindow(watermarks, connection.last_synced_at, start_date, end_date, now)
+                    planned: list[_SyncJob] = []
                     if strategy.workouts:
-                        params = _build_sync_params(provider_name, start_date, end_date)
-                        try:
-                            success = strategy.workouts.load_data(db, user_uuid, **params)
-                            provider_result.params["workouts"] = {"success": success, **params}
-                        except Exception as e:
-                            logger.warning(f"[sync_vendor_data] Workouts sync failed for {provider_name}: {e}")
-                            provider_result.params["workouts"] = {"success": False, "error": str(e)}
-
-                    # Sync 247 data (sleep, recovery, activity) and SAVE to database
+                        params = _build_sync_params(provider_name, window.start_date("workouts"), end_date)
+                        planned.append(
+                            _plan_workouts(db, user_uuid, provider_name, strategy, provider_result, window, params)
+                        )
                     if hasattr(strategy, "data_247") and strategy.data_247:
-                        # Parse dates
-                        start_dt = datetime.now() - timedelta(days=30)
-                        end_dt = datetime.now()
-
-                        if start_date:
-                            with suppress(ValueError):
-                                start_dt = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
-                        if end_date:
-                            with suppress(ValueError):
-                                end_dt = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
-
-                        try:
-                            # Use load_and_save_all if available (saves data to DB)
-                            # Otherwise fallback to load_all_247_data (just returns data)
-                            provider_any = cast(Any, strategy.data_247)
-                            if hasattr(provider_any, "load_and_save_all"):
-                                results_247 = provider_any.load_and_save_all(
-                                    db,
-                                    user_uuid,
-                                    start_time=start_dt,
-                                    end_time=end_dt,
-                                )
-                                provider_result.params["data_247"] = {"success": True, "saved": True, **results_247}
-                            else:
-                                results_247 = strategy.data_247.load_all_247_data(
-                                    db,
-                                    user_uuid,
-                                    start_time=start_dt,
-                                    end_time=end_dt,
-                                )
-                                provider_result.params["data_247"] = {"success": True, "saved": False, **results_247}
-                            logger.info(f"[sync_vendor_data] 247 data synced for {provider_name}: {results_247}")
-                        except Exception as e:
-                            logger.warning(f"[sync_vendor_data] 247 data sync failed for {provider_name}: {e}")
-                            provider_result.params["data_247"] = {"success": False, "error": str(e)}
-
-                    user_connection_repo.update_last_synced_at(db, connection)
-
-                    result.providers_synced[provider_name] = provider_result
-                    logger.info(
-                        f"[sync_vendor_data] Successfully synced {provider_name} for user {user_id}",
-                    )
-
+                        planned.extend(_plan_247(db, user_uuid, provider_name, strategy, provider_result, window))
+                    families = SyncLeases(user_uuid, provider_name, [job.family for job in planned])
+                    leases.append(families)
+                    if busy := families.acquire(coalesce):
+                        if coalesce:
+                            # The running sync runs once more when done, covering what this one would fetch
+                            logger.info(f"[sync_vendor_data] {provider_name} {', '.join(busy)} already syncing")
+                            result.coalesced[provider_name] = sorted(busy)
+                            planned = [job for job in planned if job.family not in busy]
+                        else:
+                            families.release()
+                            retry_after = min(max(busy.values()), settings.sync_lease_retry_seconds)
+                            leased_elsewhere[provider_name] = retry_after
+                            planned = []
+                    jobs.extend(planned)
+                    if strategy.oauth:
+                        _refresh_token(db, user_uuid, provider_name, strategy)
+                    synced.append((connection, provider_result, window))
                 except Exception as e:
                     logger.error(
                         f"[sync_vendor_data] Error syncing {provider_name} for user {user_id}: {str(e)}",
                         exc_info=True,
                     )
                     result.errors[provider_name] = str(e)
+
+            deferred = _run_jobs(jobs, leases)
+            for provider_name, retry_after in leased_elsewhere.items():
+                deferred[provider_name] = max(deferred.get(provider_name, 0.0), retry_after)
+
+            for connection, provider_result, window in synced:
+                for family in window.completed:
+                    if window.advances(family):
+                        watermark_repo.advance(db, connection.id, family, window.until)
+                if connection.provider in deferred:
+                    # Not marked as synced, the deferred run covers the same window
+                    provider_result.success = False
+                    result.providers_synced[connection.provider] = provider_result
                     continue
+                user_connection_repo.update_last_synced_at(db, connection)
+                result.providers_synced[connection.provider] = provider_result
+                logger.info(
+                    f"[sync_vendor_data] Successfully synced {connection.provider} for user {user_id}",
+                )
+
+            if deferred:
+                result.deferred = _defer(user_id, start_date, end_date, deferred) if defer else deferred
 
             return result.model_dump()
 
@@ -148,6 +176,418 @@ def sync_vendor_data(
             )
             result.errors["general"] = str(e)
             return result.model_dump()
+        finally:
+            _release(user_id, leases)
+
+
+class _SyncWindow:
+    """Time window to sync for each data family of one connection.
+
+    Without explicit dates, a family resumes from its watermark (or the connection's
+    last sync, for families without one yet) minus an overlap, which also catches data
+    that reached the provider late. Savers keep what is stored unique (event records by
+    device and time span, samples by series and instant), so the overlap is not stored
+    twice. Watermarks only advance for windows reaching the present that start at or
+    before the previous watermark, so a range that was never fetched is never marked as
+    synced. A family fetched in several parts (stream windows) only completes once every
+    part was saved.
+    """
+
+    def __init__(
+        self,
+        watermarks: dict[str, datetime],
+        last_synced_at: datetime | None,
+        start_date: str | None,
+        end_date: str | None,
+        now: datetime,
+    ):
+        self.watermarks = watermarks
+        self.last_synced_at = last_synced_at
+        self.start = _parse_date(start_date)
+        self.end = _parse_date(end_date)
+        self.until = self.end or now
+        self._remaining: dict[str, int] = {}
+        self._failed: set[str] = set()
+
+    def since(self, family: str) -> datetime | None:
+        """Start of the family's window, None when it has never been synced."""
+        if self.start:
+            return self.start
+        watermark = self.watermarks.get(family, self.last_synced_at)
+        if watermark is None:
+            return None
+        return watermark - timedelta(minutes=settings.sync_overlap_minutes)
+
+    def start_date(self, family: str) -> str | None:
+        since = self.since(family)
+        return since.isoformat() if since else None
+
+    def range(self, family: str) -> tuple[datetime, datetime]:
+        """Window of 247 data, which defaults to the last 30 days on the first sync."""
+        return self.since(family) or self.until - timedelta(days=30), self.until
+
+    def expect(self, family: str, parts: int) -> None:
+        self._remaining[family] = parts
+
+    def complete(self, family: str) -> None:
+        self._remaining[family] = self._remaining.get(family, 1) - 1
+
+    def fail(self, family: str) -> None:
+        self._failed.add(family)
+
+    @property
+    def completed(self) -> list[str]:
+        """Families whose every part was saved without failures."""
+        return [
+            family for family, remaining in self._remaining.items() if remaining <= 0 and family not in self._failed
+        ]
+
+    def advances(self, family: str) -> bool:
+        if self.end is not None:
+            return False
+        if self.start is None:
+            return True
+        watermark = self.watermarks.get(family)
+        return watermark is not None and self.start <= watermark
+
+
+class _SyncJob:
+    """One independent unit of a user sync.
+
+    ``fetch`` only talks to the provider API and runs on a worker thread with its own
+    session (used for token lookups). ``save`` receives the fetched data and runs on the
+    task thread, so all writes go through a single session. Jobs without ``fetch`` are
+    run entirely on the task thread.
+    """
+
+    def __init__(
+        self,
+        provider_name: str,
+        family: str,
+        fetch: Callable[[DbSession], Any] | None,
+        save: Callable[[Any], None],
+        fail: Callable[[Exception], None],
+    ):
+        self.provider_name = provider_name
+        self.family = family
+        self.fetch = fetch
+        self.save = save
+        self.fail = fail
+
+
+def _archived(
+    fetch: Callable[[DbSession], Any],
+    provider_name: str,
+    user_id: UUID,
+    family: str,
+    start: datetime,
+    end: datetime,
+) -> Callable[[DbSession], Any]:
+    """Wrap a fetch to archive what it returns (on the fetching thread) for later replay."""
+
+    def fetch_and_archive(session: DbSession) -> Any:
+        raw = fetch(session)
+        archive_payload(provider_name, user_id, family, raw, start, end)
+        return raw
+
+    return fetch_and_archive
+
+
+def _fetch(fetch: Callable[[DbSession], Any]) -> Any:
+    with SessionLocal() as session:
+        return fetch(session)
+
+
+def _run_jobs(jobs: list[_SyncJob], leases: list[SyncLeases]) -> dict[str, float]:
+    """
+    Fetch concurrently and save each result on the calling thread as soon as it arrives.
+
+    At most ``sync_max_concurrency`` fetched results are held at once: a job is only
+    submitted once an earlier one was saved, so memory stays flat however many stream
+    windows a long range is split into. Jobs of rate limited providers are skipped.
+    The leases are extended every third of ``sync_lease_seconds`` between results, so
+    they only lapse if a single save takes longer than that.
+
+    Returns:
+        dict[str, float]: Rate limited providers, with seconds until they can be retried
+    """
+    deferred: dict[str, float] = {}
+    if not jobs:
+        return deferred
+
+    renew_seconds = settings.sync_lease_seconds / 3
+    renewed_at = time.monotonic()
+
+    def renew_leases() -> None:
+        nonlocal renewed_at
+        if time.monotonic() - renewed_at >= renew_seconds:
+            for leased in leases:
+                leased.extend()
+            renewed_at = time.monotonic()
+
+    for job in jobs:
+        if not job.fetch:
+            _save(job, None, deferred)
+            renew_leases()
+
+    max_workers = max(1, settings.sync_max_concurrency)
+    queued = iter([job for job in jobs if job.fetch])
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sync-fetch") as executor:
+        futures: dict[Future[Any], _SyncJob] = {}
+
+        def submit_next() -> None:
+            for job in queued:
+                if job.provider_name in deferred:
+                    # The deferred run covers the whole window again
+                    continue
+                futures[executor.submit(_fetch, cast(Callable[[DbSession], Any], job.fetch))] = job
+                return
+
+        for _ in range(max_workers):
+            submit_next()
+
+        while futures:
+            done, _ = wait(futures, timeout=renew_seconds, return_when=FIRST_COMPLETED)
+            renew_leases()
+            for future in done:
+                job = futures.pop(future)
+                try:
+                    raw = future.result()
+                except Exception as e:
+                    _fail(job, "Fetching", e, deferred)
+                else:
+                    _save(job, raw, deferred)
+                    renew_leases()
+                submit_next()
+
+    return deferred
+
+
+def _save(job: _SyncJob, raw: Any, deferred: dict[str, float]) -> None:
+    try:
+        job.save(raw)
+    except Exception as e:
+        _fail(job, "Saving", e, deferred)
+
+
+def _fail(job: _SyncJob, stage: str, e: Exception, deferred: dict[str, float]) -> None:
+    if isinstance(e, ProviderRateLimitedError):
+        logger.info(f"[sync_vendor_data] {job.provider_name} rate limited while syncing {job.family}, deferring")
+        deferred[job.provider_name] = max(deferred.get(job.provider_name, 0.0), e.retry_after)
+    else:
+        logger.warning(f"[sync_vendor_data] {stage} {job.family} failed for {job.provider_name}: {e}")
+    job.fail(e)
+
+
+def _defer(user_id: str, start_date: str | None, end_date: str | None, deferred: dict[str, float]) -> dict[str, float]:
+    """Re-queue the sync of rate limited providers for when their quota allows it again."""
+    countdown = max(deferred.values()) + random.uniform(0, settings.sync_fanout_jitter_seconds)
+    providers = sorted(deferred)
+    sync_vendor_data.apply_async(
+        args=(user_id, start_date, end_date),
+        kwargs={"providers": providers},
+        countdown=countdown,
+    )
+    logger.info(f"[sync_vendor_data] Deferred {', '.join(providers)} for user {user_id} by {countdown:.0f}s")
+    return {provider: countdown for provider in providers}
+
+
+def _release(user_id: str, leases: list[SyncLeases]) -> None:
+    """Release the leases of a sync, queueing one more sync of providers requested meanwhile."""
+    providers = sorted(leased.provider_name for leased in leases if leased.release())
+    if providers:
+        sync_vendor_data.delay(user_id, providers=providers)
+        logger.info(f"[sync_vendor_data] Rerunning {', '.join(providers)} for user {user_id}, requested while syncing")
+
+
+def _refresh_token(db: DbSession, user_id: UUID, provider_name: str, strategy: BaseProviderStrategy) -> None:
+    """Refresh an expiring token once, before concurrent fetches would each try to refresh it."""
+    try:
+        get_valid_token(db, user_id, provider_name, strategy.connection_repo, strategy.oauth)
+    except Exception as e:
+        # The fetches will fail with the same error and report it per data family
+        logger.warning(f"[sync_vendor_data] Could not refresh {provider_name} token for user {user_id}: {e}")
+
+
+@contextmanager
+def _count_new_records(db: DbSession) -> Iterator[list[int]]:
+    """Count event records and data points inserted through the session (duplicates fail to insert)."""
+    counter = [0]
+
+    def after_flush(session: DbSession, flush_context: Any) -> None:
+        counter[0] += sum(isinstance(obj, (EventRecord, DataPointSeries)) for obj in session.new)
+
+    event.listen(db, "after_flush", after_flush)
+    try:
+        yield counter
+    finally:
+        event.remove(db, "after_flush", after_flush)
+
+
+def _save_family[T](
+    db: DbSession,
+    provider_result: ProviderSyncResult,
+    window: _SyncWindow,
+    family: str,
+    raw: Any,
+    save: Callable[[], T],
+) -> T:
+    """Save (one part of) a data family, recording how many of the fetched records were new."""
+    with _count_new_records(db) as new:
+        saved = save()
+    fetched = len(raw) if isinstance(raw, Sized) else None
+    failed_chunks = raw.failed_chunks if isinstance(raw, ChunkedFetchResult) else []
+    counts = provider_result.records.get(family)
+    if counts is None:
+        counts = provider_result.records[family] = SyncRecordCounts(fetched=fetched, new=0)
+    elif counts.fetched is not None:
+        counts.fetched = counts.fetched + fetched if fetched is not None else None
+    counts.new += new[0]
+    counts.failed_chunks.extend(failed_chunks)
+    if failed_chunks:
+        # Keep the watermark, so the missing windows are fetched again
+        logger.warning(f"[sync_vendor_data] {family}: failed to fetch {', '.join(failed_chunks)}")
+        window.fail(family)
+    else:
+        window.complete(family)
+    logger.info(
+        f"[sync_vendor_data] {family}: fetched {fetched if fetched is not None else '?'} records, {new[0]} new "
+        f"(since {window.since(family) or 'first sync'})",
+    )
+    return saved
+
+
+def _plan_workouts(
+    db: DbSession,
+    user_id: UUID,
+    provider_name: str,
+    strategy: BaseProviderStrategy,
+    provider_result: ProviderSyncResult,
+    window: _SyncWindow,
+    params: dict[str, Any],
+) -> _SyncJob:
+    workouts = strategy.workouts
+    window.expect("workouts", 1)
+
+    def save(raw: Any) -> None:
+        success = _save_family(
+            db,
+            provider_result,
+            window,
+            "workouts",
+            raw,
+            lambda: workouts.save_data(db, user_id, raw),
+        )
+        provider_result.params["workouts"] = {"success": success, **params}
+
+    def fail(e: Exception) -> None:
+        window.fail("workouts")
+        provider_result.params["workouts"] = {"success": False, "error": str(e)}
+
+    return _SyncJob(
+        provider_name,
+        "workouts",
+        fetch=_archived(
+            lambda session: workouts.fetch_data(session, user_id, **params),
+            provider_name,
+            user_id,
+            "workouts",
+            *window.range("workouts"),
+        ),
+        save=save,
+        fail=fail,
+    )
+
+
+def _plan_247(
+    db: DbSession,
+    user_id: UUID,
+    provider_name: str,
+    strategy: BaseProviderStrategy,
+    provider_result: ProviderSyncResult,
+    window: _SyncWindow,
+) -> list[_SyncJob]:
+    """Plan sync of 247 data (sleep, recovery, activity), one job per data family."""
+    data_247 = strategy.data_247
+    families = data_247.get_sync_families()
+
+    if not families:
+        start_dt, end_dt = window.range("data_247")
+        window.expect("data_247", 1)
+
+        # Providers without independent families stream, save and count in one call on the task thread
+        def load_all() -> tuple[bool, dict[str, Any]]:
+            # Use load_and_save_all if available (saves data to DB)
+            # Otherwise fallback to load_all_247_data (saves through the template's batch savers)
+            provider_any = cast(Any, data_247)
+            if hasattr(provider_any, "load_and_save_all"):
+                return True, provider_any.load_and_save_all(db, user_id, start_time=start_dt, end_time=end_dt)
+            return False, data_247.load_all_247_data(db, user_id, start_time=start_dt, end_time=end_dt)
+
+        def save_all(_: Any) -> None:
+            saved, results_247 = _save_family(db, provider_result, window, "data_247", None, load_all)
+            provider_result.params["data_247"] = {"success": True, "saved": saved, **results_247}
+
+        def fail_all(e: Exception) -> None:
+            window.fail("data_247")
+            provider_result.params["data_247"] = {"success": False, "error": str(e)}
+
+        return [_SyncJob(provider_name, "data_247", fetch=None, save=save_all, fail=fail_all)]
+
+    summary: dict[str, Any] = {"success": True, "saved": True}
+    provider_result.params["data_247"] = summary
+    parts: list[list[_SyncJob]] = []
+
+    for family, (fetch, save) in families.items():
+        # Each stream window is fetched and saved on its own, so only a few windows are in memory at once
+        windows = split_time_range(*window.range(family), timedelta(days=settings.sync_247_window_days))
+        window.expect(family, len(windows))
+        summary[family] = 0
+
+        def save_family(raw: Any, family: str = family, save: SyncSaver = save) -> None:
+            summary[family] += _save_family(db, provider_result, window, family, raw, lambda: save(db, user_id, raw))
+
+        def fail_family(e: Exception, family: str = family) -> None:
+            window.fail(family)
+            summary["success"] = False
+            summary.setdefault("errors", {}).setdefault(family, str(e))
+
+        parts.append(
+            [
+                _SyncJob(
+                    provider_name,
+                    family,
+                    fetch=_archived(
+                        lambda session, fetch=fetch, start_dt=start_dt, end_dt=end_dt: fetch(
+                            session, user_id, start_dt, end_dt
+                        ),
+                        provider_name,
+                        user_id,
+                        family,
+                        start_dt,
+                        end_dt,
+                    ),
+                    save=save_family,
+                    fail=fail_family,
+                )
+                for start_dt, end_dt in windows
+            ],
+        )
+
+    # Interleave the families, so a long backfill of one doesn't hold back the others
+    return [job for jobs in zip_longest(*parts) for job in jobs if job is not None]
+
+
+def _parse_date(value: str | None) -> datetime | None:
+    """Parse an ISO 8601 date, treating naive dates as UTC. Invalid dates are ignored."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        logger.warning(f"[sync_vendor_data] Ignoring invalid date: {value}")
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
 
 
 def _build_sync_params(provider_name: str, start_date: str | None, end_date: str | None) -> dict[str, Any]:
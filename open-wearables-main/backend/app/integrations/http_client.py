@@ -0,0 +1,218 @@
+"""Pooled HTTP clients for provider APIs and OAuth endpoints.
+
+Each provider gets its own long-lived client, so TCP/TLS connections are kept alive
+and reused across requests (and one slow provider cannot exhaust another's pool).
+The sync and async clients share one configuration: timeouts, connection limits,
+HTTP/2 and retries with jittered exponential backoff on 429/5xx responses and
+transport errors.
+"""
+
+import asyncio
+import random
+import time
+import weakref
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from logging import getLogger
+from typing import Any
+
+import httpx
+
+from app.config import settings
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+logger = getLogger(__name__)
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a provider request."""
+
+    def __init__(self, max_retries: int, backoff_seconds: float, backoff_max_seconds: float):
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+    def should_retry_response(self, request: httpx.Request, response: httpx.Response, attempt: int) -> bool:
+        if attempt >= self.max_retries or response.status_code not in RETRY_STATUS_CODES:
+            return False
+        # A non-idempotent request that failed with 5xx may already have been applied
+        # (e.g. a consumed authorization code), only rate limiting is safe to retry
+        return request.method in IDEMPOTENT_METHODS or response.status_code == 429
+
+    def should_retry_error(self, request: httpx.Request, error: httpx.TransportError, attempt: int) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        # Connection failures happen before anything is sent
+        return request.method in IDEMPOTENT_METHODS or isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+    def delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when the provider sends one."""
+        if response is not None and (retry_after := parse_retry_after(response)) is not None:
+            return min(retry_after, self.backoff_max_seconds)
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_seconds * 2**attempt))
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    """Seconds to wait according to the Retry-After header (seconds or HTTP date), if present."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Sync transport retrying failed requests according to a RetryPolicy."""
+
+    def __init__(self, transport: httpx.BaseTransport, policy: RetryPolicy):
+        self.transport = transport
+        self.policy = policy
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError as e:
+                if not self.policy.should_retry_error(request, e, attempt):
+                    raise
+                delay = self.policy.delay(attempt)
+                logger.warning(
+                    f"[http_client] {request.method} {request.url.host} failed ({e!r}), retry in {delay:.2f}s"
+                )
+            else:
+                if not self.policy.should_retry_response(request, response, attempt):
+                    return response
+                delay = self.policy.delay(attempt, response)
+                response.close()
+                logger.warning(
+                    f"[http_client] {request.method} {request.url.host} returned {response.status_code}, "
+                    f"retry in {delay:.2f}s",
+                )
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Async transport retrying failed requests according to a RetryPolicy."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, policy: RetryPolicy):
+        self.transport = transport
+        self.policy = policy
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                if not self.policy.should_retry_error(request, e, attempt):
+                    raise
+                delay = self.policy.delay(attempt)
+                logger.warning(
+                    f"[http_client] {request.method} {request.url.host} failed ({e!r}), retry in {delay:.2f}s"
+                )
+            else:
+                if not self.policy.should_retry_response(request, response, attempt):
+                    return response
+                delay = self.policy.delay(attempt, response)
+                await response.aclose()
+                logger.warning(
+                    f"[http_client] {request.method} {request.url.host} returned {response.status_code}, "
+                    f"retry in {delay:.2f}s",
+                )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def _transport_options() -> dict[str, Any]:
+    """Connection settings shared by the sync and async transports."""
+    return {
+        "http2": settings.provider_http2,
+        "limits": httpx.Limits(
+            max_connections=settings.provider_http_max_connections,
+            max_keepalive_connections=settings.provider_http_max_keepalive_connections,
+            keepalive_expiry=settings.provider_http_keepalive_expiry_seconds,
+        ),
+    }
+
+
+def _client_options() -> dict[str, Any]:
+    """Client settings shared by the sync and async clients."""
+    return {
+        "timeout": httpx.Timeout(
+            settings.provider_http_timeout_seconds,
+            connect=settings.provider_http_connect_timeout_seconds,
+        ),
+    }
+
+
+def _retry_policy() -> RetryPolicy:
+    return RetryPolicy(
+        max_retries=settings.provider_http_max_retries,
+        backoff_seconds=settings.provider_http_backoff_seconds,
+        backoff_max_seconds=settings.provider_http_backoff_max_seconds,
+    )
+
+
+@lru_cache()
+def get_http_client(provider_name: str) -> httpx.Client:
+    """
+    Get the pooled HTTP client for a provider.
+
+    Args:
+        provider_name: Provider the requests are sent to (e.g. 'garmin')
+
+    Returns:
+        httpx.Client: Long-lived client reusing connections to the provider
+    """
+    transport = RetryTransport(httpx.HTTPTransport(**_transport_options()), _retry_policy())
+    return httpx.Client(transport=transport, **_client_options())
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_http_client(provider_name: str) -> httpx.AsyncClient:
+    """
+    Get the pooled async HTTP client for a provider.
+
+    Async connections are bound to the event loop they were opened on, so one
+    client is kept per provider and running loop.
+
+    Args:
+        provider_name: Provider the requests are sent to (e.g. 'garmin')
+
+    Returns:
+        httpx.AsyncClient: Long-lived client reusing connections to the provider
+    """
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(provider_name)
+    if client is None or client.is_closed:
+        transport = AsyncRetryTransport(httpx.AsyncHTTPTransport(**_transport_options()), _retry_policy())
+        client = clients[provider_name] = httpx.AsyncClient(transport=transport, **_client_options())
+    return client
+
+
+async def close_async_http_clients() -> None:
+    """Close the async clients of the running event loop, before a short-lived loop ends."""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
@@ -0,0 +1,119 @@
+"""Token-bucket rate limiting of provider API calls, shared by all workers through Redis.
+
+Vendors enforce quotas per client application, so every API call consumes a token
+from the bucket of its provider app key. Buckets refill continuously at the
+configured rate and allow short bursts up to their capacity.
+"""
+
+import time
+from functools import lru_cache
+from logging import getLogger
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.integrations.redis_client import get_redis_client
+
+# Refill, then take the requested tokens if available. Returns the seconds to wait until
+# they would be (0 when granted). Uses the Redis clock so all workers agree on time.
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+logger = getLogger(__name__)
+
+
+class TokenBucket:
+    """Rate limiter shared across processes, refilling ``rate_per_minute`` tokens per minute."""
+
+    def __init__(self, key: str, rate_per_minute: float, capacity: int):
+        self.key = key
+        self.rate_per_second = rate_per_minute / 60
+        self.capacity = max(1, capacity)
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        """
+        Take tokens if available.
+
+        Returns:
+            float: 0 when the tokens were taken, otherwise seconds until they will be available
+        """
+        try:
+            # Runs by SHA, the script body is only sent when Redis doesn't know it yet
+            script = get_redis_client().register_script(_TOKEN_BUCKET_SCRIPT)
+            wait = script(keys=[self.key], args=[self.rate_per_second, self.capacity, tokens])
+        except RedisError as e:
+            # Limiting is best effort, the HTTP client still backs off on 429 responses
+            logger.warning(f"[rate_limiter] Failed to check {self.key}, allowing request: {e}")
+            return 0.0
+        return float(wait)
+
+    def acquire(self, max_wait_seconds: float, tokens: int = 1) -> float:
+        """
+        Wait for tokens for at most ``max_wait_seconds``.
+
+        Returns:
+            float: 0 when the tokens were taken, otherwise the expected wait, which exceeded
+                the limit (nothing is taken then, so the caller can defer its work)
+        """
+        deadline = time.monotonic() + max_wait_seconds
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return 0.0
+            if time.monotonic() + wait > deadline:
+                return wait
+            time.sleep(wait)
+
+
+def _app_key(provider_name: str) -> str:
+    return getattr(settings, f"{provider_name}_client_id", None) or "default"
+
+
+@lru_cache()
+def get_provider_rate_limiter(provider_name: str) -> TokenBucket | None:
+    """
+    Get the rate limiter of a provider's app key.
+
+    Args:
+        provider_name: Provider the requests are sent to (e.g. 'garmin')
+
+    Returns:
+        TokenBucket | None: Limiter, or None when no limit is configured for the provider
+    """
+    rate = settings.provider_rate_limits.get(provider_name)
+    if not rate:
+        return None
+    return TokenBucket(
+        f"rate_limit:{provider_name}:{_app_key(provider_name)}",
+        rate_per_minute=rate,
+        capacity=settings.provider_rate_limit_burst,
+    )
+
+
+def sync_spacing_seconds(provider_name: str) -> float:
+    """Seconds of a provider's quota used by syncing one user, for pacing bulk syncs."""
+    rate = settings.provider_rate_limits.get(provider_name)
+    if not rate:
+        return 0.0
+    return settings.provider_sync_requests_per_user.get(provider_name, 1) * 60 / rate
@@ -0,0 +1,230 @@
+"""
+Archive of raw provider payloads, for replaying them through the current normalizers.
+
+Payloads (API responses and webhook summaries) are stored as JSON compressed with zstd,
+on local disk or S3 (``raw_archive_backend``). Payloads archived with gzip by earlier
+versions are still read. Keys are content-addressed and grouped by provider, user,
+data family and time window::
+
+    {provider}/{user_id}/{family}/{window}/{sha256}.json.zst
+
+so archiving a payload again (an overlapping sync, a redelivered webhook) is a no-op.
+Archiving is best-effort: a failure is logged and never fails the sync that fetched
+the payload. See ``scripts/replay_raw_archive.py`` for replaying archived payloads.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Protocol
+from uuid import UUID
+
+import zstandard
+from pydantic_core import to_jsonable_python
+
+from app.config import settings
+
+logger = getLogger(__name__)
+
+WINDOW_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+class ArchiveStore(Protocol):
+    """Blob storage of an archive, addressed by ``/``-separated keys."""
+
+    def exists(self, key: str) -> bool: ...
+
+    def write(self, key: str, data: bytes) -> None: ...
+
+    def read(self, key: str) -> bytes: ...
+
+    def keys(self, prefix: str) -> Iterator[str]: ...
+
+
+class LocalArchiveStore:
+    """Archive stored in a directory."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def exists(self, key: str) -> bool:
+        return (self.root / key).exists()
+
+    def write(self, key: str, data: bytes) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed, so readers never see a partial file
+        partial = path.with_name(f".{path.name}.{os.getpid()}.partial")
+        partial.write_bytes(data)
+        partial.replace(path)
+
+    def read(self, key: str) -> bytes:
+        return (self.root / key).read_bytes()
+
+    def keys(self, prefix: str) -> Iterator[str]:
+        base = self.root / prefix
+        if not base.is_dir():
+            return
+        for path in sorted(base.rglob("*.json.*")):
+            if not path.name.startswith("."):
+                yield path.relative_to(self.root).as_posix()
+
+
+class S3ArchiveStore:
+    """Archive stored in an S3 bucket, under a key prefix."""
+
+    def __init__(self, bucket: str, prefix: str = "", client: Any = None):
+        if client is None:
+            import boto3
+
+            client = boto3.client(
+                "s3",
+                region_name=settings.aws_region,
+                aws_access_key_id=settings.aws_access_key_id,
+                aws_secret_access_key=settings.aws_secret_access_key,
+            )
+        self.client = client
+        self.bucket = bucket
+        self.prefix = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+
+    def exists(self, key: str) -> bool:
+        response = self.client.list_objects_v2(Bucket=self.bucket, Prefix=self.prefix + key, MaxKeys=1)
+        return response.get("KeyCount", 0) > 0
+
+    def write(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=data)
+
+    def read(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"].read()
+
+    def keys(self, prefix: str) -> Iterator[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix + prefix):
+            for item in page.get("Contents", []):
+                yield item["Key"][len(self.prefix) :]
+
+
+def _decompress(data: bytes, extension: str) -> bytes:
+    if extension == "zst":
+        return zstandard.ZstdDecompressor().decompress(data)
+    if extension == "gz":
+        return gzip.decompress(data)
+    raise ValueError(f"Unknown archive compression: {extension}")
+
+
+def format_window(start: datetime | None = None, end: datetime | None = None) -> str:
+    """Key segment of the time window a payload covers (the current day if unknown)."""
+    if start is None or end is None:
+        return datetime.now(timezone.utc).strftime("%Y%m%d")
+
+    def utc(moment: datetime) -> str:
+        moment = moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+        return moment.strftime(WINDOW_FORMAT)
+
+    return f"{utc(start)}_{utc(end)}"
+
+
+@dataclass(frozen=True)
+class ArchivedPayload:
+    """Where an archived payload came from."""
+
+    key: str
+    provider: str
+    user_id: UUID
+    family: str
+    window: str
+
+    @classmethod
+    def from_key(cls, key: str) -> "ArchivedPayload":
+        provider, user_id, family, window, _ = key.split("/")
+        return cls(key=key, provider=provider, user_id=UUID(user_id), family=family, window=window)
+
+
+class RawArchive:
+    """Content-addressed archive of compressed raw payloads."""
+
+    def __init__(self, store: ArchiveStore, zstd_level: int | None = None):
+        self.store = store
+        self.zstd_level = settings.raw_archive_zstd_level if zstd_level is None else zstd_level
+
+    def put(
+        self,
+        provider: str,
+        user_id: UUID,
+        family: str,
+        payload: Any,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> str:
+        """Archive a payload unless it is archived already, returning its key."""
+        data = json.dumps(
+            to_jsonable_python(payload, by_alias=True),
+            sort_keys=True,
+            separators=(",", ":"),
+        ).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        key = f"{provider}/{user_id}/{family}/{format_window(start, end)}/{digest}.json.zst"
+        if not self.store.exists(key):
+            self.store.write(key, zstandard.ZstdCompressor(level=self.zstd_level).compress(data))
+        return key
+
+    def get(self, key: str) -> Any:
+        """Load an archived payload."""
+        return json.loads(_decompress(self.store.read(key), key.rsplit(".", 1)[-1]))
+
+    def entries(
+        self,
+        provider: str | None = None,
+        user_id: UUID | None = None,
+        family: str | None = None,
+    ) -> Iterator[ArchivedPayload]:
+        """Archived payloads, oldest window first within each user and family."""
+        prefix = ""
+        for segment in (provider, user_id, family):
+            if segment is None:
+                break
+            prefix += f"{segment}/"
+        for key in self.store.keys(prefix):
+            entry = ArchivedPayload.from_key(key)
+            if (user_id is None or entry.user_id == user_id) and (family is None or entry.family == family):
+                yield entry
+
+
+@lru_cache
+def get_raw_archive() -> RawArchive | None:
+    """The configured archive, or None when archiving is disabled."""
+    if settings.raw_archive_backend == "local":
+        return RawArchive(LocalArchiveStore(settings.raw_archive_path))
+    if settings.raw_archive_backend == "s3":
+        bucket = settings.raw_archive_bucket or settings.aws_bucket_name
+        if not bucket:
+            logger.warning("[raw_archive] No bucket configured for the S3 archive, archiving disabled")
+            return None
+        return RawArchive(S3ArchiveStore(bucket, settings.raw_archive_prefix))
+    if settings.raw_archive_backend:
+        logger.warning(f"[raw_archive] Unknown backend {settings.raw_archive_backend}, archiving disabled")
+    return None
+
+
+def archive_payload(
+    provider: str,
+    user_id: UUID,
+    family: str,
+    payload: Any,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> None:
+    """Archive a raw payload if archiving is enabled; failures are logged, not raised."""
+    if not payload or (archive := get_raw_archive()) is None:
+        return
+    try:
+        archive.put(provider, user_id, family, payload, start, end)
+    except Exception as e:
+        logger.warning(f"[raw_archive] Failed to archive {provider} {family} of user {user_id}: {e}")
@@ -0,0 +1,205 @@
+"""
+Long-running consumer of the S3 upload notification queue.
+
+Runs as its own process (``python -m app.integrations.sqs_consumer``). It long-polls
+SQS for up to 10 messages at a time and imports the uploaded files on a pool of
+``sqs_consumer_concurrency`` threads. While an import runs, the visibility timeout of
+its message is extended so no other consumer picks it up; finished messages are
+deleted in batches. A failed import is left on the queue and retried by SQS once its
+visibility timeout runs out (or moved to the dead-letter queue by its redrive policy).
+"""
+
+import json
+import signal
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from logging import INFO, basicConfig, getLogger
+from types import FrameType
+from typing import Any
+
+import boto3
+
+from app.config import settings
+from app.integrations.celery.tasks.process_upload_task import process_uploaded_file
+from app.integrations.sentry import init_sentry
+
+logger = getLogger(__name__)
+
+# SQS limit for messages per receive and entries per batch request
+SQS_BATCH_SIZE = 10
+
+
+def import_upload(message: dict[str, Any]) -> None:
+    """
+    Import the files an S3 event notification message refers to.
+
+    Messages that are not S3 events (e.g. the S3 test event) are ignored; errors of the
+    import propagate, so the message is retried.
+    """
+    body = message["Body"]
+    try:
+        event = json.loads(body) if isinstance(body, str) else body
+    except json.JSONDecodeError:
+        logger.info(f"[sqs_consumer] Message {message['MessageId']} is not valid JSON, skipping: {body[:100]}")
+        return
+
+    if not isinstance(event, dict) or "Records" not in event:
+        logger.info(f"[sqs_consumer] Message {message['MessageId']} is not an S3 event, skipping")
+        return
+
+    for record in event["Records"]:
+        if record.get("eventSource") == "aws:s3":
+            process_uploaded_file(record["s3"]["bucket"]["name"], record["s3"]["object"]["key"])
+
+
+class UploadQueueConsumer:
+    """Long-polls an SQS queue and handles its messages concurrently."""
+
+    def __init__(
+        self,
+        client: Any,
+        queue_url: str,
+        handler: Callable[[dict[str, Any]], None] = import_upload,
+        concurrency: int | None = None,
+        wait_seconds: int | None = None,
+        visibility_timeout: float | None = None,
+    ):
+        self.client = client
+        self.queue_url = queue_url
+        self.handler = handler
+        self.concurrency = max(1, concurrency or settings.sqs_consumer_concurrency)
+        self.wait_seconds = settings.sqs_wait_seconds if wait_seconds is None else wait_seconds
+        self.visibility_timeout = visibility_timeout or settings.sqs_visibility_timeout
+        self.stopping = threading.Event()
+        self._in_flight: dict[Future[None], dict[str, Any]] = {}
+        self._extended_at: dict[str, float] = {}
+        self._finished: list[dict[str, Any]] = []
+        self.stats = {"received": 0, "handled": 0, "failed": 0}
+
+    def stop(self) -> None:
+        """Stop receiving messages; messages being handled are finished first."""
+        self.stopping.set()
+
+    def run(self) -> None:
+        """Consume until stopped."""
+        logger.info(
+            f"[sqs_consumer] Consuming {self.queue_url} with {self.concurrency} workers "
+            f"(wait {self.wait_seconds}s, visibility {self.visibility_timeout}s)",
+        )
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="sqs-consumer") as executor:
+            while not self.stopping.is_set():
+                self._step(executor)
+            while self._in_flight:
+                self._await_in_flight()
+                self._settle()
+        logger.info(f"[sqs_consumer] Stopped: {self.stats}")
+
+    def _step(self, executor: ThreadPoolExecutor) -> None:
+        free = self.concurrency - len(self._in_flight)
+        if free > 0:
+            for message in self._receive(min(SQS_BATCH_SIZE, free)):
+                self._extended_at[message["ReceiptHandle"]] = time.monotonic()
+                self._in_flight[executor.submit(self.handler, message)] = message
+        else:
+            self._await_in_flight()
+        self._settle()
+
+    def _receive(self, count: int) -> list[dict[str, Any]]:
+        try:
+            response = self.client.receive_message(
+                QueueUrl=self.queue_url,
+                MaxNumberOfMessages=count,
+                WaitTimeSeconds=self.wait_seconds,
+                VisibilityTimeout=self.visibility_timeout,
+                MessageAttributeNames=["All"],
+            )
+        except Exception as e:
+            logger.warning(f"[sqs_consumer] Failed to receive messages: {e}")
+            self.stopping.wait(1)
+            return []
+        messages = response.get("Messages", [])
+        self.stats["received"] += len(messages)
+        return messages
+
+    def _await_in_flight(self) -> None:
+        # Wake up in time to extend the visibility of long-running messages
+        wait(self._in_flight, timeout=self.visibility_timeout / 3, return_when=FIRST_COMPLETED)
+
+    def _settle(self) -> None:
+        """Collect finished messages, extend running ones and delete handled ones."""
+        for future in [future for future in self._in_flight if future.done()]:
+            message = self._in_flight.pop(future)
+            self._extended_at.pop(message["ReceiptHandle"], None)
+            if (error := future.exception()) is not None:
+                logger.error(f"[sqs_consumer] Failed to handle message {message['MessageId']}, will retry: {error}")
+                self.stats["failed"] += 1
+            else:
+                self.stats["handled"] += 1
+                self._finished.append(message)
+
+        self._extend_visibility()
+        self._delete_finished()
+
+    def _extend_visibility(self) -> None:
+        due_at = time.monotonic() - self.visibility_timeout / 2
+        due = [message for message in self._in_flight.values() if self._extended_at[message["ReceiptHandle"]] <= due_at]
+        for start in range(0, len(due), SQS_BATCH_SIZE):
+            batch = due[start : start + SQS_BATCH_SIZE]
+            try:
+                self.client.change_message_visibility_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {
+                            "Id": str(index),
+                            "ReceiptHandle": message["ReceiptHandle"],
+                            "VisibilityTimeout": self.visibility_timeout,
+                        }
+                        for index, message in enumerate(batch)
+                    ],
+                )
+            except Exception as e:
+                logger.warning(f"[sqs_consumer] Failed to extend visibility of {len(batch)} messages: {e}")
+                continue
+            for message in batch:
+                self._extended_at[message["ReceiptHandle"]] = time.monotonic()
+
+    def _delete_finished(self) -> None:
+        while self._finished:
+            batch, self._finished = self._finished[:SQS_BATCH_SIZE], self._finished[SQS_BATCH_SIZE:]
+            try:
+                response = self.client.delete_message_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {"Id": str(index), "ReceiptHandle": message["ReceiptHandle"]}
+                        for index, message in enumerate(batch)
+                    ],
+                )
+            except Exception as e:
+                # Left on the queue, the messages are handled again after their visibility timeout
+                logger.warning(f"[sqs_consumer] Failed to delete {len(batch)} messages: {e}")
+                continue
+            for failure in response.get("Failed", []):
+                logger.warning(f"[sqs_consumer] Failed to delete message: {failure}")
+
+
+def main() -> None:
+    basicConfig(level=INFO, format="[%(asctime)s - %(name)s] (%(levelname)s) %(message)s")
+    init_sentry()
+    if not settings.sqs_queue_url:
+        raise SystemExit("SQS_QUEUE_URL is not set")
+
+    consumer = UploadQueueConsumer(boto3.client("sqs", region_name=settings.aws_region), settings.sqs_queue_url)
+
+    def shutdown(signum: int, _frame: FrameType | None) -> None:
+        logger.info(f"[sqs_consumer] Received signal {signum}, finishing messages in flight")
+        consumer.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    consumer.run()
+
+
+if __name__ == "__main__":
+    main()
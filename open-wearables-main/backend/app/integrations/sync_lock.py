@@ -0,0 +1,147 @@
+"""Lease locks on syncing the data families of a provider connection, shared by all workers through Redis.
+
+The periodic sync, manual syncs, new connections and backfills can all sync a user's
+provider at the same time. Each data family (workouts, sleep, ...) of a connection is
+leased by one sync at a time. An incremental sync finding a family leased flags a rerun
+instead of fetching it in parallel: the holder queues one more sync when it releases the
+lease, however many requests were coalesced into it.
+"""
+
+from logging import getLogger
+from uuid import UUID, uuid4
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.integrations.redis_client import get_redis_client
+
+# Take the lease, or flag a rerun for its holder. Returns the seconds left on the holder's
+# lease (0 when taken). Setting the flag atomically with the check means a release can't
+# slip in between and miss it.
+_ACQUIRE_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return '0'
+end
+if ARGV[3] == '1' then
+    redis.call('SET', KEYS[2], '1', 'EX', ARGV[2])
+end
+return tostring(math.max(redis.call('TTL', KEYS[1]), 1))
+"""
+
+# Drop the lease if still held by this token. Returns '1' when a rerun was flagged meanwhile.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return '0'
+end
+redis.call('DEL', KEYS[1])
+return tostring(redis.call('DEL', KEYS[2]))
+"""
+
+# Push back the expiry of the lease if still held by this token. Returns '1' when it was.
+_EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return '0'
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return '1'
+"""
+
+logger = getLogger(__name__)
+
+
+class SyncLease:
+    """Lease on syncing one data family of a user's provider connection.
+
+    The lease expires after ``sync_lease_seconds`` on its own, so a crashed worker cannot
+    block the family for longer. A running sync extends it while its jobs run; a single
+    fetch or save outlasting the lease can still let another sync in.
+    """
+
+    def __init__(self, user_id: UUID, provider_name: str, family: str):
+        self.family = family
+        self.key = f"sync_lease:{provider_name}:{user_id}:{family}"
+        self.rerun_key = f"sync_rerun:{provider_name}:{user_id}:{family}"
+        self.token = uuid4().hex
+        self.held = False
+
+    def acquire(self, coalesce: bool) -> float:
+        """
+        Take the lease if no other sync holds it.
+
+        Args:
+            coalesce: Flag a rerun for the holder when the lease is taken (incremental syncs),
+                instead of leaving the retry to the caller (syncs of an explicit range)
+
+        Returns:
+            float: 0 when the lease was taken, otherwise seconds until the holder's lease expires
+        """
+        try:
+            script = get_redis_client().register_script(_ACQUIRE_SCRIPT)
+            held_for = float(
+                script(keys=[self.key, self.rerun_key], args=[self.token, settings.sync_lease_seconds, int(coalesce)]),
+            )
+        except RedisError as e:
+            # Locking is best effort: syncs may then fetch the same family at once. Event records
+            # stay unique by device and time span, and samples saved with replace_many replace
+            # those of the same series and instant, but nothing else deduplicates data points.
+            logger.warning(f"[sync_lock] Failed to lease {self.key}, syncing without it: {e}")
+            return 0.0
+        self.held = held_for <= 0
+        return held_for
+
+    def extend(self) -> bool:
+        """Restart the lease's ``sync_lease_seconds``. Returns whether it was still held."""
+        if not self.held:
+            return False
+        try:
+            script = get_redis_client().register_script(_EXTEND_SCRIPT)
+            extended = script(keys=[self.key], args=[self.token, settings.sync_lease_seconds]) == "1"
+        except RedisError as e:
+            logger.warning(f"[sync_lock] Failed to extend {self.key}: {e}")
+            return True
+        if not extended:
+            logger.warning(f"[sync_lock] Lease {self.key} expired while syncing")
+            self.held = False
+        return extended
+
+    def release(self) -> bool:
+        """Release the lease. Returns whether a rerun was requested while it was held."""
+        if not self.held:
+            return False
+        self.held = False
+        try:
+            script = get_redis_client().register_script(_RELEASE_SCRIPT)
+            return script(keys=[self.key, self.rerun_key], args=[self.token]) == "1"
+        except RedisError as e:
+            logger.warning(f"[sync_lock] Failed to release {self.key}, it expires on its own: {e}")
+            return False
+
+
+class SyncLeases:
+    """Leases on several data families of one provider connection, taken together."""
+
+    def __init__(self, user_id: UUID, provider_name: str, families: list[str]):
+        self.provider_name = provider_name
+        self.leases = [SyncLease(user_id, provider_name, family) for family in dict.fromkeys(families)]
+
+    def acquire(self, coalesce: bool) -> dict[str, float]:
+        """
+        Take the leases of all families that no other sync holds.
+
+        Returns:
+            dict[str, float]: Families leased by another sync, with seconds until their lease expires
+        """
+        busy = {}
+        for lease in self.leases:
+            if held_for := lease.acquire(coalesce):
+                busy[lease.family] = held_for
+        return busy
+
+    def extend(self) -> None:
+        """Extend the leases taken, so they outlast a long sync."""
+        for lease in self.leases:
+            lease.extend()
+
+    def release(self) -> list[str]:
+        """Release the leases taken. Returns the families whose rerun was requested meanwhile."""
+        return [lease.family for lease in self.leases if lease.release()]
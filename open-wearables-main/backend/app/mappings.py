@@ -4,7 +4,7 @@ from decimal import Decimal
 from typing import Annotated, NewType, TypeVar
 from uuid import UUID
 
-from sqlalchemy import Date, DateTime, ForeignKey, Numeric
+from sqlalchemy import Date, DateTime, ForeignKey, Numeric, true
 from sqlalchemy.orm import mapped_column
 
 T = TypeVar("T")
@@ -24,7 +24,9 @@ type ManyToOne[T] = T
 
 # Custom types
 datetime_tz = Annotated[datetime, mapped_column(DateTime(timezone=True))]
+datetime_tz_pk = Annotated[datetime, mapped_column(DateTime(timezone=True), primary_key=True)]
 date_col = Annotated[date_type, mapped_column(Date)]
+bool_true = Annotated[bool, mapped_column(default=True, server_default=true())]
 
 # it's mapped in database.py, because it didn't work with PrimaryKey/Unique
 email = NewType("email", str)
@@ -61,3 +63,7 @@ FKSeriesTypeDefinition = Annotated[
     mapped_column(ForeignKey("series_type_definition.id", ondelete="RESTRICT")),
 ]
 FKDevice = Annotated[UUID, mapped_column(ForeignKey("device.id", ondelete="CASCADE"))]
+FKUserConnection = Annotated[
+    UUID,
+    mapped_column(ForeignKey("user_connection.id", ondelete="CASCADE"), primary_key=True),
+]
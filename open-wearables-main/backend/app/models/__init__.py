@@ -1,5 +1,6 @@
 from .api_key import ApiKey
 from .application import Application
+from .backfill_window import BackfillWindow
 from .data_point_series import DataPointSeries
 from .developer import Developer
 from .device import Device
@@ -12,6 +13,7 @@ from .personal_record import PersonalRecord
 from .provider_setting import ProviderSetting
 from .series_type_definition import SeriesTypeDefinition
 from .sleep_details import SleepDetails
+from .sync_watermark import SyncWatermark
 from .user import User
 from .user_connection import UserConnection
 from .workout_details import WorkoutDetails
@@ -19,6 +21,7 @@ from .workout_details import WorkoutDetails
 __all__ = [
     "ApiKey",
     "Application",
+    "BackfillWindow",
     "Developer",
     "Device",
     "DeviceSoftware",
@@ -34,4 +37,5 @@ __all__ = [
     "DataPointSeries",
     "ExternalDeviceMapping",
     "SeriesTypeDefinition",
+    "SyncWatermark",
 ]
@@ -0,0 +1,18 @@
+from sqlalchemy.orm import Mapped
+
+from app.database import BaseDbModel
+from app.mappings import FKUserConnection, datetime_tz, datetime_tz_pk, str_32
+
+
+class BackfillWindow(BaseDbModel):
+    """One time window of the historical backfill of a provider connection."""
+
+    __tablename__ = "backfill_window"
+
+    user_connection_id: Mapped[FKUserConnection]
+    window_start: Mapped[datetime_tz_pk]
+    window_end: Mapped[datetime_tz]
+    status: Mapped[str_32]  # 'pending', 'done' or 'failed'
+    attempts: Mapped[int]
+    error: Mapped[str | None]
+    updated_at: Mapped[datetime_tz]
@@ -1,12 +1,13 @@
 from uuid import UUID
 
-from sqlalchemy import Index, UniqueConstraint
+from sqlalchemy import DDL, Index, UniqueConstraint, event, text
 from sqlalchemy.orm import Mapped, relationship
 
 from app.database import BaseDbModel
 from app.mappings import (
     FKExternalMapping,
     PrimaryKey,
+    bool_true,
     datetime_tz,
     str_32,
     str_64,
@@ -17,8 +18,29 @@ from app.mappings import (
 class EventRecord(BaseDbModel):
     __tablename__ = "event_record"
     __table_args__ = (
-        Index("idx_event_record_mapping_category", "external_device_mapping_id", "category"),
+        Index("idx_event_record_mapping_category_type", "external_device_mapping_id", "category", "type"),
         Index("idx_event_record_mapping_time", "external_device_mapping_id", "start_datetime", "end_datetime"),
+        # Serves queries that skip duplicates merged into a record of another source
+        Index(
+            "idx_event_record_canonical",
+            "external_device_mapping_id",
+            "category",
+            "start_datetime",
+            postgresql_where=text("is_canonical"),
+        ),
+        # Trigram indexes serve the fuzzy (ILIKE '%...%') record type / source name filters
+        Index(
+            "idx_event_record_type_trgm",
+            "type",
+            postgresql_using="gin",
+            postgresql_ops={"type": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_event_record_source_name_trgm",
+            "source_name",
+            postgresql_using="gin",
+            postgresql_ops={"source_name": "gin_trgm_ops"},
+        ),
         UniqueConstraint(
             "external_device_mapping_id",
             "start_datetime",
@@ -40,8 +62,14 @@ class EventRecord(BaseDbModel):
     start_datetime: Mapped[datetime_tz]
     end_datetime: Mapped[datetime_tz]
 
+    # False when the record duplicates one of a higher-priority source (see record_merge_service)
+    is_canonical: Mapped[bool_true]
+
     detail: Mapped["EventRecordDetail | None"] = relationship(
         "EventRecordDetail",
         uselist=False,
         cascade="all, delete-orphan",
     )
+
+
+event.listen(EventRecord.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
@@ -0,0 +1,17 @@
+from uuid import UUID
+
+from sqlalchemy.orm import Mapped
+
+from app.database import BaseDbModel
+from app.mappings import FKUserConnection, PrimaryKey, datetime_tz, str_64
+
+
+class SyncWatermark(BaseDbModel):
+    """How far each data family of a provider connection has been synced."""
+
+    __tablename__ = "sync_watermark"
+
+    user_connection_id: Mapped[FKUserConnection]
+    data_type: Mapped[PrimaryKey[str_64]]  # Sync family, e.g. 'workouts', 'sleep_sessions'
+    synced_until: Mapped[datetime_tz]
+    updated_at: Mapped[datetime_tz]
@@ -39,5 +39,6 @@ class UserConnection(BaseDbModel):
     # Metadata
     status: Mapped[ConnectionStatus]
     last_synced_at: Mapped[datetime_tz | None]
+    backfill_completed_at: Mapped[datetime_tz | None]  # When every window of the history backfill was synced
     created_at: Mapped[datetime_tz]
     updated_at: Mapped[datetime_tz]
@@ -1,4 +1,5 @@
 from .api_key_repository import ApiKeyRepository
+from .backfill_window_repository import BackfillWindowRepository
 from .data_point_series_repository import DataPointSeriesRepository
 from .developer_repository import DeveloperRepository
 from .event_record_detail_repository import EventRecordDetailRepository
@@ -6,6 +7,8 @@ from .event_record_repository import EventRecordRepository
 from .external_mapping_repository import ExternalMappingRepository
 from .invitation_repository import InvitationRepository
 from .repositories import CrudRepository
+from .sync_watermark_repository import SyncWatermarkRepository
+from .system_stats_repository import SystemStatsRepository
 from .user_connection_repository import UserConnectionRepository
 from .user_repository import UserRepository
 
@@ -20,4 +23,7 @@ __all__ = [
     "InvitationRepository",
     "CrudRepository",
     "ExternalMappingRepository",
+    "SystemStatsRepository",
+    "SyncWatermarkRepository",
+    "BackfillWindowRepository",
 ]
@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import DbSession
+from app.models import BackfillWindow
+
+
+class BackfillWindowRepository:
+    """Repository for the per-window progress of connection history backfills."""
+
+    def plan(self, db: DbSession, user_connection_id: UUID, windows: list[tuple[datetime, datetime]]) -> None:
+        """Add windows to backfill; windows not done yet are reset to pending, done ones are kept."""
+        if not windows:
+            return
+        now = datetime.now(timezone.utc)
+        stmt = insert(BackfillWindow).values(
+            [
+                {
+                    "user_connection_id": user_connection_id,
+                    "window_start": start,
+                    "window_end": end,
+                    "status": "pending",
+                    "attempts": 0,
+                    "updated_at": now,
+                }
+                for start, end in windows
+            ],
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_connection_id", "window_start"],
+                set_={"status": "pending", "attempts": 0, "error": None, "updated_at": now},
+                where=BackfillWindow.status != "done",
+            ),
+        )
+        db.commit()
+
+    def get(self, db: DbSession, user_connection_id: UUID, window_start: datetime) -> BackfillWindow | None:
+        return db.get(BackfillWindow, (user_connection_id, window_start))
+
+    def get_unfinished(self, db: DbSession, user_connection_id: UUID) -> list[BackfillWindow]:
+        """Windows of a connection not synced yet, most recent first."""
+        stmt = (
+            select(BackfillWindow)
+            .where(BackfillWindow.user_connection_id == user_connection_id, BackfillWindow.status != "done")
+            .order_by(BackfillWindow.window_start.desc())
+        )
+        return list(db.scalars(stmt))
+
+    def count_by_status(self, db: DbSession, user_connection_id: UUID) -> dict[str, int]:
+        stmt = (
+            select(BackfillWindow.status, func.count())
+            .where(BackfillWindow.user_connection_id == user_connection_id)
+            .group_by(BackfillWindow.status)
+        )
+        return {status: count for status, count in db.execute(stmt).tuples()}
+
+    def finish(self, db: DbSession, window: BackfillWindow, error: str | None = None) -> None:
+        """Record an attempt of a window: done without error, failed otherwise."""
+        db.execute(
+            update(BackfillWindow)
+            .where(
+                BackfillWindow.user_connection_id == window.user_connection_id,
+                BackfillWindow.window_start == window.window_start,
+            )
+            .values(
+                status="failed" if error else "done",
+                attempts=BackfillWindow.attempts + 1,
+                error=error,
+                updated_at=datetime.now(timezone.utc),
+            ),
+        )
+        db.commit()
@@ -1,12 +1,16 @@
-from datetime import datetime
-from uuid import UUID
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, datetime, time
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import Date, asc, cast, func, tuple_
+from sqlalchemy import Date, asc, cast, delete, func, insert, select, tuple_
 
 from app.database import DbSession
 from app.models import DataPointSeries, ExternalDeviceMapping
 from app.repositories.external_mapping_repository import ExternalMappingRepository
 from app.repositories.repositories import CrudRepository
+from app.repositories.system_stats_repository import SystemStatsRepository
 from app.schemas import (
     TimeSeriesQueryParams,
     TimeSeriesSampleCreate,
@@ -15,6 +19,9 @@ from app.schemas import (
 from app.schemas.series_types import SeriesType, get_series_type_from_id, get_series_type_id
 from app.utils.pagination import decode_cursor
 
+# Samples per delete/insert statement, well below PostgreSQL's limit of 65535 bind parameters
+WRITE_CHUNK_SIZE = 5000
+
 
 class DataPointSeriesRepository(
     CrudRepository[DataPointSeries, TimeSeriesSampleCreate, TimeSeriesSampleUpdate],
@@ -24,8 +31,26 @@ class DataPointSeriesRepository(
     def __init__(self, model: type[DataPointSeries]):
         super().__init__(model)
         self.mapping_repo = ExternalMappingRepository(ExternalDeviceMapping)
+        self.stats_repo = SystemStatsRepository()
 
     def create(self, db_session: DbSession, creator: TimeSeriesSampleCreate) -> DataPointSeries:
+        creation = self._insert(db_session, creator)
+        self.stats_repo.record_data_points(creation.series_type_definition_id, creation.recorded_at)
+        return creation
+
+    def create_many(self, db_session: DbSession, creators: Iterable[TimeSeriesSampleCreate]) -> list[DataPointSeries]:
+        """Create samples one by one like ``create``, recording stats once per series type and day."""
+        created: list[DataPointSeries] = []
+        try:
+            for creator in creators:
+                created.append(self._insert(db_session, creator))
+        finally:
+            self._record_stats(
+                Counter((creation.series_type_definition_id, creation.recorded_at.date()) for creation in created),
+            )
+        return created
+
+    def _insert(self, db_session: DbSession, creator: TimeSeriesSampleCreate) -> DataPointSeries:
         mapping = self.mapping_repo.ensure_mapping(
             db_session,
             creator.user_id,
@@ -46,6 +71,58 @@ class DataPointSeriesRepository(
         db_session.refresh(creation)
         return creation
 
+    def _record_stats(self, added: Counter[tuple[int, date]]) -> None:
+        """Update the system stats counters by the samples added per series type and day."""
+        for (series_type_id, day), count in added.items():
+            if count:
+                self.stats_repo.record_data_points(series_type_id, datetime.combine(day, time.min), count)
+
+    def replace_many(self, db_session: DbSession, external_device_mapping_id: UUID, rows: list[dict[str, Any]]) -> int:
+        """Store many samples of one mapping, replacing stored samples of the same series and instant.
+
+        Rows hold ``series_type`` (SeriesType), ``recorded_at``, ``value`` and optionally
+        ``external_id``. Stored samples at the rows' series and instants are deleted and the
+        rows inserted, with multi-row statements in one transaction, so re-delivered data
+        is idempotent. Writers of the same mapping are serialized by an advisory lock.
+        Within ``rows`` the last sample of a series and instant wins.
+
+        Returns the number of samples added (inserted minus replaced).
+        """
+        unique: dict[tuple[int, datetime], dict[str, Any]] = {}
+        for row in rows:
+            series_type_id = get_series_type_id(row["series_type"])
+            unique[(series_type_id, row["recorded_at"])] = {
+                "id": uuid4(),
+                "external_id": row.get("external_id"),
+                "external_device_mapping_id": external_device_mapping_id,
+                "recorded_at": row["recorded_at"],
+                "value": row["value"],
+                "series_type_definition_id": series_type_id,
+            }
+        if not unique:
+            return 0
+
+        db_session.execute(select(func.pg_advisory_xact_lock(func.hashtext(str(external_device_mapping_id)))))
+        added: Counter[tuple[int, date]] = Counter()
+        keys = list(unique)
+        for start in range(0, len(keys), WRITE_CHUNK_SIZE):
+            chunk = keys[start : start + WRITE_CHUNK_SIZE]
+            replaced = db_session.execute(
+                delete(self.model)
+                .where(
+                    self.model.external_device_mapping_id == external_device_mapping_id,
+                    tuple_(self.model.series_type_definition_id, self.model.recorded_at).in_(chunk),
+                )
+                .returning(self.model.series_type_definition_id, self.model.recorded_at),
+            )
+            added.subtract((series_type_id, recorded_at.date()) for series_type_id, recorded_at in replaced)
+            db_session.execute(insert(self.model), [unique[key] for key in chunk])
+            added.update((series_type_id, recorded_at.date()) for series_type_id, recorded_at in chunk)
+        db_session.commit()
+
+        self._record_stats(added)
+        return sum(added.values())
+
     def get_samples(
         self,
         db_session: DbSession,
@@ -114,6 +191,31 @@ class DataPointSeriesRepository(
         limit = params.limit or 50
         return query.limit(limit + 1).all(), total_count
 
+    def get_values_in_window(
+        self,
+        db_session: DbSession,
+        external_device_mapping_id: UUID,
+        series_type: SeriesType,
+        start_datetime: datetime,
+        end_datetime: datetime,
+    ) -> list[tuple[datetime, float]]:
+        """Get (recorded_at, value) pairs of one series for a mapping within a time window.
+
+        Served by a single range scan on idx_data_point_series_mapping_type_time.
+        """
+        rows = (
+            db_session.query(self.model.recorded_at, self.model.value)
+            .filter(
+                self.model.external_device_mapping_id == external_device_mapping_id,
+                self.model.series_type_definition_id == get_series_type_id(series_type),
+                self.model.recorded_at >= start_datetime,
+                self.model.recorded_at <= end_datetime,
+            )
+            .order_by(asc(self.model.recorded_at))
+            .all()
+        )
+        return [(recorded_at, float(value)) for recorded_at, value in rows]
+
     def get_total_count(self, db_session: DbSession) -> int:
         """Get total count of all data points."""
         return db_session.query(func.count(self.model.id)).scalar() or 0
@@ -149,6 +251,23 @@ class DataPointSeriesRepository(
 
         return [count for _, count in daily_counts]
 
+    def get_daily_counts(
+        self,
+        db_session: DbSession,
+        start_datetime: datetime,
+        end_datetime: datetime,
+    ) -> list[tuple[date, int]]:
+        """Get (day, count) pairs of data points recorded within a datetime range."""
+        day = cast(self.model.recorded_at, Date)
+        return [
+            (row_day, count)
+            for row_day, count in db_session.query(day, func.count(self.model.id))
+            .filter(self.model.recorded_at >= start_datetime)
+            .filter(self.model.recorded_at < end_datetime)
+            .group_by(day)
+            .all()
+        ]
+
     def get_count_by_series_type(self, db_session: DbSession) -> list[tuple[int, int]]:
         """Get count of data points grouped by series type ID.
 
@@ -1,6 +1,8 @@
 from typing import Literal
 from uuid import UUID
 
+from sqlalchemy import inspect
+
 from app.database import DbSession
 from app.models import (
     EventRecordDetail,
@@ -47,6 +49,27 @@ class EventRecordDetailRepository(
         db_session.refresh(detail)
         return detail
 
+    def upsert(
+        self,
+        db_session: DbSession,
+        creator: EventRecordDetailCreate,
+        detail_type: DetailType = "workout",
+    ) -> EventRecordDetail:
+        """Create a detail record, or replace the values of the record's existing detail."""
+        existing = self.get_by_record_id(db_session, creator.record_id)
+        if existing is None:
+            return self.create(db_session, creator, detail_type=detail_type)
+
+        # Unlike update, values missing from the creator are cleared, so a detail is fully
+        # replaced by its re-normalized version
+        columns = inspect(existing).mapper.column_attrs.keys()
+        for field_name, field_value in creator.model_dump(exclude={"record_id"}).items():
+            if field_name in columns:
+                setattr(existing, field_name, field_value)
+        db_session.commit()
+        db_session.refresh(existing)
+        return existing
+
     def get_by_record_id(self, db_session: DbSession, record_id: UUID) -> EventRecordDetail | None:
         """Get detail by its associated event record ID."""
         return db_session.query(EventRecordDetail).filter(EventRecordDetail.record_id == record_id).one_or_none()
@@ -1,16 +1,20 @@
 from datetime import datetime
-from uuid import UUID
+from typing import Any
+from uuid import UUID, uuid4
 
 from sqlalchemy import UUID as SQL_UUID
-from sqlalchemy import Date, Integer, String, and_, asc, case, cast, desc, func, tuple_
+from sqlalchemy import ColumnElement, Date, Integer, Row, String, and_, asc, case, cast, desc, func, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Query
+from sqlalchemy.orm import Query, joinedload, selectinload, with_polymorphic
 
 from app.database import DbSession
-from app.models import EventRecord, ExternalDeviceMapping, SleepDetails
+from app.models import EventRecord, EventRecordDetail, ExternalDeviceMapping, SleepDetails, WorkoutDetails
 from app.repositories.external_mapping_repository import ExternalMappingRepository
 from app.repositories.repositories import CrudRepository
+from app.repositories.system_stats_repository import SystemStatsRepository
 from app.schemas import EventRecordCreate, EventRecordQueryParams, EventRecordUpdate
+from app.schemas.workout_types import WorkoutType
 from app.utils.exceptions import handle_exceptions
 from app.utils.pagination import decode_cursor
 
@@ -21,6 +25,7 @@ class EventRecordRepository(
     def __init__(self, model: type[EventRecord]):
         super().__init__(model)
         self.mapping_repo = ExternalMappingRepository(ExternalDeviceMapping)
+        self.stats_repo = SystemStatsRepository()
 
     @handle_exceptions
     def create(self, db_session: DbSession, creator: EventRecordCreate) -> EventRecord:
@@ -45,7 +50,6 @@ class EventRecordRepository(
             db_session.add(creation)
             db_session.commit()
             db_session.refresh(creation)
-            return creation
         except IntegrityError:
             db_session.rollback()
             # Query using the mapping and other unique constraint fields
@@ -62,15 +66,153 @@ class EventRecordRepository(
                 return existing
             raise
 
+        if creation.category == "workout":
+            self.stats_repo.record_workouts(creation.type)
+        return creation
+
+    def upsert_sleeps(
+        self,
+        db_session: DbSession,
+        external_device_mapping_id: UUID,
+        sleeps: list[tuple[dict[str, Any], dict[str, Any]]],
+    ) -> int:
+        """Insert or update sleep records of one mapping, with their details, in bulk.
+
+        Each item pairs event record columns (type, source_name, duration_seconds,
+        start/end_datetime, external_id) with sleep detail columns. Records are matched on
+        uq_event_record_datetime, so a re-delivered sleep updates the stored one.
+
+        Returns the number of sleeps stored.
+        """
+        unique = {(record["start_datetime"], record["end_datetime"]): (record, detail) for record, detail in sleeps}
+        if not unique:
+            return 0
+
+        stmt = insert(self.model).values(
+            [
+                {**record, "id": uuid4(), "external_device_mapping_id": external_device_mapping_id, "category": "sleep"}
+                for record, _ in unique.values()
+            ],
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_event_record_datetime",
+            set_={
+                column: stmt.excluded[column]
+                for column in ("external_id", "category", "type", "source_name", "duration_seconds")
+            },
+        ).returning(self.model.id, self.model.start_datetime, self.model.end_datetime)
+        record_ids = {(start, end): record_id for record_id, start, end in db_session.execute(stmt)}
+
+        details = [{**detail, "record_id": record_ids[key]} for key, (_, detail) in unique.items()]
+        db_session.execute(
+            insert(EventRecordDetail.__table__)
+            .values([{"record_id": detail["record_id"], "detail_type": "sleep"} for detail in details])
+            .on_conflict_do_nothing(index_elements=["record_id"]),
+        )
+        detail_stmt = insert(SleepDetails.__table__).values(details)
+        db_session.execute(
+            detail_stmt.on_conflict_do_update(
+                index_elements=["record_id"],
+                set_={column: detail_stmt.excluded[column] for column in details[0] if column != "record_id"},
+            ),
+        )
+        db_session.commit()
+        return len(details)
+
+    def get_overlapping(
+        self,
+        db_session: DbSession,
+        user_id: UUID,
+        category: str,
+        start: datetime,
+        end: datetime,
+    ) -> list[Row[Any]]:
+        """Records of a user's category sharing time with [start, end), from all of their mappings.
+
+        Rows have id, external_device_mapping_id, provider_name, start_datetime,
+        end_datetime and is_canonical.
+        """
+        return (
+            db_session.query(
+                EventRecord.id,
+                EventRecord.external_device_mapping_id,
+                ExternalDeviceMapping.provider_name,
+                EventRecord.start_datetime,
+                EventRecord.end_datetime,
+                EventRecord.is_canonical,
+            )
+            .join(ExternalDeviceMapping, EventRecord.external_device_mapping_id == ExternalDeviceMapping.id)
+            .filter(
+                ExternalDeviceMapping.user_id == user_id,
+                EventRecord.category == category,
+                EventRecord.start_datetime < end,
+                EventRecord.end_datetime > start,
+            )
+            .all()
+        )
+
+    def set_canonical(self, db_session: DbSession, canonical: set[UUID], duplicates: set[UUID]) -> None:
+        """Flag records as canonical or as duplicates of another source's record."""
+        for record_ids, is_canonical in ((canonical, True), (duplicates, False)):
+            if record_ids:
+                db_session.execute(
+                    update(EventRecord).where(EventRecord.id.in_(record_ids)).values(is_canonical=is_canonical),
+                )
+        db_session.commit()
+
+    @staticmethod
+    def _contains_pattern(value: str) -> str:
+        """Build an ILIKE substring pattern with LIKE special characters escaped."""
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
+
+    def _record_type_filter(self, record_type: str) -> ColumnElement[bool]:
+        """Filter on record type, preferring the exact-match path.
+
+        Unified workout types are matched exactly, which is served by
+        idx_event_record_mapping_category_type. Anything else (e.g. raw provider
+        types) falls back to a substring match backed by the trigram index.
+        """
+        normalized = record_type.strip().lower()
+        if normalized in WorkoutType:
+            return EventRecord.type == normalized
+        return EventRecord.type.ilike(self._contains_pattern(record_type), escape="\\")
+
+    def get_user_record(
+        self,
+        db_session: DbSession,
+        user_id: UUID,
+        record_id: UUID,
+        category: str | None = None,
+    ) -> tuple[EventRecord, ExternalDeviceMapping] | None:
+        """Get a record owned by the user, with its mapping and detail, in a single query."""
+        detail = with_polymorphic(EventRecordDetail, [WorkoutDetails, SleepDetails], flat=True)
+        query = (
+            db_session.query(EventRecord, ExternalDeviceMapping)
+            .join(ExternalDeviceMapping, EventRecord.external_device_mapping_id == ExternalDeviceMapping.id)
+            .options(joinedload(EventRecord.detail.of_type(detail)))
+            .filter(EventRecord.id == record_id, ExternalDeviceMapping.user_id == user_id)
+        )
+        if category:
+            query = query.filter(EventRecord.category == category)
+        return query.one_or_none()
+
     def get_records_with_filters(
         self,
         db_session: DbSession,
         query_params: EventRecordQueryParams,
         user_id: str,
     ) -> tuple[list[tuple[EventRecord, ExternalDeviceMapping]], int]:
-        query: Query = db_session.query(EventRecord, ExternalDeviceMapping).join(
-            ExternalDeviceMapping,
-            EventRecord.external_device_mapping_id == ExternalDeviceMapping.id,
+        # Details of the whole page are loaded in one extra SELECT (outer-joined to
+        # workout_details/sleep_details) instead of a lazy load per record
+        detail = with_polymorphic(EventRecordDetail, [WorkoutDetails, SleepDetails])
+        query: Query = (
+            db_session.query(EventRecord, ExternalDeviceMapping)
+            .join(
+                ExternalDeviceMapping,
+                EventRecord.external_device_mapping_id == ExternalDeviceMapping.id,
+            )
+            .options(selectinload(EventRecord.detail.of_type(detail)))
         )
 
         filters = [ExternalDeviceMapping.user_id == UUID(user_id)]
@@ -79,10 +221,10 @@ class EventRecordRepository(
             filters.append(EventRecord.category == query_params.category)
 
         if query_params.record_type:
-            filters.append(EventRecord.type.ilike(f"%{query_params.record_type}%"))
+            filters.append(self._record_type_filter(query_params.record_type))
 
         if query_params.source_name:
-            filters.append(EventRecord.source_name.ilike(f"%{query_params.source_name}%"))
+            filters.append(EventRecord.source_name.ilike(self._contains_pattern(query_params.source_name), escape="\\"))
 
         if query_params.device_id:
             filters.append(ExternalDeviceMapping.device_id == query_params.device_id)
@@ -105,6 +247,13 @@ class EventRecordRepository(
         if query_params.max_duration is not None:
             filters.append(EventRecord.duration_seconds <= query_params.max_duration)
 
+        # Records of an explicitly requested source are listed even when another source's record is canonical
+        source_filtered = any(
+            getattr(query_params, field, None) for field in ("provider_name", "device_id", "external_device_mapping_id")
+        )
+        if query_params.canonical_only and not source_filtered:
+            filters.append(EventRecord.is_canonical)
+
         if filters:
             query = query.filter(and_(*filters))
 
@@ -256,6 +405,7 @@ class EventRecordRepository(
             .filter(
                 ExternalDeviceMapping.user_id == user_id,
                 EventRecord.category == "sleep",
+                EventRecord.is_canonical,
                 EventRecord.end_datetime >= start_date,
                 cast(EventRecord.end_datetime, Date) <= cast(end_date, Date),
             )
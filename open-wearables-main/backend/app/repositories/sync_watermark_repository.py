@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import DbSession
+from app.models import SyncWatermark
+
+
+class SyncWatermarkRepository:
+    """Repository for per data family sync progress of provider connections."""
+
+    def get_for_connection(self, db: DbSession, user_connection_id: UUID) -> dict[str, datetime]:
+        """Get the watermarks of a connection as a map of data_type -> synced_until."""
+        stmt = select(SyncWatermark.data_type, SyncWatermark.synced_until).where(
+            SyncWatermark.user_connection_id == user_connection_id,
+        )
+        return {row.data_type: row.synced_until for row in db.execute(stmt)}
+
+    def advance(self, db: DbSession, user_connection_id: UUID, data_type: str, synced_until: datetime) -> None:
+        """Move a watermark forward; it never moves back (e.g. when an older sync finishes late)."""
+        stmt = (
+            insert(SyncWatermark)
+            .values(
+                user_connection_id=user_connection_id,
+                data_type=data_type,
+                synced_until=synced_until,
+                updated_at=datetime.now(timezone.utc),
+            )
+            .on_conflict_do_update(
+                index_elements=["user_connection_id", "data_type"],
+                set_={
+                    "synced_until": func.greatest(SyncWatermark.synced_until, synced_until),
+                    "updated_at": datetime.now(timezone.utc),
+                },
+            )
+        )
+        db.execute(stmt)
+        db.commit()
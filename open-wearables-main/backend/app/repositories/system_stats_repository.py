@@ -0,0 +1,87 @@
+"""Redis-backed counters behind the developer dashboard statistics."""
+
+from datetime import date, datetime, timezone
+from logging import getLogger
+
+from redis.exceptions import RedisError
+
+from app.integrations.redis_client import get_redis_client
+
+STATS_KEY = "system_stats"
+RECONCILED_AT_FIELD = "reconciled_at"
+
+USERS = "users"
+ACTIVE_CONN = "active_conn"
+DATA_POINTS = "data_points"
+SERIES_TYPE_PREFIX = "series_type:"
+WORKOUT_TYPE_PREFIX = "workout_type:"
+
+
+def day_field(counter: str, day: date) -> str:
+    """Name of the daily bucket field for a counter, e.g. ``users:2025-01-31``."""
+    return f"{counter}:{day.isoformat()}"
+
+
+class SystemStatsRepository:
+    """Maintained counters for the dashboard ``/stats`` endpoint.
+
+    Ingest paths bump the counters with HINCRBY, so the dashboard is served from
+    a single HGETALL instead of count(*)/GROUP BY scans over the data tables.
+    Weekly growth is derived from per-day buckets. The hash is periodically
+    overwritten with exact values by the reconciliation task, which also corrects
+    drift from deletes, cascades and increments lost while Redis was unavailable.
+    """
+
+    def __init__(self, key: str = STATS_KEY):
+        self.key = key
+        self.logger = getLogger(__name__)
+
+    def _increment(self, increments: dict[str, int]) -> None:
+        """Apply counter deltas; failures are logged and left for reconciliation."""
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            for field, amount in increments.items():
+                if amount:
+                    pipe.hincrby(self.key, field, amount)
+            pipe.execute()
+        except RedisError as e:
+            self.logger.warning(f"[system_stats] Failed to update counters: {e}")
+
+    def record_users(self, created_at: datetime, count: int = 1) -> None:
+        self._increment({USERS: count, day_field(USERS, created_at.date()): count})
+
+    def record_active_connections(self, created_at: datetime, count: int = 1) -> None:
+        """Track active connections; pass a negative count when one stops being active."""
+        self._increment({ACTIVE_CONN: count, day_field(ACTIVE_CONN, created_at.date()): count})
+
+    def record_data_points(self, series_type_id: int, recorded_at: datetime, count: int = 1) -> None:
+        self._increment(
+            {
+                DATA_POINTS: count,
+                day_field(DATA_POINTS, recorded_at.date()): count,
+                f"{SERIES_TYPE_PREFIX}{series_type_id}": count,
+            },
+        )
+
+    def record_workouts(self, workout_type: str | None, count: int = 1) -> None:
+        self._increment({f"{WORKOUT_TYPE_PREFIX}{workout_type or ''}": count})
+
+    def get_snapshot(self) -> dict[str, int] | None:
+        """Return all counters, or None if they were never reconciled or Redis is unavailable."""
+        try:
+            raw = get_redis_client().hgetall(self.key)
+        except RedisError as e:
+            self.logger.warning(f"[system_stats] Failed to read counters: {e}")
+            return None
+
+        if not raw or RECONCILED_AT_FIELD not in raw:
+            return None
+        return {field: int(value) for field, value in raw.items() if field != RECONCILED_AT_FIELD}
+
+    def replace(self, counters: dict[str, int]) -> None:
+        """Atomically overwrite all counters with exact values."""
+        values: dict[str, int | str] = {**counters, RECONCILED_AT_FIELD: datetime.now(timezone.utc).isoformat()}
+        pipe = get_redis_client().pipeline(transaction=True)
+        pipe.delete(self.key)
+        pipe.hset(self.key, mapping=values)
+        pipe.execute()
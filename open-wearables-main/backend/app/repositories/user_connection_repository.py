@@ -1,11 +1,13 @@
-from datetime import datetime, timedelta, timezone
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import and_, func
+from sqlalchemy import Date, and_, cast, func
 
 from app.database import DbSession
 from app.models import UserConnection
 from app.repositories.repositories import CrudRepository
+from app.repositories.system_stats_repository import SystemStatsRepository
 from app.schemas import ConnectionStatus, UserConnectionCreate, UserConnectionUpdate
 
 
@@ -14,6 +16,13 @@ class UserConnectionRepository(CrudRepository[UserConnection, UserConnectionCrea
 
     def __init__(self, model: type[UserConnection] = UserConnection):
         super().__init__(model)
+        self.stats_repo = SystemStatsRepository()
+
+    def create(self, db_session: DbSession, creator: UserConnectionCreate) -> UserConnection:
+        connection = super().create(db_session, creator)
+        if connection.status == ConnectionStatus.ACTIVE:
+            self.stats_repo.record_active_connections(connection.created_at)
+        return connection
 
     def get_active_count(self, db_session: DbSession) -> int:
         """Get total count of active connections."""
@@ -37,6 +46,28 @@ class UserConnectionRepository(CrudRepository[UserConnection, UserConnectionCrea
             or 0
         )
 
+    def get_active_daily_counts(
+        self,
+        db_session: DbSession,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[tuple[date, int]]:
+        """Get (day, count) pairs of active connections created within a date range."""
+        day = cast(self.model.created_at, Date)
+        return [
+            (row_day, count)
+            for row_day, count in db_session.query(day, func.count(self.model.id))
+            .filter(
+                and_(
+                    self.model.status == ConnectionStatus.ACTIVE,
+                    self.model.created_at >= start_date,
+                    self.model.created_at < end_date,
+                ),
+            )
+            .group_by(day)
+            .all()
+        ]
+
     def get_by_user_and_provider(
         self,
         db_session: DbSession,
@@ -97,6 +128,29 @@ class UserConnectionRepository(CrudRepository[UserConnection, UserConnectionCrea
             .one_or_none()
         )
 
+    def get_by_provider_user_ids(
+        self,
+        db_session: DbSession,
+        provider: str,
+        provider_user_ids: Iterable[str],
+    ) -> dict[str, UserConnection]:
+        """Get active connections for many provider user IDs in one query, keyed by provider user ID."""
+        ids = set(provider_user_ids)
+        if not ids:
+            return {}
+        connections = (
+            db_session.query(self.model)
+            .filter(
+                and_(
+                    self.model.provider == provider,
+                    self.model.provider_user_id.in_(ids),
+                    self.model.status == ConnectionStatus.ACTIVE,
+                ),
+            )
+            .all()
+        )
+        return {connection.provider_user_id: connection for connection in connections if connection.provider_user_id}
+
     def get_by_user_id(
         self,
         db_session: DbSession,
@@ -129,11 +183,14 @@ class UserConnectionRepository(CrudRepository[UserConnection, UserConnectionCrea
 
     def mark_as_revoked(self, db_session: DbSession, connection: UserConnection) -> UserConnection:
         """Mark connection as revoked (when refresh token fails)."""
+        was_active = connection.status == ConnectionStatus.ACTIVE
         connection.status = ConnectionStatus.REVOKED
         connection.updated_at = datetime.now(timezone.utc)
         db_session.add(connection)
         db_session.commit()
         db_session.refresh(connection)
+        if was_active:
+            self.stats_repo.record_active_connections(connection.created_at, count=-1)
         return connection
 
     def update_tokens(
@@ -194,6 +251,14 @@ class UserConnectionRepository(CrudRepository[UserConnection, UserConnectionCrea
         db_session.refresh(connection)
         return connection
 
+    def mark_backfilled(self, db_session: DbSession, connection: UserConnection) -> UserConnection:
+        """Mark the connection's history as fully backfilled."""
+        connection.backfill_completed_at = datetime.now(timezone.utc)
+        db_session.add(connection)
+        db_session.commit()
+        db_session.refresh(connection)
+        return connection
+
     def get_all_active_by_user(self, db_session: DbSession, user_id: UUID) -> list[UserConnection]:
         """Get all active connections for a specific user."""
         return (
@@ -216,3 +281,16 @@ class UserConnectionRepository(CrudRepository[UserConnection, UserConnectionCrea
             .distinct()
             .all()
         ]
+
+    def get_active_providers_by_user(self, db_session: DbSession) -> dict[UUID, list[str]]:
+        """Get the providers each user with active connections is connected to."""
+        providers: dict[UUID, list[str]] = {}
+        rows = (
+            db_session.query(self.model.user_id, self.model.provider)
+            .filter(self.model.status == ConnectionStatus.ACTIVE)
+            .order_by(self.model.user_id, self.model.provider)
+            .all()
+        )
+        for row in rows:
+            providers.setdefault(row.user_id, []).append(row.provider)
+        return providers
@@ -1,17 +1,24 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import desc, func, or_
+from sqlalchemy import Date, cast, desc, func, or_
 from sqlalchemy.orm import Query
 
 from app.database import DbSession
 from app.models import User
 from app.repositories.repositories import CrudRepository
+from app.repositories.system_stats_repository import SystemStatsRepository
 from app.schemas.user import USER_SORT_COLUMNS, UserCreateInternal, UserQueryParams, UserUpdateInternal
 
 
 class UserRepository(CrudRepository[User, UserCreateInternal, UserUpdateInternal]):
     def __init__(self, model: type[User]):
         super().__init__(model)
+        self.stats_repo = SystemStatsRepository()
+
+    def create(self, db_session: DbSession, creator: UserCreateInternal) -> User:
+        user = super().create(db_session, creator)
+        self.stats_repo.record_users(user.created_at)
+        return user
 
     def get_total_count(self, db_session: DbSession) -> int:
         """Get total count of users."""
@@ -26,6 +33,22 @@ class UserRepository(CrudRepository[User, UserCreateInternal, UserUpdateInternal
             or 0
         )
 
+    def get_daily_counts(
+        self,
+        db_session: DbSession,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[tuple[date, int]]:
+        """Get (day, count) pairs of users created within a date range."""
+        day = cast(self.model.created_at, Date)
+        return [
+            (row_day, count)
+            for row_day, count in db_session.query(day, func.count(self.model.id))
+            .filter(self.model.created_at >= start_date, self.model.created_at < end_date)
+            .group_by(day)
+            .all()
+        ]
+
     def get_users_with_filters(
         self,
         db_session: DbSession,
@@ -131,11 +131,13 @@ from .suunto.workout_import import (
 from .sync import (
     ProviderSyncResult,
     SyncAllUsersResult,
+    SyncRecordCounts,
     SyncVendorDataResult,
 )
 from .system_info import (
     CountWithGrowth,
     DataPointsInfo,
+    QueueMetrics,
     SystemInfoResponse,
 )
 from .timeseries import (
@@ -226,6 +228,7 @@ __all__ = [
     "StepSampleCreate",
     "TimeSeriesQueryParams",
     "SystemInfoResponse",
+    "QueueMetrics",
     "CountWithGrowth",
     "DataPointsInfo",
     "HKRecordJSON",
@@ -256,6 +259,7 @@ __all__ = [
     # Sync schemas
     "ProviderSyncResult",
     "SyncAllUsersResult",
+    "SyncRecordCounts",
     "SyncVendorDataResult",
     # Common Types
     "DataSource",
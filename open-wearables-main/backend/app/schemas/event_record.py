@@ -99,7 +99,10 @@ class EventRecordQueryParams(BaseModel):
         "workout",
         description="Record category (workout, sleep, etc). Defaults to workout.",
     )
-    record_type: str | None = Field(None, description="Subtype filter (e.g. HKWorkoutActivityTypeRunning)")
+    record_type: str | None = Field(
+        None,
+        description="Subtype filter: exact match for unified workout types (e.g. running), substring match otherwise",
+    )
 
     # Source filtering
     device_id: str | None = Field(None, description="Filter by originating device id")
@@ -111,6 +114,15 @@ class EventRecordQueryParams(BaseModel):
     min_duration: int | None = Field(None, description="Minimum duration in seconds")
     max_duration: int | None = Field(None, description="Maximum duration in seconds")
 
+    # Cross-source duplicates
+    canonical_only: bool = Field(
+        True,
+        description=(
+            "Skip records duplicating one recorded by a higher-priority source "
+            "(ignored when filtering by provider, device or mapping)"
+        ),
+    )
+
     # Sorting
     sort_by: Literal[
         "start_datetime",
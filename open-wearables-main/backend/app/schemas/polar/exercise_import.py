@@ -30,6 +30,7 @@ class ExerciseJSON(BaseModel):
     sport: str
     detailed_sport_info: str | None = None
 
+    upload_time: str | None = None
     start_time: str
     start_time_utc_offset: int
     duration: str
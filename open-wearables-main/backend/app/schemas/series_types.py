@@ -109,6 +109,12 @@ class SeriesType(str, Enum):
     time_in_daylight = "time_in_daylight"
     water_temperature = "water_temperature"
 
+    # =========================================================================
+    # WELLNESS (IDs 220-239)
+    # =========================================================================
+    stress_level = "stress_level"
+    body_battery = "body_battery"
+
 
 # =============================================================================
 # DATABASE ID DEFINITIONS
@@ -200,6 +206,11 @@ SERIES_TYPE_DEFINITIONS: list[tuple[int, SeriesType, str]] = [
     (202, SeriesType.environmental_sound_reduction, "dB"),
     (203, SeriesType.time_in_daylight, "minutes"),
     (204, SeriesType.water_temperature, "celsius"),
+    # -------------------------------------------------------------------------
+    # WELLNESS (IDs 220-239)
+    # -------------------------------------------------------------------------
+    (220, SeriesType.stress_level, "score"),
+    (221, SeriesType.body_battery, "score"),
 ]
 
 
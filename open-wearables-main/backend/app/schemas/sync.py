@@ -4,9 +4,16 @@ from uuid import UUID
 from pydantic import BaseModel
 
 
+class SyncRecordCounts(BaseModel):
+    fetched: int | None = None  # None when the provider fetches and saves in one step
+    new: int = 0
+    failed_chunks: list[str] = []  # Time windows that failed to fetch, the family is re-fetched on the next sync
+
+
 class ProviderSyncResult(BaseModel):
     success: bool
     params: dict[str, Any]
+    records: dict[str, SyncRecordCounts] = {}  # Per data family
 
 
 class SyncVendorDataResult(BaseModel):
@@ -15,8 +22,12 @@ class SyncVendorDataResult(BaseModel):
     end_date: str | None = None
     providers_synced: dict[str, ProviderSyncResult] = {}
     errors: dict[str, str] = {}
+    deferred: dict[str, float] = {}  # Rate limited providers re-queued, with seconds until their retry
+    coalesced: dict[str, list[str]] = {}  # Families skipped as another sync was running them, rerun by it
     message: str | None = None
 
 
 class SyncAllUsersResult(BaseModel):
     users_for_sync: int
+    deferred: int = 0  # Users that did not fit in the sync interval, synced first by the next run
+    spread_seconds: float = 0.0  # Delay of the last queued user sync
@@ -37,3 +37,14 @@ class SystemInfoResponse(BaseModel):
     total_users: CountWithGrowth
     active_conn: CountWithGrowth
     data_points: DataPointsInfo
+
+
+class QueueMetrics(BaseModel):
+    """Depth and recent wait times of a Celery queue."""
+
+    queue: str
+    depth: int  # Tasks waiting, excluding countdowns not due yet
+    latency_samples: int  # Recent tasks the wait times are computed from
+    latency_p50_seconds: float | None
+    latency_p95_seconds: float | None
+    latency_max_seconds: float | None
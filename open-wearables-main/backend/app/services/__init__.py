@@ -8,6 +8,7 @@ from .application_service import application_service
 from .developer_service import developer_service
 from .event_record_service import event_record_service
 from .invitation_service import invitation_service
+from .record_merge_service import record_merge_service
 from .sdk_token_service import create_sdk_user_token
 from .services import AppService
 from .summaries_service import summaries_service
@@ -29,6 +30,7 @@ __all__ = [
     "ae_import_service",
     "hk_import_service",
     "event_record_service",
+    "record_merge_service",
     "summaries_service",
     "timeseries_service",
     "pre_url_service",
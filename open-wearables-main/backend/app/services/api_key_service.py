@@ -11,6 +11,7 @@ from app.repositories.api_key_repository import ApiKeyRepository
 from app.schemas.api_key import ApiKeyCreate, ApiKeyUpdate
 from app.services.services import AppService
 from app.utils.auth import get_current_developer_optional
+from app.utils.auth_cache import auth_cache
 
 
 class ApiKeyService(AppService[ApiKeyRepository, ApiKey, ApiKeyCreate, ApiKeyUpdate]):
@@ -39,6 +40,22 @@ class ApiKeyService(AppService[ApiKeyRepository, ApiKey, ApiKeyCreate, ApiKeyUpd
         self.logger.debug(f"Listed {len(keys)} API keys")
         return keys
 
+    def delete(self, db_session: DbSession, object_id: str, raise_404: bool = False) -> ApiKey | None:
+        deleted = super().delete(db_session, object_id, raise_404=raise_404)
+        auth_cache.invalidate(ApiKey, object_id)
+        return deleted
+
+    def update(
+        self,
+        db_session: DbSession,
+        object_id: str,
+        updater: ApiKeyUpdate,
+        raise_404: bool = False,
+    ) -> ApiKey | None:
+        updated = super().update(db_session, object_id, updater, raise_404=raise_404)
+        auth_cache.invalidate(ApiKey, object_id)
+        return updated
+
     def rotate_api_key(self, db: DbSession, old_key: str, created_by: UUID | None) -> ApiKey:
         """Rotate API key - delete old and create new."""
         self.delete(db, old_key, raise_404=True)
@@ -48,8 +65,11 @@ class ApiKeyService(AppService[ApiKeyRepository, ApiKey, ApiKeyCreate, ApiKeyUpd
 
     def validate_api_key(self, db: DbSession, key: str) -> ApiKey:
         """Validate API key exists in database. Raises 401 if invalid."""
+        if api_key := auth_cache.get(db, ApiKey, key):
+            return api_key
         if not (api_key := self.get(db, key)):
             raise HTTPException(status_code=401, detail="Invalid or missing API key")
+        auth_cache.set(api_key)
         return api_key
 
 
@@ -1,8 +1,7 @@
-import json
 from datetime import datetime
 from decimal import Decimal
 from logging import Logger, getLogger
-from typing import Iterable
+from typing import Any, BinaryIO, Iterable
 from uuid import UUID, uuid4
 
 from app.database import DbSession
@@ -12,14 +11,15 @@ from app.schemas import (
     EventRecordDetailCreate,
     EventRecordMetrics,
     HeartRateSampleCreate,
-    RootJSON,
     UploadDataResponse,
 )
 from app.services.event_record_service import event_record_service
 from app.services.timeseries_service import timeseries_service
 from app.utils.exceptions import handle_exceptions
+from app.utils.json_stream import is_well_formed, iter_sections
 
 APPLE_DT_FORMAT = "%Y-%m-%d %H:%M:%S %z"
+SECTIONS = ("workouts",)
 
 
 class ImportService:
@@ -87,56 +87,54 @@ class ImportService:
 
         return samples
 
-    def _build_import_bundles(
+    def _build_import_bundle(
         self,
         raw: dict,
-        user_id: str,
-    ) -> Iterable[tuple[EventRecordCreate, EventRecordDetailCreate, list[HeartRateSampleCreate]]]:
+        user_uuid: UUID,
+    ) -> tuple[EventRecordCreate, EventRecordDetailCreate, list[HeartRateSampleCreate]]:
         """
-        Given the parsed JSON dict from HealthAutoExport, yield ImportBundles
+        Given one workout of the HealthAutoExport JSON, return the ImportBundle
         ready to insert the database.
         """
-        root = RootJSON(**raw)
-        workouts_raw = root.data.get("workouts", [])
+        wjson = AEWorkoutJSON(**raw)
+
+        workout_id = uuid4()
+
+        start_date = self._dt(wjson.start)
+        end_date = self._dt(wjson.end)
+        duration_seconds = int((end_date - start_date).total_seconds())
+
+        metrics = self._compute_metrics(wjson)
+        hr_samples = self._get_records(wjson, user_uuid)
+
+        workout_type = wjson.name or "Unknown Workout"
+
+        record = EventRecordCreate(
+            category="workout",
+            type=workout_type,
+            source_name="Auto Export",
+            device_id=None,
+            duration_seconds=duration_seconds,
+            start_datetime=start_date,
+            end_datetime=end_date,
+            id=workout_id,
+            external_id=wjson.id,
+            provider_name="Apple",
+            user_id=user_uuid,
+        )
+
+        detail = EventRecordDetailCreate(
+            record_id=workout_id,
+            **metrics,
+        )
 
+        return record, detail, hr_samples
+
+    def load_data(self, db_session: DbSession, items: Iterable[tuple[str, Any]], user_id: str) -> bool:
+        """Import workouts one at a time, as yielded by ``iter_sections``."""
         user_uuid = UUID(user_id)
-        for w in workouts_raw:
-            wjson = AEWorkoutJSON(**w)
-
-            workout_id = uuid4()
-
-            start_date = self._dt(wjson.start)
-            end_date = self._dt(wjson.end)
-            duration_seconds = int((end_date - start_date).total_seconds())
-
-            metrics = self._compute_metrics(wjson)
-            hr_samples = self._get_records(wjson, user_uuid)
-
-            workout_type = wjson.name or "Unknown Workout"
-
-            record = EventRecordCreate(
-                category="workout",
-                type=workout_type,
-                source_name="Auto Export",
-                device_id=None,
-                duration_seconds=duration_seconds,
-                start_datetime=start_date,
-                end_datetime=end_date,
-                id=workout_id,
-                external_id=wjson.id,
-                provider_name="Apple",
-                user_id=user_uuid,
-            )
-
-            detail = EventRecordDetailCreate(
-                record_id=workout_id,
-                **metrics,
-            )
-
-            yield record, detail, hr_samples
-
-    def load_data(self, db_session: DbSession, raw: dict, user_id: str) -> bool:
-        for record, detail, hr_samples in self._build_import_bundles(raw, user_id):
+        for _, raw in items:
+            record, detail, hr_samples = self._build_import_bundle(raw, user_uuid)
             created_record = self.event_record_service.create(db_session, record)
             detail_for_record = detail.model_copy(update={"record_id": created_record.id})
             self.event_record_service.create_detail(db_session, detail_for_record)
@@ -150,59 +148,33 @@ class ImportService:
     async def import_data_from_request(
         self,
         db_session: DbSession,
-        request_content: str,
+        content: BinaryIO,
         content_type: str,
         user_id: str,
     ) -> UploadDataResponse:
+        # Multipart files may carry bytes around the document
+        multipart = "multipart/form-data" in content_type
         try:
-            # Parse content based on type
-            if "multipart/form-data" in content_type:
-                data = self._parse_multipart_content(request_content)
-            else:
-                data = self._parse_json_content(request_content)
-
-            if not data:
+            user_uuid = UUID(user_id)
+            # Nothing is imported from a malformed or truncated upload, nor from one with an invalid
+            # workout: workouts are saved one by one, so a late error would leave earlier ones behind
+            if not is_well_formed(
+                content,
+                "data",
+                SECTIONS,
+                skip_prefix=multipart,
+                validate=lambda _, raw: self._build_import_bundle(raw, user_uuid),
+            ):
                 return UploadDataResponse(status_code=400, response="No valid data found")
 
             # Load data using provided database session
-            self.load_data(db_session, data, user_id=user_id)
+            items = iter_sections(content, "data", SECTIONS, skip_prefix=multipart)
+            self.load_data(db_session, items, user_id=user_id)
 
         except Exception as e:
             return UploadDataResponse(status_code=400, response=f"Import failed: {str(e)}")
 
         return UploadDataResponse(status_code=200, response="Import successful")
 
-    def _parse_multipart_content(self, content: str) -> dict | None:
-        """Parse multipart form data to extract JSON."""
-        json_start = content.find('{\n  "data"')
-        if json_start == -1:
-            json_start = content.find('{"data"')
-        if json_start == -1:
-            return None
-
-        brace_count = 0
-        json_end = json_start
-        for i, char in enumerate(content[json_start:], json_start):
-            if char == "{":
-                brace_count += 1
-            elif char == "}":
-                brace_count -= 1
-                if brace_count == 0:
-                    json_end = i
-                    break
-
-        if brace_count != 0:
-            return None
-
-        json_str = content[json_start : json_end + 1]
-        return json.loads(json_str)
-
-    def _parse_json_content(self, content: str) -> dict | None:
-        """Parse JSON content directly."""
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            return None
-
 
 import_service = ImportService(log=getLogger(__name__))
@@ -1,7 +1,6 @@
-import json
 from decimal import Decimal
 from logging import Logger, getLogger
-from typing import Iterable
+from typing import Any, BinaryIO, Iterable
 from uuid import UUID, uuid4
 
 from app.constants.series_types import get_series_type_from_apple_metric_type, get_series_type_from_healthion_type
@@ -15,7 +14,6 @@ from app.schemas import (
     HKRecordJSON,
     HKWorkoutJSON,
     HKWorkoutStatisticJSON,
-    RootJSON,
     SeriesType,
     StepSampleCreate,
     TimeSeriesSampleCreate,
@@ -23,6 +21,10 @@ from app.schemas import (
 )
 from app.services.event_record_service import event_record_service
 from app.services.timeseries_service import timeseries_service
+from app.utils.json_stream import is_well_formed, iter_sections
+
+SECTIONS = ("workouts", "records")
+SAMPLE_BATCH_SIZE = 1000  # Records kept before they are written
 
 
 class ImportService:
@@ -34,88 +36,76 @@ class ImportService:
     def _dec(self, value: float | int | Decimal | None) -> Decimal | None:
         return None if value is None else Decimal(str(value))
 
-    def _build_workout_bundles(
+    def _build_workout_bundle(
         self,
         raw: dict,
-        user_id: str,
-    ) -> Iterable[tuple[EventRecordCreate, EventRecordDetailCreate]]:
+        user_uuid: UUID,
+    ) -> tuple[EventRecordCreate, EventRecordDetailCreate]:
         """
-        Given the parsed JSON dict from HealthAutoExport, yield tuples of
+        Given one workout of the HealthKit JSON, return the
         (EventRecordCreate, EventRecordDetailCreate) ready to insert into your ORM session.
         """
-        root = RootJSON(**raw)
-        workouts_raw = root.data.get("workouts", [])
-        user_uuid = UUID(user_id)
-        for w in workouts_raw:
-            wjson = HKWorkoutJSON(**w)
-
-            workout_id = uuid4()
-            external_id = wjson.uuid if wjson.uuid else None
-
-            duration_seconds = int((wjson.endDate - wjson.startDate).total_seconds())
-
-            metrics = self._extract_metrics_from_workout_stats(wjson.workoutStatistics)
-
-            record = EventRecordCreate(
-                category="workout",
-                type=get_unified_apple_workout_type(wjson.type).value if wjson.type else None,
-                source_name=wjson.sourceName or "Apple Health",
-                device_id=wjson.sourceName or None,
-                duration_seconds=duration_seconds,
-                start_datetime=wjson.startDate,
-                end_datetime=wjson.endDate,
-                id=workout_id,
-                external_id=external_id,
-                provider_name="Apple",
-                user_id=user_uuid,
-            )
-
-            detail = EventRecordDetailCreate(
-                record_id=workout_id,
-                **metrics,
-            )
-
-            yield record, detail
-
-    def _build_statistic_bundles(
-        self,
-        raw: dict,
-        user_id: str,
-    ) -> list[HeartRateSampleCreate | StepSampleCreate | TimeSeriesSampleCreate]:
-        root = RootJSON(**raw)
-        records_raw = root.data.get("records", [])
-        time_series_samples: list[HeartRateSampleCreate | StepSampleCreate | TimeSeriesSampleCreate] = []
-        user_uuid = UUID(user_id)
+        wjson = HKWorkoutJSON(**raw)
 
-        for r in records_raw:
-            rjson = HKRecordJSON(**r)
-            value = Decimal(str(rjson.value))
+        workout_id = uuid4()
+        external_id = wjson.uuid if wjson.uuid else None
 
-            record_type = rjson.type or ""
-            series_type = get_series_type_from_apple_metric_type(record_type)
-            if series_type is None:
-                continue
+        duration_seconds = int((wjson.endDate - wjson.startDate).total_seconds())
 
-            sample = TimeSeriesSampleCreate(
-                id=uuid4(),
-                external_id=rjson.uuid,
-                user_id=user_uuid,
-                provider_name="Apple",
-                device_id=rjson.sourceName or None,
-                recorded_at=rjson.startDate,
-                value=value,
-                series_type=series_type,
-            )
+        metrics = self._extract_metrics_from_workout_stats(wjson.workoutStatistics)
 
-            match series_type:
-                case SeriesType.heart_rate:
-                    time_series_samples.append(HeartRateSampleCreate(**sample.model_dump()))
-                case SeriesType.steps:
-                    time_series_samples.append(StepSampleCreate(**sample.model_dump()))
-                case _:
-                    time_series_samples.append(sample)
+        record = EventRecordCreate(
+            category="workout",
+            type=get_unified_apple_workout_type(wjson.type).value if wjson.type else None,
+            source_name=wjson.sourceName or "Apple Health",
+            device_id=wjson.sourceName or None,
+            duration_seconds=duration_seconds,
+            start_datetime=wjson.startDate,
+            end_datetime=wjson.endDate,
+            id=workout_id,
+            external_id=external_id,
+            provider_name="Apple",
+            user_id=user_uuid,
+        )
+
+        detail = EventRecordDetailCreate(
+            record_id=workout_id,
+            **metrics,
+        )
+
+        return record, detail
 
-        return time_series_samples
+    def _build_sample(
+        self,
+        raw: dict,
+        user_uuid: UUID,
+    ) -> HeartRateSampleCreate | StepSampleCreate | TimeSeriesSampleCreate | None:
+        rjson = HKRecordJSON(**raw)
+        value = Decimal(str(rjson.value))
+
+        record_type = rjson.type or ""
+        series_type = get_series_type_from_apple_metric_type(record_type)
+        if series_type is None:
+            return None
+
+        sample = TimeSeriesSampleCreate(
+            id=uuid4(),
+            external_id=rjson.uuid,
+            user_id=user_uuid,
+            provider_name="Apple",
+            device_id=rjson.sourceName or None,
+            recorded_at=rjson.startDate,
+            value=value,
+            series_type=series_type,
+        )
+
+        match series_type:
+            case SeriesType.heart_rate:
+                return HeartRateSampleCreate(**sample.model_dump())
+            case SeriesType.steps:
+                return StepSampleCreate(**sample.model_dump())
+            case _:
+                return sample
 
     def _compute_aggregates(self, values: list[Decimal]) -> tuple[Decimal | None, Decimal | None, Decimal | None]:
         if not values:
@@ -150,74 +140,64 @@ class ImportService:
 
         return EventRecordMetrics(**stats_dict)
 
-    def load_data(self, db_session: DbSession, raw: dict, user_id: str) -> bool:
-        for record, detail in self._build_workout_bundles(raw, user_id):
-            created_or_existing_record = self.event_record_service.create(db_session, record)
-            # Always use the returned record's ID (whether newly created or existing)
-            detail_for_record = detail.model_copy(update={"record_id": created_or_existing_record.id})
-            self.event_record_service.create_detail(db_session, detail_for_record)
+    def _check_item(self, section: str, raw: dict, user_uuid: UUID) -> object:
+        """Build one item of the ``workouts`` or ``records`` section as ``load_data`` would, without saving it."""
+        if section == "workouts":
+            return self._build_workout_bundle(raw, user_uuid)
+        return self._build_sample(raw, user_uuid)
 
-        samples = self._build_statistic_bundles(raw, user_id)
-        self.timeseries_service.bulk_create_samples(db_session, samples)
+    def load_data(self, db_session: DbSession, items: Iterable[tuple[str, Any]], user_id: str) -> bool:
+        """Import workouts and records one at a time, as yielded by ``iter_sections``."""
+        user_uuid = UUID(user_id)
+        samples: list[HeartRateSampleCreate | StepSampleCreate | TimeSeriesSampleCreate] = []
+        for section, raw in items:
+            if section == "workouts":
+                record, detail = self._build_workout_bundle(raw, user_uuid)
+                created_or_existing_record = self.event_record_service.create(db_session, record)
+                # Always use the returned record's ID (whether newly created or existing)
+                detail_for_record = detail.model_copy(update={"record_id": created_or_existing_record.id})
+                self.event_record_service.create_detail(db_session, detail_for_record)
+            elif (sample := self._build_sample(raw, user_uuid)) is not None:
+                samples.append(sample)
+                if len(samples) >= SAMPLE_BATCH_SIZE:
+                    self.timeseries_service.bulk_create_samples(db_session, samples)
+                    samples = []
+
+        if samples:
+            self.timeseries_service.bulk_create_samples(db_session, samples)
 
         return True
 
     async def import_data_from_request(
         self,
         db_session: DbSession,
-        request_content: str,
+        content: BinaryIO,
         content_type: str,
         user_id: str,
     ) -> UploadDataResponse:
+        # Multipart files may carry bytes around the document
+        multipart = "multipart/form-data" in content_type
         try:
-            # Parse content based on type
-            if "multipart/form-data" in content_type:
-                data = self._parse_multipart_content(request_content)
-            else:
-                data = self._parse_json_content(request_content)
-
-            if not data:
+            user_uuid = UUID(user_id)
+            # Nothing is imported from a malformed or truncated upload, nor from one with an invalid
+            # item: records are saved batch by batch, so a late error would leave earlier batches behind
+            if not is_well_formed(
+                content,
+                "data",
+                SECTIONS,
+                skip_prefix=multipart,
+                validate=lambda section, raw: self._check_item(section, raw, user_uuid),
+            ):
                 return UploadDataResponse(status_code=400, response="No valid data found")
 
             # Load data using provided database session
-            self.load_data(db_session, data, user_id=user_id)
+            items = iter_sections(content, "data", SECTIONS, skip_prefix=multipart)
+            self.load_data(db_session, items, user_id=user_id)
 
         except Exception as e:
             return UploadDataResponse(status_code=400, response=f"Import failed: {str(e)}")
 
         return UploadDataResponse(status_code=200, response="Import successful")
 
-    def _parse_multipart_content(self, content: str) -> dict | None:
-        """Parse multipart form data to extract JSON."""
-        json_start = content.find('{\n  "data"')
-        if json_start == -1:
-            json_start = content.find('{"data"')
-        if json_start == -1:
-            return None
-
-        brace_count = 0
-        json_end = json_start
-        for i, char in enumerate(content[json_start:], json_start):
-            if char == "{":
-                brace_count += 1
-            elif char == "}":
-                brace_count -= 1
-                if brace_count == 0:
-                    json_end = i
-                    break
-
-        if brace_count != 0:
-            return None
-
-        json_str = content[json_start : json_end + 1]
-        return json.loads(json_str)
-
-    def _parse_json_content(self, content: str) -> dict | None:
-        """Parse JSON content directly."""
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            return None
-
 
 import_service = ImportService(log=getLogger(__name__))
@@ -6,6 +6,7 @@ from app.models import Developer
 from app.repositories.developer_repository import DeveloperRepository
 from app.schemas import DeveloperCreate, DeveloperCreateInternal, DeveloperUpdate, DeveloperUpdateInternal
 from app.services.services import AppService
+from app.utils.auth_cache import auth_cache
 from app.utils.security import get_password_hash
 
 
@@ -45,7 +46,14 @@ class DeveloperService(AppService[DeveloperRepository, Developer, DeveloperCreat
         if updater.password:
             internal_updater.hashed_password = get_password_hash(updater.password)
 
-        return self.crud.update(db_session, developer, internal_updater)
+        updated = self.crud.update(db_session, developer, internal_updater)
+        auth_cache.invalidate(Developer, developer.id)
+        return updated
+
+    def delete(self, db_session: DbSession, object_id: UUID | int, raise_404: bool = False) -> Developer | None:
+        deleted = super().delete(db_session, object_id, raise_404=raise_404)
+        auth_cache.invalidate(Developer, object_id)
+        return deleted
 
 
 developer_service = DeveloperService(log=getLogger(__name__))
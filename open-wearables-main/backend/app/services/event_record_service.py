@@ -1,15 +1,18 @@
 from logging import Logger, getLogger
 from uuid import UUID
 
+from fastapi.concurrency import run_in_threadpool
+
 from app.database import DbSession
 from app.models import (
+    DataPointSeries,
     EventRecord,
     EventRecordDetail,
     ExternalDeviceMapping,
     SleepDetails,
     WorkoutDetails,
 )
-from app.repositories import EventRecordDetailRepository, EventRecordRepository
+from app.repositories import DataPointSeriesRepository, EventRecordDetailRepository, EventRecordRepository
 from app.schemas import (
     EventRecordCreate,
     EventRecordDetailCreate,
@@ -23,11 +26,17 @@ from app.schemas.events import (
     Workout,
     WorkoutDetailed,
 )
+from app.schemas.series_types import SeriesType, get_series_type_unit
 from app.schemas.summaries import SleepStagesSummary
+from app.schemas.timeseries import TimeSeriesSample
+from app.services.record_merge_service import record_merge_service
 from app.services.services import AppService
-from app.utils.exceptions import handle_exceptions
+from app.utils.downsampling import lttb_timeseries
+from app.utils.exceptions import ResourceNotFoundError, handle_exceptions
 from app.utils.pagination import encode_cursor
 
+DEFAULT_MAX_HEART_RATE_POINTS = 500
+
 
 class EventRecordService(
     AppService[EventRecordRepository, EventRecord, EventRecordCreate, EventRecordUpdate],
@@ -37,6 +46,7 @@ class EventRecordService(
     def __init__(self, log: Logger, **kwargs):
         super().__init__(crud_model=EventRecordRepository, model=EventRecord, log=log, **kwargs)
         self.event_record_detail_repo = EventRecordDetailRepository(EventRecordDetail)
+        self.data_point_repo = DataPointSeriesRepository(DataPointSeries)
 
     def _build_response(
         self,
@@ -58,6 +68,12 @@ class EventRecordService(
             device_id=mapping.device_id,
         )
 
+    def create(self, db_session: DbSession, creator: EventRecordCreate) -> EventRecord:
+        """Create a record (or get the stored one), merging it with other sources' duplicates."""
+        record = super().create(db_session, creator)
+        record_merge_service.merge_record(db_session, creator.user_id, record)
+        return record
+
     def create_detail(
         self,
         db_session: DbSession,
@@ -66,6 +82,14 @@ class EventRecordService(
     ) -> EventRecordDetail:
         return self.event_record_detail_repo.create(db_session, detail, detail_type=detail_type)  # type: ignore[return-value]
 
+    def upsert_detail(
+        self,
+        db_session: DbSession,
+        detail: EventRecordDetailCreate,
+        detail_type: str = "workout",
+    ) -> EventRecordDetail:
+        return self.event_record_detail_repo.upsert(db_session, detail, detail_type=detail_type)  # type: ignore[arg-type]
+
     @handle_exceptions
     async def _get_records_with_filters(
         self,
@@ -75,7 +99,12 @@ class EventRecordService(
     ) -> tuple[list[tuple[EventRecord, ExternalDeviceMapping]], int]:
         self.logger.debug(f"Fetching event records with filters: {query_params.model_dump()}")
 
-        records, total_count = self.crud.get_records_with_filters(db_session, query_params, user_id)
+        records, total_count = await run_in_threadpool(
+            self.crud.get_records_with_filters,
+            db_session,
+            query_params,
+            user_id,
+        )
 
         self.logger.debug(f"Retrieved {len(records)} event records out of {total_count} total")
 
@@ -193,29 +222,38 @@ class EventRecordService(
         db_session: DbSession,
         user_id: UUID,
         workout_id: UUID,
-    ) -> WorkoutDetailed | None:
-        # Fetch the record with details
-        # This is a simplified fetch, ideally we should have a dedicated repo method
-        record = (
-            db_session.query(EventRecord)
-            .filter(EventRecord.id == workout_id, EventRecord.category == "workout")
-            .first()
-        )
+        max_heart_rate_points: int | None = DEFAULT_MAX_HEART_RATE_POINTS,
+    ) -> WorkoutDetailed:
+        """Get a workout with its heart rate stream.
+
+        Args:
+            db_session: The database session.
+            user_id: Owner of the workout.
+            workout_id: The workout (event record) ID.
+            max_heart_rate_points: Downsample the heart rate stream to at most this many
+                points with LTTB. None returns every sample.
+
+        Raises:
+            ResourceNotFoundError: If the workout does not exist or belongs to another user.
+        """
+        result = await run_in_threadpool(self.crud.get_user_record, db_session, user_id, workout_id, "workout")
+        if not result:
+            raise ResourceNotFoundError("workout", workout_id)
+        record, mapping = result
 
-        if not record:
-            return None
+        details: WorkoutDetails | None = record.detail if isinstance(record.detail, WorkoutDetails) else None
 
-        # Ensure user matches (security check)
-        mapping = (
-            db_session.query(ExternalDeviceMapping)
-            .filter(ExternalDeviceMapping.id == record.external_mapping_id, ExternalDeviceMapping.user_id == user_id)
-            .first()
+        heart_rate = await run_in_threadpool(
+            self.data_point_repo.get_values_in_window,
+            db_session,
+            record.external_device_mapping_id,
+            SeriesType.heart_rate,
+            record.start_datetime,
+            record.end_datetime,
         )
-
-        if not mapping:
-            return None
-
-        details: WorkoutDetails | None = record.detail if isinstance(record.detail, WorkoutDetails) else None
+        if max_heart_rate_points:
+            heart_rate = lttb_timeseries(heart_rate, max_heart_rate_points)
+        heart_rate_unit = get_series_type_unit(SeriesType.heart_rate)
 
         return WorkoutDetailed(
             id=record.id,
@@ -233,7 +271,10 @@ class EventRecordService(
             elevation_gain_meters=float(details.total_elevation_gain)
             if details and details.total_elevation_gain
             else None,
-            heart_rate_samples=[],  # TODO: Fetch from DataPointSeries if needed
+            heart_rate_samples=[
+                TimeSeriesSample(timestamp=timestamp, type=SeriesType.heart_rate, value=value, unit=heart_rate_unit)
+                for timestamp, value in heart_rate
+            ],
         )
 
     @handle_exceptions
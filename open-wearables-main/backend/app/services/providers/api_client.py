@@ -1,21 +1,52 @@
 """Simple API client for making authenticated requests to provider APIs."""
 
+import asyncio
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
 
 import httpx
 from fastapi import HTTPException, status
+from redis.exceptions import LockError, RedisError
 
+from app.config import settings
 from app.database import DbSession
+from app.integrations.http_client import get_async_http_client, get_http_client, parse_retry_after
+from app.integrations.rate_limiter import get_provider_rate_limiter
+from app.models import UserConnection
 from app.repositories.user_connection_repository import UserConnectionRepository
 from app.services.providers.templates.base_oauth import BaseOAuthTemplate
+from app.services.providers.token_cache import (
+    REFRESH_MARGIN,
+    cache_token,
+    get_cached_token,
+    invalidate_token,
+    refresh_lock,
+)
+
+# Assumed wait when a provider rate limits us without saying for how long
+DEFAULT_RETRY_AFTER_SECONDS = 60.0
 
 logger = logging.getLogger(__name__)
 
 
-def _get_valid_token(
+class ProviderRateLimitedError(HTTPException):
+    """The provider's quota is used up; the request should be retried after ``retry_after`` seconds."""
+
+    def __init__(self, provider_name: str, retry_after: float):
+        self.provider_name = provider_name
+        self.retry_after = retry_after
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"{provider_name.capitalize()} API rate limit reached, retry in {retry_after:.0f}s",
+            headers={"Retry-After": str(max(1, round(retry_after)))},
+        )
+
+
+def get_valid_token(
     db: DbSession,
     user_id: UUID,
     provider_name: str,
@@ -24,8 +55,14 @@ def _get_valid_token(
 ) -> str:
     """Get a valid access token, refreshing if necessary.
 
-    Private function used internally by make_authenticated_request.
+    Valid tokens are served from a short-lived Redis cache, so parallel requests for
+    the same connection don't each read it from the database. Refreshes are
+    single-flight per (user, provider): with rotating refresh tokens, concurrent
+    refreshes would invalidate each other's tokens.
     """
+    if access_token := get_cached_token(user_id, provider_name):
+        return access_token
+
     connection = connection_repo.get_by_user_and_provider(db, user_id, provider_name)
     if not connection:
         raise HTTPException(
@@ -33,17 +70,67 @@ def _get_valid_token(
             detail=f"User not connected to {provider_name}",
         )
 
-    # Check if token is expired (with 5 minute buffer)
-    if connection.token_expires_at < datetime.now(timezone.utc) + timedelta(minutes=5):
-        if not connection.refresh_token:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Token expired and no refresh token available for {provider_name}",
-            )
-        token_response = oauth.refresh_access_token(db, user_id, connection.refresh_token)
-        return token_response.access_token
+    if not _needs_refresh(connection):
+        cache_token(user_id, provider_name, connection.access_token, connection.token_expires_at)
+        return connection.access_token
+
+    if not connection.refresh_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Token expired and no refresh token available for {provider_name}",
+        )
+
+    lock = refresh_lock(user_id, provider_name)
+    try:
+        acquired = lock.acquire()
+    except RedisError as e:
+        logger.warning(f"Could not lock {provider_name} token refresh for user {user_id}, refreshing anyway: {e}")
+        return _refresh_token(db, user_id, provider_name, connection.refresh_token, oauth)
+
+    if not acquired:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{provider_name.capitalize()} token refresh is taking too long, please retry",
+        )
+
+    try:
+        # Another worker may have refreshed the token while we were waiting for the lock
+        if access_token := get_cached_token(user_id, provider_name):
+            return access_token
+        db.refresh(connection)
+        if not _needs_refresh(connection):
+            cache_token(user_id, provider_name, connection.access_token, connection.token_expires_at)
+            return connection.access_token
+        return _refresh_token(db, user_id, provider_name, connection.refresh_token, oauth)
+    finally:
+        with suppress(LockError, RedisError):
+            lock.release()
+
+
+def _needs_refresh(connection: UserConnection) -> bool:
+    return connection.token_expires_at < datetime.now(timezone.utc) + REFRESH_MARGIN
+
+
+def _refresh_token(
+    db: DbSession,
+    user_id: UUID,
+    provider_name: str,
+    refresh_token: str,
+    oauth: BaseOAuthTemplate,
+) -> str:
+    token_response = oauth.refresh_access_token(db, user_id, refresh_token)
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=token_response.expires_in)
+    cache_token(user_id, provider_name, token_response.access_token, expires_at)
+    return token_response.access_token
+
 
-    return connection.access_token
+def throttle(provider_name: str) -> None:
+    """Wait for the provider's rate limiter, or give up when the quota is exhausted for too long."""
+    limiter = get_provider_rate_limiter(provider_name)
+    if limiter is None:
+        return
+    if retry_after := limiter.acquire(settings.provider_rate_limit_max_wait_seconds):
+        raise ProviderRateLimitedError(provider_name, retry_after)
 
 
 def make_authenticated_request(
@@ -77,60 +164,155 @@ def make_authenticated_request(
         json_data: JSON body for POST/PUT requests
 
     Returns:
-        Any: API response JSON
+        Any: API response JSON, None for responses without content (e.g. 204)
 
     Raises:
+        ProviderRateLimitedError: If the provider's rate limit does not allow the request
         HTTPException: If API request fails
     """
     # Get valid token (will auto-refresh if needed)
-    access_token = _get_valid_token(db, user_id, provider_name, connection_repo, oauth)
+    access_token = get_valid_token(db, user_id, provider_name, connection_repo, oauth)
 
-    # Prepare headers
+    return send_authenticated_request(
+        access_token=access_token,
+        user_id=user_id,
+        api_base_url=api_base_url,
+        provider_name=provider_name,
+        endpoint=endpoint,
+        method=method,
+        params=params,
+        headers=headers,
+        json_data=json_data,
+    )
+
+
+def send_authenticated_request(
+    access_token: str,
+    user_id: UUID,
+    api_base_url: str,
+    provider_name: str,
+    endpoint: str,
+    method: str = "GET",
+    params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+    json_data: dict[str, Any] | None = None,
+) -> Any:
+    """Send a request to provider API with an already valid access token.
+
+    Needs no database session, so a batch of requests resolving the token once
+    can be sent from several threads.
+
+    Args:
+        access_token: Access token returned by get_valid_token
+        user_id: User ID (for error messages and token invalidation)
+        api_base_url: Base URL of the provider API
+        provider_name: Name of the provider (for error messages)
+        endpoint: API endpoint path (e.g., "/v3/workouts/")
+        method: HTTP method (default: GET)
+        params: Query parameters
+        headers: Additional headers (Authorization header will be added automatically)
+        json_data: JSON body for POST/PUT requests
+
+    Returns:
+        Any: API response JSON, None for responses without content (e.g. 204)
+
+    Raises:
+        ProviderRateLimitedError: If the provider's rate limit does not allow the request
+        HTTPException: If API request fails
+    """
+    throttle(provider_name)
+
+    with _provider_errors(user_id, provider_name):
+        response = get_http_client(provider_name).request(
+            method=method,
+            url=f"{api_base_url}{endpoint}",
+            headers=_request_headers(access_token, headers),
+            params=params or {},
+            json=json_data,
+        )
+        return _read_response(response, provider_name)
+
+
+async def send_authenticated_request_async(
+    access_token: str,
+    user_id: UUID,
+    api_base_url: str,
+    provider_name: str,
+    endpoint: str,
+    method: str = "GET",
+    params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+    json_data: dict[str, Any] | None = None,
+) -> Any:
+    """Async variant of send_authenticated_request, sent through the pooled async client.
+
+    Lets a caller keep the next request in flight while it processes the previous response.
+    """
+    # Waiting for the shared rate limiter blocks, keep it off the event loop
+    await asyncio.to_thread(throttle, provider_name)
+
+    with _provider_errors(user_id, provider_name):
+        response = await get_async_http_client(provider_name).request(
+            method=method,
+            url=f"{api_base_url}{endpoint}",
+            headers=_request_headers(access_token, headers),
+            params=params or {},
+            json=json_data,
+        )
+        return _read_response(response, provider_name)
+
+
+def _request_headers(access_token: str, headers: dict[str, str] | None) -> dict[str, str]:
     request_headers = {
         "Authorization": f"Bearer {access_token}",
         "Accept": "application/json",
     }
     if headers:
         request_headers.update(headers)
+    return request_headers
 
-    # Make request
-    url = f"{api_base_url}{endpoint}"
 
-    try:
-        response = httpx.request(
-            method=method,
-            url=url,
-            headers=request_headers,
-            params=params or {},
-            json=json_data,
-            timeout=30.0,
-        )
-        response.raise_for_status()
+def _read_response(response: httpx.Response, provider_name: str) -> Any:
+    """Decode a provider response, raising on error statuses and errors reported in the body."""
+    response.raise_for_status()
 
-        result = response.json()
+    if response.status_code == 204 or not response.content:
+        return None
 
-        # Some APIs (like Suunto) return 200 OK but include error in response body
-        if isinstance(result, dict):
-            # Check for common error patterns
-            # Only treat as error if "error" field has a value (not None/null)
-            has_error = result.get("error") is not None and result.get("error")
-            has_error_code = "code" in result and result.get("code") not in (200, None)
+    result = response.json()
 
-            if has_error or has_error_code:
-                error_msg = result.get("message") or result.get("error") or str(result)
-                logger.error(f"{provider_name.capitalize()} API returned error in body: {error_msg}")
-                raise HTTPException(
-                    status_code=result.get("code", 400),
-                    detail=f"{provider_name.capitalize()} API error: {error_msg}",
-                )
+    # Some APIs (like Suunto) return 200 OK but include error in response body
+    if isinstance(result, dict):
+        # Check for common error patterns
+        # Only treat as error if "error" field has a value (not None/null)
+        has_error = result.get("error") is not None and result.get("error")
+        has_error_code = "code" in result and result.get("code") not in (200, None)
 
-        return result
+        if has_error or has_error_code:
+            error_msg = result.get("message") or result.get("error") or str(result)
+            logger.error(f"{provider_name.capitalize()} API returned error in body: {error_msg}")
+            raise HTTPException(
+                status_code=result.get("code", 400),
+                detail=f"{provider_name.capitalize()} API error: {error_msg}",
+            )
+
+    return result
 
+
+@contextmanager
+def _provider_errors(user_id: UUID, provider_name: str) -> Iterator[None]:
+    """Translate failed provider requests to HTTP exceptions."""
+    try:
+        yield
     except httpx.HTTPStatusError as e:
         logger.error(
             f"{provider_name.capitalize()} API error for user {user_id}: {e.response.status_code} - {e.response.text}",
         )
+        if e.response.status_code == 429:
+            retry_after = parse_retry_after(e.response)
+            raise ProviderRateLimitedError(provider_name, retry_after or DEFAULT_RETRY_AFTER_SECONDS)
         if e.response.status_code == 401:
+            invalidate_token(user_id, provider_name)
             raise HTTPException(
                 status_code=401,
                 detail=f"{provider_name.capitalize()} authorization expired. Please re-authorize.",
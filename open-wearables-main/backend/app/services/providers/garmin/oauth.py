@@ -1,6 +1,5 @@
-import httpx
-
 from app.config import settings
+from app.integrations.http_client import get_http_client
 from app.schemas import (
     AuthenticationMethod,
     OAuthTokenResponse,
@@ -35,10 +34,9 @@ class GarminOAuth(BaseOAuthTemplate):
     def _get_provider_user_info(self, token_response: OAuthTokenResponse, user_id: str) -> dict[str, str | None]:
         """Fetches Garmin user ID via API."""
         try:
-            user_id_response = httpx.get(
+            user_id_response = get_http_client(self.provider_name).get(
                 f"{self.api_base_url}/wellness-api/rest/user/id",
                 headers={"Authorization": f"Bearer {token_response.access_token}"},
-                timeout=30.0,
             )
             user_id_response.raise_for_status()
             provider_user_id = user_id_response.json().get("userId")
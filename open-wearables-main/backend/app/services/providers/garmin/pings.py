@@ -0,0 +1,187 @@
+"""Garmin ping notifications: coalescing, pulling callback URLs and saving their summaries."""
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.database import DbSession
+from app.integrations.http_client import get_http_client, parse_retry_after
+from app.integrations.raw_archive import archive_payload
+from app.integrations.redis_client import get_redis_client
+from app.repositories import UserConnectionRepository
+from app.schemas import GarminActivityJSON
+from app.services.providers.api_client import DEFAULT_RETRY_AFTER_SECONDS, ProviderRateLimitedError, throttle
+from app.services.providers.factory import ProviderFactory
+from app.services.providers.garmin.summaries import WELLNESS_SAVERS
+
+logger = getLogger(__name__)
+
+
+class GarminPing(BaseModel):
+    """One summary type of one user to pull from Garmin."""
+
+    summary_type: str
+    garmin_user_id: str
+    user_id: UUID
+    callback_url: str
+    attempt: int = 0  # Failed pulls so far
+
+    @property
+    def upload_window(self) -> tuple[str, str] | None:
+        """Upload window of the callback URL, in epoch seconds."""
+        query = parse_qs(urlparse(self.callback_url).query)
+        start = query.get("uploadStartTimeInSeconds", [None])[0]
+        end = query.get("uploadEndTimeInSeconds", [None])[0]
+        return (start, end) if start and end else None
+
+    @property
+    def coalesce_key(self) -> str:
+        """Pings for the same user, summary type and upload window pull the same data."""
+        window = "_".join(self.upload_window or ()) or self.callback_url
+        return f"garmin_ping:{self.summary_type}:{self.garmin_user_id}:{window}"
+
+
+class PlannedPings(BaseModel):
+    pings: list[GarminPing] = []
+    coalesced: int = 0
+    errors: list[str] = []
+
+
+def _save_activities(db: DbSession, user_id: UUID, summaries: list[dict[str, Any]]) -> int:
+    activities = []
+    for summary in summaries:
+        try:
+            activities.append(GarminActivityJSON(**summary))
+        except ValidationError as e:
+            logger.warning(f"[garmin_pings] Skipping invalid activity {summary.get('summaryId')}: {e}")
+    workouts = ProviderFactory().get_provider("garmin").workouts
+    if activities and workouts:
+        workouts.save_data(db, user_id, activities)
+    return len(activities)
+
+
+# Summary types pulled from pings, with how their summaries are saved
+SUMMARY_SAVERS: dict[str, Callable[[DbSession, UUID, list[dict[str, Any]]], int]] = {
+    "activities": _save_activities,
+    **WELLNESS_SAVERS,
+}
+
+
+def plan_pings(db: DbSession, payload: dict[str, Any]) -> PlannedPings:
+    """
+    Resolve the users of a ping notification and drop pings already queued.
+
+    Users are looked up in one query. Within the notification, the last ping of a user,
+    summary type and upload window wins (it carries the freshest pull token); pings
+    queued by earlier notifications in the last ``garmin_ping_coalesce_seconds`` are dropped.
+    """
+    planned = PlannedPings()
+    entries = [
+        (summary_type, entry)
+        for summary_type in SUMMARY_SAVERS
+        for entry in payload.get(summary_type) or []
+        if isinstance(entry, dict)
+    ]
+    for summary_type, items in payload.items():
+        if summary_type not in SUMMARY_SAVERS and isinstance(items, list):
+            logger.info(f"[garmin_pings] Ignoring {len(items)} {summary_type} notifications")
+
+    connections = UserConnectionRepository().get_by_provider_user_ids(
+        db,
+        "garmin",
+        (str(entry["userId"]) for _, entry in entries if entry.get("userId")),
+    )
+
+    unique: dict[str, GarminPing] = {}
+    for summary_type, entry in entries:
+        garmin_user_id = str(entry.get("userId"))
+        callback_url = entry.get("callbackURL")
+        if not callback_url:
+            logger.warning(f"[garmin_pings] No callback URL in {summary_type} notification for user {garmin_user_id}")
+            continue
+        connection = connections.get(garmin_user_id)
+        if connection is None:
+            logger.warning(f"[garmin_pings] No connection found for Garmin user {garmin_user_id}")
+            planned.errors.append(f"User {garmin_user_id} not connected")
+            continue
+        ping = GarminPing(
+            summary_type=summary_type,
+            garmin_user_id=garmin_user_id,
+            user_id=connection.user_id,
+            callback_url=callback_url,
+        )
+        if ping.coalesce_key in unique:
+            planned.coalesced += 1
+        unique[ping.coalesce_key] = ping
+
+    claimed = _claim(list(unique))
+    planned.pings = [ping for key, ping in unique.items() if claimed[key]]
+    planned.coalesced += len(unique) - len(planned.pings)
+    return planned
+
+
+def _claim(keys: list[str]) -> dict[str, bool]:
+    """Mark pings as queued, returning which were not queued already."""
+    if not keys:
+        return {}
+    try:
+        pipeline = get_redis_client().pipeline(transaction=False)
+        for key in keys:
+            pipeline.set(key, "1", nx=True, ex=settings.garmin_ping_coalesce_seconds)
+        return {key: bool(claimed) for key, claimed in zip(keys, pipeline.execute(), strict=True)}
+    except RedisError as e:
+        # Pulling twice is harmless, losing a ping is not
+        logger.warning(f"[garmin_pings] Failed to coalesce pings: {e}")
+        return dict.fromkeys(keys, True)
+
+
+def release(ping: GarminPing) -> None:
+    """Forget a ping that was given up on, so a later ping for its upload window is queued again."""
+    try:
+        get_redis_client().delete(ping.coalesce_key)
+    except RedisError as e:
+        logger.warning(f"[garmin_pings] Failed to release ping {ping.coalesce_key}: {e}")
+
+
+def fetch_callback(ping: GarminPing) -> list[dict[str, Any]]:
+    """
+    Pull the summaries behind a ping from its callback URL (authorized by its pull token).
+
+    Pulls share Garmin's rate limiter with the other Garmin API calls, so a burst of
+    pings cannot use up the quota of user syncs.
+
+    Raises:
+        ProviderRateLimitedError: If Garmin's rate limit does not allow the pull
+    """
+    throttle("garmin")
+    response = get_http_client("garmin").get(ping.callback_url)
+    if response.status_code == 429:
+        raise ProviderRateLimitedError("garmin", parse_retry_after(response) or DEFAULT_RETRY_AFTER_SECONDS)
+    response.raise_for_status()
+    if not response.content:
+        return []
+    data = response.json()
+    summaries = data if isinstance(data, list) else [data]
+    start, end = _parse_window(ping.upload_window)
+    archive_payload("garmin", ping.user_id, ping.summary_type, summaries, start, end)
+    return summaries
+
+
+def _parse_window(window: tuple[str, str] | None) -> tuple[datetime | None, datetime | None]:
+    try:
+        start, end = (datetime.fromtimestamp(int(moment), tz=timezone.utc) for moment in window or ())
+    except ValueError:
+        return None, None
+    return start, end
+
+
+def save_summaries(db: DbSession, ping: GarminPing, summaries: list[dict[str, Any]]) -> int:
+    """Parse and save pulled summaries, returning how many were saved."""
+    return SUMMARY_SAVERS[ping.summary_type](db, ping.user_id, summaries)
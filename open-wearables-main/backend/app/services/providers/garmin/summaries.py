@@ -0,0 +1,233 @@
+"""Garmin wellness summaries (dailies, epochs, sleeps, stress details) saved in bulk.
+
+Summaries are converted to plain rows without per-sample models and each call writes
+them with a few multi-row statements that replace what is stored for the same series and
+instant (or sleep window), so Garmin's redeliveries update stored data instead of
+duplicating it.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from logging import getLogger
+from typing import Any
+from uuid import UUID
+
+from app.database import DbSession
+from app.integrations.raw_archive import archive_payload
+from app.models import DataPointSeries, EventRecord, ExternalDeviceMapping
+from app.repositories import EventRecordRepository, UserConnectionRepository
+from app.repositories.data_point_series_repository import DataPointSeriesRepository
+from app.repositories.external_mapping_repository import ExternalMappingRepository
+from app.schemas.series_types import SeriesType
+from app.services.record_merge_service import record_merge_service
+
+logger = getLogger(__name__)
+
+Row = dict[str, Any]
+
+# Daily totals that are not also delivered as epochs (steps, active energy and distance
+# come per 15 minutes from epochs; storing the day total at the day's first epoch would clash)
+DAILY_TOTALS = {
+    "restingHeartRateInBeatsPerMinute": SeriesType.resting_heart_rate,
+    "bmrKilocalories": SeriesType.basal_energy,
+    "floorsClimbed": SeriesType.flights_climbed,
+}
+
+EPOCH_TOTALS = {
+    "steps": SeriesType.steps,
+    "activeKilocalories": SeriesType.energy,
+    "distanceInMeters": SeriesType.distance_walking_running,
+}
+
+
+def _start(summary: dict[str, Any]) -> datetime | None:
+    start = summary.get("startTimeInSeconds")
+    return datetime.fromtimestamp(start, tz=timezone.utc) if start is not None else None
+
+
+def _row(series_type: SeriesType, recorded_at: datetime, value: Any, summary: dict[str, Any]) -> Row:
+    return {
+        "series_type": series_type,
+        "recorded_at": recorded_at,
+        "value": Decimal(str(value)),
+        "external_id": summary.get("summaryId"),
+    }
+
+
+def _offset_rows(summary: dict[str, Any], field: str, series_type: SeriesType, minimum: float = 0) -> list[Row]:
+    """Rows of a ``timeOffset...`` map of seconds after the summary start to a value."""
+    start = _start(summary)
+    samples = summary.get(field) or {}
+    if start is None or not isinstance(samples, dict):
+        return []
+    return [
+        _row(series_type, start + timedelta(seconds=int(offset)), value, summary)
+        for offset, value in samples.items()
+        # Garmin marks unmeasurable samples with negative values (e.g. stress -1/-2)
+        if value is not None and value >= minimum
+    ]
+
+
+def _daily_rows(summaries: list[dict[str, Any]]) -> list[Row]:
+    rows: list[Row] = []
+    for summary in summaries:
+        if (start := _start(summary)) is None:
+            continue
+        rows.extend(
+            _row(series_type, start, summary[field], summary)
+            for field, series_type in DAILY_TOTALS.items()
+            if summary.get(field) is not None
+        )
+        rows.extend(_offset_rows(summary, "timeOffsetHeartRateSamples", SeriesType.heart_rate, minimum=1))
+    return rows
+
+
+def _epoch_rows(summaries: list[dict[str, Any]]) -> list[Row]:
+    # Garmin sends one epoch per activity type of a 15-minute window, which add up
+    totals: dict[tuple[SeriesType, datetime], Decimal] = defaultdict(Decimal)
+    summary_ids: dict[datetime, Any] = {}
+    for summary in summaries:
+        if (start := _start(summary)) is None:
+            continue
+        summary_ids.setdefault(start, summary.get("summaryId"))
+        for field, series_type in EPOCH_TOTALS.items():
+            if summary.get(field) is not None:
+                totals[(series_type, start)] += Decimal(str(summary[field]))
+    return [
+        {"series_type": series_type, "recorded_at": start, "value": value, "external_id": summary_ids[start]}
+        for (series_type, start), value in totals.items()
+    ]
+
+
+def _stress_rows(summaries: list[dict[str, Any]]) -> list[Row]:
+    rows: list[Row] = []
+    for summary in summaries:
+        rows.extend(_offset_rows(summary, "timeOffsetStressLevelValues", SeriesType.stress_level))
+        rows.extend(_offset_rows(summary, "timeOffsetBodyBatteryValues", SeriesType.body_battery))
+    return rows
+
+
+def _sleep_rows(summaries: list[dict[str, Any]]) -> list[Row]:
+    rows: list[Row] = []
+    for summary in summaries:
+        rows.extend(_offset_rows(summary, "timeOffsetSleepSpo2", SeriesType.oxygen_saturation, minimum=1))
+        rows.extend(_offset_rows(summary, "timeOffsetSleepRespiration", SeriesType.respiratory_rate, minimum=1))
+    return rows
+
+
+def _sleep_record(summary: dict[str, Any]) -> tuple[Row, Row] | None:
+    start = _start(summary)
+    duration = summary.get("durationInSeconds")
+    if start is None or not duration:
+        return None
+
+    # The sleep period includes the time awake within it
+    awake = min(summary.get("awakeDurationInSeconds") or 0, duration)
+    asleep = duration - awake
+    record = {
+        "external_id": summary.get("summaryId"),
+        "type": "sleep_session",
+        "source_name": "Garmin",
+        "duration_seconds": asleep,
+        "start_datetime": start,
+        "end_datetime": start + timedelta(seconds=duration),
+    }
+    detail = {
+        "sleep_total_duration_minutes": asleep // 60,
+        "sleep_time_in_bed_minutes": duration // 60,
+        "sleep_efficiency_score": round(Decimal(asleep * 100) / Decimal(duration), 2),
+        "sleep_deep_minutes": (summary.get("deepSleepDurationInSeconds") or 0) // 60,
+        "sleep_light_minutes": (summary.get("lightSleepDurationInSeconds") or 0) // 60,
+        "sleep_rem_minutes": (summary.get("remSleepInSeconds") or 0) // 60,
+        "sleep_awake_minutes": awake // 60,
+        "is_nap": False,
+    }
+    return record, detail
+
+
+def _mapping_id(db: DbSession, user_id: UUID) -> UUID:
+    # Wellness summaries are not attributed to a device
+    return ExternalMappingRepository(ExternalDeviceMapping).ensure_mapping(db, user_id, "garmin", None).id
+
+
+def _points_saver(to_rows: Callable[[list[dict[str, Any]]], list[Row]]) -> Callable[..., int]:
+    def save(db: DbSession, user_id: UUID, summaries: list[dict[str, Any]]) -> int:
+        summaries = [summary for summary in summaries if isinstance(summary, dict)]
+        rows = to_rows(summaries)
+        if rows:
+            DataPointSeriesRepository(DataPointSeries).replace_many(db, _mapping_id(db, user_id), rows)
+        return len(summaries)
+
+    return save
+
+
+def _save_sleeps(db: DbSession, user_id: UUID, summaries: list[dict[str, Any]]) -> int:
+    summaries = [summary for summary in summaries if isinstance(summary, dict)]
+    sleeps = [sleep for summary in summaries if (sleep := _sleep_record(summary)) is not None]
+    rows = _sleep_rows(summaries)
+    if not sleeps and not rows:
+        return 0
+
+    mapping_id = _mapping_id(db, user_id)
+    saved = EventRecordRepository(EventRecord).upsert_sleeps(db, mapping_id, sleeps)
+    if sleeps:
+        record_merge_service.merge(
+            db,
+            user_id,
+            "sleep",
+            min(record["start_datetime"] for record, _ in sleeps),
+            max(record["end_datetime"] for record, _ in sleeps),
+        )
+    if rows:
+        DataPointSeriesRepository(DataPointSeries).replace_many(db, mapping_id, rows)
+    return saved
+
+
+# Wellness summary types, with how one user's summaries of a payload are saved
+WELLNESS_SAVERS: dict[str, Callable[[DbSession, UUID, list[dict[str, Any]]], int]] = {
+    "dailies": _points_saver(_daily_rows),
+    "epochs": _points_saver(_epoch_rows),
+    "stressDetails": _points_saver(_stress_rows),
+    "sleeps": _save_sleeps,
+}
+
+
+def save_pushed_summaries(db: DbSession, payload: dict[str, Any]) -> dict[str, int]:
+    """
+    Save the wellness summaries of a push notification.
+
+    Users are resolved in one query and each user's summaries of a type are written
+    together. Returns counts of saved summaries per type, plus ``skipped`` summaries of
+    users without an active connection and ``failed`` summaries that could not be saved.
+    """
+    result = dict.fromkeys(WELLNESS_SAVERS, 0) | {"skipped": 0, "failed": 0}
+    grouped: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+    for summary_type in WELLNESS_SAVERS:
+        for summary in payload.get(summary_type) or []:
+            if isinstance(summary, dict):
+                grouped[(summary_type, str(summary.get("userId")))].append(summary)
+
+    connections = UserConnectionRepository().get_by_provider_user_ids(
+        db,
+        "garmin",
+        {garmin_user_id for _, garmin_user_id in grouped},
+    )
+    for (summary_type, garmin_user_id), summaries in grouped.items():
+        connection = connections.get(garmin_user_id)
+        if connection is None:
+            logger.warning(f"[garmin_summaries] No connection found for Garmin user {garmin_user_id}")
+            result["skipped"] += len(summaries)
+            continue
+        starts = [start for summary in summaries if (start := _start(summary)) is not None]
+        archive_payload(
+            "garmin", connection.user_id, summary_type, summaries, min(starts, default=None), max(starts, default=None)
+        )
+        try:
+            result[summary_type] += WELLNESS_SAVERS[summary_type](db, connection.user_id, summaries)
+        except Exception as e:
+            logger.error(f"[garmin_summaries] Failed to save {summary_type} of Garmin user {garmin_user_id}: {e}")
+            db.rollback()
+            result["failed"] += len(summaries)
+    return result
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Iterable
+from typing import Any
 from uuid import UUID, uuid4
 
 from app.constants.workout_types.garmin import get_unified_workout_type
@@ -11,13 +11,14 @@ from app.schemas import (
     EventRecordMetrics,
     GarminActivityJSON,
 )
-from app.services.event_record_service import event_record_service
 from app.services.providers.templates.base_workouts import BaseWorkoutsTemplate
 
 
 class GarminWorkouts(BaseWorkoutsTemplate):
     """Garmin implementation of workouts template."""
 
+    raw_workout_schema = GarminActivityJSON
+
     def get_workouts(
         self,
         db: DbSession,
@@ -113,7 +114,8 @@ class GarminWorkouts(BaseWorkoutsTemplate):
         steps_count = int(raw_workout.steps) if raw_workout.steps is not None else None
 
         return {
-            "heart_rate_min": int(heart_rate_avg) if heart_rate_avg is not None else None,
+            # Activity summaries carry no minimum heart rate
+            "heart_rate_min": None,
             "heart_rate_max": int(heart_rate_max) if heart_rate_max is not None else None,
             "heart_rate_avg": heart_rate_avg,
             "steps_count": steps_count,
@@ -158,31 +160,15 @@ class GarminWorkouts(BaseWorkoutsTemplate):
 
         return record, detail
 
-    def _build_bundles(
-        self,
-        raw: list[GarminActivityJSON],
-        user_id: UUID,
-    ) -> Iterable[tuple[EventRecordCreate, EventRecordDetailCreate]]:
-        """Build event record payloads for Garmin activities."""
-        for raw_workout in raw:
-            yield self._normalize_workout(raw_workout, user_id)
-
-    def load_data(
+    def fetch_data(
         self,
         db: DbSession,
         user_id: UUID,
         **kwargs: Any,
-    ) -> bool:
-        """Load data from Garmin API."""
+    ) -> list[GarminActivityJSON]:
+        """Fetch activities from Garmin API."""
         workouts = self.get_workouts_from_api(db, user_id, **kwargs)
-        activities = [GarminActivityJSON(**activity) for activity in workouts]
-
-        for record, detail in self._build_bundles(activities, user_id):
-            created_record = event_record_service.create(db, record)
-            detail_for_record = detail.model_copy(update={"record_id": created_record.id})
-            event_record_service.create_detail(db, detail_for_record)
-
-        return True
+        return [GarminActivityJSON(**activity) for activity in workouts]
 
     def get_activity_detail(
         self,
@@ -1,4 +1,5 @@
 from app.config import settings
+from app.integrations.http_client import get_http_client
 from app.schemas import OAuthTokenResponse, ProviderCredentials, ProviderEndpoints
 from app.services.providers.templates.base_oauth import BaseOAuthTemplate
 
@@ -33,8 +34,6 @@ class PolarOAuth(BaseOAuthTemplate):
 
     def _register_user(self, access_token: str, member_id: str) -> None:
         """Registers the user with Polar API."""
-        import httpx
-
         try:
             register_url = f"{self.api_base_url}/v3/users"
             headers = {
@@ -44,7 +43,7 @@ class PolarOAuth(BaseOAuthTemplate):
             }
             payload = {"member-id": member_id}
 
-            httpx.post(register_url, json=payload, headers=headers, timeout=10.0)
+            get_http_client(self.provider_name).post(register_url, json=payload, headers=headers)
         except Exception:
             # Don't fail the entire flow - user might already be registered
             pass
@@ -1,10 +1,14 @@
-from datetime import datetime, timedelta
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Iterable
+from typing import Any
 from uuid import UUID, uuid4
 
+import httpx
 import isodate
 
+from app.config import settings
 from app.constants.workout_types.polar import get_unified_workout_type
 from app.database import DbSession
 from app.schemas import (
@@ -13,13 +17,29 @@ from app.schemas import (
     EventRecordMetrics,
     PolarExerciseJSON,
 )
-from app.services.event_record_service import event_record_service
+from app.services.providers.api_client import get_valid_token, send_authenticated_request
 from app.services.providers.templates.base_workouts import BaseWorkoutsTemplate
 
 
+class PolarExerciseTransaction(list[PolarExerciseJSON]):
+    """Exercises pulled through an AccessLink transaction, committed once they are saved."""
+
+    def __init__(
+        self,
+        exercises: Iterable[PolarExerciseJSON] = (),
+        polar_user_id: str | None = None,
+        transaction_id: int | None = None,
+    ):
+        super().__init__(exercises)
+        self.polar_user_id = polar_user_id
+        self.transaction_id = transaction_id
+
+
 class PolarWorkouts(BaseWorkoutsTemplate):
     """Polar implementation of workouts template."""
 
+    raw_workout_schema = PolarExerciseJSON
+
     def get_workouts(
         self,
         db: DbSession,
@@ -28,7 +48,10 @@ class PolarWorkouts(BaseWorkoutsTemplate):
         end_date: datetime,
     ) -> list[Any]:
         """Get exercises from Polar API."""
-        return self._make_api_request(db, user_id, "/v3/exercises")
+        exercises = self._make_api_request(db, user_id, "/v3/exercises")
+        since = int(start_date.timestamp()) if start_date else None
+        until = int(end_date.timestamp()) if end_date else None
+        return [e for e in exercises if self._in_window(PolarExerciseJSON(**e), since, until)]
 
     def get_workouts_from_api(self, db: DbSession, user_id: UUID, **kwargs: Any) -> Any:
         """Get exercises from Polar API with options."""
@@ -85,7 +108,8 @@ class PolarWorkouts(BaseWorkoutsTemplate):
         )
 
         return {
-            "heart_rate_min": int(hr_avg) if hr_avg is not None else None,
+            # Exercises carry no minimum heart rate
+            "heart_rate_min": None,
             "heart_rate_max": int(hr_max) if hr_max is not None else None,
             "heart_rate_avg": hr_avg,
             "steps_count": None,
@@ -131,31 +155,113 @@ class PolarWorkouts(BaseWorkoutsTemplate):
 
         return record, detail
 
-    def _build_bundles(
-        self,
-        raw: list[PolarExerciseJSON],
-        user_id: UUID,
-    ) -> Iterable[tuple[EventRecordCreate, EventRecordDetailCreate]]:
-        """Build event record payloads for Polar exercises."""
-        for raw_workout in raw:
-            yield self._normalize_workout(raw_workout, user_id)
-
-    def load_data(
+    def fetch_data(
         self,
         db: DbSession,
         user_id: UUID,
         **kwargs: Any,
-    ) -> bool:
-        """Load data from Polar API."""
+    ) -> list[PolarExerciseJSON]:
+        """Pull new exercises through an AccessLink exercise transaction.
+
+        Polar transfers every exercise once: a transaction lists the exercises uploaded
+        since the last committed one, so the ``since``/``until`` window is not needed.
+        The transaction is committed by save_data after the exercises are stored. Polar
+        expires uncommitted transactions and offers their exercises again, so a failed
+        sync loses nothing.
+        """
+        connection = self.connection_repo.get_by_user_and_provider(db, user_id, self.provider_name)
+        if not connection or not connection.provider_user_id:
+            # Transactions need the AccessLink user id, fall back to the recent exercises list
+            return self._fetch_recent_exercises(db, user_id, **kwargs)
+
+        polar_user_id = connection.provider_user_id
+        access_token = get_valid_token(db, user_id, self.provider_name, self.connection_repo, self.oauth)
+        transactions_endpoint = f"/v3/users/{polar_user_id}/exercise-transactions"
+
+        # 204 No Content when there are no new exercises
+        created = self._send(access_token, user_id, transactions_endpoint, method="POST")
+        if not created:
+            return PolarExerciseTransaction(polar_user_id=polar_user_id)
+
+        transaction_id = created["transaction-id"]
+        listing = self._send(access_token, user_id, f"{transactions_endpoint}/{transaction_id}") or {}
+        exercise_urls = listing.get("exercises", [])
+
+        exercises = []
+        if exercise_urls:
+            max_workers = min(settings.sync_detail_fetch_concurrency, len(exercise_urls))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                exercises = list(
+                    executor.map(
+                        lambda url: self._send(access_token, user_id, httpx.URL(url).path),
+                        exercise_urls,
+                    ),
+                )
+
+        self.logger.info(f"Polar transaction {transaction_id} for user {user_id} has {len(exercises)} new exercises")
+        return PolarExerciseTransaction(
+            (self._parse_transaction_exercise(exercise) for exercise in exercises),
+            polar_user_id=polar_user_id,
+            transaction_id=transaction_id,
+        )
+
+    def save_data(self, db: DbSession, user_id: UUID, raw_workouts: list[Any]) -> bool:
+        """Save exercises, then commit the transaction they were pulled with."""
+        saved = super().save_data(db, user_id, raw_workouts)
+        if isinstance(raw_workouts, PolarExerciseTransaction) and raw_workouts.transaction_id is not None:
+            self.commit_transaction(db, user_id, raw_workouts)
+        return saved
+
+    def commit_transaction(self, db: DbSession, user_id: UUID, transaction: PolarExerciseTransaction) -> None:
+        """Commit an exercise transaction, so its exercises are not offered again."""
+        access_token = get_valid_token(db, user_id, self.provider_name, self.connection_repo, self.oauth)
+        self._send(
+            access_token,
+            user_id,
+            f"/v3/users/{transaction.polar_user_id}/exercise-transactions/{transaction.transaction_id}",
+            method="PUT",
+        )
+
+    def _send(self, access_token: str, user_id: UUID, endpoint: str, method: str = "GET") -> Any:
+        return send_authenticated_request(
+            access_token=access_token,
+            user_id=user_id,
+            api_base_url=self.api_base_url,
+            provider_name=self.provider_name,
+            endpoint=endpoint,
+            method=method,
+        )
+
+    def _parse_transaction_exercise(self, data: dict[str, Any]) -> PolarExerciseJSON:
+        """Parse a transaction exercise, which uses hyphenated keys and a numeric id."""
+        exercise = {key.replace("-", "_"): value for key, value in data.items()}
+        exercise["id"] = str(exercise["id"])
+        return PolarExerciseJSON(**exercise)
+
+    def _fetch_recent_exercises(self, db: DbSession, user_id: UUID, **kwargs: Any) -> list[PolarExerciseJSON]:
+        """Fetch exercises of the last 30 days within the ``since``/``until`` window (epoch seconds)."""
         workouts_data = self.get_workouts_from_api(db, user_id, **kwargs)
-        workouts = [PolarExerciseJSON(**w) for w in workouts_data]
+        exercises = [PolarExerciseJSON(**w) for w in workouts_data]
+        return [e for e in exercises if self._in_window(e, kwargs.get("since"), kwargs.get("until"))]
 
-        for record, detail in self._build_bundles(workouts, user_id):
-            created_record = event_record_service.create(db, record)
-            detail_for_record = detail.model_copy(update={"record_id": created_record.id})
-            event_record_service.create_detail(db, detail_for_record)
+    def _in_window(self, exercise: PolarExerciseJSON, since: int | None, until: int | None) -> bool:
+        """Whether an exercise reached Polar within the window.
 
-        return True
+        Upload time also catches exercises recorded earlier but synced from the device late,
+        the end of the exercise is used when Polar doesn't report it.
+        """
+        if exercise.upload_time:
+            timestamp = isodate.parse_datetime(exercise.upload_time)
+        else:
+            _, timestamp = self._extract_dates_with_offset(
+                exercise.start_time,
+                exercise.start_time_utc_offset,
+                exercise.duration,
+            )
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        epoch = timestamp.timestamp()
+        return (since is None or epoch >= since) and (until is None or epoch <= until)
 
     def get_exercise_detail(
         self,
@@ -0,0 +1,66 @@
+"""Replay of archived raw provider payloads through the current normalizers and savers."""
+
+from collections.abc import Callable
+from functools import cache
+from logging import getLogger
+from typing import Any
+from uuid import UUID
+
+from app.database import DbSession
+from app.integrations.raw_archive import RawArchive
+from app.services.providers.factory import ProviderFactory
+from app.services.providers.garmin.pings import SUMMARY_SAVERS
+
+logger = getLogger(__name__)
+
+Replayer = Callable[[DbSession, UUID, Any], Any]
+
+
+@cache
+def _replayer(provider: str, family: str) -> Replayer | None:
+    """How archived payloads of a provider's data family are saved, None if they can't be."""
+    try:
+        strategy = ProviderFactory().get_provider(provider)
+    except ValueError:
+        return None
+
+    # Garmin activities pulled from pings are activity summaries, like its synced workouts
+    if family == "workouts" or (provider == "garmin" and family == "activities"):
+        return strategy.workouts.replay_data if strategy.workouts else None
+    if provider == "garmin" and family in SUMMARY_SAVERS:
+        return SUMMARY_SAVERS[family]
+    if strategy.data_247 and (fetch_and_save := strategy.data_247.get_sync_families().get(family)):
+        return fetch_and_save[1]
+    return None
+
+
+def replay_archive(
+    db: DbSession,
+    archive: RawArchive,
+    provider: str | None = None,
+    user_id: UUID | None = None,
+    family: str | None = None,
+) -> dict[str, int]:
+    """
+    Save archived payloads again, normalized by the current code.
+
+    Saving replaces what is stored for the same records and samples, so fixes to the
+    normalizers apply to data already synced without fetching it from the providers
+    again. Returns counts of replayed, skipped (no saver for their family) and failed payloads.
+    """
+    result = {"replayed": 0, "skipped": 0, "failed": 0}
+    for entry in archive.entries(provider, user_id, family):
+        replayer = _replayer(entry.provider, entry.family)
+        if replayer is None:
+            logger.warning(f"[replay] No saver for {entry.provider} {entry.family}, skipping {entry.key}")
+            result["skipped"] += 1
+            continue
+        try:
+            replayer(db, entry.user_id, archive.get(entry.key))
+        except Exception as e:
+            logger.error(f"[replay] Failed to replay {entry.key}: {e}")
+            db.rollback()
+            result["failed"] += 1
+        else:
+            result["replayed"] += 1
+    return result
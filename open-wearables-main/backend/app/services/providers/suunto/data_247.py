@@ -1,23 +1,37 @@
 """Suunto 247 Data implementation for sleep, recovery, and activity samples."""
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any
+from typing import Any, Callable
 from uuid import UUID, uuid4
 
+from app.config import settings
 from app.database import DbSession
 from app.models import DataPointSeries, EventRecord, ExternalDeviceMapping
 from app.repositories import EventRecordRepository, UserConnectionRepository
 from app.repositories.data_point_series_repository import DataPointSeriesRepository
 from app.repositories.external_mapping_repository import ExternalMappingRepository
-from app.schemas import EventRecordCreate, TimeSeriesSampleCreate
+from app.schemas import EventRecordCreate
 from app.schemas.event_record_detail import EventRecordDetailCreate
 from app.schemas.series_types import SeriesType
 from app.services.event_record_service import event_record_service
-from app.services.providers.api_client import make_authenticated_request
-from app.services.providers.templates.base_247_data import Base247DataTemplate
+from app.services.providers.api_client import (
+    ProviderRateLimitedError,
+    get_valid_token,
+    send_authenticated_request,
+)
+from app.services.providers.templates.base_247_data import (
+    Base247DataTemplate,
+    ChunkedFetchResult,
+    SyncFetcher,
+    SyncSaver,
+    split_time_range,
+)
 from app.services.providers.templates.base_oauth import BaseOAuthTemplate
 
+CHUNK_FETCH_ATTEMPTS = 2  # Per time chunk, on top of the HTTP client's retries of 429/5xx responses
+
 
 class Suunto247Data(Base247DataTemplate):
     """Suunto implementation for 247 data (sleep, recovery, activity)."""
@@ -43,35 +57,31 @@ class Suunto247Data(Base247DataTemplate):
                 headers["Ocp-Apim-Subscription-Key"] = subscription_key
         return headers
 
-    def _make_api_request(
+    def _epoch_ms(self, dt: datetime) -> int:
+        """Convert datetime to epoch milliseconds."""
+        return int(dt.timestamp() * 1000)
+
+    def _send_api_request(
         self,
-        db: DbSession,
+        access_token: str,
         user_id: UUID,
         endpoint: str,
         params: dict[str, Any] | None = None,
-        headers: dict[str, str] | None = None,
     ) -> Any:
-        """Make authenticated request to Suunto API."""
-        all_headers = self._get_suunto_headers()
-        if headers:
-            all_headers.update(headers)
-
-        return make_authenticated_request(
-            db=db,
+        """Send a request to Suunto API with an already valid access token."""
+        return send_authenticated_request(
+            access_token=access_token,
             user_id=user_id,
-            connection_repo=self.connection_repo,
-            oauth=self.oauth,
             api_base_url=self.api_base_url,
             provider_name=self.provider_name,
             endpoint=endpoint,
             method="GET",
             params=params,
-            headers=all_headers,
+            headers=self._get_suunto_headers(),
         )
 
-    def _epoch_ms(self, dt: datetime) -> int:
-        """Convert datetime to epoch milliseconds."""
-        return int(dt.timestamp() * 1000)
+    def _epoch_ms_params(self, start: datetime, end: datetime) -> dict[str, Any]:
+        return {"from": self._epoch_ms(start), "to": self._epoch_ms(end)}
 
     def _fetch_in_chunks(
         self,
@@ -81,31 +91,65 @@ class Suunto247Data(Base247DataTemplate):
         start_time: datetime,
         end_time: datetime,
         chunk_days: int = 20,
-    ) -> list[dict[str, Any]]:
-        """Fetch data in chunks to avoid 28-day limit."""
-        all_data = []
-        current_start = start_time
+        params_for: Callable[[datetime, datetime], dict[str, Any]] | None = None,
+    ) -> ChunkedFetchResult:
+        """Fetch data in chunks to avoid 28-day limit.
 
-        while current_start < end_time:
-            current_end = min(current_start + timedelta(days=chunk_days), end_time)
+        Chunks are fetched concurrently and merged in time order. A failing chunk is
+        retried and, if it keeps failing, reported in the result instead of being dropped.
+        """
+        params_for = params_for or self._epoch_ms_params
+        chunks = split_time_range(start_time, end_time, timedelta(days=chunk_days))
 
-            params = {
-                "from": self._epoch_ms(current_start),
-                "to": self._epoch_ms(current_end),
-            }
+        if not chunks:
+            return ChunkedFetchResult()
 
-            try:
-                response = self._make_api_request(db, user_id, endpoint, params=params)
-                if isinstance(response, list):
-                    all_data.extend(response)
-            except Exception as e:
-                # Log error but continue with other chunks if possible
-                # In a real scenario, we might want to re-raise or handle differently
-                print(f"Error fetching chunk {current_start} to {current_end}: {e}")
+        # Resolved once on this thread, the chunk requests don't touch the session
+        access_token = get_valid_token(db, user_id, self.provider_name, self.connection_repo, self.oauth)
 
-            current_start = current_end
-
-        return all_data
+        def fetch_chunk(chunk: tuple[datetime, datetime]) -> list[dict[str, Any]]:
+            for attempt in range(1, CHUNK_FETCH_ATTEMPTS + 1):
+                try:
+                    response = self._send_api_request(access_token, user_id, endpoint, params=params_for(*chunk))
+                    return response if isinstance(response, list) else []
+                except ProviderRateLimitedError:
+                    raise
+                except Exception as e:
+                    if attempt == CHUNK_FETCH_ATTEMPTS:
+                        raise
+                    self.logger.info(f"Retrying {endpoint} chunk {chunk[0]} to {chunk[1]}: {e}")
+            return []
+
+        results: list[list[dict[str, Any]]] = [[] for _ in chunks]
+        errors: dict[int, Exception] = {}
+        executor = ThreadPoolExecutor(max_workers=min(settings.sync_detail_fetch_concurrency, len(chunks)))
+        try:
+            futures = {executor.submit(fetch_chunk, chunk): index for index, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except ProviderRateLimitedError:
+                    # The whole window is retried later, skipping chunks would silently lose data
+                    raise
+                except Exception as e:
+                    errors[index] = e
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        if errors and len(errors) == len(chunks):
+            raise errors[0]
+
+        failed_chunks = []
+        for index in sorted(errors):
+            chunk_start, chunk_end = chunks[index]
+            self.logger.warning(f"Failed to fetch {endpoint} chunk {chunk_start} to {chunk_end}: {errors[index]}")
+            failed_chunks.append(f"{chunk_start.isoformat()}/{chunk_end.isoformat()}")
+
+        return ChunkedFetchResult(
+            (record for chunk_records in results for record in chunk_records),
+            failed_chunks=failed_chunks,
+        )
 
     # -------------------------------------------------------------------------
     # Sleep Data - Suunto /247samples/sleep
@@ -381,30 +425,24 @@ class Suunto247Data(Base247DataTemplate):
         end_date: datetime,
     ) -> list[dict[str, Any]]:
         """Fetch aggregated daily activity statistics from Suunto API."""
-        all_data = []
-        current_start = start_date
-        chunk_days = 14  # Reduced to 14 days to be safe (limit is 28 days)
-
-        while current_start < end_date:
-            current_end = min(current_start + timedelta(days=chunk_days), end_date)
 
-            # Suunto uses ISO 8601 format for this endpoint
-            params = {
-                "startdate": current_start.strftime("%Y-%m-%dT%H:%M:%S"),
-                "enddate": current_end.strftime("%Y-%m-%dT%H:%M:%S"),
+        # Suunto uses ISO 8601 format for this endpoint
+        def params_for(start: datetime, end: datetime) -> dict[str, Any]:
+            return {
+                "startdate": start.strftime("%Y-%m-%dT%H:%M:%S"),
+                "enddate": end.strftime("%Y-%m-%dT%H:%M:%S"),
             }
 
-            try:
-                # Note: This endpoint is under /247 not /247samples
-                response = self._make_api_request(db, user_id, "/247/daily-activity-statistics", params=params)
-                if isinstance(response, list):
-                    all_data.extend(response)
-            except Exception as e:
-                print(f"Error fetching daily activity chunk {current_start} to {current_end}: {e}")
-
-            current_start = current_end
-
-        return all_data
+        # Note: This endpoint is under /247 not /247samples
+        return self._fetch_in_chunks(
+            db,
+            user_id,
+            "/247/daily-activity-statistics",
+            start_date,
+            end_date,
+            chunk_days=14,  # Reduced to 14 days to be safe (limit is 28 days)
+            params_for=params_for,
+        )
 
     def normalize_daily_activity(
         self,
@@ -443,6 +481,15 @@ class Suunto247Data(Base247DataTemplate):
             "raw": raw_stats,
         }
 
+    def _replace_samples(self, db: DbSession, user_id: UUID, rows: list[dict[str, Any]]) -> int:
+        """Store samples keyed by series type and instant, so re-fetched ranges replace what is stored."""
+        if not rows:
+            return 0
+        # Suunto samples are not attributed to a device
+        mapping = self.mapping_repo.ensure_mapping(db, user_id, self.provider_name, None)
+        self.data_point_repo.replace_many(db, mapping.id, rows)
+        return len(rows)
+
     def save_activity_samples(
         self,
         db: DbSession,
@@ -450,7 +497,7 @@ class Suunto247Data(Base247DataTemplate):
         normalized_samples: dict[str, list[dict[str, Any]]],
     ) -> int:
         """Save normalized activity samples to database."""
-        count = 0
+        rows: list[dict[str, Any]] = []
 
         # Map internal keys to SeriesType
         type_mapping = {
@@ -493,22 +540,12 @@ class Suunto247Data(Base247DataTemplate):
                     continue
 
                 try:
-                    sample_create = TimeSeriesSampleCreate(
-                        id=uuid4(),
-                        user_id=user_id,
-                        provider_name=self.provider_name,
-                        recorded_at=recorded_at,
-                        value=Decimal(str(value)),
-                        series_type=series_type,
-                        external_id=None,  # Suunto doesn't provide ID for individual samples
-                    )
-                    self.data_point_repo.create(db, sample_create)
-                    count += 1
-                except Exception:
-                    # Log error but continue
-                    pass
+                    # Suunto doesn't provide ID for individual samples
+                    rows.append({"series_type": series_type, "recorded_at": recorded_at, "value": Decimal(str(value))})
+                except ArithmeticError:
+                    continue
 
-        return count
+        return self._replace_samples(db, user_id, rows)
 
     def save_daily_activity_statistics(
         self,
@@ -517,7 +554,7 @@ class Suunto247Data(Base247DataTemplate):
         normalized_stats: list[dict[str, Any]],
     ) -> int:
         """Save normalized daily activity statistics to database."""
-        count = 0
+        rows: list[dict[str, Any]] = []
 
         for stat in normalized_stats:
             stat_type = stat.get("type")
@@ -546,22 +583,12 @@ class Suunto247Data(Base247DataTemplate):
                     final_value = Decimal(str(value))
                     if series_type == SeriesType.energy:
                         final_value = final_value / Decimal("4184")
+                except (ValueError, ArithmeticError):
+                    continue
 
-                    sample_create = TimeSeriesSampleCreate(
-                        id=uuid4(),
-                        user_id=user_id,
-                        provider_name=self.provider_name,
-                        recorded_at=recorded_at,
-                        value=final_value,
-                        series_type=series_type,
-                        external_id=None,
-                    )
-                    self.data_point_repo.create(db, sample_create)
-                    count += 1
-                except Exception:
-                    pass
+                rows.append({"series_type": series_type, "recorded_at": recorded_at, "value": final_value})
 
-        return count
+        return self._replace_samples(db, user_id, rows)
 
     # -------------------------------------------------------------------------
     # Load and Save All Data
@@ -576,9 +603,11 @@ class Suunto247Data(Base247DataTemplate):
     ) -> int:
         """Load sleep data from API and save to database."""
         raw_data = self.get_sleep_data(db, user_id, start_time, end_time)
+        return self._save_raw_sleep(db, user_id, raw_data)
+
+    def save_sleep_batch(self, db: DbSession, user_id: UUID, batch: list[dict[str, Any]]) -> int:
         count = 0
-        for item in raw_data:
-            normalized = self.normalize_sleep(item, user_id)
+        for normalized in batch:
             try:
                 self.save_sleep_data(db, user_id, normalized)
                 count += 1
@@ -586,6 +615,37 @@ class Suunto247Data(Base247DataTemplate):
                 self.logger.warning(f"Failed to save sleep data: {e}")
         return count
 
+    def save_activity_samples_batch(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        batch: dict[str, list[dict[str, Any]]],
+    ) -> int:
+        return self.save_activity_samples(db, user_id, batch)
+
+    def save_daily_activity_batch(self, db: DbSession, user_id: UUID, batch: list[dict[str, Any]]) -> int:
+        return self.save_daily_activity_statistics(db, user_id, batch)
+
+    def _save_raw_sleep(self, db: DbSession, user_id: UUID, raw_data: list[dict[str, Any]]) -> int:
+        """Normalize and save fetched sleep data."""
+        return self.save_sleep_batch(db, user_id, [self.normalize_sleep(item, user_id) for item in raw_data])
+
+    def _save_raw_activity_samples(self, db: DbSession, user_id: UUID, raw_data: list[dict[str, Any]]) -> int:
+        """Normalize and save fetched activity samples."""
+        return self.save_activity_samples_batch(db, user_id, self.normalize_activity_samples(raw_data, user_id))
+
+    def _save_raw_daily_activity(self, db: DbSession, user_id: UUID, raw_data: list[dict[str, Any]]) -> int:
+        """Normalize and save fetched daily activity statistics."""
+        normalized = [self.normalize_daily_activity(item, user_id) for item in raw_data]
+        return self.save_daily_activity_batch(db, user_id, normalized)
+
+    def get_sync_families(self) -> dict[str, tuple[SyncFetcher, SyncSaver]]:
+        return {
+            "sleep_sessions": (self.get_sleep_data, self._save_raw_sleep),
+            "activity_samples": (self.get_activity_samples, self._save_raw_activity_samples),
+            "daily_activity": (self.get_daily_activity_statistics, self._save_raw_daily_activity),
+        }
+
     def load_and_save_all(
         self,
         db: DbSession,
@@ -622,29 +682,16 @@ class Suunto247Data(Base247DataTemplate):
             "sleep_sessions": 0,
             "recovery_samples": 0,
             "activity_samples": 0,
+            "daily_activity": 0,
         }
 
-        # Sleep
-        try:
-            results["sleep_sessions"] = self.load_and_save_sleep(db, user_id, start_dt, end_dt)
-        except Exception as e:
-            self.logger.error(f"Failed to load sleep data: {e}")
-
-        # Activity Samples
-        try:
-            raw_activity = self.get_activity_samples(db, user_id, start_dt, end_dt)
-            normalized_activity = self.normalize_activity_samples(raw_activity, user_id)
-            results["activity_samples"] = self.save_activity_samples(db, user_id, normalized_activity)
-        except Exception as e:
-            self.logger.error(f"Failed to load activity samples: {e}")
-
-        # Daily Activity Statistics
-        try:
-            raw_daily = self.get_daily_activity_statistics(db, user_id, start_dt, end_dt)
-            normalized_daily = [self.normalize_daily_activity(item, user_id) for item in raw_daily]
-            results["daily_activity"] = self.save_daily_activity_statistics(db, user_id, normalized_daily)
-        except Exception as e:
-            self.logger.error(f"Failed to load daily activity statistics: {e}")
+        # Sleep, activity samples and daily activity statistics, saved window by window
+        for family, (fetch, save) in self.get_sync_families().items():
+            try:
+                for window_start, window_end in self.stream_windows(start_dt, end_dt):
+                    results[family] += save(db, user_id, fetch(db, user_id, window_start, window_end))
+            except Exception as e:
+                self.logger.error(f"Failed to load {family}: {e}")
 
         # Recovery and activity samples would need their own save methods
         # For now, they can be fetched via raw endpoints for debugging
@@ -1,6 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Iterable
+from typing import Any
 from uuid import UUID, uuid4
 
 from app.constants.workout_types.suunto import get_unified_workout_type
@@ -12,13 +12,14 @@ from app.schemas import (
     EventRecordMetrics,
     SuuntoWorkoutJSON,
 )
-from app.services.event_record_service import event_record_service
 from app.services.providers.templates.base_workouts import BaseWorkoutsTemplate
 
 
 class SuuntoWorkouts(BaseWorkoutsTemplate):
     """Suunto implementation of workouts template."""
 
+    raw_workout_schema = SuuntoWorkoutJSON
+
     def _get_suunto_headers(self) -> dict[str, str]:
         """Get Suunto-specific headers including subscription key."""
         headers = {}
@@ -176,23 +177,13 @@ class SuuntoWorkouts(BaseWorkoutsTemplate):
 
         return workout_create, workout_detail_create
 
-    def _build_bundles(
-        self,
-        raw: list[SuuntoWorkoutJSON],
-        user_id: UUID,
-    ) -> Iterable[tuple[EventRecordCreate, EventRecordDetailCreate]]:
-        """Build event record payloads for Suunto workouts."""
-        for raw_workout in raw:
-            record, details = self._normalize_workout(raw_workout, user_id)
-            yield record, details
-
-    def load_data(
+    def fetch_data(
         self,
         db: DbSession,
         user_id: UUID,
         **kwargs: Any,
-    ) -> bool:
-        """Load data from Suunto API."""
+    ) -> list[SuuntoWorkoutJSON]:
+        """Fetch workouts from Suunto API."""
         # Handle generic start_date/end_date
         start_date = kwargs.get("start_date")
 
@@ -217,11 +208,13 @@ class SuuntoWorkouts(BaseWorkoutsTemplate):
 
         response = self.get_workouts_from_api(db, user_id, **api_kwargs)
         workouts_data = response.get("payload", [])
-        workouts = [SuuntoWorkoutJSON(**w) for w in workouts_data]
+        return [SuuntoWorkoutJSON(**w) for w in workouts_data]
 
+    def save_data(self, db: DbSession, user_id: UUID, raw_workouts: list[SuuntoWorkoutJSON]) -> bool:
+        """Save devices and workouts returned by fetch_data."""
         device_repo = DeviceRepository()
 
-        for workout in workouts:
+        for workout in raw_workouts:
             # Save device info if available
             if workout.gear and workout.gear.serialNumber:
                 device_repo.ensure_device(
@@ -232,12 +225,7 @@ class SuuntoWorkouts(BaseWorkoutsTemplate):
                     sw_version=workout.gear.swVersion,
                 )
 
-        for record, details in self._build_bundles(workouts, user_id):
-            created_record = event_record_service.create(db, record)
-            detail_for_record = details.model_copy(update={"record_id": created_record.id})
-            event_record_service.create_detail(db, detail_for_record)
-
-        return True
+        return super().save_data(db, user_id, raw_workouts)
 
     def get_workout_detail(
         self,
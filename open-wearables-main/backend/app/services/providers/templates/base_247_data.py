@@ -2,13 +2,47 @@
 
 import logging
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Iterator
 from uuid import UUID
 
+from app.config import settings
 from app.database import DbSession
 from app.services.providers.templates.base_oauth import BaseOAuthTemplate
 
+# fetch(db, user_id, start_time, end_time) -> raw data, save(db, user_id, raw data) -> saved count
+SyncFetcher = Callable[[DbSession, UUID, datetime, datetime], Any]
+SyncSaver = Callable[[DbSession, UUID, Any], int]
+
+
+def split_time_range(start: datetime, end: datetime, size: timedelta) -> list[tuple[datetime, datetime]]:
+    """Split [start, end) into consecutive windows of at most ``size``."""
+    windows = []
+    current = start
+    while current < end:
+        window_end = min(current + size, end)
+        windows.append((current, window_end))
+        current = window_end
+    return windows
+
+
+class ChunkedFetchResult(list[Any]):
+    """Records fetched window by window, with the windows that could not be fetched.
+
+    Failed windows are reported so that a sync knows the data family is incomplete.
+    """
+
+    def __init__(self, records: Iterable[Any] = (), failed_chunks: list[str] | None = None):
+        super().__init__(records)
+        self.failed_chunks = failed_chunks or []
+
+
+def _batch_size(batch: Any) -> int:
+    """Number of records in a batch, counting each sample of categorized batches."""
+    if isinstance(batch, dict):
+        return sum(len(items) for items in batch.values())
+    return len(batch)
+
 
 class Base247DataTemplate(ABC):
     """Base template for fetching and processing 247 data (sleep, recovery, activity).
@@ -17,6 +51,9 @@ class Base247DataTemplate(ABC):
     - Collected passively by wearables 24/7
     - Aggregated into daily summaries or time-series samples
     - Includes: sleep sessions, recovery metrics, activity samples (steps, HR, etc.)
+
+    Data is streamed one time window at a time (fetch -> normalize -> save batch), so
+    memory stays bounded by one window however long the synced range is.
     """
 
     def __init__(
@@ -54,6 +91,18 @@ class Base247DataTemplate(ABC):
         """Normalize provider-specific sleep data to our schema."""
         pass
 
+    def iter_sleep_data(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Fetch and normalize sleep data, one batch per time window."""
+        for window_start, window_end in self.stream_windows(start_time, end_time):
+            raw_data = self.get_sleep_data(db, user_id, window_start, window_end)
+            yield [self.normalize_sleep(item, user_id) for item in raw_data]
+
     def process_sleep_data(
         self,
         db: DbSession,
@@ -61,9 +110,8 @@ class Base247DataTemplate(ABC):
         start_time: datetime,
         end_time: datetime,
     ) -> list[dict[str, Any]]:
-        """Fetch and normalize sleep data."""
-        raw_data = self.get_sleep_data(db, user_id, start_time, end_time)
-        return [self.normalize_sleep(item, user_id) for item in raw_data]
+        """Fetch and normalize sleep data as one list (for debugging short ranges)."""
+        return [item for batch in self.iter_sleep_data(db, user_id, start_time, end_time) for item in batch]
 
     # -------------------------------------------------------------------------
     # Recovery Data
@@ -89,6 +137,18 @@ class Base247DataTemplate(ABC):
         """Normalize provider-specific recovery data to our schema."""
         pass
 
+    def iter_recovery_data(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Fetch and normalize recovery data, one batch per time window."""
+        for window_start, window_end in self.stream_windows(start_time, end_time):
+            raw_data = self.get_recovery_data(db, user_id, window_start, window_end)
+            yield [self.normalize_recovery(item, user_id) for item in raw_data]
+
     def process_recovery_data(
         self,
         db: DbSession,
@@ -96,9 +156,8 @@ class Base247DataTemplate(ABC):
         start_time: datetime,
         end_time: datetime,
     ) -> list[dict[str, Any]]:
-        """Fetch and normalize recovery data."""
-        raw_data = self.get_recovery_data(db, user_id, start_time, end_time)
-        return [self.normalize_recovery(item, user_id) for item in raw_data]
+        """Fetch and normalize recovery data as one list (for debugging short ranges)."""
+        return [item for batch in self.iter_recovery_data(db, user_id, start_time, end_time) for item in batch]
 
     # -------------------------------------------------------------------------
     # Activity Samples (HR, Steps, SpO2, etc.)
@@ -127,6 +186,18 @@ class Base247DataTemplate(ABC):
         """
         pass
 
+    def iter_activity_samples(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> Iterator[dict[str, list[dict[str, Any]]]]:
+        """Fetch and normalize activity samples, one batch per time window."""
+        for window_start, window_end in self.stream_windows(start_time, end_time):
+            raw_data = self.get_activity_samples(db, user_id, window_start, window_end)
+            yield self.normalize_activity_samples(raw_data, user_id)
+
     def process_activity_samples(
         self,
         db: DbSession,
@@ -134,9 +205,12 @@ class Base247DataTemplate(ABC):
         start_time: datetime,
         end_time: datetime,
     ) -> dict[str, list[dict[str, Any]]]:
-        """Fetch and normalize activity samples."""
-        raw_data = self.get_activity_samples(db, user_id, start_time, end_time)
-        return self.normalize_activity_samples(raw_data, user_id)
+        """Fetch and normalize activity samples as one dict (for debugging short ranges)."""
+        merged: dict[str, list[dict[str, Any]]] = {}
+        for batch in self.iter_activity_samples(db, user_id, start_time, end_time):
+            for key, samples in batch.items():
+                merged.setdefault(key, []).extend(samples)
+        return merged
 
     # -------------------------------------------------------------------------
     # Daily Activity Statistics
@@ -162,6 +236,18 @@ class Base247DataTemplate(ABC):
         """Normalize daily activity statistics to our schema."""
         pass
 
+    def iter_daily_activity(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Fetch and normalize daily activity statistics, one batch per time window."""
+        for window_start, window_end in self.stream_windows(start_date, end_date):
+            raw_data = self.get_daily_activity_statistics(db, user_id, window_start, window_end)
+            yield [self.normalize_daily_activity(item, user_id) for item in raw_data]
+
     def process_daily_activity(
         self,
         db: DbSession,
@@ -169,28 +255,81 @@ class Base247DataTemplate(ABC):
         start_date: datetime,
         end_date: datetime,
     ) -> list[dict[str, Any]]:
-        """Fetch and normalize daily activity statistics."""
-        raw_data = self.get_daily_activity_statistics(db, user_id, start_date, end_date)
-        return [self.normalize_daily_activity(item, user_id) for item in raw_data]
+        """Fetch and normalize daily activity statistics as one list (for debugging short ranges)."""
+        return [item for batch in self.iter_daily_activity(db, user_id, start_date, end_date) for item in batch]
+
+    # -------------------------------------------------------------------------
+    # Saving Batches
+    # -------------------------------------------------------------------------
+
+    def save_sleep_batch(self, db: DbSession, user_id: UUID, batch: list[dict[str, Any]]) -> int:
+        """Save a batch of normalized sleep data, returning how many records were saved."""
+        return 0
+
+    def save_recovery_batch(self, db: DbSession, user_id: UUID, batch: list[dict[str, Any]]) -> int:
+        """Save a batch of normalized recovery data, returning how many records were saved."""
+        return 0
+
+    def save_activity_samples_batch(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        batch: dict[str, list[dict[str, Any]]],
+    ) -> int:
+        """Save a batch of normalized activity samples, returning how many samples were saved."""
+        return 0
+
+    def save_daily_activity_batch(self, db: DbSession, user_id: UUID, batch: list[dict[str, Any]]) -> int:
+        """Save a batch of normalized daily activity statistics, returning how many were saved."""
+        return 0
 
     # -------------------------------------------------------------------------
     # Combined Load
     # -------------------------------------------------------------------------
 
+    def stream_windows(self, start_time: datetime, end_time: datetime) -> list[tuple[datetime, datetime]]:
+        """Time windows data is fetched, normalized and saved in."""
+        return split_time_range(start_time, end_time, timedelta(days=settings.sync_247_window_days))
+
     def load_all_247_data(
         self,
         db: DbSession,
         user_id: UUID,
         start_time: datetime,
         end_time: datetime,
-    ) -> dict[str, Any]:
-        """Load all 247 data types in one call."""
-        return {
-            "sleep": self.process_sleep_data(db, user_id, start_time, end_time),
-            "recovery": self.process_recovery_data(db, user_id, start_time, end_time),
-            "activity_samples": self.process_activity_samples(db, user_id, start_time, end_time),
-            "daily_activity": self.process_daily_activity(db, user_id, start_time, end_time),
+    ) -> dict[str, int]:
+        """Stream all 247 data types, saving each batch before the next one is fetched.
+
+        Returns only the number of records processed per data type, so the result stays
+        small (e.g. in the Celery result backend) however long the range is.
+        """
+        streams: dict[str, tuple[Callable[..., Iterator[Any]], Callable[[DbSession, UUID, Any], int]]] = {
+            "sleep": (self.iter_sleep_data, self.save_sleep_batch),
+            "recovery": (self.iter_recovery_data, self.save_recovery_batch),
+            "activity_samples": (self.iter_activity_samples, self.save_activity_samples_batch),
+            "daily_activity": (self.iter_daily_activity, self.save_daily_activity_batch),
         }
+        counts = {}
+        for name, (iterate, save) in streams.items():
+            counts[name] = 0
+            for batch in iterate(db, user_id, start_time, end_time):
+                save(db, user_id, batch)
+                counts[name] += _batch_size(batch)
+        return counts
+
+    # -------------------------------------------------------------------------
+    # Sync Families
+    # -------------------------------------------------------------------------
+
+    def get_sync_families(self) -> dict[str, tuple[SyncFetcher, SyncSaver]]:
+        """Independent data families, keyed by their result name, as (fetch, save) pairs.
+
+        Fetchers only call the provider API, so families can be fetched concurrently
+        on separate sessions while the saver writes through a single session. Syncs call
+        them once per stream window, saving each window before fetching further ones.
+        Providers without families are synced through load_and_save_all.
+        """
+        return {}
 
     # -------------------------------------------------------------------------
     # Raw API Access (for debugging)
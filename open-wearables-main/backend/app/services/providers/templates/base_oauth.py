@@ -12,6 +12,7 @@ from fastapi import HTTPException
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_500_INTERNAL_SERVER_ERROR
 
 from app.database import DbSession
+from app.integrations.http_client import get_http_client
 from app.integrations.redis_client import get_redis_client
 from app.repositories.user_connection_repository import UserConnectionRepository
 from app.repositories.user_repository import UserRepository
@@ -23,6 +24,7 @@ from app.schemas.oauth import (
     ProviderEndpoints,
     UserConnectionCreate,
 )
+from app.services.providers.token_cache import invalidate_token
 
 
 class BaseOAuthTemplate(ABC):
@@ -101,11 +103,10 @@ class BaseOAuthTemplate(ABC):
         data, headers = self._prepare_refresh_request(refresh_token)
 
         try:
-            response = httpx.post(
+            response = get_http_client(self.provider_name).post(
                 self.endpoints.token_url,
                 data=data,
                 headers=headers,
-                timeout=30.0,
             )
             response.raise_for_status()
             token_response = OAuthTokenResponse.model_validate(response.json())
@@ -192,11 +193,10 @@ class BaseOAuthTemplate(ABC):
         data, headers = self._prepare_token_request(code, code_verifier)
 
         try:
-            response = httpx.post(
+            response = get_http_client(self.provider_name).post(
                 self.endpoints.token_url,
                 data=data,
                 headers=headers,
-                timeout=30.0,
             )
             response.raise_for_status()
             return OAuthTokenResponse.model_validate(response.json())
@@ -303,3 +303,6 @@ class BaseOAuthTemplate(ABC):
                 scope=token_response.scope,
             )
             self.connection_repo.create(db, connection_create)
+
+        # Tokens of a previous connection must not be served any longer
+        invalidate_token(user_id, self.provider_name)
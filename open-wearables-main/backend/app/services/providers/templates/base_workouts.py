@@ -1,14 +1,17 @@
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable
 from uuid import UUID
 
+from pydantic import BaseModel
+
 from app.database import DbSession
 from app.repositories.event_record_repository import EventRecordRepository
 from app.repositories.user_connection_repository import UserConnectionRepository
 from app.schemas.event_record import EventRecordCreate
 from app.schemas.event_record_detail import EventRecordDetailCreate
+from app.services.event_record_service import event_record_service
 from app.services.providers.api_client import make_authenticated_request
 from app.services.providers.templates.base_oauth import BaseOAuthTemplate
 
@@ -16,6 +19,9 @@ from app.services.providers.templates.base_oauth import BaseOAuthTemplate
 class BaseWorkoutsTemplate(ABC):
     """Base template for fetching and processing workouts."""
 
+    # Model of the workouts fetch_data returns, to load them back from the raw payload archive
+    raw_workout_schema: type[BaseModel] | None = None
+
     def __init__(
         self,
         workout_repo: EventRecordRepository,
@@ -98,13 +104,52 @@ class BaseWorkoutsTemplate(ABC):
         """
         raise NotImplementedError(f"{self.__class__.__name__} does not support API-based workout detail fetching")
 
+    def fetch_data(self, db: DbSession, user_id: UUID, **kwargs: Any) -> list[Any]:
+        """Fetch workouts from provider API without saving them.
+
+        The session is only used to read (and refresh) the user's tokens, so fetches
+        can run concurrently on separate sessions while save_data writes through one.
+        Override this method in subclasses that support cloud API access.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support API-based data loading")
+
+    def save_data(self, db: DbSession, user_id: UUID, raw_workouts: list[Any]) -> bool:
+        """Normalize and save workouts returned by fetch_data."""
+        for record, detail in self._build_bundles(raw_workouts, user_id):
+            created_record = event_record_service.create(db, record)
+            detail_for_record = detail.model_copy(update={"record_id": created_record.id})
+            event_record_service.create_detail(db, detail_for_record)
+
+        return True
+
+    def replay_data(self, db: DbSession, user_id: UUID, archived: list[dict[str, Any]]) -> int:
+        """Normalize and save archived workouts, replacing the details stored for them.
+
+        Returns the number of workouts saved.
+        """
+        if self.raw_workout_schema is None:
+            raise NotImplementedError(f"{self.__class__.__name__} does not support replaying archived workouts")
+        raw_workouts = [self.raw_workout_schema.model_validate(workout) for workout in archived]
+        for record, detail in self._build_bundles(raw_workouts, user_id):
+            created_record = event_record_service.create(db, record)
+            event_record_service.upsert_detail(db, detail.model_copy(update={"record_id": created_record.id}))
+        return len(raw_workouts)
+
     def load_data(self, db: DbSession, user_id: UUID, **kwargs: Any) -> bool:
         """Load data from provider API.
 
-        Override this method in subclasses that support cloud API access.
         For push-only providers (like Apple Health), use process_payload instead.
         """
-        raise NotImplementedError(f"{self.__class__.__name__} does not support API-based data loading")
+        return self.save_data(db, user_id, self.fetch_data(db, user_id, **kwargs))
+
+    def _build_bundles(
+        self,
+        raw: list[Any],
+        user_id: UUID,
+    ) -> Iterable[tuple[EventRecordCreate, EventRecordDetailCreate]]:
+        """Build event record payloads for provider workouts."""
+        for raw_workout in raw:
+            yield self._normalize_workout(raw_workout, user_id)
 
     def process_payload(self, db: DbSession, user_id: UUID, payload: Any, source_type: str) -> None:
         """Template method to process a pushed payload (Push flow).
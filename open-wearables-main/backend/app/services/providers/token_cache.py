@@ -0,0 +1,63 @@
+"""Short-lived cache of valid provider access tokens and the per-connection refresh lock."""
+
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from redis.lock import Lock
+
+from app.config import settings
+from app.integrations.redis_client import get_redis_client
+
+# Tokens closer than this to expiry are refreshed before use (and never served from the cache)
+REFRESH_MARGIN = timedelta(minutes=5)
+
+logger = getLogger(__name__)
+
+
+def _token_key(user_id: UUID, provider_name: str) -> str:
+    return f"provider_token:{provider_name}:{user_id}"
+
+
+def get_cached_token(user_id: UUID, provider_name: str) -> str | None:
+    """Return a cached access token that is still valid, if any."""
+    try:
+        return get_redis_client().get(_token_key(user_id, provider_name))
+    except RedisError as e:
+        logger.warning(f"[token_cache] Failed to read cached {provider_name} token: {e}")
+        return None
+
+
+def cache_token(user_id: UUID, provider_name: str, access_token: str, expires_at: datetime) -> None:
+    """Cache an access token until shortly before it needs refreshing."""
+    valid_for = (expires_at - datetime.now(timezone.utc) - REFRESH_MARGIN).total_seconds()
+    ttl = int(min(settings.provider_token_cache_ttl_seconds, valid_for))
+    if ttl <= 0:
+        return
+    try:
+        get_redis_client().setex(_token_key(user_id, provider_name), ttl, access_token)
+    except RedisError as e:
+        logger.warning(f"[token_cache] Failed to cache {provider_name} token: {e}")
+
+
+def invalidate_token(user_id: UUID, provider_name: str) -> None:
+    """Drop the cached token, e.g. after reconnecting or when the provider rejected it."""
+    try:
+        get_redis_client().delete(_token_key(user_id, provider_name))
+    except RedisError as e:
+        logger.warning(f"[token_cache] Failed to invalidate cached {provider_name} token: {e}")
+
+
+def refresh_lock(user_id: UUID, provider_name: str) -> Lock:
+    """Lock making sure only one worker refreshes the tokens of a connection at a time.
+
+    The lock expires on its own, so a crashed holder cannot block refreshes for longer
+    than the lock timeout, and waiters give up after the same time.
+    """
+    timeout = settings.provider_token_refresh_lock_seconds
+    return get_redis_client().lock(
+        f"provider_token_refresh:{provider_name}:{user_id}",
+        timeout=timeout,
+        blocking_timeout=timeout,
+    )
@@ -1,7 +1,9 @@
 """Whoop 247 Data implementation for sleep, recovery, and activity samples."""
 
+import asyncio
+from collections.abc import AsyncIterator, Callable
 from contextlib import suppress
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Any
 from uuid import UUID, uuid4
@@ -13,9 +15,19 @@ from app.repositories.external_mapping_repository import ExternalMappingReposito
 from app.schemas import EventRecordCreate
 from app.schemas.event_record_detail import EventRecordDetailCreate
 from app.services.event_record_service import event_record_service
-from app.services.providers.api_client import make_authenticated_request
-from app.services.providers.templates.base_247_data import Base247DataTemplate
+from app.services.providers.api_client import get_valid_token
+from app.services.providers.templates.base_247_data import (
+    Base247DataTemplate,
+    ChunkedFetchResult,
+    SyncFetcher,
+    SyncSaver,
+)
 from app.services.providers.templates.base_oauth import BaseOAuthTemplate
+from app.services.providers.whoop.pagination import collect_pages, iter_pages, run_pipeline, to_whoop_time
+
+SLEEP_ENDPOINT = "/v2/activity/sleep"
+RECOVERY_ENDPOINT = "/v2/recovery"
+CYCLE_ENDPOINT = "/v2/cycle"
 
 
 class Whoop247Data(Base247DataTemplate):
@@ -32,29 +44,53 @@ class Whoop247Data(Base247DataTemplate):
         self.mapping_repo = ExternalMappingRepository(ExternalDeviceMapping)
         self.connection_repo = UserConnectionRepository()
 
-    def _make_api_request(
+    def _pages(
         self,
         db: DbSession,
         user_id: UUID,
         endpoint: str,
-        params: dict[str, Any] | None = None,
-        headers: dict[str, str] | None = None,
-    ) -> Any:
-        """Make authenticated request to Whoop API."""
-        print(f"Making API request to {endpoint} with params: {params}")
-        return make_authenticated_request(
-            db=db,
-            user_id=user_id,
-            connection_repo=self.connection_repo,
-            oauth=self.oauth,
-            api_base_url=self.api_base_url,
-            provider_name=self.provider_name,
-            endpoint=endpoint,
-            method="GET",
-            params=params,
-            headers=headers,
+        start_time: datetime,
+        end_time: datetime,
+        failed_chunks: list[str] | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Pages of a collection endpoint, with the token resolved up front on the calling thread."""
+        access_token = get_valid_token(db, user_id, self.provider_name, self.connection_repo, self.oauth)
+        return iter_pages(
+            access_token,
+            user_id,
+            self.api_base_url,
+            self.provider_name,
+            endpoint,
+            {"start": to_whoop_time(start_time), "end": to_whoop_time(end_time)},
+            failed_chunks,
         )
 
+    def _normalize_page(
+        self,
+        page: list[dict[str, Any]],
+        normalize: Callable[[dict[str, Any], UUID], dict[str, Any]],
+        user_id: UUID,
+    ) -> list[dict[str, Any]]:
+        normalized = []
+        for item in page:
+            try:
+                normalized.append(normalize(item, user_id))
+            except Exception as e:
+                self.logger.warning(f"Failed to normalize Whoop record {item.get('id')}: {e}")
+        return normalized
+
+    async def _normalized(
+        self,
+        pages: AsyncIterator[list[dict[str, Any]]],
+        normalize: Callable[[dict[str, Any], UUID], dict[str, Any]],
+        user_id: UUID,
+    ) -> list[dict[str, Any]]:
+        """Normalize each page on a worker thread, so the next page downloads meanwhile."""
+        normalized = []
+        async for page in pages:
+            normalized.extend(await asyncio.to_thread(self._normalize_page, page, normalize, user_id))
+        return normalized
+
     # -------------------------------------------------------------------------
     # Sleep Data - Whoop /v2/activity/sleep
     # -------------------------------------------------------------------------
@@ -67,47 +103,22 @@ class Whoop247Data(Base247DataTemplate):
         end_time: datetime,
     ) -> list[dict[str, Any]]:
         """Fetch sleep data from Whoop API via v2 endpoint with pagination."""
-        all_sleep_data = []
-        next_token = None
-        max_limit = 25  # Whoop API limit
-
-        # Convert datetimes to ISO 8601 strings
-        start_iso = start_time.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-        end_iso = end_time.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        while True:
-            params: dict[str, Any] = {
-                "start": start_iso,
-                "end": end_iso,
-                "limit": max_limit,
-            }
+        failed_chunks: list[str] = []
+        pages = self._pages(db, user_id, SLEEP_ENDPOINT, start_time, end_time, failed_chunks)
+        return run_pipeline(collect_pages(pages, failed_chunks))
 
-            if next_token:
-                params["nextToken"] = next_token
-
-            try:
-                response = self._make_api_request(db, user_id, "/v2/activity/sleep", params=params)
-
-                # Extract records from response
-                records = response.get("records", []) if isinstance(response, dict) else []
-                all_sleep_data.extend(records)
-
-                # Check for next page
-                next_token = response.get("next_token") if isinstance(response, dict) else None
-
-                # Stop if no more records or no next token
-                if not records or not next_token:
-                    break
-
-            except Exception as e:
-                self.logger.error(f"Error fetching Whoop sleep data: {e}")
-                # If we got some data, return what we have; otherwise re-raise
-                if all_sleep_data:
-                    self.logger.warning(f"Returning partial sleep data due to error: {e}")
-                    break
-                raise
-
-        return all_sleep_data
+    def fetch_normalized_sleep(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> list[dict[str, Any]]:
+        """Fetch and normalize sleep data, normalizing each page while the next one is fetched."""
+        failed_chunks: list[str] = []
+        pages = self._pages(db, user_id, SLEEP_ENDPOINT, start_time, end_time, failed_chunks)
+        normalized = run_pipeline(self._normalized(pages, self.normalize_sleep, user_id))
+        return ChunkedFetchResult(normalized, failed_chunks)
 
     def normalize_sleep(
         self,
@@ -273,18 +284,56 @@ class Whoop247Data(Base247DataTemplate):
         start_time: datetime,
         end_time: datetime,
     ) -> int:
-        """Load sleep data from API and save to database."""
-        raw_data = self.get_sleep_data(db, user_id, start_time, end_time)
+        """Load sleep data from API and save to database, one page at a time."""
+        pages = self._pages(db, user_id, SLEEP_ENDPOINT, start_time, end_time)
+        return run_pipeline(self._stream(db, user_id, pages, self.normalize_sleep, self.save_sleep_batch))
+
+    async def _stream(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        pages: AsyncIterator[list[dict[str, Any]]],
+        normalize: Callable[[dict[str, Any], UUID], dict[str, Any]],
+        save: Callable[[DbSession, UUID, list[dict[str, Any]]], int],
+    ) -> int:
+        """Normalize and save each page while the next page is in flight, counting its records.
+
+        Only one page is held at a time, whatever the length of the range.
+        """
         count = 0
-        for item in raw_data:
+        async for page in pages:
+            page = await asyncio.to_thread(self._normalize_page, page, normalize, user_id)
+            await asyncio.to_thread(save, db, user_id, page)
+            count += len(page)
+        return count
+
+    def save_sleep_batch(self, db: DbSession, user_id: UUID, batch: list[dict[str, Any]]) -> int:
+        count = 0
+        for normalized in batch:
             try:
-                normalized = self.normalize_sleep(item, user_id)
                 self.save_sleep_data(db, user_id, normalized)
                 count += 1
             except Exception as e:
                 self.logger.warning(f"Failed to save sleep data: {e}")
         return count
 
+    def get_sync_families(self) -> dict[str, tuple[SyncFetcher, SyncSaver]]:
+        return {"sleep_sessions_synced": (self.fetch_normalized_sleep, self.save_sleep_batch)}
+
+    def load_all_247_data(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> dict[str, int]:
+        """Stream sleep, saving page by page, and return its record count.
+
+        Recovery and cycles are not pulled: nothing saves them yet, so fetching them
+        would only spend the rate limit shared with user syncs.
+        """
+        return {"sleep": self.load_and_save_sleep(db, user_id, start_time, end_time)}
+
     def load_and_save_all(
         self,
         db: DbSession,
@@ -328,8 +377,10 @@ class Whoop247Data(Base247DataTemplate):
         start_time: datetime,
         end_time: datetime,
     ) -> list[dict[str, Any]]:
-        """Fetch recovery data from Whoop API."""
-        return []
+        """Fetch recovery data from Whoop API via v2 endpoint with pagination."""
+        failed_chunks: list[str] = []
+        pages = self._pages(db, user_id, RECOVERY_ENDPOINT, start_time, end_time, failed_chunks)
+        return run_pipeline(collect_pages(pages, failed_chunks))
 
     def normalize_recovery(
         self,
@@ -337,7 +388,36 @@ class Whoop247Data(Base247DataTemplate):
         user_id: UUID,
     ) -> dict[str, Any]:
         """Normalize Whoop recovery data to our schema."""
-        return {}
+        score = raw_recovery.get("score", {}) or {}
+        return {
+            "user_id": user_id,
+            "provider": self.provider_name,
+            "timestamp": raw_recovery.get("created_at"),
+            "whoop_cycle_id": raw_recovery.get("cycle_id"),
+            "whoop_sleep_id": raw_recovery.get("sleep_id"),
+            "score_state": raw_recovery.get("score_state"),
+            "recovery_score": score.get("recovery_score"),
+            "resting_heart_rate": score.get("resting_heart_rate"),
+            "hrv_rmssd_ms": score.get("hrv_rmssd_milli"),
+            "spo2_percent": score.get("spo2_percentage"),
+            "skin_temp_celsius": score.get("skin_temp_celsius"),
+        }
+
+    # -------------------------------------------------------------------------
+    # Cycles - Whoop /v2/cycle
+    # -------------------------------------------------------------------------
+
+    def get_cycle_data(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> list[dict[str, Any]]:
+        """Fetch physiological cycles (strain, energy, heart rate per day) from Whoop API."""
+        failed_chunks: list[str] = []
+        pages = self._pages(db, user_id, CYCLE_ENDPOINT, start_time, end_time, failed_chunks)
+        return run_pipeline(collect_pages(pages, failed_chunks))
 
     # -------------------------------------------------------------------------
     # Activity Samples
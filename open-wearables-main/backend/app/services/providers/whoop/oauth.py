@@ -1,6 +1,5 @@
-import httpx
-
 from app.config import settings
+from app.integrations.http_client import get_http_client
 from app.schemas import (
     AuthenticationMethod,
     OAuthTokenResponse,
@@ -39,10 +38,9 @@ class WhoopOAuth(BaseOAuthTemplate):
         """Fetches Whoop user ID via API."""
         try:
             # Whoop API endpoint to get user info
-            user_info_response = httpx.get(
+            user_info_response = get_http_client(self.provider_name).get(
                 f"{self.api_base_url}/v2/user/profile/basic",
                 headers={"Authorization": f"Bearer {token_response.access_token}"},
-                timeout=30.0,
             )
             user_info_response.raise_for_status()
             user_data = user_info_response.json()
@@ -0,0 +1,103 @@
+"""Pipelined cursor pagination of Whoop v2 collection endpoints."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Coroutine
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from app.integrations.http_client import close_async_http_clients
+from app.services.providers.api_client import ProviderRateLimitedError, send_authenticated_request_async
+from app.services.providers.templates.base_247_data import ChunkedFetchResult
+from app.utils.async_utils import run_coroutine_sync
+
+PAGE_LIMIT = 25  # Whoop API limit
+
+logger = logging.getLogger(__name__)
+
+
+def to_whoop_time(value: datetime) -> str:
+    """Format a datetime as the ISO 8601 UTC timestamp Whoop expects."""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+async def iter_pages(
+    access_token: str,
+    user_id: UUID,
+    api_base_url: str,
+    provider_name: str,
+    endpoint: str,
+    params: dict[str, Any],
+    failed_chunks: list[str] | None = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Yield the records of each page of a collection endpoint.
+
+    The request for the next page is sent before the current page is yielded, so the
+    caller processes one page while the next one is in flight. After an error past the
+    first page, pages already yielded are kept and the listing ends, the rest of it being
+    added to ``failed_chunks`` so the caller reports the family as incomplete (see
+    ``ChunkedFetchResult``). Without ``failed_chunks``, and on the first page or rate
+    limits, the error is raised, since partial data would otherwise be saved as complete.
+    """
+
+    def request(next_token: str | None) -> asyncio.Task[Any]:
+        page_params = {**params, "limit": PAGE_LIMIT}
+        if next_token:
+            page_params["nextToken"] = next_token
+        return asyncio.ensure_future(
+            send_authenticated_request_async(
+                access_token=access_token,
+                user_id=user_id,
+                api_base_url=api_base_url,
+                provider_name=provider_name,
+                endpoint=endpoint,
+                params=page_params,
+            ),
+        )
+
+    pending: asyncio.Task[Any] | None = request(None)
+    pages = 0
+    try:
+        while pending is not None:
+            try:
+                response = await pending
+            except ProviderRateLimitedError:
+                raise
+            except Exception as e:
+                if not pages or failed_chunks is None:
+                    raise
+                logger.warning(f"Stopping {endpoint} listing after {pages} pages due to error: {e}")
+                failed_chunks.append(f"{endpoint} after page {pages}")
+                return
+
+            response = response if isinstance(response, dict) else {}
+            records = response.get("records") or []
+            next_token = response.get("next_token")
+            pending = request(next_token) if records and next_token else None
+
+            pages += 1
+            yield records
+    finally:
+        # The caller stopped early or failed, drop the prefetched page
+        if pending is not None and not pending.done():
+            pending.cancel()
+
+
+async def collect_pages[T](pages: AsyncIterator[list[T]], failed_chunks: list[str] | None = None) -> list[T]:
+    """Gather the items of all pages, as a ``ChunkedFetchResult`` when given the listing's ``failed_chunks``."""
+    items = [item async for page in pages for item in page]
+    return items if failed_chunks is None else ChunkedFetchResult(items, failed_chunks)
+
+
+def run_pipeline[T](coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a paging coroutine from sync code, closing its connections when done."""
+
+    async def run() -> T:
+        try:
+            return await coroutine
+        finally:
+            await close_async_http_clients()
+
+    return run_coroutine_sync(run())
@@ -1,3 +1,5 @@
+import asyncio
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, Iterable
@@ -12,13 +14,19 @@ from app.schemas import (
     WhoopWorkoutCollectionJSON,
     WhoopWorkoutJSON,
 )
-from app.services.event_record_service import event_record_service
+from app.services.providers.api_client import get_valid_token
+from app.services.providers.templates.base_247_data import ChunkedFetchResult
 from app.services.providers.templates.base_workouts import BaseWorkoutsTemplate
+from app.services.providers.whoop.pagination import PAGE_LIMIT, iter_pages, run_pipeline, to_whoop_time
+
+WORKOUT_ENDPOINT = "/v2/activity/workout"
 
 
 class WhoopWorkouts(BaseWorkoutsTemplate):
     """Whoop implementation of workouts template."""
 
+    raw_workout_schema = WhoopWorkoutJSON
+
     def get_workouts(
         self,
         db: DbSession,
@@ -27,67 +35,58 @@ class WhoopWorkouts(BaseWorkoutsTemplate):
         end_date: datetime,
     ) -> list[Any]:
         """Get workouts from Whoop API."""
-        all_workouts = []
-        next_token = None
-        max_limit = 25  # Whoop API limit
-
-        # Convert datetimes to ISO 8601 strings
-        start_iso = start_date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-        end_iso = end_date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        while True:
-            params: dict[str, Any] = {
-                "start": start_iso,
-                "end": end_iso,
-                "limit": max_limit,
-            }
-
-            if next_token:
-                params["nextToken"] = next_token
-
-            try:
-                response = self._make_api_request(db, user_id, "/v2/activity/workout", params=params)
-
-                # Parse response
-                if isinstance(response, dict):
-                    collection = WhoopWorkoutCollectionJSON(**response)
-                else:
-                    collection = WhoopWorkoutCollectionJSON(records=[])
-
-                all_workouts.extend(collection.records)
-
-                # Check for next page
-                next_token = collection.next_token
+        return self._fetch_workouts(db, user_id, to_whoop_time(start_date), to_whoop_time(end_date))
 
-                # Stop if no more records or no next token
-                if not collection.records or not next_token:
-                    break
+    async def _parsed(self, pages: AsyncIterator[list[dict[str, Any]]]) -> list[WhoopWorkoutJSON]:
+        """Parse each page on a worker thread, so the next page downloads meanwhile."""
+        workouts = []
+        async for page in pages:
+            collection = await asyncio.to_thread(WhoopWorkoutCollectionJSON, records=page)
+            workouts.extend(collection.records)
+        return workouts
 
-            except Exception as e:
-                self.logger.error(f"Error fetching Whoop workout data: {e}")
-                # If we got some data, return what we have; otherwise re-raise
-                if all_workouts:
-                    self.logger.warning(f"Returning partial workout data due to error: {e}")
-                    break
-                raise
+    def _fetch_workouts(
+        self,
+        db: DbSession,
+        user_id: UUID,
+        start: str | None,
+        end: str | None,
+    ) -> list[WhoopWorkoutJSON]:
+        """Fetch all pages of workouts, keeping the next page in flight while one is parsed."""
+        params = {}
+        if start:
+            params["start"] = start
+        if end:
+            params["end"] = end
 
-        return all_workouts
+        access_token = get_valid_token(db, user_id, self.provider_name, self.connection_repo, self.oauth)
+        failed_chunks: list[str] = []
+        pages = iter_pages(
+            access_token,
+            user_id,
+            self.api_base_url,
+            self.provider_name,
+            WORKOUT_ENDPOINT,
+            params,
+            failed_chunks,
+        )
+        return ChunkedFetchResult(run_pipeline(self._parsed(pages)), failed_chunks)
 
     def get_workouts_from_api(self, db: DbSession, user_id: UUID, **kwargs: Any) -> Any:
         """Get workouts from Whoop API with specific options."""
         start = kwargs.get("start")
         end = kwargs.get("end")
-        limit = kwargs.get("limit", 25)
+        limit = kwargs.get("limit", PAGE_LIMIT)
         next_token = kwargs.get("nextToken")
 
         # Convert start/end dates to ISO 8601 if provided
         if isinstance(start, datetime):
-            start = start.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            start = to_whoop_time(start)
         if isinstance(end, datetime):
-            end = end.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            end = to_whoop_time(end)
 
         params: dict[str, Any] = {
-            "limit": min(limit, 25),  # Whoop API max limit is 25
+            "limit": min(limit, PAGE_LIMIT),
         }
 
         if start:
@@ -97,7 +96,7 @@ class WhoopWorkouts(BaseWorkoutsTemplate):
         if next_token:
             params["nextToken"] = next_token
 
-        return self._make_api_request(db, user_id, "/v2/activity/workout", params=params)
+        return self._make_api_request(db, user_id, WORKOUT_ENDPOINT, params=params)
 
     def get_workout_detail_from_api(self, db: DbSession, user_id: UUID, workout_id: str, **kwargs: Any) -> Any:
         """Get detailed workout data from Whoop API."""
@@ -205,71 +204,28 @@ class WhoopWorkouts(BaseWorkoutsTemplate):
                 record, details = self._normalize_workout(raw_workout, user_id)
                 yield record, details
 
-    def load_data(
+    def fetch_data(
         self,
         db: DbSession,
         user_id: UUID,
         **kwargs: Any,
-    ) -> bool:
-        """Load data from Whoop API with pagination."""
-        all_workouts = []
-        next_token = None
-        max_limit = 25  # Whoop API limit
+    ) -> list[WhoopWorkoutJSON]:
+        """Fetch workouts from Whoop API with pagination.
 
-        # Get start/end dates from kwargs
+        The window is taken from ``start``/``end`` (datetimes or ISO 8601 strings) or
+        else from the ``since``/``until`` epoch seconds of a sync.
+        """
         start = kwargs.get("start")
         end = kwargs.get("end")
+        if not start and kwargs.get("since"):
+            start = datetime.fromtimestamp(kwargs["since"], tz=timezone.utc)
+        if not end and kwargs.get("until"):
+            end = datetime.fromtimestamp(kwargs["until"], tz=timezone.utc)
 
         # Convert start/end to ISO 8601 if they're datetime objects
         if isinstance(start, datetime):
-            start = start.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            start = to_whoop_time(start)
         if isinstance(end, datetime):
-            end = end.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        # Fetch all pages
-        while True:
-            params: dict[str, Any] = {
-                "limit": max_limit,
-            }
-
-            if start:
-                params["start"] = start
-            if end:
-                params["end"] = end
-            if next_token:
-                params["nextToken"] = next_token
-
-            try:
-                response = self.get_workouts_from_api(db, user_id, **params)
-
-                # Parse response
-                if isinstance(response, dict):
-                    collection = WhoopWorkoutCollectionJSON(**response)
-                else:
-                    collection = WhoopWorkoutCollectionJSON(records=[])
-
-                # collection.records is already a list of WhoopWorkoutJSON objects (parsed by Pydantic)
-                all_workouts.extend(collection.records)
-
-                # Check for next page
-                next_token = collection.next_token
-
-                # Stop if no more records or no next token
-                if not collection.records or not next_token:
-                    break
-
-            except Exception as e:
-                self.logger.error(f"Error fetching Whoop workout data: {e}")
-                # If we got some data, continue processing; otherwise re-raise
-                if all_workouts:
-                    self.logger.warning(f"Processing partial workout data due to error: {e}")
-                    break
-                raise
-
-        # Process and save all workouts
-        for record, details in self._build_bundles(all_workouts, user_id):
-            created_record = event_record_service.create(db, record)
-            detail_for_record = details.model_copy(update={"record_id": created_record.id})
-            event_record_service.create_detail(db, detail_for_record)
-
-        return True
+            end = to_whoop_time(end)
+
+        return self._fetch_workouts(db, user_id, start, end)
@@ -0,0 +1,93 @@
+"""Merging of workouts and sleeps recorded by several sources of one user.
+
+A user wearing a Garmin watch with an iPhone gets each run twice: once per device
+mapping. Records of different mappings overlapping by at least
+``record_merge_min_overlap`` of the shorter one are duplicates of each other; of each
+group, the record of the source first in ``record_source_priority`` stays canonical and
+the others are flagged ``is_canonical = False``, so queries and summaries skip them.
+"""
+
+from datetime import datetime
+from logging import Logger, getLogger
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Row
+
+from app.config import settings
+from app.database import DbSession
+from app.models import EventRecord
+from app.repositories import EventRecordRepository
+from app.utils.intervals import IntervalIndex
+
+
+class RecordMergeService:
+    """Flags duplicate workouts and sleeps recorded by several sources."""
+
+    def __init__(self, log: Logger):
+        self.logger = log
+        self.event_record_repo = EventRecordRepository(EventRecord)
+
+    def merge_record(self, db_session: DbSession, user_id: UUID, record: EventRecord) -> None:
+        """Merge a record saved at ingest with the user's records it overlaps."""
+        self.merge(db_session, user_id, record.category, record.start_datetime, record.end_datetime)
+
+    def merge(self, db_session: DbSession, user_id: UUID, category: str, start: datetime, end: datetime) -> int:
+        """
+        Re-evaluate which of a user's records of a category within [start, end) are duplicates.
+
+        Records are looked up through the mapping/time index and grouped with an interval
+        index, so merging a sync window costs one query and O(n log n) work for n records.
+        Returns the number of records whose flag changed.
+        """
+        rows = self.event_record_repo.get_overlapping(db_session, user_id, category, start, end)
+        if not rows:
+            return 0
+
+        canonical = {row.id for row in self._canonical_rows(rows)}
+        promoted = {row.id for row in rows if row.id in canonical and not row.is_canonical}
+        demoted = {row.id for row in rows if row.id not in canonical and row.is_canonical}
+        if promoted or demoted:
+            self.event_record_repo.set_canonical(db_session, promoted, demoted)
+            self.logger.debug(
+                f"Merged {category} records of user {user_id}: {len(promoted)} canonical, {len(demoted)} duplicates",
+            )
+        return len(promoted) + len(demoted)
+
+    def _canonical_rows(self, rows: list[Row[Any]]) -> list[Row[Any]]:
+        """The record of the highest-priority source of each group of duplicates."""
+        parents = {row.id: row.id for row in rows}
+
+        def root(record_id: UUID) -> UUID:
+            while parents[record_id] != record_id:
+                parents[record_id] = parents[parents[record_id]]
+                record_id = parents[record_id]
+            return record_id
+
+        index = IntervalIndex((row.start_datetime, row.end_datetime, row) for row in rows)
+        for row in rows:
+            for _, _, other in index.overlapping(row.start_datetime, row.end_datetime):
+                if other.external_device_mapping_id != row.external_device_mapping_id and self._duplicates(row, other):
+                    parents[root(other.id)] = root(row.id)
+
+        groups: dict[UUID, list[Row[Any]]] = {}
+        for row in rows:
+            groups.setdefault(root(row.id), []).append(row)
+        return [min(group, key=self._priority) for group in groups.values()]
+
+    @staticmethod
+    def _duplicates(first: Row[Any], second: Row[Any]) -> bool:
+        shorter = min(first.end_datetime - first.start_datetime, second.end_datetime - second.start_datetime)
+        overlap = min(first.end_datetime, second.end_datetime) - max(first.start_datetime, second.start_datetime)
+        return shorter.total_seconds() > 0 and overlap >= shorter * settings.record_merge_min_overlap
+
+    @staticmethod
+    def _priority(row: Row[Any]) -> tuple[int, float, datetime, str]:
+        # Most trusted source first, then the longest recording, then a stable tie-break
+        priority = [source.lower() for source in settings.record_source_priority]
+        provider = (row.provider_name or "").lower()
+        rank = priority.index(provider) if provider in priority else len(priority)
+        return rank, -(row.end_datetime - row.start_datetime).total_seconds(), row.start_datetime, str(row.id)
+
+
+record_merge_service = RecordMergeService(log=getLogger(__name__))
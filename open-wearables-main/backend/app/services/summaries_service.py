@@ -4,6 +4,8 @@ from datetime import datetime, timezone
 from logging import Logger, getLogger
 from uuid import UUID
 
+from fastapi.concurrency import run_in_threadpool
+
 from app.database import DbSession
 from app.models import DataPointSeries, EventRecord
 from app.repositories import EventRecordRepository
@@ -29,6 +31,35 @@ class SummariesService:
         self.event_record_repo = EventRecordRepository(EventRecord)
         self.data_point_repo = DataPointSeriesRepository(DataPointSeries)
 
+    def _get_sleep_heart_rate_averages(
+        self,
+        db_session: DbSession,
+        user_id: UUID,
+        results: list[dict],
+    ) -> list[int | None]:
+        """Get the average heart rate during each sleep period."""
+        # TODO: Add HRV, respiratory rate, and SpO2 when ready
+        averages: list[int | None] = []
+        for result in results:
+            avg_hr: int | None = None
+            sleep_start = result.get("min_start_time")
+            sleep_end = result.get("max_end_time")
+            if sleep_start and sleep_end:
+                try:
+                    physio_averages = self.data_point_repo.get_averages_for_time_range(
+                        db_session,
+                        user_id,
+                        sleep_start,
+                        sleep_end,
+                        SLEEP_PHYSIO_SERIES_TYPES,
+                    )
+                    hr_avg = physio_averages.get(SeriesType.heart_rate)
+                    avg_hr = int(round(hr_avg)) if hr_avg is not None else None
+                except Exception as e:
+                    self.logger.warning(f"Failed to fetch heart rate metrics for sleep: {e}")
+            averages.append(avg_hr)
+        return averages
+
     @handle_exceptions
     async def get_sleep_summaries(
         self,
@@ -43,7 +74,15 @@ class SummariesService:
         self.logger.debug(f"Fetching sleep summaries for user {user_id} from {start_date} to {end_date}")
 
         # Get aggregated data from repository (now returns list of dicts)
-        results = self.event_record_repo.get_sleep_summaries(db_session, user_id, start_date, end_date, cursor, limit)
+        results = await run_in_threadpool(
+            self.event_record_repo.get_sleep_summaries,
+            db_session,
+            user_id,
+            start_date,
+            end_date,
+            cursor,
+            limit,
+        )
 
         # Check if there's more data
         has_more = len(results) > limit
@@ -71,9 +110,11 @@ class SummariesService:
                 first_date_midnight = datetime.combine(first_date, datetime.min.time()).replace(tzinfo=timezone.utc)
                 previous_cursor = encode_cursor(first_date_midnight, first_id, "prev")
 
+        heart_rate_averages = await run_in_threadpool(self._get_sleep_heart_rate_averages, db_session, user_id, results)
+
         # Transform to schema
         data = []
-        for result in results:
+        for result, avg_hr in zip(results, heart_rate_averages, strict=True):
             # Build sleep stages if any stage data is available
             stages = None
             has_stage_data = any(
@@ -87,26 +128,6 @@ class SummariesService:
                     awake_minutes=result.get("awake_minutes"),
                 )
 
-            # Fetch average heart rate during the sleep period
-            # TODO: Add HRV, respiratory rate, and SpO2 when ready
-            avg_hr: int | None = None
-
-            sleep_start = result.get("min_start_time")
-            sleep_end = result.get("max_end_time")
-            if sleep_start and sleep_end:
-                try:
-                    physio_averages = self.data_point_repo.get_averages_for_time_range(
-                        db_session,
-                        user_id,
-                        sleep_start,
-                        sleep_end,
-                        SLEEP_PHYSIO_SERIES_TYPES,
-                    )
-                    hr_avg = physio_averages.get(SeriesType.heart_rate)
-                    avg_hr = int(round(hr_avg)) if hr_avg is not None else None
-                except Exception as e:
-                    self.logger.warning(f"Failed to fetch heart rate metrics for sleep: {e}")
-
             summary = SleepSummary(
                 date=result["sleep_date"],
                 source=DataSource(provider=result["provider_name"], device=result.get("device_id")),
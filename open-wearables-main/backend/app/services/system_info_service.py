@@ -1,8 +1,19 @@
 from collections.abc import Callable
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from logging import Logger, getLogger
 
+from redis.exceptions import RedisError
+
 from app.database import DbSession
+from app.repositories.system_stats_repository import (
+    ACTIVE_CONN,
+    DATA_POINTS,
+    SERIES_TYPE_PREFIX,
+    USERS,
+    WORKOUT_TYPE_PREFIX,
+    SystemStatsRepository,
+    day_field,
+)
 from app.schemas.series_types import get_series_type_from_id
 from app.schemas.system_info import (
     CountWithGrowth,
@@ -27,12 +38,14 @@ class SystemInfoService:
         user_connection_service: UserConnectionService,
         timeseries_service: TimeSeriesService,
         event_record_service: EventRecordService,
+        stats_repository: SystemStatsRepository,
     ):
         self.logger = log
         self.user_service = user_service
         self.user_connection_service = user_connection_service
         self.timeseries_service = timeseries_service
         self.event_record_service = event_record_service
+        self.stats_repository = stats_repository
 
     def _calculate_weekly_growth(self, current: int, previous: int) -> float:
         """Calculate weekly growth percentage."""
@@ -56,8 +69,97 @@ class SystemInfoService:
         growth = self._calculate_weekly_growth(this_week, last_week)
         return CountWithGrowth(count=total, weekly_growth=growth)
 
-    def get_system_info(self, db_session: DbSession) -> SystemInfoResponse:
-        """Get system dashboard information."""
+    def get_system_info(self, db_session: DbSession, exact: bool = False) -> SystemInfoResponse:
+        """Get system dashboard information.
+
+        By default the response is served from the maintained counters. If they are
+        not available yet (cold Redis, never reconciled) they are seeded from the
+        database. Pass ``exact=True`` to bypass the counters entirely.
+        """
+        if not exact:
+            snapshot = self.stats_repository.get_snapshot()
+            if snapshot is None:
+                snapshot = self.reconcile_counters(db_session)
+            return self._build_from_counters(snapshot)
+
+        return self._get_exact_system_info(db_session)
+
+    def reconcile_counters(self, db_session: DbSession) -> dict[str, int]:
+        """Recompute all dashboard counters from the database and overwrite the stored ones."""
+        today = datetime.now(timezone.utc).date()
+        # Daily buckets cover this week and the previous one, used for weekly growth
+        window_start = datetime.combine(today - timedelta(days=13), datetime.min.time(), tzinfo=timezone.utc)
+        window_end = datetime.combine(today + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+
+        counters: dict[str, int] = {
+            USERS: self.user_service.crud.get_total_count(db_session),
+            ACTIVE_CONN: self.user_connection_service.crud.get_active_count(db_session),
+            DATA_POINTS: self.timeseries_service.crud.get_total_count(db_session),
+        }
+
+        daily_sources: list[tuple[str, Callable[[DbSession, datetime, datetime], list[tuple[date, int]]]]] = [
+            (USERS, self.user_service.crud.get_daily_counts),
+            (ACTIVE_CONN, self.user_connection_service.crud.get_active_daily_counts),
+            (DATA_POINTS, self.timeseries_service.crud.get_daily_counts),
+        ]
+        for counter, daily_counts_func in daily_sources:
+            for day, count in daily_counts_func(db_session, window_start, window_end):
+                counters[day_field(counter, day)] = count
+
+        for series_type_id, count in self.timeseries_service.get_count_by_series_type(db_session):
+            counters[f"{SERIES_TYPE_PREFIX}{series_type_id}"] = count
+        for workout_type, count in self.event_record_service.get_count_by_workout_type(db_session):
+            counters[f"{WORKOUT_TYPE_PREFIX}{workout_type or ''}"] = count
+
+        try:
+            self.stats_repository.replace(counters)
+        except RedisError as e:
+            self.logger.warning(f"[system_stats] Failed to store reconciled counters: {e}")
+
+        return counters
+
+    def _get_counter_growth(self, snapshot: dict[str, int], counter: str, today: date) -> CountWithGrowth:
+        """Build count with growth from the total and the daily buckets of a counter."""
+        this_week = sum(snapshot.get(day_field(counter, today - timedelta(days=i)), 0) for i in range(7))
+        last_week = sum(snapshot.get(day_field(counter, today - timedelta(days=i)), 0) for i in range(7, 14))
+        return CountWithGrowth(
+            count=snapshot.get(counter, 0),
+            weekly_growth=self._calculate_weekly_growth(this_week, last_week),
+        )
+
+    def _get_top_counters(self, snapshot: dict[str, int], prefix: str, limit: int = 5) -> list[tuple[str, int]]:
+        """Get the largest positive counters sharing a prefix, with the prefix stripped."""
+        counters = [
+            (field.removeprefix(prefix), count)
+            for field, count in snapshot.items()
+            if field.startswith(prefix) and count > 0
+        ]
+        return sorted(counters, key=lambda item: item[1], reverse=True)[:limit]
+
+    def _build_from_counters(self, snapshot: dict[str, int]) -> SystemInfoResponse:
+        """Build the dashboard response from maintained counters."""
+        today = datetime.now(timezone.utc).date()
+        data_points_stats = self._get_counter_growth(snapshot, DATA_POINTS, today)
+
+        return SystemInfoResponse(
+            total_users=self._get_counter_growth(snapshot, USERS, today),
+            active_conn=self._get_counter_growth(snapshot, ACTIVE_CONN, today),
+            data_points=DataPointsInfo(
+                count=data_points_stats.count,
+                weekly_growth=data_points_stats.weekly_growth,
+                top_series_types=[
+                    SeriesTypeMetric(series_type=get_series_type_from_id(int(series_type_id)).value, count=count)
+                    for series_type_id, count in self._get_top_counters(snapshot, SERIES_TYPE_PREFIX)
+                ],
+                top_workout_types=[
+                    WorkoutTypeMetric(workout_type=workout_type or "Unknown", count=count)
+                    for workout_type, count in self._get_top_counters(snapshot, WORKOUT_TYPE_PREFIX)
+                ],
+            ),
+        )
+
+    def _get_exact_system_info(self, db_session: DbSession) -> SystemInfoResponse:
+        """Get system dashboard information with exact counts from the database."""
         now = datetime.now(timezone.utc)
         week_ago = now - timedelta(days=7)
         two_weeks_ago = now - timedelta(days=14)
@@ -130,4 +232,5 @@ system_info_service = SystemInfoService(
     user_connection_service=user_connection_service,
     timeseries_service=timeseries_service,
     event_record_service=event_record_service,
+    stats_repository=SystemStatsRepository(),
 )
@@ -2,6 +2,8 @@ from datetime import datetime
 from logging import Logger, getLogger
 from uuid import UUID
 
+from fastapi.concurrency import run_in_threadpool
+
 from app.database import DbSession
 from app.models import DataPointSeries
 from app.repositories import DataPointSeriesRepository
@@ -33,8 +35,7 @@ class TimeSeriesService(
         db_session: DbSession,
         samples: list[TimeSeriesSampleCreate] | list[HeartRateSampleCreate] | list[StepSampleCreate],
     ) -> None:
-        for sample in samples:
-            self.crud.create(db_session, sample)
+        self.crud.create_many(db_session, samples)
 
     def get_total_count(self, db_session: DbSession) -> int:
         """Get total count of all data points."""
@@ -69,7 +70,7 @@ class TimeSeriesService(
         types: list[SeriesType],
         params: TimeSeriesQueryParams,
     ) -> PaginatedResponse[TimeSeriesSample]:
-        samples, total_count = self.crud.get_samples(db_session, params, types, user_id)
+        samples, total_count = await run_in_threadpool(self.crud.get_samples, db_session, params, types, user_id)
 
         limit = params.limit or 50
         has_more = len(samples) > limit
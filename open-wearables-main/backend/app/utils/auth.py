@@ -10,11 +10,21 @@ from app.database import DbSession
 from app.models import Developer
 from app.repositories.developer_repository import DeveloperRepository
 from app.schemas.sdk import SDKAuthContext
+from app.utils.auth_cache import auth_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 developer_repository = DeveloperRepository(Developer)
 
 
+def _get_developer(db: DbSession, developer_id: UUID) -> Developer | None:
+    """Get developer by ID, served from the auth cache when possible."""
+    if developer := auth_cache.get(db, Developer, developer_id):
+        return developer
+    if developer := developer_repository.get(db, developer_id):
+        auth_cache.set(developer)
+    return developer
+
+
 async def get_current_developer(
     db: DbSession,
     token: Annotated[str | None, Depends(oauth2_scheme)],
@@ -49,7 +59,7 @@ async def get_current_developer(
     except JWTError:
         raise credentials_exception
 
-    developer = developer_repository.get(db, UUID(developer_id))
+    developer = _get_developer(db, UUID(developer_id))
     if not developer:
         raise credentials_exception
 
@@ -87,7 +97,7 @@ async def get_current_developer_optional(
     except JWTError:
         return None
 
-    return developer_repository.get(db, developer_uuid)
+    return _get_developer(db, developer_uuid)
 
 
 DeveloperDep = Annotated[Developer, Depends(get_current_developer)]
@@ -0,0 +1,231 @@
+"""In-process cache of validated API keys and developers.
+
+Authentication runs on every request, so the API key / developer lookups are the
+most frequent queries in the system. Validated rows are cached per process in an
+LRU with a short TTL and, optionally, in a shared Redis tier that never holds
+secrets (API key values, password hashes). Changes (rotation,
+deletion, updates) are broadcast over Redis pub/sub so every process drops its
+copy immediately instead of waiting for the TTL.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from logging import getLogger
+from typing import Any
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.database import BaseDbModel, DbSession
+from app.integrations.redis_client import get_redis_client
+
+INVALIDATION_CHANNEL = "auth_cache:invalidate"
+# Columns never written to the shared Redis tier, left unloaded on rows restored from it
+SECRET_COLUMNS = frozenset({"hashed_password"})
+
+logger = getLogger(__name__)
+
+
+class LRUTTLCache[K, V]:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def _snapshot(instance: BaseDbModel) -> dict[str, Any]:
+    """Column values of a loaded instance."""
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+
+
+def _serialize(model: type[BaseDbModel], snapshot: dict[str, Any]) -> str:
+    """JSON of the column values to share, without secrets nor the primary key.
+
+    The primary key of an API key is the key value itself, so it is restored from the
+    lookup key on read instead of being stored.
+    """
+    excluded = SECRET_COLUMNS | {column.key for column in inspect(model).primary_key}
+    return json.dumps({key: value for key, value in snapshot.items() if key not in excluded}, default=str)
+
+
+def _deserialize(model: type[BaseDbModel], payload: str, key: str) -> dict[str, Any]:
+    """Restore column values from JSON and the primary key, converting back to the column python types."""
+    data = json.loads(payload)
+    (primary_key,) = inspect(model).primary_key
+    data[primary_key.key] = key
+    for attr in inspect(model).column_attrs:
+        value = data.get(attr.key)
+        if value is None:
+            continue
+        python_type = attr.columns[0].type.python_type
+        if python_type is datetime:
+            data[attr.key] = datetime.fromisoformat(value)
+        elif python_type is UUID:
+            data[attr.key] = UUID(value)
+    return data
+
+
+class AuthCache:
+    """Cache of authentication rows (API keys, developers) keyed by primary key."""
+
+    def __init__(self, maxsize: int, ttl_seconds: int, redis_ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self._local: LRUTTLCache[tuple[str, str], dict[str, Any]] = LRUTTLCache(maxsize, ttl_seconds)
+        self._listener: threading.Thread | None = None
+        self._listener_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def _redis_key(namespace: str, key: str) -> str:
+        # Keys may be secrets (API key values), so Redis only sees their digest
+        return f"auth_cache:{namespace}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    def get[ModelType: BaseDbModel](
+        self,
+        db_session: DbSession,
+        model: type[ModelType],
+        key: UUID | str,
+    ) -> ModelType | None:
+        """Return the cached row attached to the session, without querying the database."""
+        if not self.enabled:
+            return None
+        self._ensure_listener()
+
+        namespace, cache_key = model.__tablename__, str(key)
+        snapshot = self._local.get((namespace, cache_key))
+
+        if snapshot is None and self.redis_ttl_seconds > 0:
+            try:
+                payload = get_redis_client().get(self._redis_key(namespace, cache_key))
+            except RedisError as e:
+                logger.warning(f"[auth_cache] Failed to read shared cache: {e}")
+                payload = None
+            if payload:
+                snapshot = _deserialize(model, payload, cache_key)
+                self._local.set((namespace, cache_key), snapshot)
+
+        if snapshot is None:
+            return None
+        instance = model(**snapshot)
+        make_transient_to_detached(instance)
+        return db_session.merge(instance, load=False)
+
+    def set(self, instance: BaseDbModel) -> None:
+        """Cache a row that has just been validated against the database."""
+        if not self.enabled:
+            return
+        self._ensure_listener()
+        namespace, cache_key = instance.__tablename__, str(instance.id)
+        snapshot = _snapshot(instance)
+        self._local.set((namespace, cache_key), snapshot)
+
+        if self.redis_ttl_seconds > 0:
+            try:
+                get_redis_client().set(
+                    self._redis_key(namespace, cache_key),
+                    _serialize(type(instance), snapshot),
+                    ex=self.redis_ttl_seconds,
+                )
+            except RedisError as e:
+                logger.warning(f"[auth_cache] Failed to write shared cache: {e}")
+
+    def invalidate(self, model: type[BaseDbModel], key: UUID | str) -> None:
+        """Drop a row from this process, the shared tier and (via pub/sub) every other process."""
+        namespace, cache_key = model.__tablename__, str(key)
+        self._local.delete((namespace, cache_key))
+        try:
+            client = get_redis_client()
+            if self.redis_ttl_seconds > 0:
+                client.delete(self._redis_key(namespace, cache_key))
+            client.publish(INVALIDATION_CHANNEL, json.dumps({"namespace": namespace, "key": cache_key}))
+        except RedisError as e:
+            logger.warning(f"[auth_cache] Failed to publish invalidation of {namespace} {cache_key}: {e}")
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def _handle_invalidation(self, message: dict[str, Any]) -> None:
+        if message.get("type") != "message":
+            return
+        try:
+            data = json.loads(message["data"])
+            self._local.delete((data["namespace"], data["key"]))
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"[auth_cache] Ignoring malformed invalidation message: {message.get('data')!r}")
+
+    def _listen(self) -> None:
+        """Apply invalidations published by other processes, reconnecting on failure."""
+        backoff = 1.0
+        reconnecting = False
+        while True:
+            try:
+                pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                if reconnecting:
+                    # Invalidations may have been missed while disconnected
+                    self._local.clear()
+                backoff = 1.0
+                for message in pubsub.listen():
+                    self._handle_invalidation(message)
+                return
+            except RedisError as e:
+                logger.warning(f"[auth_cache] Invalidation listener disconnected: {e}")
+                reconnecting = True
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None:
+            return
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="auth-cache-invalidation", daemon=True)
+                self._listener.start()
+
+
+auth_cache = AuthCache(
+    maxsize=settings.auth_cache_max_entries,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+    redis_ttl_seconds=settings.auth_cache_redis_ttl_seconds,
+)
@@ -0,0 +1,66 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+
+def lttb[T](points: Sequence[T], threshold: int, x: list[float], y: list[float]) -> list[T]:
+    """Downsample a series with the Largest-Triangle-Three-Buckets algorithm.
+
+    Keeps the first and last points and, for every bucket in between, the point forming
+    the largest triangle with the previously selected point and the average of the next
+    bucket. Preserves the visual shape (peaks, drops) far better than plain decimation.
+
+    Args:
+        points: Points ordered by x.
+        threshold: Maximum number of points to return (0 disables downsampling). Below 3
+            no bucket fits between the endpoints: 2 keeps the first and last points, 1 the first.
+        x: Numeric x coordinate of each point.
+        y: Numeric y coordinate of each point.
+
+    Returns:
+        The selected subset of ``points``, in order.
+    """
+    size = len(points)
+    if threshold <= 0 or size <= threshold:
+        return list(points)
+    if threshold < 3:
+        return [points[0], points[-1]][:threshold]
+
+    sampled = [points[0]]
+    bucket_size = (size - 2) / (threshold - 2)
+    selected = 0
+
+    for bucket in range(threshold - 2):
+        # Average of the next bucket is the third vertex of the triangle
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, size)
+        next_len = next_end - next_start
+        avg_x = sum(x[next_start:next_end]) / next_len
+        avg_y = sum(y[next_start:next_end]) / next_len
+
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        ax, ay = x[selected], y[selected]
+
+        max_area = -1.0
+        selected_in_bucket = start
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (y[i] - ay) - (ax - x[i]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                selected_in_bucket = i
+
+        selected = selected_in_bucket
+        sampled.append(points[selected])
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def lttb_timeseries(samples: Sequence[tuple[datetime, float]], threshold: int) -> list[tuple[datetime, float]]:
+    """Downsample (timestamp, value) samples with LTTB."""
+    return lttb(
+        samples,
+        threshold,
+        x=[timestamp.timestamp() for timestamp, _ in samples],
+        y=[float(value) for _, value in samples],
+    )
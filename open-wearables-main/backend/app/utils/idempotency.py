@@ -0,0 +1,104 @@
+"""Deduplication of SDK uploads retried by mobile clients.
+
+SDKs retry uploads on flaky networks, and series samples have no natural key, so every
+retry imported again would duplicate data. An upload is identified by the SHA-256 of its
+body and, when sent, by its ``Idempotency-Key`` header. The outcome of a successful
+import is kept in Redis for ``sdk_upload_dedup_ttl_seconds``, so retries are answered
+from there without parsing the payload again.
+"""
+
+import hashlib
+import json
+from logging import getLogger
+from typing import BinaryIO
+
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.integrations.redis_client import get_redis_client
+from app.schemas import UploadDataResponse
+
+PENDING = "pending"
+
+logger = getLogger(__name__)
+
+
+class IdempotentUpload:
+    """One upload of a user to an SDK sync endpoint, imported at most once."""
+
+    def __init__(self, endpoint: str, user_id: str, body: BinaryIO, idempotency_key: str | None = None):
+        self.sha256 = hashlib.file_digest(body, "sha256").hexdigest()
+        body.seek(0)
+        prefix = f"sdk_upload:{endpoint}:{user_id}"
+        self.outcome_key = f"{prefix}:sha256:{self.sha256}"
+        self.idempotency_key = f"{prefix}:key:{idempotency_key}" if idempotency_key else None
+        self.claimed = False
+
+    def begin(self) -> UploadDataResponse | None:
+        """
+        Claim the import of the upload.
+
+        Returns:
+            UploadDataResponse | None: Outcome of the earlier import of the same upload, to replay,
+                or None when this request should import it
+
+        Raises:
+            HTTPException: 422 if the idempotency key was used for a different body,
+                409 while the same upload is still being imported by another request
+        """
+        try:
+            redis = get_redis_client()
+            if self.idempotency_key:
+                sha256 = redis.get(self.idempotency_key)
+                if sha256 is not None and sha256 != self.sha256:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail="Idempotency-Key was already used for a different payload",
+                    )
+            # An outcome expiring between the two calls is claimed on the next attempt
+            for _ in range(2):
+                if redis.set(self.outcome_key, PENDING, nx=True, ex=settings.sdk_upload_pending_seconds):
+                    self.claimed = True
+                    return None
+                stored = redis.get(self.outcome_key)
+                if stored == PENDING:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="The same upload is still being imported",
+                        headers={"Retry-After": "30"},
+                    )
+                if stored is not None:
+                    return UploadDataResponse(**json.loads(stored))
+        except RedisError as e:
+            logger.warning(f"[idempotency] Failed to check upload {self.sha256}, importing it: {e}")
+        return None
+
+    def finish(self, outcome: UploadDataResponse) -> None:
+        """Keep the outcome of a successful import for retries; release the claim of a failed one."""
+        if not self.claimed:
+            return
+        try:
+            redis = get_redis_client()
+            if outcome.status_code != status.HTTP_200_OK:
+                # Parse errors and transient failures alike may be retried
+                self.release()
+                return
+            ttl = settings.sdk_upload_dedup_ttl_seconds
+            pipeline = redis.pipeline(transaction=False)
+            pipeline.set(self.outcome_key, outcome.model_dump_json(), ex=ttl)
+            if self.idempotency_key:
+                pipeline.set(self.idempotency_key, self.sha256, ex=ttl)
+            pipeline.execute()
+        except RedisError as e:
+            logger.warning(f"[idempotency] Failed to store outcome of upload {self.sha256}: {e}")
+
+    def release(self) -> None:
+        """Let a retry import the upload again, after an import that failed."""
+        if not self.claimed:
+            return
+        self.claimed = False
+        try:
+            get_redis_client().delete(self.outcome_key)
+        except RedisError as e:
+            logger.warning(f"[idempotency] Failed to release upload {self.sha256}: {e}")
@@ -0,0 +1,29 @@
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+
+
+class IntervalIndex[T]:
+    """Static index of time intervals answering overlap queries by bisection.
+
+    Intervals are kept sorted by start. Any interval overlapping ``[start, end)`` starts
+    within ``[start - longest, end)``, where ``longest`` is the longest indexed interval, so
+    a query bisects to that range in O(log n) and only scans the intervals starting in it.
+    Workouts and sleeps are bounded in length, which keeps the scanned range short.
+    """
+
+    def __init__(self, intervals: Iterable[tuple[datetime, datetime, T]]):
+        self._intervals = sorted(intervals, key=lambda interval: interval[0])
+        self._starts = [start for start, _, _ in self._intervals]
+        self._longest = max((end - start for start, end, _ in self._intervals), default=timedelta(0))
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def overlapping(self, start: datetime, end: datetime) -> Iterator[tuple[datetime, datetime, T]]:
+        """Intervals sharing some time with ``[start, end)``, ordered by start."""
+        first = bisect_left(self._starts, start - self._longest)
+        last = bisect_left(self._starts, end)
+        for interval in self._intervals[first:last]:
+            if interval[1] > start:
+                yield interval
@@ -0,0 +1,186 @@
+"""Incremental parsing of large JSON uploads.
+
+Health exports hold a few arrays of many small items, e.g. ``{"data": {"records": [...]}}``.
+``iter_sections`` reads such a document from a binary stream in chunks and yields the items
+of the wanted arrays one at a time, so the whole document is never held in memory. Each item
+is decoded by the C-accelerated ``json`` decoder; only the enclosing objects and arrays are
+walked in Python.
+"""
+
+import codecs
+import json
+import re
+from collections.abc import Callable, Collection, Iterator
+from typing import Any, BinaryIO
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """Tokens and values of a JSON document read from a binary stream chunk by chunk."""
+
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the unread part of the buffer, False at the end of the stream."""
+        if self._eof:
+            return False
+        # Reads grow with the pending value, so a large value is decoded in few attempts
+        chunk = self._stream.read(max(self._chunk_size, len(self._buffer) - self._pos))
+        self._eof = not chunk
+        self._buffer = self._buffer[self._pos :] + self._decoder.decode(chunk, final=self._eof)
+        self._pos = 0
+        return True
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"Invalid JSON: {message}")
+
+    def peek(self) -> str:
+        """Next character after whitespace, empty at the end of the document."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def skip_to(self, char: str) -> None:
+        """Skip everything before the next ``char``."""
+        while (found := self._buffer.find(char, self._pos)) == -1:
+            self._pos = len(self._buffer)
+            if not self._fill():
+                raise self._error(f"{char!r} not found")
+        self._pos = found
+
+    def expect(self, char: str) -> None:
+        if (found := self.peek()) != char:
+            raise self._error(f"expected {char!r}, found {found or 'end of document'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self._buffer) and self._fill():
+                continue  # A number or literal may go on in the next chunk
+            self._pos = end
+            return value
+
+    def _separator(self, closing: str) -> bool:
+        """Consume the separator after a member or element, False after the last one."""
+        found = self.peek()
+        self._pos += 1
+        if found == closing:
+            return False
+        if found != ",":
+            raise self._error(f"expected ',' or {closing!r}, found {found or 'end of document'!r}")
+        return True
+
+    def members(self) -> Iterator[str]:
+        """Keys of the next object, each value must be consumed before the next key is taken."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise self._error(f"object key {key!r} is not a string")
+            self.expect(":")
+            yield key
+            if not self._separator("}"):
+                return
+
+    def elements(self) -> Iterator[Any]:
+        """Decoded elements of the next array."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if not self._separator("]"):
+                return
+
+
+def iter_sections(
+    stream: BinaryIO,
+    root: str,
+    sections: Collection[str],
+    skip_prefix: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[tuple[str, Any]]:
+    """
+    Yield the items of arrays of the ``root`` object of a JSON document, in document order.
+
+    Args:
+        stream: Binary stream of the UTF-8 document
+        root: Key of the object holding the arrays, e.g. "data"
+        sections: Keys of the arrays whose items are yielded; other values are skipped
+        skip_prefix: Ignore anything before the document and after it (multipart leftovers)
+        chunk_size: Bytes read at a time
+
+    Yields:
+        tuple[str, Any]: Key of the array and one of its items
+
+    Raises:
+        ValueError: If the document is malformed or has no ``root`` object
+    """
+    reader = _Reader(stream, chunk_size)
+    if skip_prefix:
+        reader.skip_to("{")
+    found = False
+    for key in reader.members():
+        if key != root or found:
+            reader.value()
+            continue
+        found = True
+        for section in reader.members():
+            if section in sections and reader.peek() == "[":
+                for item in reader.elements():
+                    yield section, item
+            else:
+                reader.value()
+    if not found:
+        raise ValueError(f"No {root!r} object found")
+    if not skip_prefix and reader.peek():
+        raise ValueError("Invalid JSON: extra data after the document")
+
+
+def is_well_formed(
+    stream: BinaryIO,
+    root: str,
+    sections: Collection[str],
+    skip_prefix: bool = False,
+    validate: Callable[[str, Any], object] | None = None,
+) -> bool:
+    """
+    Check a whole document with ``iter_sections``, without keeping its items, and rewind the stream.
+
+    ``validate`` is called with each section name and item; a ``ValueError`` it raises (such as a
+    pydantic ``ValidationError``) makes the document invalid as well.
+    """
+    try:
+        for section, item in iter_sections(stream, root, sections, skip_prefix):
+            if validate is not None:
+                validate(section, item)
+    except ValueError:
+        return False
+    finally:
+        stream.seek(0)
+    return True
@@ -0,0 +1,59 @@
+"""event record type indexes
+
+Revision ID: 3f9d1c2a7b84
+Revises: 218666d94c82
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9d1c2a7b84"
+down_revision: Union[str, None] = "218666d94c82"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Exact-match filtering on unified workout types; supersedes the (mapping, category) index
+    op.create_index(
+        "idx_event_record_mapping_category_type",
+        "event_record",
+        ["external_device_mapping_id", "category", "type"],
+        unique=False,
+    )
+    op.drop_index("idx_event_record_mapping_category", table_name="event_record")
+
+    # Fuzzy (ILIKE '%...%') filtering on record type and source name
+    op.create_index(
+        "idx_event_record_type_trgm",
+        "event_record",
+        ["type"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"type": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "idx_event_record_source_name_trgm",
+        "event_record",
+        ["source_name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"source_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_event_record_source_name_trgm", table_name="event_record")
+    op.drop_index("idx_event_record_type_trgm", table_name="event_record")
+    op.create_index(
+        "idx_event_record_mapping_category",
+        "event_record",
+        ["external_device_mapping_id", "category"],
+        unique=False,
+    )
+    op.drop_index("idx_event_record_mapping_category_type", table_name="event_record")
@@ -0,0 +1,33 @@
+"""sync watermarks
+
+Revision ID: 8d2e5f7a9c13
+Revises: 3f9d1c2a7b84
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2e5f7a9c13"
+down_revision: Union[str, None] = "3f9d1c2a7b84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_watermark",
+        sa.Column("user_connection_id", sa.UUID(), nullable=False),
+        sa.Column("data_type", sa.String(length=64), nullable=False),
+        sa.Column("synced_until", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_connection_id"], ["user_connection.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_connection_id", "data_type"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sync_watermark")
@@ -0,0 +1,36 @@
+"""event record canonical flag
+
+Revision ID: a4c7e2f91b30
+Revises: 8d2e5f7a9c13
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c7e2f91b30"
+down_revision: Union[str, None] = "8d2e5f7a9c13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "event_record",
+        sa.Column("is_canonical", sa.Boolean(), server_default=sa.true(), nullable=False),
+    )
+    op.create_index(
+        "idx_event_record_canonical",
+        "event_record",
+        ["external_device_mapping_id", "category", "start_datetime"],
+        unique=False,
+        postgresql_where=sa.text("is_canonical"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_event_record_canonical", table_name="event_record")
+    op.drop_column("event_record", "is_canonical")
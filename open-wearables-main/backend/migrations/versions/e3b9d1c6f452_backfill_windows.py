@@ -0,0 +1,38 @@
+"""backfill windows
+
+Revision ID: e3b9d1c6f452
+Revises: a4c7e2f91b30
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b9d1c6f452"
+down_revision: Union[str, None] = "a4c7e2f91b30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "backfill_window",
+        sa.Column("user_connection_id", sa.UUID(), nullable=False),
+        sa.Column("window_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("window_end", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_connection_id"], ["user_connection.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_connection_id", "window_start"),
+    )
+    op.add_column("user_connection", sa.Column("backfill_completed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("user_connection", "backfill_completed_at")
+    op.drop_table("backfill_window")
@@ -0,0 +1,33 @@
+"""Replay archived raw provider payloads through the current normalizers.
+
+Usage:
+    python scripts/replay_raw_archive.py --provider garmin --family workouts
+    python scripts/replay_raw_archive.py --provider polar --user-id <uuid>
+"""
+
+import argparse
+from uuid import UUID
+
+from app.database import SessionLocal
+from app.integrations.raw_archive import get_raw_archive
+from app.services.providers.replay import replay_archive
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--provider", help="Only replay payloads of this provider")
+    parser.add_argument("--user-id", type=UUID, help="Only replay payloads of this user")
+    parser.add_argument("--family", help="Only replay this data family (e.g. workouts, sleeps)")
+    args = parser.parse_args()
+
+    archive = get_raw_archive()
+    if archive is None:
+        raise SystemExit("Raw payload archive is disabled (set RAW_ARCHIVE_BACKEND)")
+
+    with SessionLocal() as db:
+        result = replay_archive(db, archive, args.provider, args.user_id, args.family)
+    print(f"✓ Replayed {result['replayed']} payloads, skipped {result['skipped']}, failed {result['failed']}")
+
+
+if __name__ == "__main__":
+    main()
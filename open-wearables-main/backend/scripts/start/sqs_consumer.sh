@@ -0,0 +1,4 @@
+#!/bin/bash
+set -e -x
+
+uv run python -m app.integrations.sqs_consumer
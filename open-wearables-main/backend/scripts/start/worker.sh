@@ -1,4 +1,5 @@
 #!/bin/bash
 set -e -x
 
-uv run celery -A app.main:celery_app worker --loglevel=info
+# CELERY_QUEUES limits the worker to some queues (e.g. "bulk"), it consumes all of them by default
+uv run celery -A app.main:celery_app worker --loglevel=info ${CELERY_QUEUES:+--queues "$CELERY_QUEUES"}
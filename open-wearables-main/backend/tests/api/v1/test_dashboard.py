@@ -3,11 +3,15 @@ Tests for dashboard endpoints.
 
 Tests cover:
 - GET /api/v1/dashboard/stats - get system dashboard statistics
+- GET /api/v1/dashboard/queues - get background task queue metrics
 """
 
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from app.schemas import QueueMetrics
 from tests.factories import (
     DataPointSeriesFactory,
     DeveloperFactory,
@@ -193,6 +197,22 @@ class TestGetDashboardStats:
             assert "count" in top_workouts[0]
             assert isinstance(top_workouts[0]["count"], int)
 
+    def test_get_dashboard_stats_exact(self, client: TestClient, db: Session, api_v1_prefix: str) -> None:
+        """Test that exact=true bypasses the maintained counters."""
+        # Arrange
+        developer = DeveloperFactory(email="test@example.com", password="test123")
+        headers = developer_auth_headers(developer.id)
+        UserFactory()
+
+        # Act
+        with patch("app.services.system_info_service.system_info_service.stats_repository") as mock_stats:
+            response = client.get(f"{api_v1_prefix}/dashboard/stats", headers=headers, params={"exact": "true"})
+
+        # Assert
+        assert response.status_code == 200
+        mock_stats.get_snapshot.assert_not_called()
+        assert response.json()["total_users"]["count"] == 1
+
     def test_get_dashboard_stats_unauthorized(self, client: TestClient, api_v1_prefix: str) -> None:
         """Test getting dashboard stats fails without authentication."""
         # Act
@@ -325,3 +345,39 @@ class TestGetDashboardStats:
             assert "total_users" in data
             assert "active_conn" in data
             assert "data_points" in data
+
+
+class TestGetQueueMetrics:
+    """Tests for GET /api/v1/dashboard/queues."""
+
+    def test_get_queue_metrics(self, client: TestClient, db: Session, api_v1_prefix: str) -> None:
+        """Test the depth and wait times of the task queues are listed."""
+        # Arrange
+        developer = DeveloperFactory()
+        headers = developer_auth_headers(developer.id)
+        queues = [
+            QueueMetrics(
+                queue="bulk",
+                depth=3,
+                latency_samples=2,
+                latency_p50_seconds=1.5,
+                latency_p95_seconds=40.0,
+                latency_max_seconds=40.0,
+            ),
+        ]
+
+        # Act
+        with patch("app.api.routes.v1.dashboard.get_queue_metrics", return_value=queues):
+            response = client.get(f"{api_v1_prefix}/dashboard/queues", headers=headers)
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == [queue.model_dump() for queue in queues]
+
+    def test_get_queue_metrics_unauthorized(self, client: TestClient, api_v1_prefix: str) -> None:
+        """Test queue metrics require authentication."""
+        # Act
+        response = client.get(f"{api_v1_prefix}/dashboard/queues")
+
+        # Assert
+        assert response.status_code == 401
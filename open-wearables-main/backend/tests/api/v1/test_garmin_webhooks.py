@@ -2,21 +2,58 @@
 Tests for Garmin webhook endpoints.
 
 Tests the /api/v1/garmin/webhooks endpoints including:
-- POST /api/v1/garmin/webhooks/ping - test ping webhook
-- POST /api/v1/garmin/webhooks/push - test push webhook
+- POST /api/v1/garmin/webhooks/ping - test ping webhook (queued, coalesced)
+- POST /api/v1/garmin/webhooks/push - test push webhook (wellness summaries queued)
 - GET /api/v1/garmin/webhooks/health - test health check
 - Authentication and authorization
 - Error cases
 """
 
-from unittest.mock import MagicMock
+from collections.abc import Generator
+from unittest.mock import MagicMock, patch
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from app.integrations.redis_client import get_redis_client
 from tests.factories import UserConnectionFactory, UserFactory
 
 
+@pytest.fixture
+def queued_pings() -> Generator[set[str], None, None]:
+    """Coalescing keys of queued pings, claimed in Redis as SET NX would."""
+    claimed: set[str] = set()
+    pending: list[str] = []
+
+    def execute() -> list[bool]:
+        results = [key not in claimed for key in pending]
+        claimed.update(pending)
+        pending.clear()
+        return results
+
+    pipeline = get_redis_client().pipeline.return_value
+    pipeline.set.side_effect = lambda key, *args, **kwargs: pending.append(key)
+    pipeline.execute.side_effect = execute
+    yield claimed
+    pipeline.set.side_effect = None
+    pipeline.execute.side_effect = None
+
+
+@pytest.fixture
+def ping_task() -> Generator[MagicMock, None, None]:
+    with patch("app.api.routes.v1.garmin_webhooks.process_garmin_pings") as task:
+        yield task
+
+
+def _callback_url(token: str, start: int = 1234567890) -> str:
+    return (
+        "https://apis.garmin.com/wellness-api/rest/activities"
+        f"?uploadStartTimeInSeconds={start}&uploadEndTimeInSeconds={start + 10}&token={token}"
+    )
+
+
+@pytest.mark.usefixtures("queued_pings")
 class TestGarminPingWebhook:
     """Test suite for Garmin ping webhook endpoint."""
 
@@ -25,8 +62,9 @@ class TestGarminPingWebhook:
         client: TestClient,
         db: Session,
         mock_external_apis: dict[str, MagicMock],
+        ping_task: MagicMock,
     ) -> None:
-        """Test successfully receiving Garmin ping notification."""
+        """Test a ping is acknowledged and queued without pulling its callback URL in the request."""
         # Arrange
         user = UserFactory()
         UserConnectionFactory(
@@ -39,23 +77,11 @@ class TestGarminPingWebhook:
             "activities": [
                 {
                     "userId": "garmin_user_123",
-                    "callbackURL": "https://apis.garmin.com/wellness-api/rest/activities?uploadStartTimeInSeconds=1234567890&uploadEndTimeInSeconds=1234567900&token=abc123",
+                    "callbackURL": _callback_url("abc123"),
                 },
             ],
         }
 
-        # Mock httpx response for callback URL
-        mock_httpx = mock_external_apis["httpx"]
-        mock_response = mock_httpx.return_value.__aenter__.return_value.get.return_value
-        mock_response.__aenter__.return_value.status_code = 200
-        mock_response.__aenter__.return_value.json.return_value = [
-            {
-                "activityId": 12345,
-                "activityName": "Morning Run",
-                "startTimeInSeconds": 1234567890,
-            },
-        ]
-
         # Act
         response = client.post(
             "/api/v1/garmin/webhooks/ping",
@@ -65,10 +91,18 @@ class TestGarminPingWebhook:
 
         # Assert
         assert response.status_code == 200
-        data = response.json()
-        assert "processed" in data
-        assert "errors" in data
-        assert "activities" in data
+        assert response.json() == {"queued": 1, "coalesced": 0, "errors": []}
+        mock_external_apis["httpx"].assert_not_called()
+        (pings,) = ping_task.delay.call_args.args
+        assert pings == [
+            {
+                "summary_type": "activities",
+                "garmin_user_id": "garmin_user_123",
+                "user_id": str(user.id),
+                "callback_url": _callback_url("abc123"),
+                "attempt": 0,
+            },
+        ]
 
     def test_ping_webhook_missing_client_id(self, client: TestClient, db: Session) -> None:
         """Test that ping webhook requires garmin-client-id header."""
@@ -95,7 +129,7 @@ class TestGarminPingWebhook:
         self,
         client: TestClient,
         db: Session,
-        mock_external_apis: dict[str, MagicMock],
+        ping_task: MagicMock,
     ) -> None:
         """Test ping webhook with unknown Garmin user."""
         # Arrange
@@ -119,14 +153,15 @@ class TestGarminPingWebhook:
         # Assert
         assert response.status_code == 200
         data = response.json()
-        assert "errors" in data
-        assert len(data["errors"]) > 0
+        assert data["queued"] == 0
+        assert data["errors"] == ["User unknown_garmin_user not connected"]
+        ping_task.delay.assert_not_called()
 
     def test_ping_webhook_no_callback_url(
         self,
         client: TestClient,
         db: Session,
-        mock_external_apis: dict[str, MagicMock],
+        ping_task: MagicMock,
     ) -> None:
         """Test ping webhook with missing callback URL."""
         # Arrange
@@ -155,16 +190,15 @@ class TestGarminPingWebhook:
 
         # Assert
         assert response.status_code == 200
-        data = response.json()
-        assert "processed" in data
+        assert response.json()["queued"] == 0
 
-    def test_ping_webhook_multiple_activities(
+    def test_ping_webhook_multiple_users(
         self,
         client: TestClient,
         db: Session,
-        mock_external_apis: dict[str, MagicMock],
+        ping_task: MagicMock,
     ) -> None:
-        """Test ping webhook with multiple activities."""
+        """Test pings of several users are resolved and queued in one task."""
         # Arrange
         user1 = UserFactory()
         user2 = UserFactory()
@@ -181,23 +215,11 @@ class TestGarminPingWebhook:
         headers = {"garmin-client-id": "test-client-id"}
         payload = {
             "activities": [
-                {
-                    "userId": "garmin_user_1",
-                    "callbackURL": "https://apis.garmin.com/wellness-api/rest/activities?token=token1",
-                },
-                {
-                    "userId": "garmin_user_2",
-                    "callbackURL": "https://apis.garmin.com/wellness-api/rest/activities?token=token2",
-                },
+                {"userId": "garmin_user_1", "callbackURL": _callback_url("token1")},
+                {"userId": "garmin_user_2", "callbackURL": _callback_url("token2")},
             ],
         }
 
-        # Mock httpx response
-        mock_httpx = mock_external_apis["httpx"]
-        mock_response = mock_httpx.return_value.__aenter__.return_value.get.return_value
-        mock_response.__aenter__.return_value.status_code = 200
-        mock_response.__aenter__.return_value.json.return_value = [{"activityId": 12345}]
-
         # Act
         response = client.post(
             "/api/v1/garmin/webhooks/ping",
@@ -207,49 +229,48 @@ class TestGarminPingWebhook:
 
         # Assert
         assert response.status_code == 200
-        data = response.json()
-        assert "processed" in data
-        assert "activities" in data
+        assert response.json()["queued"] == 2
+        ping_task.delay.assert_called_once()
+        (pings,) = ping_task.delay.call_args.args
+        assert {ping["user_id"] for ping in pings} == {str(user1.id), str(user2.id)}
 
-    def test_ping_webhook_with_summary_types(
+    def test_ping_webhook_coalesces_repeated_pings(
         self,
         client: TestClient,
         db: Session,
-        mock_external_apis: dict[str, MagicMock],
+        ping_task: MagicMock,
     ) -> None:
-        """Test ping webhook with different summary types."""
+        """Test repeated pings for the same window are queued once, keeping the latest pull token."""
         # Arrange
         user = UserFactory()
-        UserConnectionFactory(
-            user=user,
-            provider="garmin",
-            provider_user_id="garmin_user_123",
-        )
+        UserConnectionFactory(user=user, provider="garmin", provider_user_id="garmin_user_123")
         headers = {"garmin-client-id": "test-client-id"}
         payload = {
-            "activities": [],
-            "activityDetails": [{"userId": "garmin_user_123"}],
-            "dailies": [{"userId": "garmin_user_123"}],
-            "sleeps": [{"userId": "garmin_user_123"}],
+            "activities": [
+                {"userId": "garmin_user_123", "callbackURL": _callback_url("old")},
+                {"userId": "garmin_user_123", "callbackURL": _callback_url("new")},
+                {"userId": "garmin_user_123", "callbackURL": _callback_url("other", start=1234569999)},
+            ],
         }
 
         # Act
-        response = client.post(
-            "/api/v1/garmin/webhooks/ping",
-            headers=headers,
-            json=payload,
-        )
+        first = client.post("/api/v1/garmin/webhooks/ping", headers=headers, json=payload)
+        redelivered = client.post("/api/v1/garmin/webhooks/ping", headers=headers, json=payload)
 
         # Assert
-        assert response.status_code == 200
+        assert first.json() == {"queued": 2, "coalesced": 1, "errors": []}
+        assert redelivered.json() == {"queued": 0, "coalesced": 3, "errors": []}
+        ping_task.delay.assert_called_once()
+        (pings,) = ping_task.delay.call_args.args
+        assert [ping["callback_url"] for ping in pings] == [_callback_url("new"), _callback_url("other", 1234569999)]
 
-    def test_ping_webhook_callback_fetch_error(
+    def test_ping_webhook_with_summary_types(
         self,
         client: TestClient,
         db: Session,
-        mock_external_apis: dict[str, MagicMock],
+        ping_task: MagicMock,
     ) -> None:
-        """Test ping webhook when callback URL fetch fails."""
+        """Test ping webhook with different summary types."""
         # Arrange
         user = UserFactory()
         UserConnectionFactory(
@@ -259,21 +280,12 @@ class TestGarminPingWebhook:
         )
         headers = {"garmin-client-id": "test-client-id"}
         payload = {
-            "activities": [
-                {
-                    "userId": "garmin_user_123",
-                    "callbackURL": "https://apis.garmin.com/wellness-api/rest/activities?token=abc123",
-                },
-            ],
+            "activities": [],
+            "activityDetails": [{"userId": "garmin_user_123"}],
+            "dailies": [{"userId": "garmin_user_123"}],
+            "sleeps": [{"userId": "garmin_user_123"}],
         }
 
-        # Mock httpx to raise an error
-        import httpx
-
-        mock_httpx = mock_external_apis["httpx"]
-        mock_response = mock_httpx.return_value.__aenter__.return_value.get
-        mock_response.side_effect = httpx.HTTPError("Connection failed")
-
         # Act
         response = client.post(
             "/api/v1/garmin/webhooks/ping",
@@ -283,8 +295,6 @@ class TestGarminPingWebhook:
 
         # Assert
         assert response.status_code == 200
-        data = response.json()
-        assert "errors" in data
 
 
 class TestGarminPushWebhook:
@@ -449,6 +459,31 @@ class TestGarminPushWebhook:
         data = response.json()
         assert data["processed"] == 0
 
+    def test_push_webhook_queues_wellness_summaries(
+        self,
+        client: TestClient,
+        db: Session,
+        mock_external_apis: dict[str, MagicMock],
+    ) -> None:
+        """Test wellness summaries are handed to the push task as a whole."""
+        # Arrange
+        headers = {"garmin-client-id": "test-client-id"}
+        epochs = [
+            {"userId": "garmin_user_123", "summaryId": f"e{i}", "startTimeInSeconds": 1763596800 + 900 * i}
+            for i in range(3)
+        ]
+        payload = {"epochs": epochs, "dailies": [], "stressDetails": [{"userId": "garmin_user_123"}]}
+
+        # Act
+        with patch("app.api.routes.v1.garmin_webhooks.process_garmin_push") as push_task:
+            response = client.post("/api/v1/garmin/webhooks/push", headers=headers, json=payload)
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["queued"] == {"epochs": 3, "stressDetails": 1}
+        (summaries,) = push_task.delay.call_args.args
+        assert summaries == {"epochs": epochs, "stressDetails": [{"userId": "garmin_user_123"}]}
+
 
 class TestGarminWebhookHealth:
     """Test suite for Garmin webhook health check endpoint."""
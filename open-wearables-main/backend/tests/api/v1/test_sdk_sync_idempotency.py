@@ -0,0 +1,204 @@
+"""
+Tests for deduplication of retried SDK uploads.
+
+Tests cover:
+- Answering a retried upload from its stored outcome without importing it again
+- Recognising retries by body when no Idempotency-Key is sent
+- Rejecting an Idempotency-Key reused for a different body
+- Answering retries of an upload still being imported with 409
+- Importing again after a failed import
+- Importing without deduplication when Redis is unavailable
+"""
+
+from collections.abc import Generator
+from io import BytesIO
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.orm import Session
+from starlette.testclient import TestClient
+
+from app.schemas import UploadDataResponse
+from app.utils.idempotency import PENDING, IdempotentUpload
+from tests.factories import ApiKeyFactory
+
+USER_ID = "123e4567-e89b-12d3-a456-426614174000"
+BODY = '{"data": {"workouts": [], "records": []}}'
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis string commands used by the deduplication."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    def pipeline(self, transaction: bool = True) -> "FakeRedis":
+        return self
+
+    def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    def execute(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_redis() -> Generator[FakeRedis, None, None]:
+    redis = FakeRedis()
+    with patch("app.utils.idempotency.get_redis_client", return_value=redis):
+        yield redis
+
+
+@pytest.fixture
+def mock_import() -> Generator[AsyncMock, None, None]:
+    with patch(
+        "app.api.routes.v1.sdk_sync.hk_import_service.import_data_from_request",
+        new_callable=AsyncMock,
+        return_value=UploadDataResponse(status_code=200, response="Import successful"),
+    ) as mock:
+        yield mock
+
+
+class TestSDKSyncIdempotency:
+    """Test suite for retried uploads to the SDK sync endpoints."""
+
+    @staticmethod
+    def _post(client: TestClient, api_v1_prefix: str, body: str = BODY, key: str | None = None) -> object:
+        headers = {"X-Open-Wearables-API-Key": ApiKeyFactory().id, "Content-Type": "application/json"}
+        if key:
+            headers["Idempotency-Key"] = key
+        return client.post(f"{api_v1_prefix}/sdk/users/{USER_ID}/sync/apple/healthion", headers=headers, content=body)
+
+    def test_retry_replayed(
+        self,
+        client: TestClient,
+        db: Session,
+        api_v1_prefix: str,
+        fake_redis: FakeRedis,
+        mock_import: AsyncMock,
+    ) -> None:
+        """Test a retry with the same key is answered with the first outcome without importing."""
+        # Act
+        first = self._post(client, api_v1_prefix, key="upload-1")
+        retry = self._post(client, api_v1_prefix, key="upload-1")
+
+        # Assert
+        assert first.status_code == retry.status_code == 200
+        assert retry.json() == first.json() == {"status_code": 200, "response": "Import successful"}
+        assert "Idempotent-Replayed" not in first.headers
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        mock_import.assert_awaited_once()
+
+    def test_retry_without_key_replayed(
+        self,
+        client: TestClient,
+        db: Session,
+        api_v1_prefix: str,
+        fake_redis: FakeRedis,
+        mock_import: AsyncMock,
+    ) -> None:
+        """Test a retry of the same body is recognised without an Idempotency-Key."""
+        # Act
+        self._post(client, api_v1_prefix)
+        retry = self._post(client, api_v1_prefix)
+        other = self._post(client, api_v1_prefix, body='{"data": {"workouts": [{}], "records": []}}')
+
+        # Assert
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert "Idempotent-Replayed" not in other.headers
+        assert mock_import.await_count == 2
+
+    def test_key_reused_for_other_body(
+        self,
+        client: TestClient,
+        db: Session,
+        api_v1_prefix: str,
+        fake_redis: FakeRedis,
+        mock_import: AsyncMock,
+    ) -> None:
+        """Test an Idempotency-Key sent again with a different body is rejected."""
+        # Arrange
+        self._post(client, api_v1_prefix, key="upload-1")
+
+        # Act
+        response = self._post(client, api_v1_prefix, body='{"data": {"workouts": [{}]}}', key="upload-1")
+
+        # Assert
+        assert response.status_code == 422
+        mock_import.assert_awaited_once()
+
+    def test_retry_while_importing(
+        self,
+        client: TestClient,
+        db: Session,
+        api_v1_prefix: str,
+        fake_redis: FakeRedis,
+        mock_import: AsyncMock,
+    ) -> None:
+        """Test a retry arriving while the same upload is being imported gets 409."""
+        # Arrange
+        fake_redis.data[IdempotentUpload("healthion", USER_ID, BytesIO(BODY.encode())).outcome_key] = PENDING
+
+        # Act
+        response = self._post(client, api_v1_prefix)
+
+        # Assert
+        assert response.status_code == 409
+        assert response.headers["Retry-After"] == "30"
+        mock_import.assert_not_awaited()
+
+    def test_failed_import_retried(
+        self,
+        client: TestClient,
+        db: Session,
+        api_v1_prefix: str,
+        fake_redis: FakeRedis,
+        mock_import: AsyncMock,
+    ) -> None:
+        """Test an upload whose import failed is imported again when retried."""
+        # Arrange
+        mock_import.side_effect = [
+            UploadDataResponse(status_code=400, response="Import failed: boom"),
+            UploadDataResponse(status_code=200, response="Import successful"),
+        ]
+
+        # Act
+        failed = self._post(client, api_v1_prefix, key="upload-1")
+        retry = self._post(client, api_v1_prefix, key="upload-1")
+
+        # Assert
+        assert failed.json()["status_code"] == 400
+        assert retry.json()["status_code"] == 200
+        assert "Idempotent-Replayed" not in retry.headers
+        assert mock_import.await_count == 2
+
+    def test_redis_unavailable(
+        self,
+        client: TestClient,
+        db: Session,
+        api_v1_prefix: str,
+        mock_import: AsyncMock,
+    ) -> None:
+        """Test uploads are imported without deduplication when Redis is down."""
+        # Arrange
+        redis = MagicMock()
+        redis.get.side_effect = RedisConnectionError("down")
+        redis.set.side_effect = RedisConnectionError("down")
+
+        # Act
+        with patch("app.utils.idempotency.get_redis_client", return_value=redis):
+            responses = [self._post(client, api_v1_prefix, key="upload-1") for _ in range(2)]
+
+        # Assert
+        assert [response.status_code for response in responses] == [200, 200]
+        assert mock_import.await_count == 2
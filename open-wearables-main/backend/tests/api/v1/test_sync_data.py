@@ -1,7 +1,7 @@
 """
 Tests for sync data endpoint.
 
-Tests the following endpoint:
+Tests the following endpoint (including refusing syncs of data already being synced):
 - POST /api/v1/providers/{provider}/users/{user_id}/sync
 """
 
@@ -169,3 +169,23 @@ class TestSyncDataEndpoint:
         # Assert
         assert response.status_code == 501
         assert "does not support workouts" in response.json()["detail"]
+
+    def test_sync_already_running(self, client: TestClient, db: Session, mock_provider_factory: MagicMock) -> None:
+        """Test a sync of data another sync of the user is running returns 409 with Retry-After."""
+        # Arrange
+        user = UserFactory()
+        api_key = ApiKeyFactory()
+        UserConnectionFactory(user=user, provider="garmin", status=ConnectionStatus.ACTIVE)
+
+        # Act
+        with patch("app.integrations.sync_lock.SyncLease.acquire", return_value=120.0):
+            response = client.post(
+                f"/api/v1/providers/garmin/users/{user.id}/sync",
+                headers={"X-Open-Wearables-API-Key": api_key.id},
+                params={"data_type": "workouts"},
+            )
+
+        # Assert
+        assert response.status_code == 409
+        assert response.headers["Retry-After"] == "120"
+        mock_provider_factory.get_provider.return_value.workouts.load_data.assert_not_called()
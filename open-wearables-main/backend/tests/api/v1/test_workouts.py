@@ -3,16 +3,25 @@ Tests for workout endpoints.
 
 Tests the /api/v1/users/{user_id}/workouts endpoint including:
 - List workouts with filtering, sorting, and pagination
+- Workout detail with heart rate stream
 - Authentication and authorization
 - Error cases
 """
 
 from datetime import datetime, timedelta, timezone
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from tests.factories import ApiKeyFactory, EventRecordFactory, ExternalDeviceMappingFactory, UserFactory
+from tests.factories import (
+    ApiKeyFactory,
+    DataPointSeriesFactory,
+    EventRecordFactory,
+    ExternalDeviceMappingFactory,
+    SeriesTypeDefinitionFactory,
+    UserFactory,
+)
 from tests.utils import api_key_headers
 
 
@@ -392,3 +401,63 @@ class TestWorkoutsEndpoints:
         assert "start_time" in workout_data
         assert "end_time" in workout_data
         assert "duration_seconds" in workout_data
+
+    @pytest.mark.parametrize(("max_points", "expected"), [(10, 10), (2, 2), (1, 1), (0, 50)])
+    def test_get_workout_detail_with_heart_rate(
+        self,
+        client: TestClient,
+        db: Session,
+        max_points: int,
+        expected: int,
+    ) -> None:
+        """Test retrieving a single workout with its heart rate stream downsampled to at most the requested points."""
+        # Arrange
+        user = UserFactory()
+        mapping = ExternalDeviceMappingFactory(user=user)
+        start = datetime(2025, 6, 1, 8, 0, tzinfo=timezone.utc)
+        workout = EventRecordFactory(
+            mapping=mapping,
+            category="workout",
+            type_="running",
+            start_datetime=start,
+            end_datetime=start + timedelta(minutes=5),
+            duration_seconds=300,
+        )
+        heart_rate_type = SeriesTypeDefinitionFactory.get_or_create_heart_rate()
+        for i in range(50):
+            DataPointSeriesFactory(
+                mapping=mapping,
+                series_type=heart_rate_type,
+                recorded_at=start + timedelta(seconds=i * 6),
+            )
+        api_key = ApiKeyFactory()
+        headers = api_key_headers(api_key.id)
+
+        # Act
+        response = client.get(
+            f"/api/v1/users/{user.id}/events/workouts/{workout.id}",
+            headers=headers,
+            params={"max_heart_rate_points": max_points},
+        )
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == str(workout.id)
+        assert len(data["heart_rate_samples"]) == expected
+        assert data["heart_rate_samples"][0]["type"] == "heart_rate"
+
+    def test_get_workout_detail_not_found(self, client: TestClient, db: Session) -> None:
+        """Test retrieving another user's workout returns 404."""
+        # Arrange
+        owner = UserFactory()
+        workout = EventRecordFactory(mapping=ExternalDeviceMappingFactory(user=owner), category="workout")
+        other_user = UserFactory()
+        api_key = ApiKeyFactory()
+        headers = api_key_headers(api_key.id)
+
+        # Act
+        response = client.get(f"/api/v1/users/{other_user.id}/events/workouts/{workout.id}", headers=headers)
+
+        # Assert
+        assert response.status_code == 404
@@ -23,6 +23,7 @@ os.environ["SECRET_KEY"] = "test-secret-key-for-testing-only"
 os.environ["MASTER_KEY"] = "dGVzdC1tYXN0ZXIta2V5LWZvci10ZXN0aW5nLW9ubHk="  # base64 test key
 
 from app.database import BaseDbModel, _get_db_dependency
+from app.integrations.redis_client import get_redis_client
 from app.main import api
 
 # Test database URL - uses test PostgreSQL database
@@ -146,23 +147,29 @@ def mock_redis(monkeypatch: pytest.MonkeyPatch) -> Generator[MagicMock, None, No
     mock.delete.return_value = True
 
     with patch("app.integrations.redis_client.redis", mock):
+        # The client is cached by the first test using it, rate limiters always have tokens
+        get_redis_client().register_script.return_value.return_value = "0"
         yield mock
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_cache() -> Generator[None, None, None]:
+    """Drop cached API keys and developers so rows never leak between tests."""
+    from app.utils.auth_cache import auth_cache
+
+    auth_cache.clear()
+    yield
+    auth_cache.clear()
+
+
 @pytest.fixture(autouse=True)
 def mock_celery_tasks(monkeypatch: pytest.MonkeyPatch) -> Generator[MagicMock, None, None]:
     """Mock Celery tasks to run synchronously."""
-    # Mock the poll_sqs_task specifically
     mock_task = MagicMock()
     mock_task.delay.return_value = MagicMock()
     mock_task.apply_async.return_value = MagicMock()
 
-    with (
-        patch("celery.current_app") as mock_celery,
-        patch("app.integrations.celery.tasks.poll_sqs_task.poll_sqs_task", mock_task),
-        patch("app.api.routes.v1.import_data.poll_sqs_task", mock_task),
-        patch("app.api.routes.v1.import_xml.poll_sqs_task", mock_task),
-    ):
+    with patch("celery.current_app") as mock_celery:
         mock_celery.conf = {
             "task_always_eager": True,
             "task_eager_propagates": True,
@@ -0,0 +1,147 @@
+"""
+Tests for the Celery queue routing and metrics.
+
+Tests cover:
+- Routing each routed task to its queue
+- Stamping published tasks and recording how long started ones waited
+- Waits of tasks with a countdown counted from when they were due
+- Queue depth and wait percentiles per queue
+"""
+
+from collections.abc import Generator
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from kombu.exceptions import ChannelError
+
+from app.integrations.celery import metrics
+from app.integrations.celery.queues import BULK, INTERACTIVE, SYNC, TASK_ROUTES
+from app.integrations.celery.tasks import (
+    backfill_connection,
+    backfill_window,
+    process_uploaded_file,
+    send_invitation_email_task,
+    sync_all_users,
+    sync_vendor_data,
+)
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis list commands used by the metrics."""
+
+    def __init__(self) -> None:
+        self.lists: dict[str, list[str]] = {}
+
+    def pipeline(self, transaction: bool = True) -> "FakeRedis":
+        return self
+
+    def lpush(self, key: str, value: float) -> None:
+        self.lists.setdefault(key, []).insert(0, str(value))
+
+    def ltrim(self, key: str, start: int, end: int) -> None:
+        self.lists[key] = self.lists.get(key, [])[start : end + 1]
+
+    def lrange(self, key: str, start: int, end: int) -> list[str]:
+        return list(self.lists.get(key, []))
+
+    def execute(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_redis() -> Generator[FakeRedis, None, None]:
+    redis = FakeRedis()
+    with patch("app.integrations.celery.metrics.get_redis_client", return_value=redis):
+        yield redis
+
+
+def _started(headers: dict, queue: str, eta: str | None = None) -> SimpleNamespace:
+    request = SimpleNamespace(delivery_info={"routing_key": queue}, eta=eta, **headers)
+    return SimpleNamespace(request=request)
+
+
+class TestQueueRouting:
+    """Test suite for the task routes."""
+
+    def test_tasks_routed(self) -> None:
+        """Test routed task names match the registered tasks."""
+        # Arrange
+        expected = {
+            send_invitation_email_task: INTERACTIVE,
+            sync_vendor_data: SYNC,
+            sync_all_users: SYNC,
+            process_uploaded_file: BULK,
+            backfill_connection: BULK,
+            backfill_window: BULK,
+        }
+
+        # Act
+        queues = {task: TASK_ROUTES[task.name]["queue"] for task in expected}
+
+        # Assert
+        assert queues == expected
+
+
+class TestQueueMetrics:
+    """Test suite for the queue wait latency and depth metrics."""
+
+    def test_wait_recorded(self, fake_redis: FakeRedis) -> None:
+        """Test a task stamped when published records its wait in its queue when started."""
+        # Arrange
+        headers: dict = {}
+        with patch("app.integrations.celery.metrics.time.time", return_value=1000.0):
+            metrics._stamp_enqueued_at(headers=headers)
+
+        # Act
+        with patch("app.integrations.celery.metrics.time.time", return_value=1012.5):
+            metrics._record_wait(task=_started(headers, SYNC))
+        metrics._record_wait(task=_started({}, SYNC))
+
+        # Assert
+        assert headers == {metrics.ENQUEUED_AT: 1000.0}
+        assert fake_redis.lists == {"celery_latency:sync": ["12.5"]}
+
+    def test_wait_from_countdown(self, fake_redis: FakeRedis) -> None:
+        """Test a task with a countdown only waits from when it was due."""
+        # Arrange
+        due = datetime.now(timezone.utc).timestamp() - 2
+        headers = {metrics.ENQUEUED_AT: due - 3600}
+
+        # Act
+        metrics._record_wait(task=_started(headers, BULK, datetime.fromtimestamp(due, timezone.utc).isoformat()))
+
+        # Assert
+        (wait,) = fake_redis.lists["celery_latency:bulk"]
+        assert 2 <= float(wait) < 60
+
+    def test_queue_metrics(self, fake_redis: FakeRedis) -> None:
+        """Test depth and wait percentiles are reported for every queue."""
+        # Arrange
+        for wait in range(1, 101):
+            metrics.record_latency(INTERACTIVE, wait / 10)
+
+        def queue_declare(queue: str, passive: bool) -> SimpleNamespace:
+            if queue != BULK:
+                raise ChannelError(f"NOT_FOUND - no queue {queue!r}")
+            return SimpleNamespace(message_count=7)
+
+        channel = MagicMock()
+        channel.queue_declare.side_effect = queue_declare
+        app = MagicMock()
+        app.connection_for_read.return_value.__enter__.return_value.default_channel = channel
+
+        # Act
+        with patch("app.integrations.celery.metrics.current_app", app):
+            by_queue = {queue.queue: queue for queue in metrics.get_queue_metrics()}
+
+        # Assert
+        assert list(by_queue) == [INTERACTIVE, "default", SYNC, BULK]
+        assert by_queue[BULK].depth == 7
+        assert by_queue[SYNC].depth == 0
+        interactive = by_queue[INTERACTIVE]
+        assert interactive.latency_samples == 100
+        assert (interactive.latency_p50_seconds, interactive.latency_p95_seconds) == (5.1, 9.6)
+        assert interactive.latency_max_seconds == 10.0
+        assert by_queue[SYNC].latency_p50_seconds is None
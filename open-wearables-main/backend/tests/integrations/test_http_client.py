@@ -0,0 +1,207 @@
+"""
+Tests for the pooled provider HTTP clients.
+
+Tests cover:
+- Retrying 429/5xx responses and connection errors with backoff
+- Not retrying non-idempotent requests that may have been applied
+- Honouring Retry-After
+- Sync and async transports sharing one policy
+- One pooled client per provider (and per event loop for async)
+- Offering HTTP/2 on pooled connections
+"""
+
+from collections.abc import Callable
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from httpx import AsyncClient
+
+from app.integrations.http_client import (
+    AsyncRetryTransport,
+    RetryPolicy,
+    RetryTransport,
+    get_async_http_client,
+    get_http_client,
+)
+
+
+def _responder(*statuses: int, headers: dict[str, str] | None = None) -> tuple[Callable, list[httpx.Request]]:
+    """Mock handler returning the given statuses in order (the last one repeats)."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        status = statuses[min(len(requests), len(statuses)) - 1]
+        return httpx.Response(status, headers=headers or {}, json={"attempt": len(requests)})
+
+    return handler, requests
+
+
+def _client(handler: Callable, max_retries: int = 3) -> httpx.Client:
+    policy = RetryPolicy(max_retries=max_retries, backoff_seconds=0.5, backoff_max_seconds=30)
+    return httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), policy))
+
+
+class TestRetryTransport:
+    """Test suite for RetryTransport."""
+
+    @patch("app.integrations.http_client.time.sleep")
+    def test_retries_server_errors_until_success(self, mock_sleep: MagicMock) -> None:
+        """Test 5xx and 429 responses are retried with backoff."""
+        # Arrange
+        handler, requests = _responder(503, 429, 200)
+
+        # Act
+        response = _client(handler).get("https://api.example.com/v3/workouts")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"attempt": 3}
+        assert len(requests) == 3
+        assert mock_sleep.call_count == 2
+
+    @patch("app.integrations.http_client.time.sleep")
+    def test_gives_up_after_max_retries(self, mock_sleep: MagicMock) -> None:
+        """Test the last response is returned once retries are exhausted."""
+        # Arrange
+        handler, requests = _responder(502)
+
+        # Act
+        response = _client(handler, max_retries=2).get("https://api.example.com/v3/workouts")
+
+        # Assert
+        assert response.status_code == 502
+        assert len(requests) == 3
+
+    @patch("app.integrations.http_client.time.sleep")
+    def test_client_errors_not_retried(self, mock_sleep: MagicMock) -> None:
+        """Test 4xx responses other than 429 are returned immediately."""
+        # Arrange
+        handler, requests = _responder(401)
+
+        # Act
+        response = _client(handler).get("https://api.example.com/v3/workouts")
+
+        # Assert
+        assert response.status_code == 401
+        assert len(requests) == 1
+        mock_sleep.assert_not_called()
+
+    @patch("app.integrations.http_client.time.sleep")
+    def test_post_retried_only_when_rate_limited(self, mock_sleep: MagicMock) -> None:
+        """Test a POST failing with 5xx is not replayed, but a rate limited one is."""
+        # Arrange
+        server_error, server_error_requests = _responder(500, 200)
+        rate_limited, rate_limited_requests = _responder(429, 200)
+
+        # Act
+        first = _client(server_error).post("https://auth.example.com/token", data={"code": "abc"})
+        second = _client(rate_limited).post("https://auth.example.com/token", data={"code": "abc"})
+
+        # Assert
+        assert first.status_code == 500
+        assert len(server_error_requests) == 1
+        assert second.status_code == 200
+        assert len(rate_limited_requests) == 2
+        assert rate_limited_requests[1].content == b"code=abc"
+
+    @patch("app.integrations.http_client.time.sleep")
+    def test_honours_retry_after(self, mock_sleep: MagicMock) -> None:
+        """Test the Retry-After header overrides the computed backoff."""
+        # Arrange
+        handler, _ = _responder(429, 200, headers={"Retry-After": "7"})
+
+        # Act
+        _client(handler).get("https://api.example.com/v3/workouts")
+
+        # Assert
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch("app.integrations.http_client.time.sleep")
+    def test_retries_connection_errors(self, mock_sleep: MagicMock) -> None:
+        """Test connection failures are retried."""
+        # Arrange
+        attempts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200)
+
+        # Act
+        response = _client(handler).post("https://auth.example.com/token")
+
+        # Assert
+        assert response.status_code == 200
+        assert len(attempts) == 2
+
+
+class TestRetryPolicy:
+    """Test suite for RetryPolicy backoff."""
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        """Test delays stay within the exponential envelope and the cap."""
+        # Arrange
+        policy = RetryPolicy(max_retries=10, backoff_seconds=0.5, backoff_max_seconds=4)
+
+        # Act
+        delays = [policy.delay(attempt) for attempt in range(8) for _ in range(20)]
+
+        # Assert
+        assert all(0 <= delay <= 4 for delay in delays)
+        assert len(set(delays)) > 1
+
+
+class TestAsyncRetryTransport:
+    """Test suite for AsyncRetryTransport."""
+
+    @pytest.mark.asyncio
+    async def test_retries_server_errors_until_success(self) -> None:
+        """Test the async transport applies the same retry policy."""
+        # Arrange
+        handler, requests = _responder(503, 200)
+        policy = RetryPolicy(max_retries=3, backoff_seconds=0, backoff_max_seconds=0)
+        client = AsyncClient(transport=AsyncRetryTransport(httpx.MockTransport(handler), policy))
+
+        # Act
+        response = await client.get("https://api.example.com/v2/activity/sleep")
+
+        # Assert
+        assert response.status_code == 200
+        assert len(requests) == 2
+        await client.aclose()
+
+
+class TestPooledClients:
+    """Test suite for the per-provider client factories."""
+
+    def test_sync_client_reused_per_provider(self) -> None:
+        """Test each provider gets one long-lived client."""
+        # Act & Assert
+        assert get_http_client("garmin") is get_http_client("garmin")
+        assert get_http_client("garmin") is not get_http_client("polar")
+        assert isinstance(get_http_client("garmin")._transport, RetryTransport)
+
+    def test_http2_offered(self) -> None:
+        """Test pooled connections offer HTTP/2, whose h2 dependency is installed with httpx."""
+        # Act
+        transport = get_http_client("oura")._transport
+
+        # Assert
+        assert isinstance(transport, RetryTransport)
+        assert transport.transport._pool._http2 is True
+
+    @pytest.mark.asyncio
+    async def test_async_client_reused_per_provider(self, mock_external_apis: dict[str, MagicMock]) -> None:
+        """Test async clients are reused within an event loop."""
+        # Arrange
+        mock_external_apis["httpx"].side_effect = lambda **kwargs: MagicMock(is_closed=False)
+
+        # Act
+        client = get_async_http_client("whoop")
+
+        # Assert
+        assert client is get_async_http_client("whoop")
+        assert client is not get_async_http_client("suunto")
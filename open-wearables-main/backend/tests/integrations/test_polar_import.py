@@ -73,9 +73,9 @@ class TestPolarOAuthFlow:
             data = response.json()
             assert "authorization_url" in data or "url" in data
 
-    @patch("app.integrations.celery.tasks.sync_vendor_data.delay")
+    @patch("app.integrations.celery.tasks.sync_vendor_data.apply_async")
     @patch("app.services.providers.templates.base_oauth.get_redis_client")
-    @patch("httpx.post")
+    @patch("httpx.Client.post")
     def test_polar_oauth_callback_success(
         self,
         mock_post: MagicMock,
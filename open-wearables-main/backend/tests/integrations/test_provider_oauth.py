@@ -134,8 +134,8 @@ class TestPolarOAuth:
         # Assert
         assert response.status_code in [200, 302, 307, 422]
 
-    @patch("app.integrations.celery.tasks.sync_vendor_data.delay")
-    @patch("httpx.post")
+    @patch("app.integrations.celery.tasks.sync_vendor_data.apply_async")
+    @patch("httpx.Client.post")
     def test_polar_callback_success(
         self,
         mock_httpx_post: MagicMock,
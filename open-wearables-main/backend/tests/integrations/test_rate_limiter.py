@@ -0,0 +1,117 @@
+"""
+Tests for the Redis token-bucket rate limiter.
+
+Tests cover:
+- Taking tokens and waiting for the bucket to refill
+- Giving up when the wait exceeds the limit, so work can be deferred
+- Allowing requests when Redis is unavailable
+- One bucket per provider app key
+- Spacing of user syncs derived from the provider quota
+"""
+
+from collections.abc import Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.integrations.rate_limiter import TokenBucket, get_provider_rate_limiter, sync_spacing_seconds
+
+
+@pytest.fixture
+def script() -> Generator[MagicMock, None, None]:
+    """The registered token bucket script, returning the wait as Redis does (a string)."""
+    redis = MagicMock()
+    with patch("app.integrations.rate_limiter.get_redis_client", return_value=redis):
+        yield redis.register_script.return_value
+
+
+@pytest.fixture
+def bucket() -> TokenBucket:
+    return TokenBucket("rate_limit:polar:test", rate_per_minute=30, capacity=5)
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket."""
+
+    def test_tokens_available(self, bucket: TokenBucket, script: MagicMock) -> None:
+        """Test a request is granted immediately while the bucket has tokens."""
+        # Arrange
+        script.return_value = "0"
+
+        # Act
+        wait = bucket.acquire(max_wait_seconds=10)
+
+        # Assert
+        assert wait == 0
+        script.assert_called_once_with(keys=["rate_limit:polar:test"], args=[0.5, 5, 1])
+
+    @patch("app.integrations.rate_limiter.time.sleep")
+    def test_waits_for_refill(self, mock_sleep: MagicMock, bucket: TokenBucket, script: MagicMock) -> None:
+        """Test short waits are slept through before retrying."""
+        # Arrange
+        script.side_effect = ["1.5", "0"]
+
+        # Act
+        wait = bucket.acquire(max_wait_seconds=10)
+
+        # Assert
+        assert wait == 0
+        mock_sleep.assert_called_once_with(1.5)
+        assert script.call_count == 2
+
+    @patch("app.integrations.rate_limiter.time.sleep")
+    def test_long_wait_returned_to_caller(
+        self,
+        mock_sleep: MagicMock,
+        bucket: TokenBucket,
+        script: MagicMock,
+    ) -> None:
+        """Test waits beyond the limit are returned instead of blocking."""
+        # Arrange
+        script.return_value = "120"
+
+        # Act
+        wait = bucket.acquire(max_wait_seconds=30)
+
+        # Assert
+        assert wait == 120
+        mock_sleep.assert_not_called()
+
+    def test_redis_unavailable_allows_request(self, bucket: TokenBucket, script: MagicMock) -> None:
+        """Test limiting fails open when Redis cannot be reached."""
+        # Arrange
+        script.side_effect = RedisConnectionError("down")
+
+        # Act & Assert
+        assert bucket.acquire(max_wait_seconds=10) == 0
+
+
+class TestProviderRateLimiter:
+    """Test suite for the per-provider limiters."""
+
+    def test_bucket_per_provider_app_key(self) -> None:
+        """Test each provider's app key gets its own bucket and rate."""
+        # Arrange
+        get_provider_rate_limiter.cache_clear()
+
+        # Act
+        with patch("app.integrations.rate_limiter.settings") as mock_settings:
+            mock_settings.provider_rate_limits = {"whoop": 100}
+            mock_settings.provider_rate_limit_burst = 10
+            mock_settings.whoop_client_id = "whoop-app"
+            limiter = get_provider_rate_limiter("whoop")
+            unlimited = get_provider_rate_limiter("apple")
+        get_provider_rate_limiter.cache_clear()
+
+        # Assert
+        assert limiter is not None
+        assert limiter.key == "rate_limit:whoop:whoop-app"
+        assert limiter.capacity == 10
+        assert unlimited is None
+
+    def test_sync_spacing(self) -> None:
+        """Test spacing is the share of a minute's quota one user sync uses."""
+        # Act & Assert
+        assert sync_spacing_seconds("whoop") == 4 * 60 / 100
+        assert sync_spacing_seconds("apple") == 0
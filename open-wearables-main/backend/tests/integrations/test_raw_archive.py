@@ -0,0 +1,215 @@
+"""
+Tests for the raw payload archive and its replay.
+
+Tests cover:
+- Content-addressed keys grouped by provider, user, family and window, compressed with zstd
+- Reading payloads archived with gzip by earlier versions
+- Archiving the same payload twice storing it once
+- Loading payloads back and listing them filtered by provider, user and family
+- Best-effort archiving: disabled archives and failures never raise
+- Replaying archived workouts through the current normalizer, replacing stored details
+- Replaying archived 247 samples twice without storing them twice
+- Skipping payloads of families without a saver
+"""
+
+import gzip
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+from uuid import uuid4
+
+import zstandard
+from sqlalchemy.orm import Session
+
+from app.integrations.raw_archive import LocalArchiveStore, RawArchive, archive_payload
+from app.models import DataPointSeries, EventRecord, ExternalDeviceMapping, WorkoutDetails
+from app.schemas import GarminActivityJSON
+from app.services.providers.factory import ProviderFactory
+from app.services.providers.replay import replay_archive
+from tests.factories import UserFactory
+
+START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+END = datetime(2025, 3, 8, tzinfo=timezone.utc)
+
+
+def _activity(**overrides: Any) -> dict[str, Any]:
+    return {
+        "userId": "garmin_user_123",
+        "activityId": "12345678901",
+        "summaryId": "summary_123",
+        "activityType": "RUNNING",
+        "startTimeInSeconds": 1740816000,
+        "durationInSeconds": 3600,
+        "deviceName": "Garmin Forerunner 945",
+        "distanceInMeters": 10000,
+        "steps": 8500,
+        "activeKilocalories": 650,
+        "averageHeartRateInBeatsPerMinute": 145,
+        "maxHeartRateInBeatsPerMinute": 175,
+        **overrides,
+    }
+
+
+class TestRawArchive:
+    """Test suite for RawArchive with the local backend."""
+
+    def test_put_and_get(self, tmp_path: Path) -> None:
+        """Test a payload is stored compressed under its content-addressed key and loaded back."""
+        # Arrange
+        archive = RawArchive(LocalArchiveStore(tmp_path))
+        user_id = uuid4()
+        payload = [{"id": "sleep-1", "score": 87}]
+
+        # Act
+        key = archive.put("suunto", user_id, "sleep_sessions", payload, START, END)
+
+        # Assert
+        provider, user, family, window, name = key.split("/")
+        assert (provider, user, family) == ("suunto", str(user_id), "sleep_sessions")
+        assert window == "20250301T000000Z_20250308T000000Z"
+        assert name.split(".")[1:] == ["json", "zst"]
+        assert (
+            zstandard.ZstdDecompressor().decompress((tmp_path / key).read_bytes()) == b'[{"id":"sleep-1","score":87}]'
+        )
+        assert archive.get(key) == payload
+
+    def test_gzip_archives_read(self, tmp_path: Path) -> None:
+        """Test payloads archived with gzip by earlier versions are still loaded and listed."""
+        # Arrange
+        archive = RawArchive(LocalArchiveStore(tmp_path))
+        key = f"suunto/{uuid4()}/sleep_sessions/20250301/{'0' * 64}.json.gz"
+        (tmp_path / key).parent.mkdir(parents=True)
+        (tmp_path / key).write_bytes(gzip.compress(b'[{"id":"sleep-1"}]'))
+
+        # Act
+        payload = archive.get(key)
+
+        # Assert
+        assert payload == [{"id": "sleep-1"}]
+        assert [entry.key for entry in archive.entries("suunto")] == [key]
+
+    def test_same_payload_stored_once(self, tmp_path: Path) -> None:
+        """Test archiving an identical payload again is a no-op while a changed one is stored apart."""
+        # Arrange
+        archive = RawArchive(LocalArchiveStore(tmp_path))
+        user_id = uuid4()
+        first = archive.put("garmin", user_id, "workouts", [_activity()], START, END)
+
+        # Act
+        again = archive.put("garmin", user_id, "workouts", [dict(reversed(_activity().items()))], START, END)
+        changed = archive.put("garmin", user_id, "workouts", [_activity(steps=100)], START, END)
+
+        # Assert
+        assert again == first
+        assert changed != first
+        assert len(list(archive.entries())) == 2
+
+    def test_entries_filtered(self, tmp_path: Path) -> None:
+        """Test entries are listed by provider, user and family."""
+        # Arrange
+        archive = RawArchive(LocalArchiveStore(tmp_path))
+        alice, bob = uuid4(), uuid4()
+        archive.put("garmin", alice, "workouts", [_activity()], START, END)
+        archive.put("garmin", alice, "sleeps", [{"summaryId": "sleep-1"}], START, END)
+        archive.put("garmin", bob, "workouts", [_activity()], START, END)
+        archive.put("polar", alice, "workouts", [{"id": "1"}], START, END)
+
+        # Act
+        by_user = list(archive.entries(user_id=alice))
+        by_family = list(archive.entries("garmin", alice, "workouts"))
+
+        # Assert
+        assert len(by_user) == 3
+        assert [(entry.provider, entry.user_id, entry.family) for entry in by_family] == [("garmin", alice, "workouts")]
+
+    def test_archive_payload_best_effort(self, tmp_path: Path) -> None:
+        """Test archiving does nothing when disabled and logs instead of raising on failure."""
+        # Arrange
+        failing = RawArchive(LocalArchiveStore(tmp_path / "file"))
+        (tmp_path / "file").write_text("not a directory")
+
+        # Act
+        with patch("app.integrations.raw_archive.get_raw_archive", return_value=None):
+            archive_payload("garmin", uuid4(), "workouts", [_activity()])
+        with patch("app.integrations.raw_archive.get_raw_archive", return_value=failing):
+            archive_payload("garmin", uuid4(), "workouts", [_activity()])
+
+        # Assert
+        assert [path.name for path in tmp_path.iterdir()] == ["file"]
+
+
+class TestReplayArchive:
+    """Test suite for replay_archive."""
+
+    def test_workouts_renormalized(self, db: Session, tmp_path: Path) -> None:
+        """Test replaying archived workouts replaces details saved by an earlier normalizer."""
+        # Arrange
+        user = UserFactory()
+        workouts = ProviderFactory().get_provider("garmin").workouts
+        assert workouts is not None
+        workouts.save_data(db, user.id, [GarminActivityJSON(**_activity())])
+        detail = (
+            db.query(WorkoutDetails)
+            .join(EventRecord, WorkoutDetails.record_id == EventRecord.id)
+            .join(ExternalDeviceMapping, EventRecord.external_device_mapping_id == ExternalDeviceMapping.id)
+            .filter(ExternalDeviceMapping.user_id == user.id)
+            .one()
+        )
+        detail.heart_rate_min = 145  # as formerly derived from the average
+        db.commit()
+
+        archive = RawArchive(LocalArchiveStore(tmp_path))
+        archive.put("garmin", user.id, "workouts", [GarminActivityJSON(**_activity())], START, END)
+
+        # Act
+        result = replay_archive(db, archive, "garmin", user.id)
+
+        # Assert
+        assert result == {"replayed": 1, "skipped": 0, "failed": 0}
+        db.expire_all()
+        replayed = db.query(WorkoutDetails).filter(WorkoutDetails.record_id == detail.record_id).one()
+        assert replayed.heart_rate_min is None
+        assert replayed.heart_rate_max == 175
+        assert db.query(EventRecord).filter(EventRecord.id == detail.record_id).count() == 1
+
+    def test_247_samples_replaced(self, db: Session, tmp_path: Path) -> None:
+        """Test replaying archived Suunto 247 payloads twice leaves the stored samples unchanged."""
+        # Arrange
+        user = UserFactory()
+        archive = RawArchive(LocalArchiveStore(tmp_path))
+        samples = [
+            {"timestamp": "2025-03-01T10:00:00Z", "entryData": {"HR": 60, "StepCount": 10}},
+            {"timestamp": "2025-03-01T10:10:00Z", "entryData": {"HR": 72}},
+        ]
+        daily = [
+            {
+                "Name": "stepcount",
+                "Sources": [{"Name": "watch", "Samples": [{"Value": 8500, "TimeISO8601": "2025-03-01T00:00:00Z"}]}],
+            },
+        ]
+        archive.put("suunto", user.id, "activity_samples", samples, START, END)
+        archive.put("suunto", user.id, "daily_activity", daily, START, END)
+
+        # Act
+        first = replay_archive(db, archive, "suunto", user.id)
+        stored = db.query(DataPointSeries).count()
+        second = replay_archive(db, archive, "suunto", user.id)
+
+        # Assert
+        assert first == second == {"replayed": 2, "skipped": 0, "failed": 0}
+        assert stored == db.query(DataPointSeries).count() == 4
+
+    def test_unknown_family_skipped(self, db: Session, tmp_path: Path) -> None:
+        """Test payloads of families without a saver are skipped and invalid ones counted as failed."""
+        # Arrange
+        user = UserFactory()
+        archive = RawArchive(LocalArchiveStore(tmp_path))
+        archive.put("garmin", user.id, "bloodPressures", [{"summaryId": "bp-1"}], START, END)
+        archive.put("garmin", user.id, "workouts", [{"activityId": "missing fields"}], START, END)
+
+        # Act
+        result = replay_archive(db, archive)
+
+        # Assert
+        assert result == {"replayed": 0, "skipped": 1, "failed": 1}
@@ -0,0 +1,256 @@
+"""
+Tests for the upload queue consumer, run against an in-memory SQS stand-in.
+
+Tests cover:
+- Receiving batches of at most 10 messages and deleting handled ones in batches
+- Handling messages concurrently, within the configured bound
+- Extending the visibility of long-running messages so they are not redelivered
+- Leaving failed messages on the queue to be retried, surviving receive errors
+- Finishing messages in flight when stopped
+- Importing the files of S3 event messages and skipping other messages
+"""
+
+import json
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.integrations.sqs_consumer import UploadQueueConsumer, import_upload
+
+QUEUE_URL = "https://sqs.eu-north-1.amazonaws.com/12345678/uploads"
+
+
+class FakeSQS:
+    """In-memory SQS queue with visibility timeouts and receipt handles."""
+
+    def __init__(self, bodies: list[str]):
+        self.lock = threading.Lock()
+        self.messages = [
+            {"MessageId": f"m{i}", "Body": body, "visible_at": 0.0, "receipt": None} for i, body in enumerate(bodies)
+        ]
+        self.receive_sizes: list[int] = []
+        self.delete_sizes: list[int] = []
+        self.extended: list[str] = []
+
+    def _by_receipt(self, receipt: str) -> dict[str, Any] | None:
+        return next((message for message in self.messages if message["receipt"] == receipt), None)
+
+    def receive_message(self, **kwargs: Any) -> dict[str, Any]:
+        assert kwargs["QueueUrl"] == QUEUE_URL
+        with self.lock:
+            now = time.monotonic()
+            visible = [message for message in self.messages if message["visible_at"] <= now]
+            received = visible[: kwargs["MaxNumberOfMessages"]]
+            for message in received:
+                message["visible_at"] = now + kwargs["VisibilityTimeout"]
+                message["receipt"] = uuid4().hex
+            self.receive_sizes.append(kwargs["MaxNumberOfMessages"])
+        if not received:
+            time.sleep(0.01)
+        return {
+            "Messages": [
+                {"MessageId": message["MessageId"], "ReceiptHandle": message["receipt"], "Body": message["Body"]}
+                for message in received
+            ],
+        }
+
+    def change_message_visibility_batch(self, **kwargs: Any) -> dict[str, Any]:
+        entries = kwargs["Entries"]
+        assert len(entries) <= 10
+        with self.lock:
+            for entry in entries:
+                if message := self._by_receipt(entry["ReceiptHandle"]):
+                    message["visible_at"] = time.monotonic() + entry["VisibilityTimeout"]
+                    self.extended.append(message["MessageId"])
+        return {"Successful": [{"Id": entry["Id"]} for entry in entries], "Failed": []}
+
+    def delete_message_batch(self, **kwargs: Any) -> dict[str, Any]:
+        entries = kwargs["Entries"]
+        assert len(entries) <= 10
+        with self.lock:
+            self.delete_sizes.append(len(entries))
+            for entry in entries:
+                if message := self._by_receipt(entry["ReceiptHandle"]):
+                    self.messages.remove(message)
+        return {"Successful": [{"Id": entry["Id"]} for entry in entries], "Failed": []}
+
+
+def _consume_until(consumer: UploadQueueConsumer, done: Callable[[], bool], timeout: float = 5) -> None:
+    thread = threading.Thread(target=consumer.run)
+    thread.start()
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    consumer.stop()
+    thread.join(timeout)
+    assert not thread.is_alive()
+
+
+def _consumer(sqs: FakeSQS, handler: Callable[[dict[str, Any]], None], **kwargs: Any) -> UploadQueueConsumer:
+    return UploadQueueConsumer(sqs, QUEUE_URL, handler, wait_seconds=0, **kwargs)
+
+
+class TestUploadQueueConsumer:
+    """Test suite for UploadQueueConsumer."""
+
+    def test_handles_and_deletes_in_batches(self) -> None:
+        """Test every message is handled once and deleted with batch requests."""
+        # Arrange
+        sqs = FakeSQS([f"upload-{i}" for i in range(25)])
+        handled: list[str] = []
+        consumer = _consumer(sqs, lambda message: handled.append(message["Body"]), concurrency=20)
+
+        # Act
+        _consume_until(consumer, lambda: not sqs.messages)
+
+        # Assert
+        assert sorted(handled) == sorted(f"upload-{i}" for i in range(25))
+        assert not sqs.messages
+        assert max(sqs.receive_sizes) == 10
+        assert sum(sqs.delete_sizes) == 25
+        assert len(sqs.delete_sizes) < 25
+
+    def test_concurrency_bounded(self) -> None:
+        """Test at most `concurrency` messages are handled (and held invisible) at once."""
+        # Arrange
+        sqs = FakeSQS([f"upload-{i}" for i in range(9)])
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, max
+
+        def handle(message: dict[str, Any]) -> None:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+
+        consumer = _consumer(sqs, handle, concurrency=3)
+
+        # Act
+        _consume_until(consumer, lambda: not sqs.messages)
+
+        # Assert
+        assert in_flight[1] == 3
+        assert max(sqs.receive_sizes) <= 3
+        assert consumer.stats == {"received": 9, "handled": 9, "failed": 0}
+
+    def test_visibility_extended_for_long_message(self) -> None:
+        """Test a message handled for longer than its visibility timeout is not redelivered."""
+        # Arrange
+        sqs = FakeSQS(["long-import"])
+        handled: list[str] = []
+
+        def handle(message: dict[str, Any]) -> None:
+            time.sleep(1.0)
+            handled.append(message["MessageId"])
+
+        consumer = _consumer(sqs, handle, concurrency=2, visibility_timeout=0.3)
+
+        # Act
+        _consume_until(consumer, lambda: not sqs.messages)
+
+        # Assert
+        assert handled == ["m0"]
+        assert len(sqs.extended) >= 2
+
+    def test_failed_message_retried(self) -> None:
+        """Test a failed message stays on the queue and is handled again once visible."""
+        # Arrange
+        sqs = FakeSQS(["flaky", "fine"])
+        attempts: list[str] = []
+
+        def handle(message: dict[str, Any]) -> None:
+            attempts.append(message["Body"])
+            if message["Body"] == "flaky" and attempts.count("flaky") == 1:
+                raise RuntimeError("Database unavailable")
+
+        consumer = _consumer(sqs, handle, concurrency=2, visibility_timeout=0.2)
+
+        # Act
+        _consume_until(consumer, lambda: not sqs.messages)
+
+        # Assert
+        assert attempts.count("flaky") == 2
+        assert attempts.count("fine") == 1
+        assert consumer.stats["failed"] == 1
+        assert not sqs.messages
+
+    def test_receive_error_retried(self) -> None:
+        """Test a failing receive is logged and the consumer keeps polling."""
+        # Arrange
+        sqs = FakeSQS(["upload"])
+        receive = sqs.receive_message
+        calls = [0]
+
+        def flaky_receive(**kwargs: Any) -> dict[str, Any]:
+            calls[0] += 1
+            if calls[0] == 1:
+                raise ConnectionError("Network down")
+            return receive(**kwargs)
+
+        sqs.receive_message = flaky_receive  # type: ignore[method-assign]
+        consumer = _consumer(sqs, lambda message: None)
+
+        # Act
+        _consume_until(consumer, lambda: not sqs.messages)
+
+        # Assert
+        assert calls[0] >= 2
+        assert not sqs.messages
+
+    def test_stop_finishes_in_flight(self) -> None:
+        """Test stopping waits for messages being handled and deletes them."""
+        # Arrange
+        sqs = FakeSQS(["upload"])
+        started = threading.Event()
+
+        def handle(message: dict[str, Any]) -> None:
+            started.set()
+            time.sleep(0.2)
+
+        consumer = _consumer(sqs, handle, concurrency=2)
+
+        # Act
+        _consume_until(consumer, started.is_set)
+
+        # Assert
+        assert consumer.stats["handled"] == 1
+        assert not sqs.messages
+
+
+class TestImportUpload:
+    """Test suite for import_upload."""
+
+    def test_imports_s3_records(self) -> None:
+        """Test each S3 record of an event message is imported."""
+        # Arrange
+        event = {
+            "Records": [
+                {"eventSource": "aws:s3", "s3": {"bucket": {"name": "uploads"}, "object": {"key": f"u/raw/{i}.xml"}}}
+                for i in range(2)
+            ],
+        }
+
+        # Act
+        with patch("app.integrations.sqs_consumer.process_uploaded_file") as process:
+            import_upload({"MessageId": "m0", "Body": json.dumps(event)})
+
+        # Assert
+        assert [call.args for call in process.call_args_list] == [
+            ("uploads", "u/raw/0.xml"),
+            ("uploads", "u/raw/1.xml"),
+        ]
+
+    def test_skips_other_messages(self) -> None:
+        """Test invalid JSON and non-S3 events are skipped (and so deleted) without importing."""
+        # Act
+        with patch("app.integrations.sqs_consumer.process_uploaded_file") as process:
+            import_upload({"MessageId": "m0", "Body": "not json"})
+            import_upload({"MessageId": "m1", "Body": json.dumps({"Event": "s3:TestEvent"})})
+
+        # Assert
+        process.assert_not_called()
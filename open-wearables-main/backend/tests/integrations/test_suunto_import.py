@@ -88,7 +88,7 @@ class TestSuuntoImport:
             ],
         }
 
-    @patch("httpx.post")
+    @patch("httpx.Client.post")
     def test_oauth_token_exchange_with_jwt(
         self,
         mock_post: MagicMock,
@@ -247,7 +247,7 @@ class TestSuuntoImport:
         assert "samples" in result
         mock_request.assert_called_once()
 
-    @patch("httpx.post")
+    @patch("httpx.Client.post")
     def test_token_refresh_flow(
         self,
         mock_post: MagicMock,
@@ -0,0 +1,291 @@
+"""
+Tests for the per user, provider and data family sync leases.
+
+Tests cover:
+- Leasing a family to one sync at a time
+- Coalescing incremental syncs into one rerun by the lease holder
+- Leaving leases taken over after expiry alone
+- Extending leases while they are held
+- Syncing without leases when Redis is unavailable
+- Skipping leased families in sync_vendor_data and rerunning them after the holder
+- Deferring syncs of an explicit range while their families are leased
+- Extending the leases of sync_vendor_data while its jobs run
+"""
+
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.integrations.celery.tasks.sync_vendor_data_task import sync_vendor_data
+from app.integrations.sync_lock import _ACQUIRE_SCRIPT, _EXTEND_SCRIPT, _RELEASE_SCRIPT, SyncLease, SyncLeases
+from app.schemas import ConnectionStatus
+from tests.factories import UserConnectionFactory, UserFactory
+
+TTL = 1800
+
+
+class FakeRedis:
+    """In-memory stand-in running the lease scripts as Redis would."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.extended: list[str] = []
+
+    def register_script(self, script: str) -> MagicMock:
+        run = {_ACQUIRE_SCRIPT: self._acquire, _EXTEND_SCRIPT: self._extend, _RELEASE_SCRIPT: self._release}[script]
+        return MagicMock(side_effect=lambda keys, args: run(*keys, *args))
+
+    def _acquire(self, key: str, rerun_key: str, token: str, ttl: int, coalesce: int) -> str:
+        if key not in self.data:
+            self.data[key] = token
+            return "0"
+        if coalesce:
+            self.data[rerun_key] = "1"
+        return str(ttl)
+
+    def _extend(self, key: str, token: str, ttl: int) -> str:
+        if self.data.get(key) != token:
+            return "0"
+        self.extended.append(key)
+        return "1"
+
+    def _release(self, key: str, rerun_key: str, token: str) -> str:
+        if self.data.get(key) != token:
+            return "0"
+        del self.data[key]
+        return "1" if self.data.pop(rerun_key, None) else "0"
+
+
+@pytest.fixture
+def fake_redis() -> Generator[FakeRedis, None, None]:
+    redis = FakeRedis()
+    with patch("app.integrations.sync_lock.get_redis_client", return_value=redis):
+        yield redis
+
+
+class TestSyncLease:
+    """Test suite for SyncLease."""
+
+    def test_one_holder_at_a_time(self, fake_redis: FakeRedis) -> None:
+        """Test a leased family is refused to other syncs until released."""
+        # Arrange
+        user_id = uuid4()
+        holder = SyncLease(user_id, "garmin", "workouts")
+        other = SyncLease(user_id, "garmin", "workouts")
+
+        # Act
+        taken = holder.acquire(coalesce=False)
+        refused = other.acquire(coalesce=False)
+        rerun = holder.release()
+
+        # Assert
+        assert (taken, refused, rerun) == (0, TTL, False)
+        assert SyncLease(user_id, "garmin", "sleeps").acquire(coalesce=False) == 0
+        assert other.acquire(coalesce=False) == 0
+
+    def test_incremental_syncs_coalesced(self, fake_redis: FakeRedis) -> None:
+        """Test syncs requested while the family is leased result in a single rerun."""
+        # Arrange
+        user_id = uuid4()
+        holder = SyncLease(user_id, "suunto", "sleep_sessions")
+        holder.acquire(coalesce=True)
+
+        # Act
+        for _ in range(3):
+            SyncLease(user_id, "suunto", "sleep_sessions").acquire(coalesce=True)
+
+        # Assert
+        assert holder.release() is True
+        assert holder.release() is False
+        assert fake_redis.data == {}
+
+    def test_expired_lease_taken_over(self, fake_redis: FakeRedis) -> None:
+        """Test a holder whose lease expired and was taken over releases nothing."""
+        # Arrange
+        user_id = uuid4()
+        expired = SyncLease(user_id, "whoop", "workouts")
+        expired.acquire(coalesce=True)
+        fake_redis.data.clear()
+        current = SyncLease(user_id, "whoop", "workouts")
+        current.acquire(coalesce=True)
+
+        # Act
+        rerun = expired.release()
+
+        # Assert
+        assert rerun is False
+        assert fake_redis.data == {current.key: current.token}
+
+    def test_lease_extended_while_held(self, fake_redis: FakeRedis) -> None:
+        """Test a held lease is extended, and one that expired meanwhile is given up."""
+        # Arrange
+        user_id = uuid4()
+        holder = SyncLease(user_id, "oura", "sleep")
+        holder.acquire(coalesce=True)
+
+        # Act
+        extended = holder.extend()
+        fake_redis.data.clear()
+        current = SyncLease(user_id, "oura", "sleep")
+        current.acquire(coalesce=True)
+        lost = holder.extend()
+
+        # Assert
+        assert (extended, lost) == (True, False)
+        assert fake_redis.extended == [holder.key]
+        assert holder.release() is False
+        assert fake_redis.data == {current.key: current.token}
+
+    def test_redis_unavailable(self) -> None:
+        """Test syncs go ahead without leases when Redis is down."""
+        # Arrange
+        redis = MagicMock()
+        redis.register_script.side_effect = RedisConnectionError("down")
+        lease = SyncLease(uuid4(), "polar", "workouts")
+
+        # Act
+        with patch("app.integrations.sync_lock.get_redis_client", return_value=redis):
+            taken = lease.acquire(coalesce=True)
+            rerun = lease.release()
+
+        # Assert
+        assert (taken, rerun) == (0, False)
+
+
+class TestSyncVendorDataLeases:
+    """Test suite for sync_vendor_data running alongside other syncs of a connection."""
+
+    @staticmethod
+    def _strategy() -> MagicMock:
+        strategy = MagicMock()
+        strategy.workouts.fetch_data.return_value = []
+        strategy.workouts.save_data.return_value = True
+        strategy.data_247.get_sync_families.return_value = {
+            "sleep_sessions": (MagicMock(return_value=[]), MagicMock(return_value=0)),
+        }
+        return strategy
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.sync_vendor_data.delay")
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_leased_family_coalesced(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        mock_delay: MagicMock,
+        db: Session,
+        fake_redis: FakeRedis,
+    ) -> None:
+        """Test an incremental sync skips the family being synced and the running sync reruns it."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        strategy = mock_get_provider.return_value = self._strategy()
+        running = SyncLeases(user.id, "suunto", ["sleep_sessions"])
+        running.acquire(coalesce=True)
+
+        # Act
+        result = sync_vendor_data(str(user.id))
+        rerun = running.release()
+
+        # Assert
+        assert result["coalesced"] == {"suunto": ["sleep_sessions"]}
+        assert result["providers_synced"]["suunto"]["params"]["workouts"]["success"] is True
+        strategy.workouts.fetch_data.assert_called_once()
+        strategy.data_247.get_sync_families.return_value["sleep_sessions"][0].assert_not_called()
+        assert rerun == ["sleep_sessions"]
+        assert fake_redis.data == {}
+        mock_delay.assert_not_called()
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.sync_vendor_data.delay")
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_holder_reruns_coalesced_sync(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        mock_delay: MagicMock,
+        db: Session,
+        fake_redis: FakeRedis,
+    ) -> None:
+        """Test a sync queues one more sync of the provider when another was requested meanwhile."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="garmin", status=ConnectionStatus.ACTIVE)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        strategy = mock_get_provider.return_value = self._strategy()
+
+        def fetch_while_requested(*args: Any, **kwargs: Any) -> list[Any]:
+            SyncLeases(user.id, "garmin", ["workouts"]).acquire(coalesce=True)
+            return []
+
+        strategy.workouts.fetch_data.side_effect = fetch_while_requested
+
+        # Act
+        sync_vendor_data(str(user.id))
+
+        # Assert
+        mock_delay.assert_called_once_with(str(user.id), providers=["garmin"])
+        assert fake_redis.data == {}
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_range_sync_deferred_while_leased(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        fake_redis: FakeRedis,
+    ) -> None:
+        """Test a sync of an explicit range is deferred instead of coalesced into a running sync."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="whoop", status=ConnectionStatus.ACTIVE)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        strategy = mock_get_provider.return_value = self._strategy()
+        running = SyncLeases(user.id, "whoop", ["workouts"])
+        running.acquire(coalesce=False)
+
+        # Act
+        result = sync_vendor_data(str(user.id), "2025-01-01T00:00:00Z", "2025-01-31T00:00:00Z", defer=False)
+
+        # Assert
+        assert result["deferred"] == {"whoop": 60.0}
+        assert result["providers_synced"]["whoop"]["success"] is False
+        strategy.workouts.fetch_data.assert_not_called()
+        assert list(fake_redis.data) == [running.leases[0].key]
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_leases_extended_while_syncing(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        fake_redis: FakeRedis,
+    ) -> None:
+        """Test the leases of the families being synced are extended as their jobs complete."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        mock_get_provider.return_value = self._strategy()
+
+        # Act
+        with patch.object(settings, "sync_lease_seconds", 0):
+            sync_vendor_data(str(user.id))
+
+        # Assert
+        assert {key.rsplit(":", 1)[1] for key in fake_redis.extended} == {"workouts", "sleep_sessions"}
+        assert fake_redis.data == {}
@@ -0,0 +1,72 @@
+"""
+Load tests for the read API concurrency.
+
+Tests cover:
+- Read queries run on threadpool threads, never on the event loop thread
+- Concurrent read requests on a single worker run their queries at the same time
+"""
+
+import asyncio
+import threading
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.database import _get_db_dependency
+from app.main import api
+from app.services.api_key_service import _require_api_key
+
+CONCURRENT_REQUESTS = 20
+BARRIER_TIMEOUT_SECONDS = 10  # Only reached when queries do not run concurrently
+
+
+@pytest.fixture
+def query_threads() -> Generator[list[int], None, None]:
+    """Serve the API with every read query blocking until all concurrent requests have issued theirs.
+
+    Yields the identifiers of the threads the queries ran on.
+    """
+    barrier = threading.Barrier(CONCURRENT_REQUESTS, timeout=BARRIER_TIMEOUT_SECONDS)
+    threads: list[int] = []
+
+    def _blocking_get_samples(*_args: Any) -> tuple[list, int]:
+        threads.append(threading.get_ident())
+        barrier.wait()
+        return [], 0
+
+    api.dependency_overrides[_get_db_dependency] = lambda: MagicMock()
+    api.dependency_overrides[_require_api_key] = lambda: "test-api-key"
+    with patch(
+        "app.services.timeseries_service.timeseries_service.crud.get_samples",
+        side_effect=_blocking_get_samples,
+    ):
+        yield threads
+    api.dependency_overrides.clear()
+
+
+class TestReadConcurrency:
+    """Load test for read endpoints served by a single worker."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_timeseries_queries_off_event_loop(self, query_threads: list[int]) -> None:
+        """Queries should run on threadpool threads, all at once, while the event loop stays free."""
+        # Arrange
+        user_id = uuid4()
+        params = {"start_time": "2025-01-01T00:00:00Z", "end_time": "2025-01-02T00:00:00Z"}
+        loop_thread = threading.get_ident()
+
+        # Act
+        async with AsyncClient(transport=ASGITransport(app=api), base_url="http://test") as client:
+            responses = await asyncio.gather(
+                *(client.get(f"/api/v1/users/{user_id}/timeseries", params=params) for _ in range(CONCURRENT_REQUESTS)),
+            )
+
+        # Assert
+        # A query blocking the loop (or run one after another) would break the barrier and fail its request
+        assert all(response.status_code == 200 for response in responses)
+        assert len(query_threads) == CONCURRENT_REQUESTS
+        assert loop_thread not in query_threads
@@ -75,7 +75,7 @@ class TestGarminOAuth:
         assert len(state) > 0
         mock_redis_client.setex.assert_called_once()
 
-    @patch("httpx.get")
+    @patch("httpx.Client.get")
     def test_get_provider_user_info_success(
         self,
         mock_httpx_get: MagicMock,
@@ -104,10 +104,9 @@ class TestGarminOAuth:
         mock_httpx_get.assert_called_once_with(
             "https://apis.garmin.com/wellness-api/rest/user/id",
             headers={"Authorization": "Bearer test_access_token"},
-            timeout=30.0,
         )
 
-    @patch("httpx.get")
+    @patch("httpx.Client.get")
     def test_get_provider_user_info_failure(
         self,
         mock_httpx_get: MagicMock,
@@ -131,7 +130,7 @@ class TestGarminOAuth:
         assert user_info["user_id"] is None
         assert user_info["username"] is None
 
-    @patch("httpx.post")
+    @patch("httpx.Client.post")
     @patch("app.integrations.redis_client.get_redis_client")
     def test_exchange_token_with_pkce(
         self,
@@ -165,7 +164,7 @@ class TestGarminOAuth:
         call_args = mock_httpx_post.call_args
         assert call_args[1]["data"]["code_verifier"] == code_verifier
 
-    @patch("httpx.post")
+    @patch("httpx.Client.post")
     def test_refresh_access_token(
         self,
         mock_httpx_post: MagicMock,
@@ -0,0 +1,86 @@
+"""
+Tests for pulling the callback URLs of Garmin pings.
+
+Tests cover:
+- Pulling through Garmin's shared rate limiter
+- Not pulling while the shared rate limit is exhausted
+- Reporting Garmin's own rate limit responses with their Retry-After
+"""
+
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.services.providers.api_client import ProviderRateLimitedError
+from app.services.providers.garmin.pings import GarminPing, fetch_callback
+
+CALLBACK_URL = (
+    "https://apis.garmin.com/wellness-api/rest/dailies?uploadStartTimeInSeconds=1&uploadEndTimeInSeconds=2&token=t"
+)
+
+
+def _ping() -> GarminPing:
+    return GarminPing(
+        summary_type="dailies",
+        garmin_user_id="garmin_user_123",
+        user_id=uuid4(),
+        callback_url=CALLBACK_URL,
+    )
+
+
+class TestFetchCallback:
+    """Test suite for fetch_callback."""
+
+    @patch("app.services.providers.garmin.pings.archive_payload")
+    @patch("httpx.Client.get")
+    def test_pull_throttled(self, mock_get: MagicMock, mock_archive: MagicMock) -> None:
+        """Test a pull takes a token from Garmin's rate limiter before it is sent."""
+        # Arrange
+        limiter = MagicMock()
+        limiter.acquire.return_value = 0.0
+        mock_get.return_value = httpx.Response(
+            200, json=[{"summaryId": "daily-1"}], request=httpx.Request("GET", CALLBACK_URL)
+        )
+
+        # Act
+        with patch("app.services.providers.api_client.get_provider_rate_limiter", return_value=limiter) as get_limiter:
+            summaries = fetch_callback(_ping())
+
+        # Assert
+        assert summaries == [{"summaryId": "daily-1"}]
+        get_limiter.assert_called_once_with("garmin")
+        limiter.acquire.assert_called_once()
+
+    @patch("httpx.Client.get")
+    def test_exhausted_limiter_skips_pull(self, mock_get: MagicMock) -> None:
+        """Test no pull is sent while the shared rate limit is exhausted."""
+        # Arrange
+        limiter = MagicMock()
+        limiter.acquire.return_value = 120.0
+
+        # Act
+        with (
+            patch("app.services.providers.api_client.get_provider_rate_limiter", return_value=limiter),
+            pytest.raises(ProviderRateLimitedError) as exc_info,
+        ):
+            fetch_callback(_ping())
+
+        # Assert
+        assert exc_info.value.retry_after == 120
+        mock_get.assert_not_called()
+
+    @patch("httpx.Client.get")
+    def test_garmin_rate_limit_reported(self, mock_get: MagicMock) -> None:
+        """Test a 429 from Garmin is raised as a rate limit with its Retry-After."""
+        # Arrange
+        mock_get.return_value = httpx.Response(429, headers={"Retry-After": "30"})
+
+        # Act & Assert
+        with (
+            patch("app.services.providers.api_client.get_provider_rate_limiter", return_value=None),
+            pytest.raises(ProviderRateLimitedError) as exc_info,
+        ):
+            fetch_callback(_ping())
+        assert exc_info.value.retry_after == 30
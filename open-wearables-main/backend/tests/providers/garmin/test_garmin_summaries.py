@@ -0,0 +1,187 @@
+"""
+Tests for bulk saving of Garmin wellness summaries.
+
+Tests cover:
+- Epochs of a 15-minute window summed into steps, energy and distance samples
+- Redelivered summaries replacing stored data instead of duplicating it
+- Daily totals and heart rate samples, skipping totals delivered as epochs
+- Stress and body battery samples, skipping unmeasurable values
+- Sleeps saved as event records with sleep details and SpO2 samples
+- Push payloads resolved per user, skipping users without a connection
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models import DataPointSeries, EventRecord, ExternalDeviceMapping, SleepDetails
+from app.schemas.series_types import SeriesType, get_series_type_id
+from app.services.providers.garmin.summaries import WELLNESS_SAVERS, save_pushed_summaries
+from tests.factories import UserConnectionFactory, UserFactory
+
+START = 1740787200  # 2025-03-01T00:00:00Z
+
+
+def _epoch(offset: int, activity_type: str, steps: int, kcal: float) -> dict[str, Any]:
+    return {
+        "userId": "garmin_user_123",
+        "summaryId": f"epoch-{offset}-{activity_type}",
+        "activityType": activity_type,
+        "startTimeInSeconds": START + offset,
+        "durationInSeconds": 900,
+        "steps": steps,
+        "activeKilocalories": kcal,
+        "distanceInMeters": steps * 0.8,
+    }
+
+
+def _sleep(deep: int = 3600) -> dict[str, Any]:
+    return {
+        "userId": "garmin_user_123",
+        "summaryId": "sleep-1",
+        "startTimeInSeconds": START - 7 * 3600,
+        "durationInSeconds": 28800,
+        "deepSleepDurationInSeconds": deep,
+        "lightSleepDurationInSeconds": 14400,
+        "remSleepInSeconds": 7200,
+        "awakeDurationInSeconds": 3600,
+        "timeOffsetSleepSpo2": {"0": 96, "60": 95, "120": -1},
+    }
+
+
+def _samples(db: Session, user_id: UUID, series_type: SeriesType) -> dict[datetime, float]:
+    rows = (
+        db.query(DataPointSeries.recorded_at, DataPointSeries.value)
+        .join(ExternalDeviceMapping, DataPointSeries.external_device_mapping_id == ExternalDeviceMapping.id)
+        .filter(
+            ExternalDeviceMapping.user_id == user_id,
+            DataPointSeries.series_type_definition_id == get_series_type_id(series_type),
+        )
+        .all()
+    )
+    return {recorded_at: float(value) for recorded_at, value in rows}
+
+
+def _at(offset: int) -> datetime:
+    return datetime.fromtimestamp(START + offset, tz=timezone.utc)
+
+
+class TestGarminWellnessSavers:
+    """Test suite for the wellness summary savers."""
+
+    def test_epochs_summed_per_window(self, db: Session) -> None:
+        """Test epochs of different activity types in one window add up to one sample per series."""
+        # Arrange
+        user = UserFactory()
+        epochs = [_epoch(0, "SEDENTARY", 40, 2.0), _epoch(0, "WALKING", 400, 20.5), _epoch(900, "WALKING", 300, 15.0)]
+
+        # Act
+        saved = WELLNESS_SAVERS["epochs"](db, user.id, epochs)
+
+        # Assert
+        assert saved == 3
+        assert _samples(db, user.id, SeriesType.steps) == {_at(0): 440.0, _at(900): 300.0}
+        assert _samples(db, user.id, SeriesType.energy) == {_at(0): 22.5, _at(900): 15.0}
+        assert _samples(db, user.id, SeriesType.distance_walking_running)[_at(0)] == 352.0
+
+    def test_redelivered_epochs_replace_stored(self, db: Session) -> None:
+        """Test a redelivered window updates its samples and adds none."""
+        # Arrange
+        user = UserFactory()
+        WELLNESS_SAVERS["epochs"](db, user.id, [_epoch(0, "WALKING", 400, 20.0), _epoch(900, "WALKING", 300, 15.0)])
+
+        # Act
+        WELLNESS_SAVERS["epochs"](db, user.id, [_epoch(0, "WALKING", 450, 22.0), _epoch(900, "WALKING", 300, 15.0)])
+
+        # Assert
+        assert _samples(db, user.id, SeriesType.steps) == {_at(0): 450.0, _at(900): 300.0}
+
+    def test_dailies_totals_and_heart_rate(self, db: Session) -> None:
+        """Test daily totals not covered by epochs and heart rate samples are saved."""
+        # Arrange
+        user = UserFactory()
+        daily = {
+            "userId": "garmin_user_123",
+            "summaryId": "daily-1",
+            "startTimeInSeconds": START,
+            "steps": 9000,
+            "restingHeartRateInBeatsPerMinute": 52,
+            "bmrKilocalories": 1650,
+            "timeOffsetHeartRateSamples": {"0": 58, "15": 60, "30": 0},
+        }
+
+        # Act
+        WELLNESS_SAVERS["dailies"](db, user.id, [daily])
+
+        # Assert
+        assert _samples(db, user.id, SeriesType.resting_heart_rate) == {_at(0): 52.0}
+        assert _samples(db, user.id, SeriesType.basal_energy) == {_at(0): 1650.0}
+        assert _samples(db, user.id, SeriesType.heart_rate) == {_at(0): 58.0, _at(15): 60.0}
+        assert _samples(db, user.id, SeriesType.steps) == {}
+
+    def test_stress_details_skip_unmeasurable(self, db: Session) -> None:
+        """Test negative stress values (rest not measurable, activity) are skipped."""
+        # Arrange
+        user = UserFactory()
+        stress = {
+            "userId": "garmin_user_123",
+            "summaryId": "stress-1",
+            "startTimeInSeconds": START,
+            "timeOffsetStressLevelValues": {"0": 18, "180": -1, "360": -2, "540": 35},
+            "timeOffsetBodyBatteryValues": {"0": 55, "180": 54},
+        }
+
+        # Act
+        WELLNESS_SAVERS["stressDetails"](db, user.id, [stress])
+
+        # Assert
+        assert _samples(db, user.id, SeriesType.stress_level) == {_at(0): 18.0, _at(540): 35.0}
+        assert _samples(db, user.id, SeriesType.body_battery) == {_at(0): 55.0, _at(180): 54.0}
+
+    def test_sleeps_saved_with_details(self, db: Session) -> None:
+        """Test a sleep is saved once with its details, also when redelivered."""
+        # Arrange
+        user = UserFactory()
+        WELLNESS_SAVERS["sleeps"](db, user.id, [_sleep(deep=3000)])
+
+        # Act
+        saved = WELLNESS_SAVERS["sleeps"](db, user.id, [_sleep()])
+
+        # Assert
+        assert saved == 1
+        record = (
+            db.query(EventRecord)
+            .join(ExternalDeviceMapping, EventRecord.external_device_mapping_id == ExternalDeviceMapping.id)
+            .filter(ExternalDeviceMapping.user_id == user.id, EventRecord.category == "sleep")
+            .one()
+        )
+        assert record.external_id == "sleep-1"
+        assert record.duration_seconds == 25200
+        assert record.end_datetime - record.start_datetime == timedelta(hours=8)
+        detail = db.query(SleepDetails).filter(SleepDetails.record_id == record.id).one()
+        assert detail.sleep_deep_minutes == 60
+        assert detail.sleep_time_in_bed_minutes == 480
+        assert detail.sleep_efficiency_score == Decimal("87.50")
+        assert len(_samples(db, user.id, SeriesType.oxygen_saturation)) == 2
+
+
+class TestSavePushedSummaries:
+    """Test suite for save_pushed_summaries."""
+
+    def test_saves_connected_users_only(self, db: Session) -> None:
+        """Test summaries are saved for connected users and skipped for unknown ones."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="garmin", provider_user_id="garmin_user_123")
+        unknown = {**_epoch(0, "WALKING", 100, 5.0), "userId": "garmin_unknown"}
+        payload = {"epochs": [_epoch(0, "WALKING", 400, 20.0), unknown], "sleeps": [_sleep()]}
+
+        # Act
+        result = save_pushed_summaries(db, payload)
+
+        # Assert
+        assert result == {"dailies": 0, "epochs": 1, "stressDetails": 0, "sleeps": 1, "skipped": 1, "failed": 0}
+        assert _samples(db, user.id, SeriesType.steps) == {_at(0): 400.0}
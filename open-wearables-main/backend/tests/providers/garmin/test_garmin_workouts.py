@@ -123,7 +123,7 @@ class TestGarminWorkouts:
 
         assert metrics["heart_rate_avg"] == Decimal("145")
         assert metrics["heart_rate_max"] == 175
-        assert metrics["heart_rate_min"] == 145
+        assert metrics["heart_rate_min"] is None
         assert metrics["steps_count"] == 8500
 
     def test_build_metrics_with_missing_values(self, garmin_workouts: GarminWorkouts) -> None:
@@ -187,7 +187,7 @@ class TestPolarOAuthAuthorization:
 class TestPolarOAuthUserInfo:
     """Tests for extracting Polar user info from token response."""
 
-    @patch("httpx.post")
+    @patch("httpx.Client.post")
     def test_get_provider_user_info_with_x_user_id(self, mock_post: MagicMock, db: Session) -> None:
         """Test extracting user info when x_user_id is present."""
         # Arrange
@@ -264,7 +264,7 @@ class TestPolarOAuthUserInfo:
 class TestPolarUserRegistration:
     """Tests for Polar user registration API call."""
 
-    @patch("httpx.post")
+    @patch("httpx.Client.post")
     def test_register_user_success(self, mock_post: MagicMock, db: Session) -> None:
         """Test successful user registration with Polar API."""
         # Arrange
@@ -298,7 +298,7 @@ class TestPolarUserRegistration:
         assert "Bearer test_access_token" in call_args[1]["headers"]["Authorization"]
         assert call_args[1]["json"]["member-id"] == str(user.id)
 
-    @patch("httpx.post")
+    @patch("httpx.Client.post")
     def test_register_user_handles_failure_gracefully(self, mock_post: MagicMock, db: Session) -> None:
         """Test user registration handles API errors without raising exceptions."""
         # Arrange
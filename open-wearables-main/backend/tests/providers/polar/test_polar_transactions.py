@@ -0,0 +1,229 @@
+"""
+Tests for the Polar AccessLink exercise transaction pull.
+
+Runs PolarWorkouts against a local HTTP stand-in of the AccessLink API.
+
+Tests cover:
+- Creating a transaction, fetching its exercises in parallel and committing it after saving
+- No requests beyond the transaction when there are no new exercises
+- Leaving the transaction uncommitted when saving fails
+"""
+
+import json
+import threading
+import time
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import EventRecord
+from app.repositories.event_record_repository import EventRecordRepository
+from app.repositories.user_connection_repository import UserConnectionRepository
+from app.services.providers.polar.workouts import PolarExerciseTransaction, PolarWorkouts
+from tests.factories import UserConnectionFactory, UserFactory
+
+POLAR_USER_ID = "4242"
+TRANSACTION_ID = 77
+TRANSACTIONS_PATH = f"/v3/users/{POLAR_USER_ID}/exercise-transactions"
+
+
+class AccessLinkStub(ThreadingHTTPServer):
+    """AccessLink exercise transaction endpoints serving a fixed set of new exercises."""
+
+    def __init__(self, exercises: list[dict[str, Any]]):
+        super().__init__(("127.0.0.1", 0), AccessLinkHandler)
+        self.exercises = exercises
+        self.requests: list[tuple[str, str, str | None]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class AccessLinkHandler(BaseHTTPRequestHandler):
+    server: AccessLinkStub
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _respond(self, status: int, body: Any = None) -> None:
+        content = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _record(self) -> None:
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path, self.headers.get("Authorization")))
+
+    def do_POST(self) -> None:
+        self._record()
+        if self.path != TRANSACTIONS_PATH:
+            return self._respond(404)
+        if not self.server.exercises:
+            return self._respond(204)
+        self._respond(
+            201,
+            {"transaction-id": TRANSACTION_ID, "resource-uri": f"{self.server.base_url}{self.path}/{TRANSACTION_ID}"},
+        )
+
+    def do_GET(self) -> None:
+        self._record()
+        transaction_path = f"{TRANSACTIONS_PATH}/{TRANSACTION_ID}"
+        if self.path == transaction_path:
+            count = len(self.server.exercises)
+            urls = [f"{self.server.base_url}{transaction_path}/exercises/{i}" for i in range(count)]
+            return self._respond(200, {"exercises": urls})
+
+        index = int(self.path.rsplit("/", 1)[-1])
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        time.sleep(0.05)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        self._respond(200, self.server.exercises[index])
+
+    def do_PUT(self) -> None:
+        self._record()
+        self._respond(200)
+
+
+def _transaction_exercise(exercise_id: int, start_time: str) -> dict[str, Any]:
+    """An exercise as listed in a transaction (hyphenated keys, numeric id)."""
+    return {
+        "id": exercise_id,
+        "upload-time": "2024-01-15T09:00:00.000Z",
+        "polar-user": f"https://www.polaraccesslink.com/v3/users/{POLAR_USER_ID}",
+        "transaction-id": TRANSACTION_ID,
+        "device": "Polar Vantage V2",
+        "start-time": start_time,
+        "start-time-utc-offset": 60,
+        "duration": "PT45M",
+        "calories": 530,
+        "distance": 1600,
+        "heart-rate": {"average": 129, "maximum": 147},
+        "sport": "RUNNING",
+        "detailed-sport-info": "RUNNING",
+    }
+
+
+def _stub(exercises: list[dict[str, Any]]) -> Generator[AccessLinkStub, None, None]:
+    server = AccessLinkStub(exercises)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def access_link() -> Generator[AccessLinkStub, None, None]:
+    exercises = [_transaction_exercise(1000 + i, f"2024-01-{10 + i:02d}T08:00:00") for i in range(5)]
+    yield from _stub(exercises)
+
+
+@pytest.fixture
+def empty_access_link() -> Generator[AccessLinkStub, None, None]:
+    yield from _stub([])
+
+
+def _workouts(base_url: str) -> PolarWorkouts:
+    return PolarWorkouts(
+        workout_repo=EventRecordRepository(EventRecord),
+        connection_repo=UserConnectionRepository(),
+        provider_name="polar",
+        api_base_url=base_url,
+        oauth=MagicMock(),
+    )
+
+
+@patch("app.services.providers.polar.workouts.get_valid_token", return_value="polar-access")
+class TestPolarExerciseTransactions:
+    """Test suite for the AccessLink transaction pull."""
+
+    def test_pulls_new_exercises_and_commits(
+        self,
+        mock_token: MagicMock,
+        db: Session,
+        access_link: AccessLinkStub,
+    ) -> None:
+        """Test new exercises are fetched in parallel, saved, and the transaction committed."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="polar", provider_user_id=POLAR_USER_ID)
+        workouts = _workouts(access_link.base_url)
+
+        # Act
+        with patch.object(settings, "sync_detail_fetch_concurrency", 3):
+            raw = workouts.fetch_data(db, user.id)
+            committed_before_save = ("PUT", f"{TRANSACTIONS_PATH}/{TRANSACTION_ID}", "Bearer polar-access") in (
+                access_link.requests
+            )
+            workouts.save_data(db, user.id, raw)
+
+        # Assert
+        assert isinstance(raw, PolarExerciseTransaction)
+        assert raw.transaction_id == TRANSACTION_ID
+        assert [exercise.id for exercise in raw] == ["1000", "1001", "1002", "1003", "1004"]
+        assert raw[0].heart_rate is not None
+        assert raw[0].heart_rate.maximum == 147
+        assert 1 < access_link.max_in_flight <= 3
+
+        assert committed_before_save is False
+        assert access_link.requests[-1] == ("PUT", f"{TRANSACTIONS_PATH}/{TRANSACTION_ID}", "Bearer polar-access")
+        saved = db.query(EventRecord).filter(EventRecord.external_id.in_([exercise.id for exercise in raw])).all()
+        assert len(saved) == 5
+
+    def test_no_new_exercises(self, mock_token: MagicMock, db: Session, empty_access_link: AccessLinkStub) -> None:
+        """Test a 204 from the transaction endpoint ends the pull without a commit."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="polar", provider_user_id=POLAR_USER_ID)
+        workouts = _workouts(empty_access_link.base_url)
+
+        # Act
+        raw = workouts.fetch_data(db, user.id)
+        workouts.save_data(db, user.id, raw)
+
+        # Assert
+        assert raw == []
+        assert [(method, path) for method, path, _ in empty_access_link.requests] == [("POST", TRANSACTIONS_PATH)]
+
+    def test_failed_save_leaves_transaction_open(
+        self,
+        mock_token: MagicMock,
+        db: Session,
+        access_link: AccessLinkStub,
+    ) -> None:
+        """Test exercises are offered again when saving fails, as the transaction is not committed."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="polar", provider_user_id=POLAR_USER_ID)
+        workouts = _workouts(access_link.base_url)
+        raw = workouts.fetch_data(db, user.id)
+
+        # Act
+        with (
+            patch(
+                "app.services.event_record_service.event_record_service.create",
+                side_effect=RuntimeError("database unavailable"),
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            workouts.save_data(db, user.id, raw)
+
+        # Assert
+        assert all(method != "PUT" for method, _, _ in access_link.requests)
@@ -4,9 +4,10 @@ Tests for Polar workouts implementation.
 Tests the PolarWorkouts class for fetching and processing workout data from Polar API.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
+from uuid import uuid4
 
 import pytest
 from sqlalchemy.orm import Session
@@ -203,7 +204,7 @@ class TestPolarWorkoutsMetricsBuilding:
         # Assert
         assert metrics["heart_rate_avg"] == Decimal("145")
         assert metrics["heart_rate_max"] == 175
-        assert metrics["heart_rate_min"] == 145
+        assert metrics["heart_rate_min"] is None
         assert metrics["steps_count"] is None
 
     def test_build_metrics_without_heart_rate_data(self, db: Session) -> None:
@@ -496,7 +497,8 @@ class TestPolarWorkoutsDataLoading:
         from app.services.providers.polar.oauth import PolarOAuth
 
         user = UserFactory()
-        UserConnectionFactory(user=user, provider="polar")
+        # Without an AccessLink user id, the recent exercises list is used instead of transactions
+        UserConnectionFactory(user=user, provider="polar", provider_user_id=None)
 
         user_repo = UserRepository(User)
         connection_repo = UserConnectionRepository()
@@ -536,7 +538,8 @@ class TestPolarWorkoutsDataLoading:
         from app.services.providers.polar.oauth import PolarOAuth
 
         user = UserFactory()
-        UserConnectionFactory(user=user, provider="polar")
+        # Without an AccessLink user id, the recent exercises list is used instead of transactions
+        UserConnectionFactory(user=user, provider="polar", provider_user_id=None)
 
         user_repo = UserRepository(User)
         connection_repo = UserConnectionRepository()
@@ -562,3 +565,34 @@ class TestPolarWorkoutsDataLoading:
 
         # Assert
         assert result is True
+
+    @patch("app.services.providers.templates.base_workouts.make_authenticated_request")
+    def test_fetch_data_respects_window(
+        self,
+        mock_request: MagicMock,
+        db: Session,
+        sample_polar_exercise: dict,
+    ) -> None:
+        """Test the recent exercises fallback only returns exercises uploaded within the sync window."""
+        # Arrange
+        connection_repo = MagicMock()
+        connection_repo.get_by_user_and_provider.return_value = None
+        workouts = PolarWorkouts(
+            workout_repo=MagicMock(),
+            connection_repo=connection_repo,
+            provider_name="polar",
+            api_base_url="https://www.polaraccesslink.com",
+            oauth=MagicMock(),
+        )
+        old = {**sample_polar_exercise, "id": "OLD", "upload_time": "2024-01-10T09:00:00.000Z"}
+        # Recorded before the window but uploaded within it
+        late = {**sample_polar_exercise, "id": "LATE", "start_time": "2024-01-01T08:00:00"}
+        no_upload_time = {**sample_polar_exercise, "id": "NO_UPLOAD", "upload_time": None}
+        mock_request.return_value = [old, late, no_upload_time]
+        since = int(datetime(2024, 1, 14, tzinfo=timezone.utc).timestamp())
+
+        # Act
+        result = workouts.fetch_data(db, uuid4(), since=since)
+
+        # Assert - without an upload time, the end of the exercise (2024-01-15) is used
+        assert [exercise.id for exercise in result] == ["LATE", "NO_UPLOAD"]
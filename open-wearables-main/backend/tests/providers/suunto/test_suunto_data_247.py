@@ -0,0 +1,158 @@
+"""
+Tests for fetching Suunto 247 data in time chunks.
+
+Tests cover:
+- Fetching chunks concurrently and merging them in time order
+- Retrying a failed chunk
+- Reporting chunks that keep failing instead of dropping them
+- Failing when no chunk could be fetched
+- Stopping on provider rate limits
+- Daily activity statistics chunking and parameters
+"""
+
+import threading
+import time
+from collections.abc import Generator
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.services.providers.api_client import ProviderRateLimitedError
+from app.services.providers.suunto.data_247 import Suunto247Data
+from app.services.providers.templates.base_247_data import ChunkedFetchResult
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+END = datetime(2025, 3, 2, tzinfo=timezone.utc)  # Three 20-day chunks
+
+
+@pytest.fixture
+def data_247() -> Suunto247Data:
+    return Suunto247Data(provider_name="suunto", api_base_url="https://cloudapi.suunto.com", oauth=MagicMock())
+
+
+@pytest.fixture
+def send_request() -> Generator[MagicMock, None, None]:
+    with (
+        patch("app.services.providers.suunto.data_247.get_valid_token", return_value="suunto-access"),
+        patch("app.services.providers.suunto.data_247.send_authenticated_request") as send,
+    ):
+        yield send
+
+
+def _chunk_start(kwargs: dict[str, Any]) -> datetime:
+    return datetime.fromtimestamp(kwargs["params"]["from"] / 1000, tz=timezone.utc)
+
+
+class TestSuuntoChunkedFetch:
+    """Test suite for Suunto247Data._fetch_in_chunks."""
+
+    def test_chunks_fetched_concurrently_in_order(self, data_247: Suunto247Data, send_request: MagicMock) -> None:
+        """Test chunks run in parallel and are merged in time order, whatever order they finish in."""
+        # Arrange
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, max
+
+        def respond(**kwargs: Any) -> list[dict[str, Any]]:
+            chunk_start = _chunk_start(kwargs)
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            # Later chunks finish first
+            time.sleep(0.1 - (chunk_start - START).days / 1000)
+            with lock:
+                in_flight[0] -= 1
+            return [{"chunk": chunk_start.date().isoformat()}]
+
+        send_request.side_effect = respond
+
+        # Act
+        with patch.object(settings, "sync_detail_fetch_concurrency", 3):
+            result = data_247.get_sleep_data(MagicMock(), uuid4(), START, END)
+
+        # Assert
+        assert [item["chunk"] for item in result] == ["2025-01-01", "2025-01-21", "2025-02-10"]
+        assert result.failed_chunks == []
+        assert in_flight[1] == 3
+        assert send_request.call_args.kwargs["access_token"] == "suunto-access"
+        assert send_request.call_args.kwargs["endpoint"] == "/247samples/sleep"
+
+    def test_failed_chunk_retried(self, data_247: Suunto247Data, send_request: MagicMock) -> None:
+        """Test a chunk failing once is fetched again."""
+        # Arrange
+        attempts: dict[datetime, int] = {}
+
+        def respond(**kwargs: Any) -> list[dict[str, Any]]:
+            chunk_start = _chunk_start(kwargs)
+            attempts[chunk_start] = attempts.get(chunk_start, 0) + 1
+            if chunk_start == START and attempts[chunk_start] == 1:
+                raise HTTPException(status_code=502, detail="Bad gateway")
+            return [{"chunk": chunk_start}]
+
+        send_request.side_effect = respond
+
+        # Act
+        result = data_247.get_recovery_data(MagicMock(), uuid4(), START, END)
+
+        # Assert
+        assert len(result) == 3
+        assert result.failed_chunks == []
+        assert attempts[START] == 2
+
+    def test_failing_chunk_reported(self, data_247: Suunto247Data, send_request: MagicMock) -> None:
+        """Test a chunk that keeps failing is reported while the other chunks are returned."""
+
+        # Arrange
+        def respond(**kwargs: Any) -> list[dict[str, Any]]:
+            chunk_start = _chunk_start(kwargs)
+            if chunk_start == datetime(2025, 1, 21, tzinfo=timezone.utc):
+                raise HTTPException(status_code=500, detail="Internal error")
+            return [{"chunk": chunk_start}]
+
+        send_request.side_effect = respond
+
+        # Act
+        result = data_247.get_activity_samples(MagicMock(), uuid4(), START, END)
+
+        # Assert
+        assert isinstance(result, ChunkedFetchResult)
+        assert len(result) == 2
+        assert result.failed_chunks == ["2025-01-21T00:00:00+00:00/2025-02-10T00:00:00+00:00"]
+
+    def test_all_chunks_failing_raises(self, data_247: Suunto247Data, send_request: MagicMock) -> None:
+        """Test the family fails when nothing could be fetched."""
+        # Arrange
+        send_request.side_effect = HTTPException(status_code=503, detail="Unavailable")
+
+        # Act & Assert
+        with pytest.raises(HTTPException):
+            data_247.get_sleep_data(MagicMock(), uuid4(), START, END)
+
+    def test_rate_limit_not_retried(self, data_247: Suunto247Data, send_request: MagicMock) -> None:
+        """Test rate limits abort the fetch without retries, so the whole window is retried later."""
+        # Arrange
+        send_request.side_effect = ProviderRateLimitedError("suunto", 60)
+
+        # Act & Assert
+        with pytest.raises(ProviderRateLimitedError):
+            data_247.get_sleep_data(MagicMock(), uuid4(), START, END)
+
+        chunk_starts = [_chunk_start(call.kwargs) for call in send_request.call_args_list]
+        assert len(chunk_starts) == len(set(chunk_starts))
+
+    def test_daily_activity_chunks(self, data_247: Suunto247Data, send_request: MagicMock) -> None:
+        """Test daily statistics are fetched in 14-day chunks with ISO 8601 parameters."""
+        # Arrange
+        send_request.return_value = []
+
+        # Act
+        data_247.get_daily_activity_statistics(MagicMock(), uuid4(), START, datetime(2025, 1, 29, tzinfo=timezone.utc))
+
+        # Assert
+        params = sorted(call.kwargs["params"]["startdate"] for call in send_request.call_args_list)
+        assert params == ["2025-01-01T00:00:00", "2025-01-15T00:00:00"]
+        assert send_request.call_args.kwargs["endpoint"] == "/247/daily-activity-statistics"
@@ -142,7 +142,7 @@ class TestSuuntoOAuth:
         assert user_info["user_id"] is None
         assert user_info["username"] is None
 
-    @patch("httpx.post")
+    @patch("httpx.Client.post")
     def test_exchange_token_success(self, mock_post: MagicMock, suunto_oauth: SuuntoOAuth, db: Session) -> None:
         """Should exchange authorization code for tokens."""
         # Arrange
@@ -166,7 +166,7 @@ class TestSuuntoOAuth:
         assert token_response.expires_in == 3600
         mock_post.assert_called_once()
 
-    @patch("httpx.post")
+    @patch("httpx.Client.post")
     def test_refresh_access_token_success(self, mock_post: MagicMock, suunto_oauth: SuuntoOAuth, db: Session) -> None:
         """Should refresh access token using refresh token."""
         # Arrange
@@ -7,10 +7,11 @@ Tests cover:
 - Template method pattern implementation
 - Abstract method enforcement
 - Repository integration
+- Base247DataTemplate streaming window by window, returning counts only
 """
 
 from abc import ABC
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 from unittest.mock import MagicMock
 
@@ -20,6 +21,7 @@ from app.repositories.event_record_repository import EventRecordRepository
 from app.repositories.user_connection_repository import UserConnectionRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas import EventRecordCreate, EventRecordDetailCreate
+from app.services.providers.templates.base_247_data import Base247DataTemplate
 from app.services.providers.templates.base_oauth import BaseOAuthTemplate
 from app.services.providers.templates.base_workouts import BaseWorkoutsTemplate
 
@@ -134,3 +136,71 @@ class TestBaseWorkoutsTemplate:
         # Assert
         assert result_start == start
         assert result_end == end
+
+
+class Streaming247Data(Base247DataTemplate):
+    """One sleep record per day, recording fetches and saves in order."""
+
+    def __init__(self) -> None:
+        super().__init__(provider_name="test", api_base_url="https://api.test.com", oauth=MagicMock())
+        self.events: list[str] = []
+
+    def get_sleep_data(self, db: Any, user_id: Any, start_time: datetime, end_time: datetime) -> list[dict[str, Any]]:
+        self.events.append(f"fetch:{start_time.date()}")
+        return [{"day": start_time + timedelta(days=i)} for i in range((end_time - start_time).days)]
+
+    def normalize_sleep(self, raw_sleep: dict[str, Any], user_id: Any) -> dict[str, Any]:
+        return {"timestamp": raw_sleep["day"]}
+
+    def save_sleep_batch(self, db: Any, user_id: Any, batch: list[dict[str, Any]]) -> int:
+        self.events.append(f"save:{len(batch)}")
+        return len(batch)
+
+    def get_recovery_data(self, *args: Any) -> list[dict[str, Any]]:
+        return []
+
+    def normalize_recovery(self, raw_recovery: dict[str, Any], user_id: Any) -> dict[str, Any]:
+        return raw_recovery
+
+    def get_activity_samples(self, *args: Any) -> list[dict[str, Any]]:
+        return [{"hr": 60}, {"hr": 61}]
+
+    def normalize_activity_samples(self, raw_samples: list[dict[str, Any]], user_id: Any) -> dict[str, Any]:
+        return {"heart_rate": raw_samples}
+
+    def get_daily_activity_statistics(self, *args: Any) -> list[dict[str, Any]]:
+        return []
+
+    def normalize_daily_activity(self, raw_stats: dict[str, Any], user_id: Any) -> dict[str, Any]:
+        return raw_stats
+
+
+class TestBase247DataTemplate:
+    """Test suite for Base247DataTemplate."""
+
+    def test_load_all_streams_windows_and_returns_counts(self) -> None:
+        """Should save each window before fetching the next and return only counts."""
+        # Arrange
+        template = Streaming247Data()
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        # Act
+        result = template.load_all_247_data(MagicMock(), MagicMock(), start, start + timedelta(days=10))
+
+        # Assert
+        assert template.events == ["fetch:2024-01-01", "save:7", "fetch:2024-01-08", "save:3"]
+        assert result == {"sleep": 10, "recovery": 0, "activity_samples": 4, "daily_activity": 0}
+
+    def test_process_merges_windows(self) -> None:
+        """Should still return complete lists for short debugging ranges."""
+        # Arrange
+        template = Streaming247Data()
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        # Act
+        sleep = template.process_sleep_data(MagicMock(), MagicMock(), start, start + timedelta(days=10))
+        samples = template.process_activity_samples(MagicMock(), MagicMock(), start, start + timedelta(days=10))
+
+        # Assert
+        assert [item["timestamp"].day for item in sleep] == list(range(1, 11))
+        assert len(samples["heart_rate"]) == 4
@@ -0,0 +1,290 @@
+"""
+Tests for provider access token handling in the API client.
+
+Tests cover:
+- Serving valid tokens from the token cache without database reads
+- Caching tokens read from the database
+- Single-flight refresh of expiring tokens across concurrent callers
+- Failing fast when the refresh lock cannot be acquired
+- Refreshing without the lock when Redis is unavailable
+- Dropping the cached token when the provider rejects it
+- Reporting exhausted rate limits with the time to retry
+"""
+
+import threading
+import time
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.schemas.oauth import OAuthTokenResponse
+from app.services.providers.api_client import (
+    ProviderRateLimitedError,
+    get_valid_token,
+    make_authenticated_request,
+)
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by the token cache."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+        self.locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    def register_script(self, script: str) -> MagicMock:
+        return MagicMock(return_value="0")
+
+    def lock(self, name: str, timeout: int, blocking_timeout: int) -> MagicMock:
+        with self._guard:
+            lock = self.locks.setdefault(name, threading.Lock())
+        fake = MagicMock()
+        fake.acquire.side_effect = lambda: lock.acquire(timeout=blocking_timeout)
+        fake.release.side_effect = lock.release
+        return fake
+
+
+@pytest.fixture
+def fake_redis() -> Generator[FakeRedis, None, None]:
+    redis = FakeRedis()
+    with patch("app.services.providers.token_cache.get_redis_client", return_value=redis):
+        yield redis
+
+
+def _connection(expires_in: timedelta, access_token: str = "old-access") -> SimpleNamespace:
+    return SimpleNamespace(
+        access_token=access_token,
+        refresh_token="old-refresh",
+        token_expires_at=datetime.now(timezone.utc) + expires_in,
+    )
+
+
+class TestGetValidToken:
+    """Test suite for get_valid_token."""
+
+    def test_valid_token_cached_after_first_read(self, fake_redis: FakeRedis) -> None:
+        """Test a valid token is read from the database once and then served from the cache."""
+        # Arrange
+        user_id = uuid4()
+        connection_repo = MagicMock()
+        connection_repo.get_by_user_and_provider.return_value = _connection(timedelta(hours=1))
+
+        # Act
+        first = get_valid_token(MagicMock(), user_id, "garmin", connection_repo, MagicMock())
+        second = get_valid_token(MagicMock(), user_id, "garmin", connection_repo, MagicMock())
+
+        # Assert
+        assert first == second == "old-access"
+        connection_repo.get_by_user_and_provider.assert_called_once()
+        # Cached until shortly before the refresh margin, capped by the configured TTL
+        assert fake_redis.ttls[f"provider_token:garmin:{user_id}"] <= 300
+
+    def test_expiring_token_refreshed_and_cached(self, fake_redis: FakeRedis) -> None:
+        """Test tokens inside the refresh margin are refreshed and the new token is cached."""
+        # Arrange
+        user_id = uuid4()
+        connection_repo = MagicMock()
+        connection_repo.get_by_user_and_provider.return_value = _connection(timedelta(minutes=2))
+        oauth = MagicMock()
+        oauth.refresh_access_token.return_value = OAuthTokenResponse(
+            access_token="new-access",
+            token_type="Bearer",
+            expires_in=3600,
+            refresh_token="new-refresh",
+        )
+
+        # Act
+        token = get_valid_token(MagicMock(), user_id, "polar", connection_repo, oauth)
+
+        # Assert
+        assert token == "new-access"
+        oauth.refresh_access_token.assert_called_once()
+        assert fake_redis.data[f"provider_token:polar:{user_id}"] == "new-access"
+
+    def test_concurrent_callers_refresh_once(self, fake_redis: FakeRedis) -> None:
+        """Test parallel callers with an expiring token trigger a single refresh."""
+        # Arrange
+        user_id = uuid4()
+        connection = _connection(timedelta(minutes=1))
+        connection_repo = MagicMock()
+        connection_repo.get_by_user_and_provider.return_value = connection
+
+        def refresh(db: Any, user_id: Any, refresh_token: str) -> OAuthTokenResponse:
+            time.sleep(0.1)
+            assert refresh_token == "old-refresh"
+            connection.access_token = "new-access"
+            connection.refresh_token = "new-refresh"
+            connection.token_expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+            return OAuthTokenResponse(access_token="new-access", token_type="Bearer", expires_in=3600)
+
+        oauth = MagicMock()
+        oauth.refresh_access_token.side_effect = refresh
+
+        # Act
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = list(
+                executor.map(
+                    lambda _: get_valid_token(MagicMock(), user_id, "whoop", connection_repo, oauth),
+                    range(8),
+                ),
+            )
+
+        # Assert
+        assert tokens == ["new-access"] * 8
+        oauth.refresh_access_token.assert_called_once()
+
+    def test_lock_timeout_raises_503(self, fake_redis: FakeRedis) -> None:
+        """Test callers give up when another refresh holds the lock for too long."""
+        # Arrange
+        connection_repo = MagicMock()
+        connection_repo.get_by_user_and_provider.return_value = _connection(timedelta(minutes=1))
+        lock = MagicMock()
+        lock.acquire.return_value = False
+
+        # Act & Assert
+        with (
+            patch("app.services.providers.api_client.refresh_lock", return_value=lock),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            get_valid_token(MagicMock(), uuid4(), "suunto", connection_repo, MagicMock())
+
+        assert exc_info.value.status_code == 503
+
+    def test_redis_unavailable_refreshes_without_lock(self) -> None:
+        """Test token refresh still works when Redis is down."""
+        # Arrange
+        redis = MagicMock()
+        redis.get.side_effect = RedisConnectionError("down")
+        redis.setex.side_effect = RedisConnectionError("down")
+        redis.lock.return_value.acquire.side_effect = RedisConnectionError("down")
+        connection_repo = MagicMock()
+        connection_repo.get_by_user_and_provider.return_value = _connection(timedelta(minutes=1))
+        oauth = MagicMock()
+        oauth.refresh_access_token.return_value = OAuthTokenResponse(
+            access_token="new-access",
+            token_type="Bearer",
+            expires_in=3600,
+        )
+
+        # Act
+        with patch("app.services.providers.token_cache.get_redis_client", return_value=redis):
+            token = get_valid_token(MagicMock(), uuid4(), "garmin", connection_repo, oauth)
+
+        # Assert
+        assert token == "new-access"
+
+    def test_not_connected_raises_401(self, fake_redis: FakeRedis) -> None:
+        """Test missing connections are rejected."""
+        # Arrange
+        connection_repo = MagicMock()
+        connection_repo.get_by_user_and_provider.return_value = None
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            get_valid_token(MagicMock(), uuid4(), "garmin", connection_repo, MagicMock())
+
+        assert exc_info.value.status_code == 401
+
+
+class TestMakeAuthenticatedRequest:
+    """Test suite for make_authenticated_request token handling."""
+
+    @patch("httpx.Client.request")
+    def test_rejected_token_dropped_from_cache(self, mock_request: MagicMock, fake_redis: FakeRedis) -> None:
+        """Test a 401 from the provider invalidates the cached token."""
+        # Arrange
+        user_id = uuid4()
+        fake_redis.data[f"provider_token:garmin:{user_id}"] = "revoked-access"
+        request = httpx.Request("GET", "https://apis.garmin.com/wellness-api/rest/activities")
+        mock_request.return_value = httpx.Response(401, request=request, text="Unauthorized")
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            make_authenticated_request(
+                db=MagicMock(),
+                user_id=user_id,
+                connection_repo=MagicMock(),
+                oauth=MagicMock(),
+                api_base_url="https://apis.garmin.com",
+                provider_name="garmin",
+                endpoint="/wellness-api/rest/activities",
+            )
+
+        # Assert
+        assert exc_info.value.status_code == 401
+        assert f"provider_token:garmin:{user_id}" not in fake_redis.data
+
+    @patch("httpx.Client.request")
+    def test_provider_429_raises_rate_limited(self, mock_request: MagicMock, fake_redis: FakeRedis) -> None:
+        """Test a 429 response is reported with the provider's Retry-After."""
+        # Arrange
+        user_id = uuid4()
+        fake_redis.data[f"provider_token:whoop:{user_id}"] = "access"
+        request = httpx.Request("GET", "https://api.prod.whoop.com/developer/v2/activity/sleep")
+        mock_request.return_value = httpx.Response(429, request=request, headers={"Retry-After": "42"})
+
+        # Act
+        with pytest.raises(ProviderRateLimitedError) as exc_info:
+            make_authenticated_request(
+                db=MagicMock(),
+                user_id=user_id,
+                connection_repo=MagicMock(),
+                oauth=MagicMock(),
+                api_base_url="https://api.prod.whoop.com/developer",
+                provider_name="whoop",
+                endpoint="/v2/activity/sleep",
+            )
+
+        # Assert
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after == 42
+        assert exc_info.value.headers == {"Retry-After": "42"}
+
+    @patch("httpx.Client.request")
+    def test_exhausted_limiter_skips_request(self, mock_request: MagicMock, fake_redis: FakeRedis) -> None:
+        """Test no request is sent while the shared rate limit is exhausted."""
+        # Arrange
+        user_id = uuid4()
+        fake_redis.data[f"provider_token:polar:{user_id}"] = "access"
+        limiter = MagicMock()
+        limiter.acquire.return_value = 300.0
+
+        # Act
+        with (
+            patch("app.services.providers.api_client.get_provider_rate_limiter", return_value=limiter),
+            pytest.raises(ProviderRateLimitedError) as exc_info,
+        ):
+            make_authenticated_request(
+                db=MagicMock(),
+                user_id=user_id,
+                connection_repo=MagicMock(),
+                oauth=MagicMock(),
+                api_base_url="https://www.polaraccesslink.com",
+                provider_name="polar",
+                endpoint="/v3/exercises",
+            )
+
+        # Assert
+        assert exc_info.value.retry_after == 300
+        mock_request.assert_not_called()
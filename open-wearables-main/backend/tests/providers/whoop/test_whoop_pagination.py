@@ -0,0 +1,273 @@
+"""
+Tests for pipelined pagination of Whoop endpoints.
+
+Tests cover:
+- Requesting the next page while the current page is processed
+- Keeping pages already fetched when a later page fails, reporting the rest as failed
+- Raising errors on the first page, on rate limits and when failures cannot be reported
+- Sleep fetched and normalized across pages, also from within a running event loop
+- Streaming only sleep (the one family with a saver), returning counts only
+- Workouts fetched for the sync window and parsed across pages
+- Reporting truncated sleep and workout listings, so the sync keeps the watermark
+"""
+
+import asyncio
+from collections.abc import Generator
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.providers.api_client import ProviderRateLimitedError
+from app.services.providers.templates.base_247_data import ChunkedFetchResult
+from app.services.providers.whoop.data_247 import Whoop247Data
+from app.services.providers.whoop.pagination import iter_pages
+from app.services.providers.whoop.workouts import WhoopWorkouts
+
+API_BASE_URL = "https://api.prod.whoop.com/developer"
+
+
+class FakeWhoopApi:
+    """Serves pages per endpoint, recording requests and how many run at once."""
+
+    def __init__(self, pages: dict[str, list[list[dict[str, Any]]]], delay: float = 0.01):
+        self.pages = pages
+        self.delay = delay
+        self.events: list[str] = []
+        self.params: list[dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail: dict[tuple[str, int], Exception] = {}
+
+    async def __call__(self, endpoint: str, params: dict[str, Any], **kwargs: Any) -> Any:
+        page = int(params.get("nextToken") or 0)
+        self.events.append(f"request:{endpoint}:{page}")
+        self.params.append(params)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if (error := self.fail.get((endpoint, page))) is not None:
+            raise error
+        pages = self.pages.get(endpoint, [[]])
+        next_token = str(page + 1) if page + 1 < len(pages) else None
+        return {"records": pages[page], "next_token": next_token}
+
+
+@pytest.fixture
+def whoop_api() -> Generator[FakeWhoopApi, None, None]:
+    api = FakeWhoopApi(
+        {
+            "/v2/activity/sleep": [[_sleep(i)] for i in range(3)],
+            "/v2/recovery": [[{"cycle_id": 1, "score_state": "SCORED", "score": {"resting_heart_rate": 52}}]],
+            "/v2/cycle": [[{"id": 1}], [{"id": 2}]],
+            "/v2/activity/workout": [[_workout(0), _workout(1)], [_workout(2)]],
+        },
+    )
+    with (
+        patch("app.services.providers.whoop.pagination.send_authenticated_request_async", new=api),
+        patch("app.services.providers.whoop.data_247.get_valid_token", return_value="whoop-access"),
+        patch("app.services.providers.whoop.workouts.get_valid_token", return_value="whoop-access"),
+    ):
+        yield api
+
+
+def _sleep(index: int) -> dict[str, Any]:
+    return {
+        "id": str(uuid4()),
+        "start": f"2025-03-0{index + 1}T22:00:00.000Z",
+        "end": f"2025-03-0{index + 2}T06:00:00.000Z",
+        "score": {"stage_summary": {"total_in_bed_time_milli": 8 * 3600 * 1000}},
+    }
+
+
+def _workout(index: int) -> dict[str, Any]:
+    return {
+        "id": str(uuid4()),
+        "user_id": 10129,
+        "created_at": "2025-03-01T12:00:00.000Z",
+        "updated_at": "2025-03-01T12:00:00.000Z",
+        "start": f"2025-03-0{index + 1}T10:00:00.000Z",
+        "end": f"2025-03-0{index + 1}T11:00:00.000Z",
+        "sport_name": "running",
+        "score_state": "SCORED",
+    }
+
+
+def _data_247() -> Whoop247Data:
+    return Whoop247Data(provider_name="whoop", api_base_url=API_BASE_URL, oauth=MagicMock())
+
+
+def _pages(endpoint: str, failed_chunks: list[str] | None = None) -> Any:
+    params = {"start": "2025-03-01T00:00:00Z"}
+    return iter_pages("whoop-access", uuid4(), API_BASE_URL, "whoop", endpoint, params, failed_chunks)
+
+
+def _workouts() -> WhoopWorkouts:
+    return WhoopWorkouts(
+        workout_repo=MagicMock(),
+        connection_repo=MagicMock(),
+        provider_name="whoop",
+        api_base_url=API_BASE_URL,
+        oauth=MagicMock(),
+    )
+
+
+class TestIterPages:
+    """Test suite for iter_pages."""
+
+    async def test_next_page_requested_while_processing(self, whoop_api: FakeWhoopApi) -> None:
+        """Test the next page is already in flight while the caller processes a page."""
+        # Act
+        async for page in _pages("/v2/activity/sleep"):
+            whoop_api.events.append(f"processing:{page[0]['start'][:10]}")
+            await asyncio.sleep(0.05)
+            whoop_api.events.append("processed")
+
+        # Assert
+        events = whoop_api.events
+        assert events.index("request:/v2/activity/sleep:1") < events.index("processed")
+        assert [params["limit"] for params in whoop_api.params] == [25, 25, 25]
+        assert "nextToken" not in whoop_api.params[0]
+        assert whoop_api.params[1]["nextToken"] == "1"
+
+    async def test_later_page_error_keeps_fetched_pages(self, whoop_api: FakeWhoopApi) -> None:
+        """Test pages fetched before an error are returned and the rest of the listing reported as failed."""
+        # Arrange
+        whoop_api.fail[("/v2/activity/sleep", 2)] = HTTPException(status_code=502, detail="Bad gateway")
+        failed_chunks: list[str] = []
+
+        # Act
+        pages = [page async for page in _pages("/v2/activity/sleep", failed_chunks)]
+
+        # Assert
+        assert len(pages) == 2
+        assert failed_chunks == ["/v2/activity/sleep after page 2"]
+
+    async def test_later_page_error_raises_without_report(self, whoop_api: FakeWhoopApi) -> None:
+        """Test a later page error is raised when the caller cannot report a truncated listing."""
+        # Arrange
+        whoop_api.fail[("/v2/activity/sleep", 2)] = HTTPException(status_code=502, detail="Bad gateway")
+
+        # Act & Assert
+        with pytest.raises(HTTPException):
+            _ = [page async for page in _pages("/v2/activity/sleep")]
+
+    async def test_first_page_error_raises(self, whoop_api: FakeWhoopApi) -> None:
+        """Test nothing is returned as if complete when the first page fails."""
+        # Arrange
+        whoop_api.fail[("/v2/activity/sleep", 0)] = HTTPException(status_code=502, detail="Bad gateway")
+
+        # Act & Assert
+        with pytest.raises(HTTPException):
+            _ = [page async for page in _pages("/v2/activity/sleep")]
+
+    async def test_rate_limit_raises(self, whoop_api: FakeWhoopApi) -> None:
+        """Test rate limits end the listing with an error, so the window is retried later."""
+        # Arrange
+        whoop_api.fail[("/v2/activity/sleep", 1)] = ProviderRateLimitedError("whoop", 60)
+
+        # Act & Assert
+        with pytest.raises(ProviderRateLimitedError):
+            _ = [page async for page in _pages("/v2/activity/sleep")]
+
+
+class TestWhoop247DataPipelines:
+    """Test suite for Whoop 247 data fetching."""
+
+    def test_sleep_normalized_across_pages(self, whoop_api: FakeWhoopApi) -> None:
+        """Test every page of sleep is fetched and normalized."""
+        # Act
+        result = _data_247().fetch_normalized_sleep(
+            MagicMock(),
+            uuid4(),
+            datetime(2025, 3, 1, tzinfo=timezone.utc),
+            datetime(2025, 3, 5, tzinfo=timezone.utc),
+        )
+
+        # Assert
+        assert len(result) == 3
+        assert result.failed_chunks == []
+        assert all(item["duration_seconds"] == 8 * 3600 for item in result)
+        assert whoop_api.params[0]["start"] == "2025-03-01T00:00:00Z"
+        assert whoop_api.params[0]["end"] == "2025-03-05T00:00:00Z"
+
+    async def test_sleep_fetched_from_running_event_loop(self, whoop_api: FakeWhoopApi) -> None:
+        """Test sync callers inside an event loop (e.g. async routes) can fetch."""
+        # Act
+        result = _data_247().get_sleep_data(
+            MagicMock(),
+            uuid4(),
+            datetime(2025, 3, 1, tzinfo=timezone.utc),
+            datetime(2025, 3, 5, tzinfo=timezone.utc),
+        )
+
+        # Assert
+        assert len(result) == 3
+
+    def test_load_all_streams_sleep_only(self, whoop_api: FakeWhoopApi) -> None:
+        """Test sleep is saved page by page, and recovery and cycles (never saved) are not requested."""
+        # Arrange
+        data_247 = _data_247()
+        saved_pages: list[int] = []
+
+        def save(db: Any, user_id: Any, batch: list[dict[str, Any]]) -> int:
+            saved_pages.append(len(batch))
+            return len(batch)
+
+        # Act
+        with patch.object(data_247, "save_sleep_batch", side_effect=save):
+            result = data_247.load_all_247_data(
+                MagicMock(),
+                uuid4(),
+                datetime(2025, 3, 1, tzinfo=timezone.utc),
+                datetime(2025, 3, 5, tzinfo=timezone.utc),
+            )
+
+        # Assert
+        assert result == {"sleep": 3}
+        assert saved_pages == [1, 1, 1]
+        assert all(event.startswith("request:/v2/activity/sleep:") for event in whoop_api.events)
+
+
+class TestWhoopWorkoutsPipeline:
+    """Test suite for Whoop workout fetching."""
+
+    def test_fetch_data_uses_sync_window(self, whoop_api: FakeWhoopApi) -> None:
+        """Test the since/until window of a sync is sent and all pages are parsed."""
+        # Arrange
+        workouts = _workouts()
+        since = int(datetime(2025, 3, 1, tzinfo=timezone.utc).timestamp())
+
+        # Act
+        result = workouts.fetch_data(MagicMock(), uuid4(), since=since)
+
+        # Assert
+        assert len(result) == 3
+        assert result[0].sport_name == "running"
+        assert whoop_api.params[0]["start"] == "2025-03-01T00:00:00Z"
+        assert "end" not in whoop_api.params[0]
+
+    def test_truncated_listings_reported(self, whoop_api: FakeWhoopApi) -> None:
+        """Test sleep and workouts listings cut short by an error are returned as failed chunks."""
+        # Arrange
+        whoop_api.fail[("/v2/activity/sleep", 1)] = HTTPException(status_code=502, detail="Bad gateway")
+        whoop_api.fail[("/v2/activity/workout", 1)] = HTTPException(status_code=502, detail="Bad gateway")
+        start, end = datetime(2025, 3, 1, tzinfo=timezone.utc), datetime(2025, 3, 5, tzinfo=timezone.utc)
+
+        # Act
+        sleep = _data_247().fetch_normalized_sleep(MagicMock(), uuid4(), start, end)
+        workouts = _workouts().fetch_data(MagicMock(), uuid4(), since=int(start.timestamp()))
+
+        # Assert
+        assert isinstance(sleep, ChunkedFetchResult)
+        assert len(sleep) == 1
+        assert sleep.failed_chunks == ["/v2/activity/sleep after page 1"]
+        assert isinstance(workouts, ChunkedFetchResult)
+        assert len(workouts) == 2
+        assert workouts.failed_chunks == ["/v2/activity/workout after page 1"]
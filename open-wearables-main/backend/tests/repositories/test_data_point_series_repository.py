@@ -6,6 +6,7 @@ Tests cover:
 - get_samples with filtering by series type, device, date range
 - Aggregation methods (get_total_count, get_count_in_range, get_daily_histogram)
 - get_count_by_series_type and get_count_by_provider
+- replace_many idempotent on re-delivered samples
 """
 
 from datetime import datetime, timedelta, timezone
@@ -643,3 +644,29 @@ class TestDataPointSeriesRepository:
         assert total_count == 2
         for _, mapping in results:
             assert mapping.user_id == user1.id
+
+    def test_replace_many_idempotent(self, db: Session, series_repo: DataPointSeriesRepository) -> None:
+        """Test re-delivered samples replace the stored ones instead of adding rows."""
+        # Arrange
+        mapping = ExternalDeviceMappingFactory(user=UserFactory())
+        start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        rows = [
+            {"series_type": SeriesType.steps, "recorded_at": start + timedelta(minutes=15 * i), "value": Decimal(i)}
+            for i in range(4)
+        ]
+        redelivered = [{**rows[0], "value": Decimal("5")}, *rows[1:], {**rows[0], "value": Decimal("99")}]
+
+        # Act
+        added = series_repo.replace_many(db, mapping.id, rows)
+        readded = series_repo.replace_many(db, mapping.id, redelivered)
+
+        # Assert
+        assert added == 4
+        assert readded == 0
+        values = sorted(
+            float(value)
+            for (value,) in db.query(DataPointSeries.value).filter(
+                DataPointSeries.external_device_mapping_id == mapping.id,
+            )
+        )
+        assert values == [1.0, 2.0, 3.0, 99.0]
@@ -6,6 +6,7 @@ Tests cover:
 - get operations (by ID, by record_id)
 - get_all operations (filtering, pagination, sorting)
 - update operations (partial updates)
+- upsert operations (replacing all values of an existing detail)
 - delete operations
 - polymorphic inheritance behavior
 """
@@ -222,6 +223,21 @@ class TestEventRecordDetailRepository:
         assert getattr(result, "heart_rate_max") == 180  # Unchanged
         assert getattr(result, "steps_count") == 5000  # Unchanged
 
+    def test_upsert_replaces_existing_details(self, db: Session, detail_repo: EventRecordDetailRepository) -> None:
+        """Test upserting a detail of a record that has one replaces all of its values."""
+        # Arrange
+        workout_details = WorkoutDetailsFactory(heart_rate_min=140, heart_rate_avg=Decimal("140.0"), steps_count=5000)
+        upsert_data = EventRecordDetailCreate(record_id=workout_details.record_id, heart_rate_avg=Decimal("141.5"))
+
+        # Act
+        result = detail_repo.upsert(db, upsert_data)
+
+        # Assert
+        assert result.record_id == workout_details.record_id
+        assert getattr(result, "heart_rate_avg") == Decimal("141.5")
+        assert getattr(result, "heart_rate_min") is None
+        assert getattr(result, "steps_count") is None
+
     def test_delete_workout_details(self, db: Session, detail_repo: EventRecordDetailRepository) -> None:
         """Test deleting workout details."""
         # Arrange
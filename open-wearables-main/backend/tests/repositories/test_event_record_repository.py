@@ -7,18 +7,45 @@ Tests cover:
 - Filtering by category, type, device, provider, date range, duration
 - get_count_by_workout_type aggregation
 - Pagination and sorting
+- Eager loading of record details (constant query count per page)
 """
 
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from typing import Any
 from uuid import uuid4
 
 import pytest
+from sqlalchemy import event as sa_event
 from sqlalchemy.orm import Session
 
-from app.models import EventRecord
+from app.models import EventRecord, SleepDetails, WorkoutDetails
 from app.repositories.event_record_repository import EventRecordRepository
 from app.schemas.event_record import EventRecordCreate, EventRecordQueryParams
-from tests.factories import EventRecordFactory, ExternalDeviceMappingFactory, UserFactory
+from tests.factories import (
+    EventRecordFactory,
+    ExternalDeviceMappingFactory,
+    SleepDetailsFactory,
+    UserFactory,
+    WorkoutDetailsFactory,
+)
+
+
+@contextmanager
+def count_queries(db: Session) -> Iterator[list[str]]:
+    """Collect SQL statements executed on the session's connection."""
+    statements: list[str] = []
+
+    def _before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    connection = db.connection()
+    sa_event.listen(connection, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        sa_event.remove(connection, "before_cursor_execute", _before_cursor_execute)
 
 
 class TestEventRecordRepository:
@@ -142,7 +169,7 @@ class TestEventRecordRepository:
             assert event.category == "workout"
 
     def test_get_records_with_filters_by_type(self, db: Session, event_repo: EventRecordRepository) -> None:
-        """Test filtering event records by type (with ILIKE)."""
+        """Test filtering event records by a non-unified type (with ILIKE)."""
         # Arrange
         user = UserFactory()
         mapping = ExternalDeviceMappingFactory(user=user)
@@ -153,7 +180,7 @@ class TestEventRecordRepository:
 
         query_params = EventRecordQueryParams(
             category="workout",
-            record_type="running",  # Should match both with "running" in name
+            record_type="Run",  # Not a unified type, should match both with "run" in name
             limit=10,
             offset=0,
         )
@@ -167,6 +194,49 @@ class TestEventRecordRepository:
             assert event.type is not None
             assert "running" in event.type.lower()
 
+    def test_get_records_with_filters_by_unified_type_exact(
+        self,
+        db: Session,
+        event_repo: EventRecordRepository,
+    ) -> None:
+        """Test unified workout types are matched exactly, not as substrings."""
+        # Arrange
+        user = UserFactory()
+        mapping = ExternalDeviceMappingFactory(user=user)
+
+        running = EventRecordFactory(mapping=mapping, category="workout", type_="running")
+        EventRecordFactory(mapping=mapping, category="workout", type_="trail_running")
+
+        query_params = EventRecordQueryParams(category="workout", record_type="Running", limit=10, offset=0)
+
+        # Act
+        results, total_count = event_repo.get_records_with_filters(db, query_params, str(user.id))
+
+        # Assert
+        assert total_count == 1
+        assert results[0][0].id == running.id
+
+    def test_get_records_with_filters_escapes_like_characters(
+        self,
+        db: Session,
+        event_repo: EventRecordRepository,
+    ) -> None:
+        """Test LIKE wildcards in fuzzy filters are matched literally."""
+        # Arrange
+        user = UserFactory()
+        mapping = ExternalDeviceMappingFactory(user=user)
+        EventRecordFactory(mapping=mapping, category="workout", source_name="Watch 100%")
+        EventRecordFactory(mapping=mapping, category="workout", source_name="Watch 1000")
+
+        query_params = EventRecordQueryParams(category="workout", source_name="100%", limit=10, offset=0)
+
+        # Act
+        results, total_count = event_repo.get_records_with_filters(db, query_params, str(user.id))
+
+        # Assert
+        assert total_count == 1
+        assert results[0][0].source_name == "Watch 100%"
+
     def test_get_records_with_filters_by_device_id(self, db: Session, event_repo: EventRecordRepository) -> None:
         """Test filtering event records by device ID."""
         # Arrange
@@ -524,3 +594,77 @@ class TestEventRecordRepository:
         assert event.type is not None
         assert "running" in event.type
         assert mapping_result.device_id == "watch1"
+
+    def _fetch_page_and_details(
+        self,
+        db: Session,
+        event_repo: EventRecordRepository,
+        user_id: str,
+        limit: int,
+    ) -> tuple[int, int]:
+        """Fetch a page, touch every record's detail and return (rows, executed queries)."""
+        db.expire_all()
+        with count_queries(db) as statements:
+            query_params = EventRecordQueryParams(category=None, limit=limit)
+            results, _ = event_repo.get_records_with_filters(db, query_params, user_id)
+            for record, _ in results:
+                _ = record.detail
+        return len(results), len(statements)
+
+    def test_get_records_with_filters_eager_loads_details(
+        self,
+        db: Session,
+        event_repo: EventRecordRepository,
+    ) -> None:
+        """Test the number of queries per page does not grow with the page size."""
+        # Arrange
+        user = UserFactory()
+        mapping = ExternalDeviceMappingFactory(user=user)
+        base_time = datetime.now(timezone.utc)
+        for i in range(10):
+            start = base_time - timedelta(days=i)
+            record = EventRecordFactory(
+                mapping=mapping,
+                category="workout" if i % 2 else "sleep",
+                start_datetime=start,
+                end_datetime=start + timedelta(hours=1),
+            )
+            if i % 2:
+                WorkoutDetailsFactory(event_record=record)
+            else:
+                SleepDetailsFactory(event_record=record)
+
+        # Act
+        small_rows, small_queries = self._fetch_page_and_details(db, event_repo, str(user.id), limit=2)
+        large_rows, large_queries = self._fetch_page_and_details(db, event_repo, str(user.id), limit=9)
+
+        # Assert
+        assert small_rows == 3
+        assert large_rows == 10
+        assert small_queries == large_queries
+
+    def test_get_records_with_filters_loads_polymorphic_details(
+        self,
+        db: Session,
+        event_repo: EventRecordRepository,
+    ) -> None:
+        """Test eagerly loaded details keep their concrete workout/sleep type."""
+        # Arrange
+        user = UserFactory()
+        mapping = ExternalDeviceMappingFactory(user=user)
+        now = datetime.now(timezone.utc)
+        workout = EventRecordFactory(mapping=mapping, category="workout", start_datetime=now)
+        sleep = EventRecordFactory(mapping=mapping, category="sleep", start_datetime=now - timedelta(days=1))
+        WorkoutDetailsFactory(event_record=workout, heart_rate_max=180)
+        SleepDetailsFactory(event_record=sleep, sleep_deep_minutes=95)
+        db.expire_all()
+
+        # Act
+        results, _ = event_repo.get_records_with_filters(db, EventRecordQueryParams(category=None), str(user.id))
+
+        # Assert
+        details = {record.id: record.detail for record, _ in results}
+        assert isinstance(details[workout.id], WorkoutDetails)
+        assert details[workout.id].heart_rate_max == 180
+        assert isinstance(details[sleep.id], SleepDetails)
+        assert details[sleep.id].sleep_deep_minutes == 95
@@ -0,0 +1,68 @@
+"""
+Tests for SyncWatermarkRepository.
+
+Tests cover:
+- get_for_connection (no watermarks, watermarks of one connection only)
+- advance operations (insert new, move forward, never move back)
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.repositories.sync_watermark_repository import SyncWatermarkRepository
+from tests.factories import UserConnectionFactory
+
+
+class TestSyncWatermarkRepository:
+    """Test suite for SyncWatermarkRepository."""
+
+    @pytest.fixture
+    def watermark_repo(self) -> SyncWatermarkRepository:
+        """Create SyncWatermarkRepository instance."""
+        return SyncWatermarkRepository()
+
+    def test_get_for_connection_empty(self, db: Session, watermark_repo: SyncWatermarkRepository) -> None:
+        """Test a connection that was never synced has no watermarks."""
+        # Arrange
+        connection = UserConnectionFactory()
+
+        # Act
+        result = watermark_repo.get_for_connection(db, connection.id)
+
+        # Assert
+        assert result == {}
+
+    def test_advance_creates_and_moves_forward(self, db: Session, watermark_repo: SyncWatermarkRepository) -> None:
+        """Test watermarks are created per data type and moved forward."""
+        # Arrange
+        connection = UserConnectionFactory()
+        other_connection = UserConnectionFactory(provider="polar")
+        first = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        second = datetime(2025, 3, 2, tzinfo=timezone.utc)
+
+        # Act
+        watermark_repo.advance(db, connection.id, "workouts", first)
+        watermark_repo.advance(db, connection.id, "sleep_sessions", first)
+        watermark_repo.advance(db, connection.id, "workouts", second)
+        watermark_repo.advance(db, other_connection.id, "workouts", first)
+
+        # Assert
+        assert watermark_repo.get_for_connection(db, connection.id) == {
+            "workouts": second,
+            "sleep_sessions": first,
+        }
+
+    def test_advance_never_moves_back(self, db: Session, watermark_repo: SyncWatermarkRepository) -> None:
+        """Test a sync finishing late cannot rewind the watermark."""
+        # Arrange
+        connection = UserConnectionFactory()
+        newer = datetime(2025, 3, 2, tzinfo=timezone.utc)
+        watermark_repo.advance(db, connection.id, "workouts", newer)
+
+        # Act
+        watermark_repo.advance(db, connection.id, "workouts", datetime(2025, 3, 1, tzinfo=timezone.utc))
+
+        # Assert
+        assert watermark_repo.get_for_connection(db, connection.id) == {"workouts": newer}
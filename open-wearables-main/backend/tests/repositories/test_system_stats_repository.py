@@ -0,0 +1,89 @@
+"""
+Tests for SystemStatsRepository.
+
+Tests cover:
+- Incrementing dashboard counters and their daily buckets
+- Reading counter snapshots
+- Tolerating Redis failures on the ingest path
+"""
+
+from collections.abc import Generator
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.repositories.system_stats_repository import SystemStatsRepository
+
+
+class TestSystemStatsRepository:
+    """Test suite for SystemStatsRepository."""
+
+    @pytest.fixture
+    def redis_client(self) -> Generator[MagicMock, None, None]:
+        """Patch the shared Redis client."""
+        client = MagicMock()
+        with patch("app.repositories.system_stats_repository.get_redis_client", return_value=client):
+            yield client
+
+    def test_record_data_points(self, redis_client: MagicMock) -> None:
+        """Should increment the total, the daily bucket and the series type counter."""
+        # Arrange
+        repo = SystemStatsRepository()
+        pipe = redis_client.pipeline.return_value
+
+        # Act
+        repo.record_data_points(1, datetime(2025, 3, 4, 12, tzinfo=timezone.utc), count=3)
+
+        # Assert
+        pipe.hincrby.assert_any_call("system_stats", "data_points", 3)
+        pipe.hincrby.assert_any_call("system_stats", "data_points:2025-03-04", 3)
+        pipe.hincrby.assert_any_call("system_stats", "series_type:1", 3)
+        pipe.execute.assert_called_once()
+
+    def test_record_ignores_redis_errors(self, redis_client: MagicMock) -> None:
+        """Should not fail ingest when Redis is unavailable."""
+        # Arrange
+        repo = SystemStatsRepository()
+        redis_client.pipeline.return_value.execute.side_effect = RedisConnectionError("down")
+
+        # Act & Assert (no exception)
+        repo.record_users(datetime.now(timezone.utc))
+
+    def test_get_snapshot(self, redis_client: MagicMock) -> None:
+        """Should parse counters and drop the reconciliation marker."""
+        # Arrange
+        repo = SystemStatsRepository()
+        redis_client.hgetall.return_value = {"users": "5", "reconciled_at": "2025-03-04T00:00:00+00:00"}
+
+        # Act
+        snapshot = repo.get_snapshot()
+
+        # Assert
+        assert snapshot == {"users": 5}
+
+    def test_get_snapshot_not_reconciled(self, redis_client: MagicMock) -> None:
+        """Should return None until counters were reconciled at least once."""
+        # Arrange
+        repo = SystemStatsRepository()
+        redis_client.hgetall.return_value = {"users": "5"}
+
+        # Act & Assert
+        assert repo.get_snapshot() is None
+
+    def test_replace(self, redis_client: MagicMock) -> None:
+        """Should overwrite the whole hash in one transaction."""
+        # Arrange
+        repo = SystemStatsRepository()
+        pipe = redis_client.pipeline.return_value
+
+        # Act
+        repo.replace({"users": 2})
+
+        # Assert
+        redis_client.pipeline.assert_called_once_with(transaction=True)
+        pipe.delete.assert_called_once_with("system_stats")
+        mapping = pipe.hset.call_args.kwargs["mapping"]
+        assert mapping["users"] == 2
+        assert "reconciled_at" in mapping
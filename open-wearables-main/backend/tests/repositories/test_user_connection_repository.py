@@ -182,6 +182,27 @@ class TestUserConnectionRepository:
         # Assert
         assert result is None
 
+    def test_get_by_provider_user_ids(self, db: Session, connection_repo: UserConnectionRepository) -> None:
+        """Test resolving many provider user IDs at once, skipping inactive and unknown ones."""
+        # Arrange
+        first = UserConnectionFactory(provider="garmin", provider_user_id="garmin_a", status=ConnectionStatus.ACTIVE)
+        second = UserConnectionFactory(provider="garmin", provider_user_id="garmin_b", status=ConnectionStatus.ACTIVE)
+        UserConnectionFactory(provider="garmin", provider_user_id="garmin_c", status=ConnectionStatus.REVOKED)
+        UserConnectionFactory(provider="polar", provider_user_id="garmin_a", status=ConnectionStatus.ACTIVE)
+
+        # Act
+        result = connection_repo.get_by_provider_user_ids(
+            db,
+            "garmin",
+            ["garmin_a", "garmin_b", "garmin_c", "garmin_unknown"],
+        )
+
+        # Assert
+        assert {key: connection.id for key, connection in result.items()} == {
+            "garmin_a": first.id,
+            "garmin_b": second.id,
+        }
+
     def test_get_by_user_id(self, db: Session, connection_repo: UserConnectionRepository) -> None:
         """Test retrieving all connections for a specific user."""
         # Arrange
@@ -434,6 +455,23 @@ class TestUserConnectionRepository:
         # Check that user1 appears only once despite having 2 connections
         assert results.count(user1.id) == 1
 
+    def test_get_active_providers_by_user(self, db: Session, connection_repo: UserConnectionRepository) -> None:
+        """Test grouping the providers of active connections by user."""
+        # Arrange
+        user1 = UserFactory()
+        user2 = UserFactory()
+
+        UserConnectionFactory(user=user1, provider="polar", status=ConnectionStatus.ACTIVE)
+        UserConnectionFactory(user=user1, provider="garmin", status=ConnectionStatus.ACTIVE)
+        UserConnectionFactory(user=user2, provider="whoop", status=ConnectionStatus.REVOKED)
+
+        # Act
+        results = connection_repo.get_active_providers_by_user(db)
+
+        # Assert
+        assert results[user1.id] == ["garmin", "polar"]
+        assert user2.id not in results
+
     def test_update(self, db: Session, connection_repo: UserConnectionRepository) -> None:
         """Test updating a connection using the base update method."""
         # Arrange
@@ -6,10 +6,12 @@ Tests cover:
 - Listing API keys ordered by creation date
 - Rotating API keys (delete old, create new)
 - Validating API keys
+- Caching validated keys and invalidating them on rotation/deletion
 - Key generation format
 """
 
 from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import pytest
 from fastapi import HTTPException
@@ -258,6 +260,50 @@ class TestApiKeyServiceValidateApiKey:
 
         assert exc_info.value.status_code == 401
 
+    def test_validate_api_key_served_from_cache(self, db: Session) -> None:
+        """Should not query the database again for a recently validated key."""
+        # Arrange
+        api_key = ApiKeyFactory(developer=DeveloperFactory())
+        api_key_service.validate_api_key(db, api_key.id)
+
+        # Act
+        with patch.object(api_key_service.crud, "get") as mock_get:
+            validated = api_key_service.validate_api_key(db, api_key.id)
+
+        # Assert
+        mock_get.assert_not_called()
+        assert validated.id == api_key.id
+
+    def test_rotated_key_is_no_longer_valid(self, db: Session) -> None:
+        """Should reject a cached key once it has been rotated."""
+        # Arrange
+        developer = DeveloperFactory()
+        old_key = ApiKeyFactory(developer=developer)
+        old_key_id = old_key.id
+        api_key_service.validate_api_key(db, old_key_id)
+
+        # Act
+        api_key_service.rotate_api_key(db, old_key_id, developer.id)
+
+        # Assert
+        with pytest.raises(HTTPException) as exc_info:
+            api_key_service.validate_api_key(db, old_key_id)
+        assert exc_info.value.status_code == 401
+
+    def test_deleted_key_is_no_longer_valid(self, db: Session) -> None:
+        """Should reject a cached key once it has been deleted."""
+        # Arrange
+        api_key = ApiKeyFactory(developer=DeveloperFactory())
+        api_key_id = api_key.id
+        api_key_service.validate_api_key(db, api_key_id)
+
+        # Act
+        api_key_service.delete(db, api_key_id)
+
+        # Assert
+        with pytest.raises(HTTPException):
+            api_key_service.validate_api_key(db, api_key_id)
+
 
 class TestApiKeyServiceGet:
     """Test getting API key by ID."""
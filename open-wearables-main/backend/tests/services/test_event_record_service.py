@@ -5,17 +5,28 @@ Tests cover:
 - Creating event record details
 - Getting formatted event records with filters
 - Counting workouts by type
+- Getting a detailed workout with its heart rate stream
 """
 
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+from uuid import uuid4
 
 import pytest
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from app.schemas.event_record import EventRecordQueryParams
 from app.schemas.event_record_detail import EventRecordDetailCreate
 from app.services.event_record_service import event_record_service
-from tests.factories import EventRecordFactory, ExternalDeviceMappingFactory, UserFactory
+from tests.factories import (
+    DataPointSeriesFactory,
+    EventRecordFactory,
+    ExternalDeviceMappingFactory,
+    SeriesTypeDefinitionFactory,
+    UserFactory,
+    WorkoutDetailsFactory,
+)
 
 
 class TestEventRecordServiceCreateDetail:
@@ -315,3 +326,89 @@ class TestEventRecordServiceGetCountByWorkoutType:
 
         # Assert
         assert results == []
+
+
+class TestEventRecordServiceGetWorkoutDetailed:
+    """Test getting a workout with its heart rate stream."""
+
+    @pytest.fixture
+    def workout_with_heart_rate(self, db: Session) -> tuple:
+        """Workout with 600 heart rate samples inside its window and a few outside."""
+        user = UserFactory()
+        mapping = ExternalDeviceMappingFactory(user=user)
+        start = datetime(2025, 6, 1, 8, 0, tzinfo=timezone.utc)
+        workout = EventRecordFactory(
+            mapping=mapping,
+            category="workout",
+            type_="cycling",
+            start_datetime=start,
+            end_datetime=start + timedelta(minutes=10),
+            duration_seconds=600,
+        )
+        WorkoutDetailsFactory(event_record=workout, heart_rate_max=181)
+
+        heart_rate_type = SeriesTypeDefinitionFactory.get_or_create_heart_rate()
+        for i in range(600):
+            DataPointSeriesFactory(
+                mapping=mapping,
+                series_type=heart_rate_type,
+                recorded_at=start + timedelta(seconds=i),
+                value=Decimal(120 + i % 40),
+            )
+        DataPointSeriesFactory(mapping=mapping, series_type=heart_rate_type, recorded_at=start - timedelta(minutes=5))
+        return user, workout
+
+    @pytest.mark.asyncio
+    async def test_get_workout_detailed_returns_heart_rate_window(
+        self,
+        db: Session,
+        workout_with_heart_rate: tuple,
+    ) -> None:
+        """Should return all samples within the workout window when not downsampling."""
+        # Arrange
+        user, workout = workout_with_heart_rate
+
+        # Act
+        result = await event_record_service.get_workout_detailed(db, user.id, workout.id, max_heart_rate_points=None)
+
+        # Assert
+        assert result.max_heart_rate_bpm == 181
+        assert len(result.heart_rate_samples) == 600
+        assert all(workout.start_datetime <= s.timestamp <= workout.end_datetime for s in result.heart_rate_samples)
+        assert result.heart_rate_samples[0].unit == "bpm"
+
+    @pytest.mark.asyncio
+    async def test_get_workout_detailed_downsamples(self, db: Session, workout_with_heart_rate: tuple) -> None:
+        """Should downsample the heart rate stream to the requested point count."""
+        # Arrange
+        user, workout = workout_with_heart_rate
+
+        # Act
+        result = await event_record_service.get_workout_detailed(db, user.id, workout.id, max_heart_rate_points=100)
+
+        # Assert
+        assert len(result.heart_rate_samples) == 100
+        assert result.heart_rate_samples[0].timestamp == workout.start_datetime
+
+    @pytest.mark.asyncio
+    async def test_get_workout_detailed_other_user(self, db: Session, workout_with_heart_rate: tuple) -> None:
+        """Should not expose workouts of another user."""
+        # Arrange
+        _, workout = workout_with_heart_rate
+        other_user = UserFactory()
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await event_record_service.get_workout_detailed(db, other_user.id, workout.id)
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_get_workout_detailed_not_found(self, db: Session) -> None:
+        """Should raise when the workout does not exist."""
+        # Arrange
+        user = UserFactory()
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await event_record_service.get_workout_detailed(db, user.id, uuid4())
+        assert exc_info.value.status_code == 404
@@ -0,0 +1,128 @@
+"""
+Tests for RecordMergeService.
+
+Tests cover:
+- Flagging records of lower-priority sources as duplicates
+- Keeping records of one mapping and barely overlapping records apart
+- Promoting a duplicate again once its canonical record is gone
+- Merging at ingest and skipping duplicates in record queries
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from app.models import EventRecord
+from app.repositories import EventRecordRepository
+from app.schemas.event_record import EventRecordCreate, EventRecordQueryParams
+from app.services.event_record_service import event_record_service
+from app.services.record_merge_service import record_merge_service
+from tests.factories import EventRecordFactory, ExternalDeviceMappingFactory, UserFactory
+
+START = datetime(2025, 3, 1, 7, 0, tzinfo=timezone.utc)
+
+
+def _canonical(db: Session, *records: EventRecord) -> list[bool]:
+    db.expire_all()
+    return [db.get(EventRecord, record.id).is_canonical for record in records]  # type: ignore[union-attr]
+
+
+class TestRecordMergeService:
+    """Test suite for RecordMergeService."""
+
+    def test_lower_priority_source_flagged(self, db: Session) -> None:
+        """Test of a run recorded by Apple and Garmin, the Garmin record stays canonical."""
+        # Arrange
+        user = UserFactory()
+        apple = ExternalDeviceMappingFactory(user=user, provider_name="apple")
+        garmin = ExternalDeviceMappingFactory(user=user, provider_name="Garmin")
+        apple_run = EventRecordFactory(mapping=apple, start_datetime=START, duration_seconds=3600)
+        garmin_run = EventRecordFactory(
+            mapping=garmin,
+            start_datetime=START + timedelta(minutes=2),
+            duration_seconds=3480,
+        )
+
+        # Act
+        changed = record_merge_service.merge(db, user.id, "workout", START, START + timedelta(hours=2))
+
+        # Assert
+        assert changed == 1
+        assert _canonical(db, apple_run, garmin_run) == [False, True]
+
+    def test_unrelated_records_kept(self, db: Session) -> None:
+        """Test overlapping records of one mapping and barely overlapping ones stay canonical."""
+        # Arrange
+        user = UserFactory()
+        apple = ExternalDeviceMappingFactory(user=user, provider_name="apple")
+        polar = ExternalDeviceMappingFactory(user=user, provider_name="polar")
+        walk = EventRecordFactory(mapping=apple, start_datetime=START, duration_seconds=3600)
+        strength = EventRecordFactory(mapping=apple, start_datetime=START + timedelta(minutes=10), duration_seconds=600)
+        ride = EventRecordFactory(mapping=polar, start_datetime=START + timedelta(minutes=50), duration_seconds=3600)
+
+        # Act
+        changed = record_merge_service.merge(db, user.id, "workout", START, START + timedelta(hours=3))
+
+        # Assert
+        assert changed == 0
+        assert _canonical(db, walk, strength, ride) == [True, True, True]
+
+    def test_duplicate_promoted_when_canonical_gone(self, db: Session) -> None:
+        """Test a duplicate becomes canonical again when the record it duplicated is deleted."""
+        # Arrange
+        user = UserFactory()
+        apple_run = EventRecordFactory(
+            mapping=ExternalDeviceMappingFactory(user=user, provider_name="apple"),
+            start_datetime=START,
+        )
+        garmin_run = EventRecordFactory(
+            mapping=ExternalDeviceMappingFactory(user=user, provider_name="garmin"),
+            start_datetime=START,
+        )
+        record_merge_service.merge(db, user.id, "workout", START, START + timedelta(hours=1))
+        db.delete(garmin_run)
+        db.commit()
+
+        # Act
+        record_merge_service.merge(db, user.id, "workout", START, START + timedelta(hours=1))
+
+        # Assert
+        assert _canonical(db, apple_run) == [True]
+
+    def test_merged_at_ingest_and_skipped_by_queries(self, db: Session) -> None:
+        """Test records created through the service are merged and queries list the canonical one."""
+        # Arrange
+        user = UserFactory()
+
+        def create(provider: str, offset_minutes: int) -> EventRecord:
+            start = START + timedelta(minutes=offset_minutes)
+            return event_record_service.create(
+                db,
+                EventRecordCreate(
+                    id=uuid4(),
+                    category="sleep",
+                    type="sleep_session",
+                    source_name=provider,
+                    duration_seconds=8 * 3600,
+                    start_datetime=start,
+                    end_datetime=start + timedelta(hours=8),
+                    provider_name=provider,
+                    user_id=user.id,
+                ),
+            )
+
+        # Act
+        whoop_sleep = create("whoop", 0)
+        suunto_sleep = create("suunto", 5)
+
+        # Assert
+        repository = EventRecordRepository(EventRecord)
+        listed = repository.get_records_with_filters(db, EventRecordQueryParams(category="sleep"), str(user.id))[0]
+        assert [record.id for record, _ in listed] == [suunto_sleep.id]
+        by_source = repository.get_records_with_filters(
+            db,
+            EventRecordQueryParams(category="sleep", provider_name="whoop"),
+            str(user.id),
+        )[0]
+        assert [record.id for record, _ in by_source] == [whoop_sleep.id]
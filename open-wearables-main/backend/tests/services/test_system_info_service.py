@@ -5,12 +5,16 @@ Tests cover:
 - Getting system dashboard information
 - Calculating weekly growth percentages
 - Aggregating metrics from multiple services
+- Serving stats from maintained counters and reconciling them
 """
 
 from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
 
 from sqlalchemy.orm import Session
 
+from app.repositories.system_stats_repository import day_field
+from app.schemas.series_types import SeriesType, get_series_type_id
 from app.services.system_info_service import system_info_service
 from tests.factories import (
     DataPointSeriesFactory,
@@ -343,3 +347,103 @@ class TestSystemInfoServiceGetSystemInfo:
         # weekly_growth should handle the case where previous week had 0 users
         assert isinstance(info.total_users.weekly_growth, float)
         assert info.total_users.weekly_growth >= 0.0 or info.total_users.weekly_growth == 100.0
+
+
+class TestSystemInfoServiceCounters:
+    """Test serving dashboard stats from maintained counters."""
+
+    def test_get_system_info_uses_counters_snapshot(self, db: Session) -> None:
+        """Should build the response from counters without querying the data tables."""
+        # Arrange
+        today = datetime.now(timezone.utc).date()
+        heart_rate_id = get_series_type_id(SeriesType.heart_rate)
+        snapshot = {
+            "users": 40,
+            day_field("users", today): 6,
+            day_field("users", today - timedelta(days=8)): 3,
+            "active_conn": 12,
+            "data_points": 1000,
+            day_field("data_points", today - timedelta(days=1)): 100,
+            f"series_type:{heart_rate_id}": 1000,
+            "workout_type:running": 7,
+            "workout_type:": 2,
+        }
+        stats_repository = MagicMock()
+        stats_repository.get_snapshot.return_value = snapshot
+        UserFactory()  # Not reflected in counters
+
+        # Act
+        with (
+            patch.object(system_info_service, "stats_repository", stats_repository),
+            patch.object(system_info_service, "reconcile_counters") as mock_reconcile,
+        ):
+            info = system_info_service.get_system_info(db)
+
+        # Assert
+        mock_reconcile.assert_not_called()
+        assert info.total_users.count == 40
+        assert info.total_users.weekly_growth == 100.0
+        assert info.active_conn.count == 12
+        assert info.data_points.count == 1000
+        assert info.data_points.top_series_types[0].series_type == SeriesType.heart_rate.value
+        assert [(w.workout_type, w.count) for w in info.data_points.top_workout_types] == [
+            ("running", 7),
+            ("Unknown", 2),
+        ]
+
+    def test_get_system_info_exact_bypasses_counters(self, db: Session) -> None:
+        """Should count from the database when exact results are requested."""
+        # Arrange
+        UserFactory()
+        UserFactory()
+        stats_repository = MagicMock()
+        stats_repository.get_snapshot.return_value = {"users": 999}
+
+        # Act
+        with patch.object(system_info_service, "stats_repository", stats_repository):
+            info = system_info_service.get_system_info(db, exact=True)
+
+        # Assert
+        stats_repository.get_snapshot.assert_not_called()
+        assert info.total_users.count == 2
+
+    def test_get_system_info_seeds_missing_counters(self, db: Session) -> None:
+        """Should reconcile counters from the database when none are stored yet."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user)
+        stats_repository = MagicMock()
+        stats_repository.get_snapshot.return_value = None
+
+        # Act
+        with patch.object(system_info_service, "stats_repository", stats_repository):
+            info = system_info_service.get_system_info(db)
+
+        # Assert
+        stats_repository.replace.assert_called_once()
+        assert info.total_users.count == 1
+        assert info.active_conn.count == 1
+
+    def test_reconcile_counters_computes_exact_values(self, db: Session) -> None:
+        """Should store totals, daily buckets and per-type breakdowns."""
+        # Arrange
+        today = datetime.now(timezone.utc).date()
+        user = UserFactory()
+        mapping = ExternalDeviceMappingFactory(user=user)
+        heart_rate_type = SeriesTypeDefinitionFactory.get_or_create_heart_rate()
+        DataPointSeriesFactory(mapping=mapping, series_type=heart_rate_type, recorded_at=datetime.now(timezone.utc))
+        DataPointSeriesFactory(mapping=mapping, series_type=heart_rate_type, recorded_at=datetime.now(timezone.utc))
+        EventRecordFactory(mapping=mapping, category="workout", type_="cycling")
+        stats_repository = MagicMock()
+
+        # Act
+        with patch.object(system_info_service, "stats_repository", stats_repository):
+            counters = system_info_service.reconcile_counters(db)
+
+        # Assert
+        stats_repository.replace.assert_called_once_with(counters)
+        assert counters["users"] == 1
+        assert counters["data_points"] == 2
+        assert counters[day_field("data_points", today)] == 2
+        assert counters[f"series_type:{heart_rate_type.id}"] == 2
+        assert counters["workout_type:cycling"] == 1
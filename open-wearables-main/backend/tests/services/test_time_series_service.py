@@ -3,17 +3,19 @@ Tests for TimeSeriesService.
 
 Tests cover:
 - Bulk creating time series samples
+- Recording the stats counters once per series type and day of a bulk create
 - Getting daily histogram of data points
 - Counting data points by series type
 - Counting data points by provider
 """
 
 from datetime import datetime, timedelta, timezone
+from unittest.mock import call, patch
 from uuid import uuid4
 
 from sqlalchemy.orm import Session
 
-from app.schemas.series_types import SeriesType
+from app.schemas.series_types import SeriesType, get_series_type_id
 from app.schemas.timeseries import (
     HeartRateSampleCreate,
     StepSampleCreate,
@@ -123,6 +125,37 @@ class TestTimeSeriesServiceBulkCreateSamples:
         total_count = timeseries_service.get_total_count(db)
         assert total_count >= initial_count + 2
 
+    def test_bulk_create_records_stats_once(self, db: Session) -> None:
+        """Should update the stats counters once per series type and day, not once per sample."""
+        # Arrange
+        user = UserFactory()
+        day = datetime(2025, 3, 4, 8, tzinfo=timezone.utc)
+        samples = [
+            TimeSeriesSampleCreate(
+                id=uuid4(),
+                user_id=user.id,
+                provider_name="apple",
+                device_id="device_4",
+                recorded_at=day + timedelta(minutes=i),
+                value=70 + i,
+                series_type=SeriesType.heart_rate if i < 3 else SeriesType.steps,
+            )
+            for i in range(5)
+        ]
+
+        # Act
+        with patch.object(timeseries_service.crud.stats_repo, "record_data_points") as record_data_points:
+            timeseries_service.bulk_create_samples(db, samples)
+
+        # Assert
+        midnight = datetime(2025, 3, 4)
+        assert sorted(record_data_points.call_args_list) == sorted(
+            [
+                call(get_series_type_id(SeriesType.heart_rate), midnight, 3),
+                call(get_series_type_id(SeriesType.steps), midnight, 2),
+            ],
+        )
+
 
 class TestTimeSeriesServiceGetDailyHistogram:
     """Test getting daily histogram of data points."""
@@ -0,0 +1,209 @@
+"""
+Tests for the connection history backfill tasks.
+
+Tests cover:
+- Planning windows sized per provider, aligned so replanning keeps their starts
+- Resuming a backfill without re-queueing the windows already done
+- Retrying failed windows with backoff and re-queueing rate limited ones, at low priority
+- Marking the connection as backfilled once its last window is done
+"""
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.integrations.celery.queues import PRIORITY_LOW
+from app.integrations.celery.tasks.backfill_task import _windows, backfill_connection, backfill_window
+from app.models import UserConnection
+from app.repositories import BackfillWindowRepository
+from tests.factories import UserConnectionFactory, UserFactory
+
+START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+TASKS = "app.integrations.celery.tasks.backfill_task"
+
+
+@pytest.fixture
+def session_local(db: Session) -> Iterator[MagicMock]:
+    with patch(f"{TASKS}.SessionLocal") as mock_session_local:
+        mock_session_local.return_value.__enter__ = MagicMock(return_value=db)
+        mock_session_local.return_value.__exit__ = MagicMock(return_value=None)
+        yield mock_session_local
+
+
+@pytest.fixture
+def queued() -> Iterator[MagicMock]:
+    with patch.object(backfill_window, "apply_async") as mock_apply_async:
+        yield mock_apply_async
+
+
+def _sync_result(provider: str, **overrides: Any) -> dict[str, Any]:
+    return {
+        "errors": {},
+        "deferred": {},
+        "message": None,
+        "providers_synced": {
+            provider: {
+                "success": True,
+                "params": {"workouts": {"success": True}, "data_247": {"success": True, "saved": True}},
+            },
+        },
+        **overrides,
+    }
+
+
+def _plan(db: Session, connection: UserConnection, days: int) -> list[str]:
+    windows = [(START + timedelta(days=i), START + timedelta(days=i + 1)) for i in range(days)]
+    BackfillWindowRepository().plan(db, connection.id, windows)
+    return [start.isoformat() for start, _ in windows]
+
+
+class TestBackfillConnection:
+    """Test suite for backfill_connection."""
+
+    def test_windows_aligned(self) -> None:
+        """Test windows start at multiples of their size, whatever the requested start."""
+        # Act
+        windows = _windows(START + timedelta(days=3, hours=5), START + timedelta(days=60), timedelta(days=28))
+
+        # Assert
+        assert [(end - start).days for start, end in windows[:-1]] == [28, 28]
+        assert windows[0][0] <= START + timedelta(days=3, hours=5) < windows[0][1]
+        assert windows[-1][1] == START + timedelta(days=60)
+        assert _windows(windows[0][0] + timedelta(days=1), windows[-1][1], timedelta(days=28))[0] == windows[0]
+
+    @pytest.mark.parametrize(("provider", "windows"), [("garmin", (60, 61)), ("suunto", (3, 4)), ("polar", (0, 0))])
+    def test_windows_planned_per_provider(
+        self,
+        db: Session,
+        session_local: MagicMock,
+        queued: MagicMock,
+        provider: str,
+        windows: tuple[int, int],
+    ) -> None:
+        """Test the history is split in windows of the provider's size, most recent queued first."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider=provider)
+
+        # Act
+        result = backfill_connection(str(user.id), provider, history_days=60)
+
+        # Assert
+        assert windows[0] <= result["planned"] <= windows[1]
+        assert result["queued"] == result["planned"] == queued.call_count
+        if queued.call_count:
+            starts = [call.kwargs["args"][1] for call in queued.call_args_list]
+            assert starts == sorted(starts, reverse=True)
+            assert queued.call_args_list[0].kwargs["countdown"] == 0
+
+    def test_resume_skips_done_windows(self, db: Session, session_local: MagicMock, queued: MagicMock) -> None:
+        """Test planning again only re-queues the windows not done yet."""
+        # Arrange
+        user = UserFactory()
+        connection = UserConnectionFactory(user=user, provider="garmin")
+        backfill_connection(str(user.id), "garmin", history_days=5)
+        repository = BackfillWindowRepository()
+        windows = repository.get_unfinished(db, connection.id)
+        for window in windows[:3]:
+            repository.finish(db, window)
+        queued.reset_mock()
+
+        # Act
+        result = backfill_connection(str(user.id), "garmin", history_days=5)
+
+        # Assert
+        assert result["queued"] == len(windows) - 3
+        assert {call.kwargs["args"][1] for call in queued.call_args_list} == {
+            window.window_start.isoformat() for window in windows[3:]
+        }
+
+
+class TestBackfillWindow:
+    """Test suite for backfill_window."""
+
+    @patch(f"{TASKS}.sync_vendor_data")
+    def test_last_window_marks_connection_backfilled(
+        self,
+        mock_sync: MagicMock,
+        db: Session,
+        session_local: MagicMock,
+        queued: MagicMock,
+    ) -> None:
+        """Test the window's range is synced and the connection is complete after its last window."""
+        # Arrange
+        connection = UserConnectionFactory(user=UserFactory(), provider="suunto")
+        first, second = _plan(db, connection, 2)
+        mock_sync.return_value = _sync_result("suunto")
+
+        # Act
+        backfill_window(str(connection.id), first)
+        after_first = connection.backfill_completed_at
+        result = backfill_window(str(connection.id), second)
+
+        # Assert
+        assert result == {"status": "done"}
+        assert mock_sync.call_args.args == (str(connection.user_id), second, (START + timedelta(days=2)).isoformat())
+        assert mock_sync.call_args.kwargs == {"providers": ["suunto"], "defer": False}
+        assert after_first is None
+        assert connection.backfill_completed_at is not None
+        assert backfill_window(str(connection.id), second) == {"status": "done"}
+        assert mock_sync.call_count == 2
+
+    @patch(f"{TASKS}.sync_vendor_data")
+    def test_failed_window_retried(
+        self,
+        mock_sync: MagicMock,
+        db: Session,
+        session_local: MagicMock,
+        queued: MagicMock,
+    ) -> None:
+        """Test a window whose data family failed is retried with backoff until attempts run out."""
+        # Arrange
+        connection = UserConnectionFactory(user=UserFactory(), provider="whoop")
+        (start,) = _plan(db, connection, 1)
+        failed = _sync_result("whoop")
+        failed["providers_synced"]["whoop"]["params"]["data_247"] = {"success": False, "errors": {"sleep": "502"}}
+        mock_sync.return_value = failed
+
+        # Act
+        results = [backfill_window(str(connection.id), start) for _ in range(3)]
+
+        # Assert
+        assert [result["status"] for result in results] == ["failed"] * 3
+        assert [call.kwargs["countdown"] for call in queued.call_args_list] == [300.0, 600.0]
+        assert {call.kwargs["priority"] for call in queued.call_args_list} == {PRIORITY_LOW}
+        window = BackfillWindowRepository().get(db, connection.id, START)
+        db.refresh(window)
+        assert (window.status, window.attempts) == ("failed", 3)
+        assert connection.backfill_completed_at is None
+
+    @patch(f"{TASKS}.sync_vendor_data")
+    def test_rate_limited_window_deferred(
+        self,
+        mock_sync: MagicMock,
+        db: Session,
+        session_local: MagicMock,
+        queued: MagicMock,
+    ) -> None:
+        """Test a rate limited window is re-queued for when the quota allows, without counting an attempt."""
+        # Arrange
+        connection = UserConnectionFactory(user=UserFactory(), provider="garmin")
+        (start,) = _plan(db, connection, 1)
+        mock_sync.return_value = _sync_result("garmin", deferred={"garmin": 42.0})
+
+        # Act
+        result = backfill_window(str(connection.id), start)
+
+        # Assert
+        assert result == {"status": "deferred", "retry_after": 42.0}
+        assert queued.call_args.kwargs == {
+            "args": (str(connection.id), start),
+            "countdown": 42.0,
+            "priority": PRIORITY_LOW,
+        }
+        window = BackfillWindowRepository().get(db, connection.id, START)
+        assert (window.status, window.attempts) == ("pending", 0)
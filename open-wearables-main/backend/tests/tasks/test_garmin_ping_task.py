@@ -0,0 +1,245 @@
+"""
+Tests for process_garmin_pings Celery task.
+
+Tests cover:
+- Pulling callback URLs concurrently, within the configured bound
+- Saving pulled activities on the task's session
+- Queueing failed pings again with a backoff until their data is saved
+- Releasing pings once their last attempt has failed
+- Rolling back a failed save so the other pings of the batch are still saved
+"""
+
+import threading
+import time
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.integrations.celery.tasks.garmin_ping_task import process_garmin_pings
+from app.models import EventRecord
+from app.services.providers.api_client import ProviderRateLimitedError
+from app.services.providers.garmin.pings import GarminPing, save_summaries
+from tests.factories import UserConnectionFactory, UserFactory
+
+
+def _activity(activity_id: int) -> dict[str, Any]:
+    return {
+        "userId": "garmin_user_123",
+        "activityId": str(activity_id),
+        "summaryId": str(activity_id),
+        "activityType": "RUNNING",
+        "startTimeInSeconds": 1763597760 + activity_id,
+        "durationInSeconds": 1800,
+        "deviceName": "Forerunner 965",
+        "distanceInMeters": 5000,
+        "steps": 4800,
+        "activeKilocalories": 320,
+        "averageHeartRateInBeatsPerMinute": 142,
+        "maxHeartRateInBeatsPerMinute": 171,
+    }
+
+
+def _pings(user_id: Any, count: int) -> list[dict[str, Any]]:
+    return [
+        GarminPing(
+            summary_type="activities",
+            garmin_user_id="garmin_user_123",
+            user_id=user_id,
+            callback_url=(
+                "https://apis.garmin.com/wellness-api/rest/activities"
+                f"?uploadStartTimeInSeconds={i}&uploadEndTimeInSeconds={i + 1}&token=t{i}"
+            ),
+        ).model_dump(mode="json")
+        for i in range(count)
+    ]
+
+
+@patch("app.integrations.celery.tasks.garmin_ping_task.SessionLocal")
+class TestProcessGarminPings:
+    """Test suite for process_garmin_pings."""
+
+    def test_pulls_concurrently_and_saves(
+        self,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test callback URLs are pulled in parallel (bounded) and their activities saved."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="garmin", provider_user_id="garmin_user_123")
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, max
+
+        def fetch(ping: GarminPing) -> list[dict[str, Any]]:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            index = int(ping.callback_url.rsplit("=t", 1)[-1])
+            return [_activity(1000 + index)]
+
+        # Act
+        with (
+            patch("app.integrations.celery.tasks.garmin_ping_task.fetch_callback", side_effect=fetch),
+            patch.object(settings, "garmin_ping_fetch_concurrency", 2),
+        ):
+            result = process_garmin_pings(_pings(user.id, 5))
+
+        # Assert
+        assert result == {"pulled": 5, "saved": 5, "retried": 0, "failed": 0}
+        assert in_flight[1] == 2
+        saved = db.query(EventRecord).filter(EventRecord.external_id.in_([str(1000 + i) for i in range(5)])).all()
+        assert len(saved) == 5
+
+    def test_failed_pull_retried_until_saved(
+        self,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test a failing pull is queued again with a backoff, and its data saved by the retry."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="garmin", provider_user_id="garmin_user_123")
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        db.commit()  # Failed pings roll the session back
+        pings = _pings(user.id, 2)
+        pulls: list[str] = []
+
+        def fetch(ping: GarminPing) -> list[dict[str, Any]]:
+            pulls.append(ping.callback_url)
+            index = int(ping.callback_url.rsplit("=t", 1)[-1])
+            if index == 0 and pulls.count(ping.callback_url) == 1:
+                raise RuntimeError("Garmin unavailable")
+            return [_activity(2000 + index)]
+
+        # Act
+        with (
+            patch("app.integrations.celery.tasks.garmin_ping_task.fetch_callback", side_effect=fetch),
+            patch("app.integrations.celery.tasks.garmin_ping_task.release") as release,
+            patch.object(process_garmin_pings, "apply_async") as apply_async,
+            patch.object(settings, "garmin_ping_retry_seconds", 60),
+        ):
+            first = process_garmin_pings(pings)
+            (retried,) = apply_async.call_args.kwargs["args"]
+            second = process_garmin_pings(retried)
+
+        # Assert
+        assert first == {"pulled": 1, "saved": 1, "retried": 1, "failed": 0}
+        assert apply_async.call_args.kwargs["countdown"] == 60
+        assert [ping["callback_url"] for ping in retried] == [pings[0]["callback_url"]]
+        assert retried[0]["attempt"] == 1
+        assert second == {"pulled": 1, "saved": 1, "retried": 0, "failed": 0}
+        release.assert_not_called()
+        assert db.query(EventRecord).filter(EventRecord.external_id.in_(["2000", "2001"])).count() == 2
+
+    def test_rate_limited_pull_retried_after_retry_after(
+        self,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test a rate-limited pull is not retried before Garmin's Retry-After."""
+        # Arrange
+        user = UserFactory()
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        db.commit()  # Failed pings roll the session back
+
+        # Act
+        with (
+            patch(
+                "app.integrations.celery.tasks.garmin_ping_task.fetch_callback",
+                side_effect=ProviderRateLimitedError("garmin", 300),
+            ),
+            patch.object(process_garmin_pings, "apply_async") as apply_async,
+            patch.object(settings, "garmin_ping_retry_seconds", 60),
+        ):
+            result = process_garmin_pings(_pings(user.id, 1))
+
+        # Assert
+        assert result == {"pulled": 0, "saved": 0, "retried": 1, "failed": 0}
+        assert apply_async.call_args.kwargs["countdown"] == 300
+
+    def test_last_failed_attempt_released(
+        self,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test a ping is given up on and released once its last attempt fails."""
+        # Arrange
+        user = UserFactory()
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        db.commit()  # Failed pings roll the session back
+        pings = _pings(user.id, 1)
+        pings[0]["attempt"] = 3
+
+        # Act
+        with (
+            patch(
+                "app.integrations.celery.tasks.garmin_ping_task.fetch_callback",
+                side_effect=RuntimeError("Pull token expired"),
+            ),
+            patch("app.integrations.celery.tasks.garmin_ping_task.release") as release,
+            patch.object(process_garmin_pings, "apply_async") as apply_async,
+            patch.object(settings, "garmin_ping_max_attempts", 4),
+        ):
+            result = process_garmin_pings(pings)
+
+        # Assert
+        assert result == {"pulled": 0, "saved": 0, "retried": 0, "failed": 1}
+        apply_async.assert_not_called()
+        (released,) = release.call_args.args
+        assert released.callback_url == pings[0]["callback_url"]
+
+    def test_failed_save_rolled_back(
+        self,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test a database error saving one ping leaves the shared session usable for the others."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="garmin", provider_user_id="garmin_user_123")
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        db.commit()  # Failed pings roll the session back
+        pings = _pings(user.id, 3)
+
+        def fetch(ping: GarminPing) -> list[dict[str, Any]]:
+            return [_activity(3000 + int(ping.callback_url.rsplit("=t", 1)[-1]))]
+
+        def save(session: Session, ping: GarminPing, summaries: list[dict[str, Any]]) -> int:
+            if ping.callback_url.endswith("=t0"):
+                session.execute(text("SELECT 1 / 0"))
+            return save_summaries(session, ping, summaries)
+
+        # Act
+        with (
+            patch.object(settings, "garmin_ping_fetch_concurrency", 1),
+            patch("app.integrations.celery.tasks.garmin_ping_task.fetch_callback", side_effect=fetch),
+            patch("app.integrations.celery.tasks.garmin_ping_task.save_summaries", side_effect=save),
+            patch.object(process_garmin_pings, "apply_async") as apply_async,
+        ):
+            result = process_garmin_pings(pings)
+
+        # Assert
+        assert result == {"pulled": 3, "saved": 2, "retried": 1, "failed": 0}
+        apply_async.assert_called_once()
+        assert db.query(EventRecord).filter(EventRecord.external_id.in_(["3001", "3002"])).count() == 2
@@ -0,0 +1,44 @@
+"""
+Tests for process_garmin_push Celery task.
+
+Tests cover:
+- Saving pushed wellness summaries through the task's session
+"""
+
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.orm import Session
+
+from app.integrations.celery.tasks.garmin_push_task import process_garmin_push
+from app.models import DataPointSeries
+from tests.factories import UserConnectionFactory, UserFactory
+
+
+@patch("app.integrations.celery.tasks.garmin_push_task.SessionLocal")
+class TestProcessGarminPush:
+    """Test suite for process_garmin_push."""
+
+    def test_saves_summaries(
+        self,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test pushed epochs are saved and counted per summary type."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="garmin", provider_user_id="garmin_user_123")
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        epochs = [
+            {"userId": "garmin_user_123", "summaryId": f"e{i}", "startTimeInSeconds": 1740787200 + 900 * i, "steps": 50}
+            for i in range(4)
+        ]
+
+        # Act
+        result = process_garmin_push({"epochs": epochs})
+
+        # Assert
+        assert result["epochs"] == 4
+        assert result["skipped"] == 0
+        assert db.query(DataPointSeries).filter(DataPointSeries.external_id.in_(["e0", "e1", "e2", "e3"])).count() == 4
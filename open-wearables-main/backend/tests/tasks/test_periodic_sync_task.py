@@ -1,18 +1,42 @@
 """
 Tests for sync_all_users periodic Celery task.
 
-Tests the periodic task that syncs data for all users with active connections.
+Tests the periodic task that syncs data for all users with active connections,
+pacing the queued syncs to the providers' rate limits within the sync interval.
 """
 
+import json
+from collections.abc import Generator
 from unittest.mock import MagicMock, patch
+from uuid import uuid4
 
+import pytest
 from sqlalchemy.orm import Session
 
-from app.integrations.celery.tasks.periodic_sync_task import sync_all_users
+from app.config import settings
+from app.integrations.celery.tasks.periodic_sync_task import (
+    DEFERRED_SYNCS_KEY,
+    _schedule_user_syncs,
+    sync_all_users,
+)
+from app.integrations.redis_client import get_redis_client
 from app.schemas import ConnectionStatus
 from tests.factories import UserConnectionFactory, UserFactory
 
 
+@pytest.fixture(autouse=True)
+def redis_store(mock_redis: MagicMock) -> Generator[dict[str, str], None, None]:
+    """Keys written by sync_all_users (the users it deferred), kept in memory."""
+    store: dict[str, str] = {}
+    redis_client = get_redis_client()
+    with (
+        patch.object(redis_client, "get", side_effect=store.get),
+        patch.object(redis_client, "set", side_effect=lambda key, value, ex: store.__setitem__(key, value)),
+        patch.object(redis_client, "delete", side_effect=lambda key: store.pop(key, None)),
+    ):
+        yield store
+
+
 class TestSyncAllUsersTask:
     """Test suite for sync_all_users periodic task."""
 
@@ -43,10 +67,10 @@ class TestSyncAllUsersTask:
 
         # Assert
         assert result["users_for_sync"] == 3
-        assert mock_sync_vendor_data.delay.call_count == 3
+        assert mock_sync_vendor_data.apply_async.call_count == 3
 
         # Verify each user was queued for sync
-        call_args_list = [call[0][0] for call in mock_sync_vendor_data.delay.call_args_list]
+        call_args_list = [call.kwargs["args"][0] for call in mock_sync_vendor_data.apply_async.call_args_list]
         assert str(user1.id) in call_args_list
         assert str(user2.id) in call_args_list
         assert str(user3.id) in call_args_list
@@ -76,11 +100,8 @@ class TestSyncAllUsersTask:
 
         # Assert
         assert result["users_for_sync"] == 1
-        mock_sync_vendor_data.delay.assert_called_once_with(
-            str(user.id),
-            start_date,
-            end_date,
-        )
+        mock_sync_vendor_data.apply_async.assert_called_once()
+        assert mock_sync_vendor_data.apply_async.call_args.kwargs["args"] == (str(user.id), start_date, end_date)
 
     @patch("app.integrations.celery.tasks.periodic_sync_task.SessionLocal")
     @patch("app.integrations.celery.tasks.periodic_sync_task.sync_vendor_data")
@@ -110,10 +131,10 @@ class TestSyncAllUsersTask:
 
         # Assert
         assert result["users_for_sync"] == 1
-        mock_sync_vendor_data.delay.assert_called_once()
+        mock_sync_vendor_data.apply_async.assert_called_once()
 
         # Verify only user1 was queued
-        call_args = mock_sync_vendor_data.delay.call_args[0]
+        call_args = mock_sync_vendor_data.apply_async.call_args.kwargs["args"]
         assert call_args[0] == str(user1.id)
 
     @patch("app.integrations.celery.tasks.periodic_sync_task.SessionLocal")
@@ -135,7 +156,7 @@ class TestSyncAllUsersTask:
 
         # Assert
         assert result["users_for_sync"] == 0
-        mock_sync_vendor_data.delay.assert_not_called()
+        mock_sync_vendor_data.apply_async.assert_not_called()
 
     @patch("app.integrations.celery.tasks.periodic_sync_task.SessionLocal")
     @patch("app.integrations.celery.tasks.periodic_sync_task.sync_vendor_data")
@@ -164,7 +185,8 @@ class TestSyncAllUsersTask:
         # Assert
         # User should only be counted once despite having 3 connections
         assert result["users_for_sync"] == 1
-        mock_sync_vendor_data.delay.assert_called_once_with(str(user.id), None, None)
+        mock_sync_vendor_data.apply_async.assert_called_once()
+        assert mock_sync_vendor_data.apply_async.call_args.kwargs["args"] == (str(user.id), None, None)
 
     @patch("app.integrations.celery.tasks.periodic_sync_task.SessionLocal")
     @patch("app.integrations.celery.tasks.periodic_sync_task.sync_vendor_data")
@@ -199,9 +221,9 @@ class TestSyncAllUsersTask:
 
         # Assert
         assert result["users_for_sync"] == 2  # Only user1 and user2
-        assert mock_sync_vendor_data.delay.call_count == 2
+        assert mock_sync_vendor_data.apply_async.call_count == 2
 
-        call_args_list = [call[0][0] for call in mock_sync_vendor_data.delay.call_args_list]
+        call_args_list = [call.kwargs["args"][0] for call in mock_sync_vendor_data.apply_async.call_args_list]
         assert str(user1.id) in call_args_list
         assert str(user2.id) in call_args_list
         assert str(user3.id) not in call_args_list
@@ -215,7 +237,7 @@ class TestSyncAllUsersTask:
         db: Session,
         mock_celery_app: MagicMock,
     ) -> None:
-        """Test that sync tasks are queued asynchronously with delay."""
+        """Test that sync tasks are queued asynchronously with a countdown."""
         # Arrange
         user = UserFactory()
         UserConnectionFactory(user=user, provider="garmin", status=ConnectionStatus.ACTIVE)
@@ -226,8 +248,9 @@ class TestSyncAllUsersTask:
         # Act
         sync_all_users()
 
-        # Assert - verify .delay() was called (async execution)
-        mock_sync_vendor_data.delay.assert_called_once()
+        # Assert - verify .apply_async() was called (async execution)
+        mock_sync_vendor_data.apply_async.assert_called_once()
+        assert mock_sync_vendor_data.apply_async.call_args.kwargs["countdown"] >= 0
         # Verify .apply() or direct call was NOT used
         mock_sync_vendor_data.apply.assert_not_called() if hasattr(mock_sync_vendor_data, "apply") else None
 
@@ -256,9 +279,102 @@ class TestSyncAllUsersTask:
 
         # Assert
         assert result["users_for_sync"] == 10
-        assert mock_sync_vendor_data.delay.call_count == 10
+        assert mock_sync_vendor_data.apply_async.call_count == 10
 
         # Verify all users were queued
-        call_args_list = [call[0][0] for call in mock_sync_vendor_data.delay.call_args_list]
+        call_args_list = [call.kwargs["args"][0] for call in mock_sync_vendor_data.apply_async.call_args_list]
         for user in users:
             assert str(user.id) in call_args_list
+
+    @patch("app.integrations.celery.tasks.periodic_sync_task.random.uniform", return_value=0.0)
+    @patch("app.integrations.celery.tasks.periodic_sync_task.SessionLocal")
+    @patch("app.integrations.celery.tasks.periodic_sync_task.sync_vendor_data")
+    def test_sync_all_users_defers_users_beyond_interval(
+        self,
+        mock_sync_vendor_data: MagicMock,
+        mock_session_local: MagicMock,
+        mock_uniform: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+        redis_store: dict[str, str],
+    ) -> None:
+        """Test users that do not fit in the sync interval are left to the next run, which queues them first."""
+        # Arrange - polar fits two user syncs in 10 seconds
+        users = sorted((UserFactory() for _ in range(3)), key=lambda user: user.id)
+        for user in users:
+            UserConnectionFactory(user=user, provider="polar", status=ConnectionStatus.ACTIVE)
+        mock_session_local.return_value.__enter__ = MagicMock(return_value=db)
+        mock_session_local.return_value.__exit__ = MagicMock(return_value=None)
+
+        # Act
+        with patch.object(settings, "sync_interval_seconds", 10):
+            first = sync_all_users()
+            first_queued = [call.kwargs["args"][0] for call in mock_sync_vendor_data.apply_async.call_args_list]
+            mock_sync_vendor_data.apply_async.reset_mock()
+            second = sync_all_users()
+            second_queued = [call.kwargs["args"][0] for call in mock_sync_vendor_data.apply_async.call_args_list]
+
+        # Assert
+        assert (first["deferred"], second["deferred"]) == (1, 1)
+        assert first["spread_seconds"] <= 10
+        assert first_queued == [str(users[0].id), str(users[1].id)]
+        assert second_queued == [str(users[2].id), str(users[0].id)]
+        assert json.loads(redis_store[DEFERRED_SYNCS_KEY]) == [str(users[1].id)]
+
+
+class TestScheduleUserSyncs:
+    """Test suite for pacing the fan-out of user syncs."""
+
+    @patch("app.integrations.celery.tasks.periodic_sync_task.random.uniform", return_value=0.0)
+    def test_syncs_spaced_by_provider_quota(self, mock_uniform: MagicMock) -> None:
+        """Test users of one provider are spread according to its rate limit."""
+        # Arrange - polar allows 33 requests/min and a user sync needs 3
+        users = [uuid4() for _ in range(3)]
+
+        # Act
+        countdowns = _schedule_user_syncs({user_id: ["polar"] for user_id in users})
+
+        # Assert
+        spacing = 3 * 60 / 33
+        assert [countdowns[user_id] for user_id in users] == [0.0, spacing, 2 * spacing]
+
+    @patch("app.integrations.celery.tasks.periodic_sync_task.random.uniform", return_value=0.0)
+    def test_providers_paced_independently(self, mock_uniform: MagicMock) -> None:
+        """Test each provider has its own timeline, users wait for all of theirs."""
+        # Arrange
+        polar_user, garmin_user, both_user = uuid4(), uuid4(), uuid4()
+
+        # Act
+        countdowns = _schedule_user_syncs(
+            {polar_user: ["polar"], garmin_user: ["garmin"], both_user: ["garmin", "polar"]},
+        )
+
+        # Assert
+        assert countdowns[polar_user] == 0.0
+        assert countdowns[garmin_user] == 0.0
+        assert countdowns[both_user] == 3 * 60 / 33  # Polar is the bottleneck
+
+    def test_jitter_bounded(self) -> None:
+        """Test jitter never exceeds the configured maximum."""
+        # Act
+        countdowns = _schedule_user_syncs({uuid4(): ["apple"] for _ in range(20)})
+
+        # Assert - providers without a rate limit are not spaced
+        assert all(0 <= countdown <= 30 for countdown in countdowns.values())
+
+    @patch("app.integrations.celery.tasks.periodic_sync_task.random.uniform", return_value=0.0)
+    def test_users_beyond_horizon_left_out(self, mock_uniform: MagicMock) -> None:
+        """Test users that cannot start before the horizon are not scheduled nor reserve slots."""
+        # Arrange
+        polar_users = [uuid4() for _ in range(3)]
+        garmin_user = uuid4()
+
+        # Act
+        countdowns = _schedule_user_syncs(
+            {**{user_id: ["polar"] for user_id in polar_users}, garmin_user: ["garmin"]},
+            horizon=10,
+        )
+
+        # Assert
+        assert list(countdowns) == [*polar_users[:2], garmin_user]
+        assert countdowns[garmin_user] == 0.0
@@ -0,0 +1,38 @@
+"""
+Tests for reconcile_system_stats periodic Celery task.
+
+Tests the task that recomputes the maintained dashboard counters.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.orm import Session
+
+from app.integrations.celery.tasks.reconcile_system_stats_task import reconcile_system_stats
+from tests.factories import UserFactory
+
+
+class TestReconcileSystemStatsTask:
+    """Test suite for reconcile_system_stats task."""
+
+    @patch("app.integrations.celery.tasks.reconcile_system_stats_task.SessionLocal")
+    def test_reconcile_system_stats(
+        self,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test counters are recomputed from the database and stored."""
+        # Arrange
+        UserFactory()
+        mock_session_local.return_value.__enter__ = MagicMock(return_value=db)
+        mock_session_local.return_value.__exit__ = MagicMock(return_value=None)
+
+        # Act
+        with patch("app.services.system_info_service.system_info_service.stats_repository") as mock_stats:
+            result = reconcile_system_stats()
+
+        # Assert
+        stored = mock_stats.replace.call_args.args[0]
+        assert stored["users"] == 1
+        assert result == {"counters": len(stored)}
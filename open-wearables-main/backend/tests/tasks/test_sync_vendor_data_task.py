@@ -2,18 +2,34 @@
 Tests for sync_vendor_data Celery task.
 
 Tests synchronization of workout data from external providers (Garmin, Polar, Suunto).
+Tests concurrent fetching of providers and data families with a single writer.
+Tests deferring rate limited providers instead of dropping their data.
+Tests incremental syncs resuming from per data family watermarks.
+Tests reporting time chunks that failed to fetch.
+Tests streaming long ranges window by window with a bounded number of fetched results.
+Tests samples re-fetched within the overlap of incremental syncs being stored once.
 """
 
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.integrations.celery.tasks.sync_vendor_data_task import (
     _build_sync_params,
     sync_vendor_data,
 )
+from app.models import DataPointSeries
+from app.repositories import SyncWatermarkRepository
 from app.schemas import ConnectionStatus
-from tests.factories import UserConnectionFactory, UserFactory
+from app.services.providers.api_client import ProviderRateLimitedError
+from app.services.providers.suunto.data_247 import Suunto247Data
+from app.services.providers.templates.base_247_data import ChunkedFetchResult
+from tests.factories import EventRecordFactory, UserConnectionFactory, UserFactory
 
 
 class TestSyncVendorDataTask:
@@ -43,7 +59,7 @@ class TestSyncVendorDataTask:
 
         # Mock the provider strategy
         mock_workouts = MagicMock()
-        mock_workouts.load_data.return_value = True
+        mock_workouts.save_data.return_value = True
 
         mock_strategy = MagicMock()
         mock_strategy.workouts = mock_workouts
@@ -57,7 +73,8 @@ class TestSyncVendorDataTask:
         assert "garmin" in result["providers_synced"]
         assert result["providers_synced"]["garmin"]["success"] is True
         assert result["errors"] == {}
-        mock_workouts.load_data.assert_called_once()
+        mock_workouts.fetch_data.assert_called_once()
+        mock_workouts.save_data.assert_called_once()
 
         # Verify connection was updated
         db.refresh(connection)
@@ -85,7 +102,7 @@ class TestSyncVendorDataTask:
         mock_session_local.return_value.__exit__.return_value = None
 
         mock_workouts = MagicMock()
-        mock_workouts.load_data.return_value = True
+        mock_workouts.save_data.return_value = True
 
         mock_strategy = MagicMock()
         mock_strategy.workouts = mock_workouts
@@ -102,7 +119,8 @@ class TestSyncVendorDataTask:
         assert result["start_date"] == start_date
         assert result["end_date"] == end_date
         assert "polar" in result["providers_synced"]
-        mock_workouts.load_data.assert_called_once()
+        mock_workouts.fetch_data.assert_called_once()
+        mock_workouts.save_data.assert_called_once()
 
     @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
     @patch("app.services.providers.factory.ProviderFactory.get_provider")
@@ -124,7 +142,7 @@ class TestSyncVendorDataTask:
         mock_session_local.return_value.__exit__.return_value = None
 
         mock_workouts = MagicMock()
-        mock_workouts.load_data.return_value = True
+        mock_workouts.save_data.return_value = True
 
         mock_strategy = MagicMock()
         mock_strategy.workouts = mock_workouts
@@ -138,7 +156,8 @@ class TestSyncVendorDataTask:
         assert "garmin" in result["providers_synced"]
         assert "polar" in result["providers_synced"]
         assert "suunto" in result["providers_synced"]
-        assert mock_workouts.load_data.call_count == 3
+        assert mock_workouts.fetch_data.call_count == 3
+        assert mock_workouts.save_data.call_count == 3
 
     @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
     @patch("app.services.providers.factory.ProviderFactory.get_provider")
@@ -159,7 +178,7 @@ class TestSyncVendorDataTask:
         mock_session_local.return_value.__exit__.return_value = None
 
         mock_workouts = MagicMock()
-        mock_workouts.load_data.return_value = True
+        mock_workouts.save_data.return_value = True
 
         mock_strategy = MagicMock()
         mock_strategy.workouts = mock_workouts
@@ -172,7 +191,8 @@ class TestSyncVendorDataTask:
         assert len(result["providers_synced"]) == 1
         assert "garmin" in result["providers_synced"]
         assert "polar" not in result["providers_synced"]
-        mock_workouts.load_data.assert_called_once()
+        mock_workouts.fetch_data.assert_called_once()
+        mock_workouts.save_data.assert_called_once()
 
     @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
     def test_sync_vendor_data_no_active_connections(
@@ -249,7 +269,7 @@ class TestSyncVendorDataTask:
         mock_session_local.return_value.__exit__.return_value = None
 
         mock_workouts = MagicMock()
-        mock_workouts.load_data.return_value = False
+        mock_workouts.save_data.return_value = False
 
         mock_strategy = MagicMock()
         mock_strategy.workouts = mock_workouts
@@ -306,6 +326,521 @@ class TestSyncVendorDataTask:
         assert "Invalid UUID format" in result["errors"]["user_id"]
 
 
+class TestSyncVendorDataConcurrency:
+    """Test suite for concurrent fetching in sync_vendor_data."""
+
+    @staticmethod
+    def _slow_fetch(delay: float, result: Any) -> Any:
+        def fetch(*args: Any, **kwargs: Any) -> Any:
+            time.sleep(delay)
+            return result
+
+        return fetch
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_providers_and_families_fetched_concurrently(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test wall time follows the slowest fetch while saves run on the task thread."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="garmin", status=ConnectionStatus.ACTIVE)
+        UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+
+        save_threads: set[int] = set()
+
+        def save_sleep(db: Session, user_id: Any, raw: list[Any]) -> int:
+            save_threads.add(threading.get_ident())
+            return len(raw)
+
+        def save_workouts(db: Session, user_id: Any, raw: list[Any]) -> bool:
+            save_threads.add(threading.get_ident())
+            return True
+
+        mock_strategy = MagicMock()
+        mock_strategy.workouts.fetch_data.side_effect = self._slow_fetch(0.3, [])
+        mock_strategy.workouts.save_data.side_effect = save_workouts
+        mock_strategy.data_247.get_sync_families.return_value = {
+            "sleep_sessions": (self._slow_fetch(0.3, [{}, {}]), save_sleep),
+        }
+        mock_get_provider.return_value = mock_strategy
+
+        # Act
+        started = time.perf_counter()
+        with patch.object(settings, "sync_247_window_days", 30):
+            result = sync_vendor_data(str(user.id))
+        elapsed = time.perf_counter() - started
+
+        # Assert - 4 fetches of 0.3s each take roughly as long as one
+        assert elapsed < 0.9
+        assert save_threads == {threading.get_ident()}
+        for provider in ("garmin", "suunto"):
+            params = result["providers_synced"][provider]["params"]
+            assert params["workouts"]["success"] is True
+            assert params["data_247"] == {"success": True, "saved": True, "sleep_sessions": 2}
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_failed_family_reported_without_blocking_others(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test a failing data family is reported while the others are saved."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+
+        def failing_fetch(*args: Any) -> Any:
+            raise RuntimeError("Suunto API unavailable")
+
+        mock_strategy = MagicMock()
+        mock_strategy.workouts = None
+        mock_strategy.data_247.get_sync_families.return_value = {
+            "sleep_sessions": (failing_fetch, MagicMock()),
+            "daily_activity": (self._slow_fetch(0, [{}]), MagicMock(return_value=1)),
+        }
+        mock_get_provider.return_value = mock_strategy
+
+        # Act
+        with patch.object(settings, "sync_247_window_days", 30):
+            result = sync_vendor_data(str(user.id))
+
+        # Assert
+        data_247 = result["providers_synced"]["suunto"]["params"]["data_247"]
+        assert data_247["success"] is False
+        assert data_247["daily_activity"] == 1
+        assert data_247["errors"] == {"sleep_sessions": "Suunto API unavailable"}
+        assert result["errors"] == {}
+
+
+class TestSyncVendorDataRateLimits:
+    """Test suite for rate limited providers in sync_vendor_data."""
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.random.uniform", return_value=0.0)
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.sync_vendor_data.apply_async")
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_rate_limited_provider_deferred(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        mock_apply_async: MagicMock,
+        mock_uniform: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test a rate limited provider is re-queued while the others complete."""
+        # Arrange
+        user = UserFactory()
+        garmin = UserConnectionFactory(user=user, provider="garmin", status=ConnectionStatus.ACTIVE)
+        whoop = UserConnectionFactory(user=user, provider="whoop", status=ConnectionStatus.ACTIVE)
+        garmin_synced_at, whoop_synced_at = garmin.last_synced_at, whoop.last_synced_at
+
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+
+        garmin_strategy = MagicMock()
+        garmin_strategy.workouts.fetch_data.return_value = []
+        garmin_strategy.workouts.save_data.return_value = True
+        garmin_strategy.data_247 = None
+        whoop_strategy = MagicMock()
+        whoop_strategy.workouts.fetch_data.side_effect = ProviderRateLimitedError("whoop", 90)
+        whoop_strategy.data_247 = None
+        mock_get_provider.side_effect = lambda name: {"garmin": garmin_strategy, "whoop": whoop_strategy}[name]
+
+        # Act
+        result = sync_vendor_data(str(user.id), "2025-01-01T00:00:00Z", None)
+
+        # Assert
+        assert result["deferred"] == {"whoop": 90}
+        assert result["providers_synced"]["garmin"]["success"] is True
+        assert result["providers_synced"]["whoop"]["success"] is False
+        mock_apply_async.assert_called_once_with(
+            args=(str(user.id), "2025-01-01T00:00:00Z", None),
+            kwargs={"providers": ["whoop"]},
+            countdown=90,
+        )
+        db.refresh(garmin)
+        db.refresh(whoop)
+        assert garmin.last_synced_at != garmin_synced_at
+        assert whoop.last_synced_at == whoop_synced_at
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.sync_vendor_data.apply_async")
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_other_failures_not_deferred(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        mock_apply_async: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test ordinary errors are reported without re-queueing the sync."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="polar", status=ConnectionStatus.ACTIVE)
+
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+
+        mock_strategy = MagicMock()
+        mock_strategy.workouts.fetch_data.side_effect = RuntimeError("Polar API unavailable")
+        mock_strategy.data_247 = None
+        mock_get_provider.return_value = mock_strategy
+
+        # Act
+        result = sync_vendor_data(str(user.id))
+
+        # Assert
+        assert result["deferred"] == {}
+        assert result["providers_synced"]["polar"]["params"]["workouts"]["success"] is False
+        mock_apply_async.assert_not_called()
+
+
+class TestSyncVendorDataIncremental:
+    """Test suite for incremental syncs based on watermarks."""
+
+    @staticmethod
+    def _strategy(sleep_fetch: MagicMock, sleep_save: MagicMock) -> MagicMock:
+        strategy = MagicMock()
+        strategy.workouts.fetch_data.return_value = []
+        strategy.workouts.save_data.return_value = True
+        strategy.data_247.get_sync_families.return_value = {"sleep_sessions": (sleep_fetch, sleep_save)}
+        return strategy
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_first_sync_sets_watermarks(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test a first sync uses the default windows and records a watermark per family."""
+        # Arrange
+        user = UserFactory()
+        connection = UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        sleep_fetch = MagicMock(return_value=[])
+        strategy = self._strategy(sleep_fetch, MagicMock(return_value=0))
+        mock_get_provider.return_value = strategy
+
+        # Act
+        before = datetime.now(timezone.utc)
+        sync_vendor_data(str(user.id))
+
+        # Assert
+        assert strategy.workouts.fetch_data.call_args.kwargs["start_date"] is None
+        windows = sorted(call.args[2:] for call in sleep_fetch.call_args_list)
+        assert windows[-1][1] - windows[0][0] == timedelta(days=30)
+        assert all(end - start <= timedelta(days=settings.sync_247_window_days) for start, end in windows)
+        watermarks = SyncWatermarkRepository().get_for_connection(db, connection.id)
+        assert set(watermarks) == {"workouts", "sleep_sessions"}
+        assert all(watermark >= before for watermark in watermarks.values())
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_resumes_from_watermark_with_overlap(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test each family only fetches data since its own watermark, minus the overlap."""
+        # Arrange
+        user = UserFactory()
+        connection = UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        workouts_synced = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+        sleep_synced = datetime(2025, 3, 2, 12, tzinfo=timezone.utc)
+        watermark_repo = SyncWatermarkRepository()
+        watermark_repo.advance(db, connection.id, "workouts", workouts_synced)
+        watermark_repo.advance(db, connection.id, "sleep_sessions", sleep_synced)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        sleep_fetch = MagicMock(return_value=[])
+        strategy = self._strategy(sleep_fetch, MagicMock(return_value=0))
+        mock_get_provider.return_value = strategy
+
+        # Act
+        sync_vendor_data(str(user.id))
+
+        # Assert
+        params = strategy.workouts.fetch_data.call_args.kwargs
+        assert params["start_date"] == (workouts_synced - timedelta(hours=1)).isoformat()
+        assert params["since"] == int((workouts_synced - timedelta(hours=1)).timestamp())
+        assert min(call.args[2] for call in sleep_fetch.call_args_list) == sleep_synced - timedelta(hours=1)
+        assert watermark_repo.get_for_connection(db, connection.id)["sleep_sessions"] > sleep_synced
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_failed_family_keeps_watermark(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test a family that failed is fetched from the same point next time."""
+        # Arrange
+        user = UserFactory()
+        connection = UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        sleep_synced = datetime(2025, 3, 2, 12, tzinfo=timezone.utc)
+        watermark_repo = SyncWatermarkRepository()
+        watermark_repo.advance(db, connection.id, "sleep_sessions", sleep_synced)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        sleep_fetch = MagicMock(side_effect=RuntimeError("Suunto API unavailable"))
+        mock_get_provider.return_value = self._strategy(sleep_fetch, MagicMock())
+
+        # Act
+        sync_vendor_data(str(user.id))
+
+        # Assert
+        watermarks = watermark_repo.get_for_connection(db, connection.id)
+        assert watermarks["sleep_sessions"] == sleep_synced
+        assert "workouts" in watermarks
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_explicit_past_window_keeps_watermarks(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test syncing an explicit historical range doesn't move the watermarks."""
+        # Arrange
+        user = UserFactory()
+        connection = UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        sleep_fetch = MagicMock(return_value=[])
+        mock_get_provider.return_value = self._strategy(sleep_fetch, MagicMock(return_value=0))
+
+        # Act
+        sync_vendor_data(str(user.id), "2024-01-01T00:00:00Z", "2024-02-01T00:00:00Z")
+
+        # Assert
+        windows = sorted(call.args[2:] for call in sleep_fetch.call_args_list)
+        assert windows[0][0] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert windows[-1][1] == datetime(2024, 2, 1, tzinfo=timezone.utc)
+        assert SyncWatermarkRepository().get_for_connection(db, connection.id) == {}
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_reports_fetched_and_new_records(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test the result tells how many fetched records were actually new."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+
+        def save_sleep(db: Session, user_id: Any, raw: list[Any]) -> int:
+            # Two of the three fetched sessions were not stored yet
+            EventRecordFactory(category="sleep")
+            EventRecordFactory(category="sleep")
+            return len(raw)
+
+        mock_get_provider.return_value = self._strategy(MagicMock(return_value=[{}, {}, {}]), save_sleep)
+
+        # Act
+        with patch.object(settings, "sync_247_window_days", 30):
+            result = sync_vendor_data(str(user.id))
+
+        # Assert
+        records = result["providers_synced"]["suunto"]["records"]
+        assert records["sleep_sessions"] == {"fetched": 3, "new": 2, "failed_chunks": []}
+        assert records["workouts"] == {"fetched": 0, "new": 0, "failed_chunks": []}
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_failed_chunks_reported_and_keep_watermark(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test a family missing time chunks is saved, reported and fetched again next time."""
+        # Arrange
+        user = UserFactory()
+        connection = UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        sleep_synced = datetime.now(timezone.utc) - timedelta(days=1)
+        watermark_repo = SyncWatermarkRepository()
+        watermark_repo.advance(db, connection.id, "sleep_sessions", sleep_synced)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        failed = "2025-03-02T11:00:00+00:00/2025-03-03T11:00:00+00:00"
+        sleep_fetch = MagicMock(return_value=ChunkedFetchResult([{}, {}], failed_chunks=[failed]))
+        sleep_save = MagicMock(return_value=2)
+        mock_get_provider.return_value = self._strategy(sleep_fetch, sleep_save)
+
+        # Act
+        result = sync_vendor_data(str(user.id))
+
+        # Assert
+        sleep_save.assert_called_once()
+        records = result["providers_synced"]["suunto"]["records"]
+        assert records["sleep_sessions"]["failed_chunks"] == [failed]
+        assert watermark_repo.get_for_connection(db, connection.id)["sleep_sessions"] == sleep_synced
+
+
+class TestSyncVendorDataStreaming:
+    """Test suite for streaming long ranges window by window."""
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_long_range_saved_window_by_window(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test a long backfill holds no more fetched windows than there are fetch workers."""
+        # Arrange
+        user = UserFactory()
+        UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+
+        lock = threading.Lock()
+        unsaved = [0, 0]  # current, max
+
+        def fetch(session: Session, user_id: Any, start: datetime, end: datetime) -> list[dict[str, Any]]:
+            with lock:
+                unsaved[0] += 1
+                unsaved[1] = max(unsaved[1], unsaved[0])
+            return [{"start": start}]
+
+        def save(session: Session, user_id: Any, raw: list[dict[str, Any]]) -> int:
+            time.sleep(0.005)
+            with lock:
+                unsaved[0] -= 1
+            return len(raw)
+
+        strategy = MagicMock()
+        strategy.workouts = None
+        strategy.data_247.get_sync_families.return_value = {"sleep_sessions": (fetch, save)}
+        mock_get_provider.return_value = strategy
+
+        # Act
+        with patch.object(settings, "sync_max_concurrency", 2):
+            result = sync_vendor_data(str(user.id), "2024-01-01T00:00:00Z", "2025-01-01T00:00:00Z")
+
+        # Assert
+        provider_result = result["providers_synced"]["suunto"]
+        assert provider_result["params"]["data_247"]["sleep_sessions"] == 53  # 366 days in 7-day windows
+        assert provider_result["records"]["sleep_sessions"]["fetched"] == 53
+        assert unsaved[1] <= 2
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_failed_window_keeps_watermark(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test the watermark only advances once every window of the family was saved."""
+        # Arrange
+        user = UserFactory()
+        connection = UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        sleep_synced = datetime.now(timezone.utc) - timedelta(days=20)
+        watermark_repo = SyncWatermarkRepository()
+        watermark_repo.advance(db, connection.id, "sleep_sessions", sleep_synced)
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+
+        def fetch(session: Session, user_id: Any, start: datetime, end: datetime) -> list[dict[str, Any]]:
+            if start > sleep_synced:
+                raise RuntimeError("Suunto API unavailable")
+            return [{}]
+
+        strategy = MagicMock()
+        strategy.workouts = None
+        strategy.data_247.get_sync_families.return_value = {"sleep_sessions": (fetch, MagicMock(return_value=1))}
+        mock_get_provider.return_value = strategy
+
+        # Act
+        result = sync_vendor_data(str(user.id))
+
+        # Assert
+        data_247 = result["providers_synced"]["suunto"]["params"]["data_247"]
+        assert data_247["success"] is False
+        assert data_247["sleep_sessions"] == 1
+        assert watermark_repo.get_for_connection(db, connection.id)["sleep_sessions"] == sleep_synced
+
+    @patch("app.integrations.celery.tasks.sync_vendor_data_task.SessionLocal")
+    @patch("app.services.providers.factory.ProviderFactory.get_provider")
+    def test_overlap_refetch_stores_samples_once(
+        self,
+        mock_get_provider: MagicMock,
+        mock_session_local: MagicMock,
+        db: Session,
+        mock_celery_app: MagicMock,
+    ) -> None:
+        """Test samples fetched again within the overlap replace the stored ones on the next sync."""
+        # Arrange
+        user = UserFactory()
+        connection = UserConnectionFactory(user=user, provider="suunto", status=ConnectionStatus.ACTIVE)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        SyncWatermarkRepository().advance(db, connection.id, "activity_samples", now - timedelta(hours=2))
+        mock_session_local.return_value.__enter__.return_value = db
+        mock_session_local.return_value.__exit__.return_value = None
+        samples = [
+            {"timestamp": (now - timedelta(minutes=minutes)).isoformat(), "entryData": {"HR": 60, "StepCount": 10}}
+            for minutes in (90, 30)
+        ]
+
+        def fetch(session: Session, user_id: Any, start: datetime, end: datetime) -> list[dict[str, Any]]:
+            return [sample for sample in samples if start <= datetime.fromisoformat(sample["timestamp"]) < end]
+
+        data_247 = Suunto247Data(provider_name="suunto", api_base_url="https://cloudapi.suunto.com", oauth=MagicMock())
+        strategy = MagicMock()
+        strategy.workouts = None
+        strategy.data_247.get_sync_families.return_value = {
+            "activity_samples": (fetch, data_247._save_raw_activity_samples),
+        }
+        mock_get_provider.return_value = strategy
+
+        # Act
+        sync_vendor_data(str(user.id))
+        stored = db.query(DataPointSeries).count()
+        second = sync_vendor_data(str(user.id))
+
+        # Assert
+        assert second["providers_synced"]["suunto"]["params"]["data_247"]["activity_samples"] == 2
+        assert stored == db.query(DataPointSeries).count() == 4
+
+
 class TestBuildSyncParams:
     """Test suite for _build_sync_params helper function."""
 
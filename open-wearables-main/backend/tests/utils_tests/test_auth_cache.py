@@ -0,0 +1,189 @@
+"""
+Tests for the authentication cache.
+
+Tests cover:
+- LRU eviction and TTL expiry
+- Serving cached rows attached to the session without queries
+- Invalidation (local, shared Redis tier and pub/sub broadcast)
+- Applying invalidations received from other processes
+- Keeping API key values and password hashes out of the shared Redis tier
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.orm import Session
+
+from app.models import ApiKey, Developer
+from app.utils.auth_cache import INVALIDATION_CHANNEL, AuthCache, LRUTTLCache
+from tests.factories import ApiKeyFactory, DeveloperFactory
+
+
+class TestLRUTTLCache:
+    """Test suite for LRUTTLCache."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test the least recently used entry is evicted when full."""
+        # Arrange
+        cache: LRUTTLCache[str, int] = LRUTTLCache(maxsize=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        # Act
+        cache.set("c", 3)
+
+        # Assert
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_entries_expire_after_ttl(self) -> None:
+        """Test entries are dropped once their TTL has elapsed."""
+        # Arrange
+        cache: LRUTTLCache[str, int] = LRUTTLCache(maxsize=2, ttl_seconds=60)
+        with patch("app.utils.auth_cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+
+        # Act & Assert
+        with patch("app.utils.auth_cache.time.monotonic", return_value=159.0):
+            assert cache.get("a") == 1
+        with patch("app.utils.auth_cache.time.monotonic", return_value=161.0):
+            assert cache.get("a") is None
+
+
+class TestAuthCache:
+    """Test suite for AuthCache."""
+
+    def test_get_returns_session_bound_instance_without_query(self, db: Session) -> None:
+        """Test a cached row is merged into the session without hitting the database."""
+        # Arrange
+        cache = AuthCache(maxsize=10, ttl_seconds=60, redis_ttl_seconds=0)
+        developer = DeveloperFactory()
+        cache.set(developer)
+        db.expunge(developer)
+
+        # Act
+        with patch.object(db, "execute", wraps=db.execute) as mock_execute:
+            cached = cache.get(db, Developer, developer.id)
+
+        # Assert
+        mock_execute.assert_not_called()
+        assert cached is not None
+        assert cached.id == developer.id
+        assert cached.email == developer.email
+        assert cached in db
+
+    def test_get_miss_returns_none(self, db: Session) -> None:
+        """Test unknown keys are not served."""
+        # Arrange
+        cache = AuthCache(maxsize=10, ttl_seconds=60, redis_ttl_seconds=0)
+
+        # Act & Assert
+        assert cache.get(db, ApiKey, "sk-unknown") is None
+
+    def test_disabled_cache_never_serves(self, db: Session) -> None:
+        """Test a zero TTL disables caching."""
+        # Arrange
+        cache = AuthCache(maxsize=10, ttl_seconds=0, redis_ttl_seconds=0)
+        api_key = ApiKeyFactory()
+        cache.set(api_key)
+
+        # Act & Assert
+        assert cache.get(db, ApiKey, api_key.id) is None
+
+    def test_invalidate_drops_entry_and_publishes(self, db: Session) -> None:
+        """Test invalidation removes the local entry and broadcasts it."""
+        # Arrange
+        cache = AuthCache(maxsize=10, ttl_seconds=60, redis_ttl_seconds=0)
+        api_key = ApiKeyFactory()
+        cache.set(api_key)
+        mock_redis = MagicMock()
+
+        # Act
+        with patch("app.utils.auth_cache.get_redis_client", return_value=mock_redis):
+            cache.invalidate(ApiKey, api_key.id)
+
+        # Assert
+        assert cache.get(db, ApiKey, api_key.id) is None
+        mock_redis.publish.assert_called_once_with(
+            INVALIDATION_CHANNEL,
+            json.dumps({"namespace": "api_key", "key": api_key.id}),
+        )
+
+    def test_handle_invalidation_from_other_process(self, db: Session) -> None:
+        """Test invalidation messages received over pub/sub drop the local entry."""
+        # Arrange
+        cache = AuthCache(maxsize=10, ttl_seconds=60, redis_ttl_seconds=0)
+        developer = DeveloperFactory()
+        cache.set(developer)
+        message = {"type": "message", "data": json.dumps({"namespace": "developer", "key": str(developer.id)})}
+
+        # Act
+        cache._handle_invalidation(message)
+
+        # Assert
+        assert cache.get(db, Developer, developer.id) is None
+
+    def test_handle_invalidation_ignores_malformed_messages(self) -> None:
+        """Test malformed messages are ignored."""
+        # Arrange
+        cache = AuthCache(maxsize=10, ttl_seconds=60, redis_ttl_seconds=0)
+
+        # Act & Assert (no exception)
+        cache._handle_invalidation({"type": "message", "data": "not-json"})
+
+    def test_redis_tier_round_trip(self, db: Session) -> None:
+        """Test rows cached by another process are restored from Redis."""
+        # Arrange
+        store: dict[str, str] = {}
+        mock_redis = MagicMock()
+        mock_redis.set.side_effect = lambda key, value, ex: store.__setitem__(key, value)
+        mock_redis.get.side_effect = store.get
+        developer = DeveloperFactory()
+        writer = AuthCache(maxsize=10, ttl_seconds=60, redis_ttl_seconds=300)
+        reader = AuthCache(maxsize=10, ttl_seconds=60, redis_ttl_seconds=300)
+
+        # Act
+        with patch("app.utils.auth_cache.get_redis_client", return_value=mock_redis):
+            writer.set(developer)
+            db.expunge(developer)
+            cached = reader.get(db, Developer, developer.id)
+
+        # Assert
+        assert len(store) == 1
+        assert str(developer.id) not in next(iter(store))
+        assert cached is not None
+        assert cached.id == developer.id
+        assert cached.created_at == developer.created_at
+
+    def test_redis_tier_holds_no_secrets(self, db: Session) -> None:
+        """Test API key values and password hashes never reach Redis, and are restored or loaded on read."""
+        # Arrange
+        store: dict[str, str] = {}
+        mock_redis = MagicMock()
+        mock_redis.set.side_effect = lambda key, value, ex: store.__setitem__(key, value)
+        mock_redis.get.side_effect = store.get
+        developer = DeveloperFactory()
+        api_key = ApiKeyFactory(created_by=developer.id)
+        writer = AuthCache(maxsize=10, ttl_seconds=60, redis_ttl_seconds=300)
+        reader = AuthCache(maxsize=10, ttl_seconds=60, redis_ttl_seconds=300)
+        key_value, password_hash = api_key.id, developer.hashed_password
+
+        # Act
+        with patch("app.utils.auth_cache.get_redis_client", return_value=mock_redis):
+            writer.set(api_key)
+            writer.set(developer)
+            db.expunge_all()
+            cached_key = reader.get(db, ApiKey, key_value)
+            cached_developer = reader.get(db, Developer, developer.id)
+
+        # Assert
+        raw = "".join(store) + "".join(store.values())
+        assert key_value not in raw
+        assert password_hash not in raw
+        assert "hashed_password" not in raw
+        assert cached_key is not None
+        assert cached_key.id == key_value
+        assert cached_developer is not None
+        assert cached_developer.hashed_password == password_hash
@@ -0,0 +1,63 @@
+"""
+Tests for downsampling utility functions.
+
+Tests Largest-Triangle-Three-Buckets downsampling of time series.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.utils.downsampling import lttb, lttb_timeseries
+
+
+class TestLttb:
+    """Test suite for lttb."""
+
+    def test_returns_all_points_below_threshold(self) -> None:
+        """Test series shorter than the threshold are returned unchanged."""
+        # Arrange
+        points = [0, 1, 2]
+
+        # Act
+        result = lttb(points, 5, x=[0.0, 1.0, 2.0], y=[1.0, 2.0, 3.0])
+
+        # Assert
+        assert result == points
+
+    def test_small_thresholds_honoured(self) -> None:
+        """Test thresholds too small for buckets keep the endpoints, and 0 keeps every point."""
+        # Arrange
+        points = list(range(10))
+        x, y = [float(p) for p in points], [float(p % 3) for p in points]
+
+        # Act & Assert
+        assert lttb(points, 2, x=x, y=y) == [0, 9]
+        assert lttb(points, 1, x=x, y=y) == [0]
+        assert lttb(points, 0, x=x, y=y) == points
+
+    def test_downsamples_to_threshold_keeping_endpoints(self) -> None:
+        """Test output size equals the threshold and keeps first and last points."""
+        # Arrange
+        points = list(range(1000))
+
+        # Act
+        result = lttb(points, 100, x=[float(p) for p in points], y=[float(p % 7) for p in points])
+
+        # Assert
+        assert len(result) == 100
+        assert result[0] == 0
+        assert result[-1] == 999
+        assert result == sorted(result)
+
+    def test_preserves_spike(self) -> None:
+        """Test a single peak survives downsampling."""
+        # Arrange
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        samples = [(start + timedelta(seconds=i), 120.0) for i in range(600)]
+        samples[321] = (samples[321][0], 190.0)
+
+        # Act
+        result = lttb_timeseries(samples, 50)
+
+        # Assert
+        assert len(result) == 50
+        assert max(value for _, value in result) == 190.0
@@ -0,0 +1,66 @@
+"""
+Tests for the interval index.
+
+Tests overlap queries of IntervalIndex against a brute-force scan.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.utils.intervals import IntervalIndex
+
+BASE = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+def _at(minutes: int) -> datetime:
+    return BASE + timedelta(minutes=minutes)
+
+
+class TestIntervalIndex:
+    """Test suite for IntervalIndex."""
+
+    def test_overlapping_excludes_touching(self) -> None:
+        """Test intervals ending at the query start or starting at its end do not overlap it."""
+        # Arrange
+        index = IntervalIndex(
+            [(_at(0), _at(60), "before"), (_at(30), _at(90), "inside"), (_at(120), _at(180), "after")],
+        )
+
+        # Act
+        result = [label for _, _, label in index.overlapping(_at(60), _at(120))]
+
+        # Assert
+        assert result == ["inside"]
+
+    def test_long_interval_found_from_far_start(self) -> None:
+        """Test an interval starting long before the query is found through the longest-interval bound."""
+        # Arrange
+        index = IntervalIndex([(_at(0), _at(24 * 60), "hike"), *((_at(m), _at(m + 5), m) for m in range(0, 1000, 10))])
+
+        # Act
+        result = [label for _, _, label in index.overlapping(_at(1200), _at(1201))]
+
+        # Assert
+        assert result == ["hike"]
+
+    def test_matches_brute_force(self) -> None:
+        """Test random queries return exactly the overlapping intervals, ordered by start."""
+        # Arrange
+        rng = random.Random(7)
+        intervals = []
+        for label in range(500):
+            start = rng.randrange(0, 10_000)
+            intervals.append((_at(start), _at(start + rng.randrange(1, 240)), label))
+        index = IntervalIndex(intervals)
+
+        for _ in range(200):
+            start = rng.randrange(0, 10_000)
+            end = start + rng.randrange(1, 120)
+
+            # Act
+            result = list(index.overlapping(_at(start), _at(end)))
+
+            # Assert
+            expected = [interval for interval in intervals if interval[0] < _at(end) and interval[1] > _at(start)]
+            assert sorted(label for _, _, label in result) == sorted(label for _, _, label in expected)
+            assert [interval[0] for interval in result] == sorted(interval[0] for interval in result)
@@ -0,0 +1,188 @@
+"""
+Tests for incremental parsing of large JSON uploads.
+
+Tests cover:
+- Yielding items of the wanted arrays in document order, across chunk boundaries
+- Skipping other values and multipart leftovers around the document
+- Rejecting malformed, truncated and rootless documents, and documents with invalid items
+- Importing HealthKit uploads item by item from a stream
+- Importing nothing from HealthKit and Auto Export uploads with an invalid item late in the document
+"""
+
+import json
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import DataPointSeries, EventRecord
+from app.services.apple.auto_export.import_service import import_service as ae_import_service
+from app.services.apple.healthkit import import_service as hk_import_module
+from app.services.apple.healthkit.import_service import import_service as hk_import_service
+from app.utils.json_stream import is_well_formed, iter_sections
+from tests.factories import UserFactory
+
+DOCUMENT = {
+    "meta": {"records": [{"ignored": True}], "note": "café ❤"},
+    "data": {
+        "workouts": [{"uuid": "w1", "laps": [[1, 2], {"}": "]"}]}],
+        "device": {"name": "Watch"},
+        "records": [{"value": 12345678901234567890}, {"value": -1.5e-3}, None, "❤"],
+        "summary": [1, 2, 3],
+    },
+}
+
+
+def _stream(document: object | str) -> BytesIO:
+    text = document if isinstance(document, str) else json.dumps(document, ensure_ascii=False)
+    return BytesIO(text.encode("utf-8"))
+
+
+class TestIterSections:
+    """Test suite for iter_sections."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64 * 1024])
+    def test_items_in_order(self, chunk_size: int) -> None:
+        """Test items of the wanted arrays are yielded whatever the chunk boundaries."""
+        # Act
+        items = list(iter_sections(_stream(DOCUMENT), "data", {"workouts", "records"}, chunk_size=chunk_size))
+
+        # Assert
+        assert items == [("workouts", workout) for workout in DOCUMENT["data"]["workouts"]] + [
+            ("records", record) for record in DOCUMENT["data"]["records"]
+        ]
+
+    def test_multipart_leftovers_skipped(self) -> None:
+        """Test bytes before and after a multipart document are ignored."""
+        # Arrange
+        stream = _stream('--boundary\r\n\r\n{"data": {"records": [1, 2]}}\r\n--boundary--\r\n')
+
+        # Act
+        items = list(iter_sections(stream, "data", {"records"}, skip_prefix=True, chunk_size=4))
+
+        # Assert
+        assert items == [("records", 1), ("records", 2)]
+
+    @pytest.mark.parametrize(
+        "document",
+        [
+            '{"data": {"records": [1, 2}}',
+            '{"data": {"records": [{"value": 1},',
+            '{"data": {"records": []}} {"data": {}}',
+            '{"meta": {}}',
+            '{"data": []}',
+            "",
+        ],
+    )
+    def test_malformed_rejected(self, document: str) -> None:
+        """Test malformed, truncated and rootless documents raise ValueError and fail the check."""
+        # Act & Assert
+        with pytest.raises(ValueError, match=r"Invalid JSON|Expecting|No 'data'"):
+            list(iter_sections(_stream(document), "data", {"records"}, chunk_size=5))
+        assert is_well_formed(_stream(document), "data", {"records"}) is False
+
+    def test_well_formed_rewinds(self) -> None:
+        """Test checking a document leaves the stream ready to be imported."""
+        # Arrange
+        stream = _stream(DOCUMENT)
+
+        # Act
+        valid = is_well_formed(stream, "data", {"records"})
+
+        # Assert
+        assert valid is True
+        assert stream.tell() == 0
+
+    def test_invalid_item_rejected(self) -> None:
+        """Test a ValueError raised by the item check makes the document invalid."""
+
+        # Arrange
+        def validate(section: str, item: object) -> None:
+            if item is None:
+                raise ValueError(f"empty item in {section}")
+
+        # Act
+        valid = is_well_formed(_stream(DOCUMENT), "data", {"workouts", "records"}, validate=validate)
+
+        # Assert
+        assert valid is False
+
+
+def _record(index: int) -> dict[str, object]:
+    return {
+        "uuid": f"r{index}",
+        "type": "HKQuantityTypeIdentifierHeartRate",
+        "startDate": f"2025-01-01T10:00:{index:02d}Z",
+        "endDate": f"2025-01-01T10:00:{index:02d}Z",
+        "unit": "count/min",
+        "value": 60 + index,
+        "sourceName": "Watch",
+    }
+
+
+class TestHealthKitStreamingImport:
+    """Test suite for the Apple Health imports of a streamed upload."""
+
+    async def test_import_from_stream(self, db: Session) -> None:
+        """Test workouts and records are imported, records in batches, and a truncated upload imports nothing."""
+        # Arrange
+        user = UserFactory()
+        records = [_record(i) for i in range(5)]
+        workout = {
+            "uuid": "w1",
+            "type": "running",
+            "startDate": "2025-01-01T10:00:00Z",
+            "endDate": "2025-01-01T10:30:00Z",
+            "sourceName": "Watch",
+        }
+        body = json.dumps({"data": {"records": records, "workouts": [workout]}})
+
+        # Act
+        truncated = await hk_import_service.import_data_from_request(
+            db, _stream(body[:-10]), "application/json", str(user.id)
+        )
+        with patch.object(hk_import_module, "SAMPLE_BATCH_SIZE", 2):
+            response = await hk_import_service.import_data_from_request(
+                db, _stream(body), "application/json", str(user.id)
+            )
+
+        # Assert
+        assert truncated.status_code == 400
+        assert response.status_code == 200
+        assert db.query(EventRecord).filter(EventRecord.external_id == "w1").count() == 1
+        assert db.query(DataPointSeries).count() == 5
+
+    async def test_invalid_record_imports_nothing(self, db: Session) -> None:
+        """Test a record failing its schema after the first batches fails the upload before any batch is saved."""
+        # Arrange
+        user = UserFactory()
+        records = [_record(i) for i in range(5)] + [{**_record(5), "startDate": "yesterday"}]
+        body = json.dumps({"data": {"records": records}})
+
+        # Act
+        with patch.object(hk_import_module, "SAMPLE_BATCH_SIZE", 2):
+            response = await hk_import_service.import_data_from_request(
+                db, _stream(body), "application/json", str(user.id)
+            )
+
+        # Assert
+        assert response.status_code == 400
+        assert db.query(DataPointSeries).count() == 0
+
+    async def test_invalid_auto_export_workout_imports_nothing(self, db: Session) -> None:
+        """Test an Auto Export workout failing its schema fails the upload before earlier workouts are saved."""
+        # Arrange
+        user = UserFactory()
+        workouts = [
+            {"id": "ae-1", "name": "Running", "start": "2025-01-01 10:00:00 +0000", "end": "2025-01-01 10:30:00 +0000"},
+            {"id": "ae-2", "name": "Cycling", "start": "2025-01-02 10:00:00 +0000"},
+        ]
+        body = json.dumps({"data": {"workouts": workouts}})
+
+        # Act
+        response = await ae_import_service.import_data_from_request(db, _stream(body), "application/json", str(user.id))
+
+        # Assert
+        assert response.status_code == 400
+        assert db.query(EventRecord).count() == 0